@@ -0,0 +1,4 @@
+"""Benchmarks for idrac_ctl, run with ``python -m benchmarks.<name>``.
+
+Author Mus spyroot@gmail.com
+"""
@@ -0,0 +1,893 @@
+"""Synthetic Redfish fleet for offline benchmarks.
+
+    python -m benchmarks.simulator --bmcs 1000 --vendors dell,hpe,supermicro,generic \\
+        --latency lognormal:0.03,0.5 --error-rate 0.01 --write-targets /tmp/hosts.txt
+    idrac_ctl --use_http --idrac_password sim fleet --targets /tmp/hosts.txt sensors
+
+The unit tests mock one server in process with requests-mock. This module
+serves N synthetic BMCs over real HTTP (or HTTPS with --certfile) from one
+asyncio loop, so fleet features can be measured at 1,000-node scale on one
+box. Every BMC answers from a fixture corpus: the captured DMTF tree in
+``idrac_ctl/json_responses`` overlaid by ``tests/<vendor>_fixtures``, the
+same layering the tests use. A member captured only inline, in the
+``Members`` of its collection, is served from that body.
+
+Addressing:
+
+    port mode   one listening port per BMC, addresses 127.0.0.1:<port>
+    host mode   one port for the fleet, the BMC is picked by the Host header;
+                addresses are 127.1.x.y:<port>, which Linux routes to loopback
+
+Each BMC keeps its own state: PATCH bodies are merged into an overlay,
+sessions issue X-Auth-Token, and resets, virtual media actions and Dell
+jobs (i.e. a BIOS apply posted to ``<manager>/Jobs``) become tasks that move
+from New/Scheduled through Running to Completed over ``job_seconds`` and
+apply their effect when they complete. A task monitor answers 202 with
+Retry-After while the task runs and 200 afterwards. GETs carry an ETag and
+honour If-None-Match. With ``page_size`` a collection answers at most that
+many members and links the rest with ``Members@odata.nextLink`` (``$skip``,
+the only parameter of the link on a one-parameter-per-URI vendor).
+
+GETs honour the query parameters the vendor profile in ``idrac_ctl.vendors``
+claims: ``$expand`` (``*``, ``.`` and ``~`` with ``$levels``), ``$select``,
+``$filter`` (``eq`` / ``ne`` comparisons joined with ``and`` / ``or``),
+``$top`` and ``$skip``. A parameter the vendor does not support is ignored,
+as most BMCs do, and the Dell corpus answers 400 to more than one parameter
+per URI like iDRAC does.
+
+Latency is drawn per request from a distribution spec:
+
+    fixed:S  uniform:A,B  normal:MEAN,SD  lognormal:MEDIAN,SIGMA  exp:MEAN
+
+(seconds). Faults are per request rates: 500s, 503s with Retry-After,
+401s for valid credentials, and timeouts that hold the connection without
+answering.
+
+Author Mus spyroot@gmail.com
+"""
+import argparse
+import asyncio
+import base64
+import copy
+import http
+import itertools
+import json
+import math
+import random
+import re
+import ssl
+import sys
+import threading
+import time
+import uuid
+import zlib
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import unquote
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+BASE_FIXTURES = REPO_ROOT / "idrac_ctl" / "json_responses"
+FIXTURES_ROOT = REPO_ROOT / "tests"
+VENDOR_FIXTURES = {
+    "dell": "idrac_fixtures",
+    "hpe": "hpe_fixtures",
+    "supermicro": "supermicro_fixtures",
+    "generic": "generic_fixtures",
+}
+DEFAULT_USERNAME = "root"
+DEFAULT_PASSWORD = "sim"
+DEFAULT_JOB_SECONDS = 5.0
+SERVICE_ROOT = "/redfish/v1"
+TASKS = "/redfish/v1/TaskService/Tasks"
+SESSIONS = "/redfish/v1/SessionService/Sessions"
+
+# served when a corpus has no captured service root
+_SERVICE_ROOT = {
+    "@odata.id": SERVICE_ROOT,
+    "@odata.type": "#ServiceRoot.v1_15_0.ServiceRoot",
+    "Id": "RootService",
+    "Name": "Root Service",
+    "RedfishVersion": "1.17.0",
+    **{name: {"@odata.id": f"{SERVICE_ROOT}/{name}"}
+       for name in ("Systems", "Chassis", "Managers", "AccountService", "SessionService",
+                    "TaskService", "UpdateService", "EventService", "JobService")},
+}
+
+# query parameters each vendor corpus honours, see the module docstring
+QUERY_SUPPORT = {
+    "dell": frozenset({"$expand", "$select", "$filter", "$top", "$skip"}),
+    "hpe": frozenset({"$expand"}),
+    "generic": frozenset({"$expand"}),
+    "supermicro": frozenset(),
+}
+ONE_QUERY_PARAM_PER_URI = frozenset({"dell"})
+_SELECT_KEEP = ("@odata.id", "@odata.type", "@odata.context", "@odata.etag")
+
+_POWER_AFTER_RESET = {
+    "On": "On", "ForceOn": "On", "ForceRestart": "On", "GracefulRestart": "On",
+    "PowerCycle": "On", "ForceOff": "Off", "GracefulShutdown": "Off", "PushPowerButton": None,
+}
+
+
+def _fixture_key(path: str) -> str:
+    return ("_" + path.strip("/").replace("/", "_") + ".json").lower()
+
+
+def _merge(base: dict, patch: dict) -> dict:
+    for key, value in patch.items():
+        if isinstance(value, dict) and isinstance(base.get(key), dict):
+            _merge(base[key], value)
+        else:
+            base[key] = value
+    return base
+
+
+class FixtureCorpus:
+    """Read-only Redfish documents of one vendor, parsed on first use."""
+
+    def __init__(self, vendor: str, fixtures_root: Path = FIXTURES_ROOT):
+        """
+        :param vendor: dell, hpe, supermicro or generic
+        :param fixtures_root: directory that holds the <vendor>_fixtures trees
+        """
+        if vendor not in VENDOR_FIXTURES:
+            raise ValueError(f"unknown vendor {vendor}, expected one of {sorted(VENDOR_FIXTURES)}")
+        self.vendor = vendor
+        self._index = {}
+        for directory in (BASE_FIXTURES, Path(fixtures_root) / VENDOR_FIXTURES[vendor]):
+            if directory.exists():
+                for path in directory.glob("*.json"):
+                    self._index[path.name.lower()] = path
+        self._docs = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._index)
+
+    def get(self, path: str) -> Optional[dict]:
+        """Document served at a Redfish path, None when the corpus has none.
+        A member captured only inline, in the body of its collection, is
+        served from there. Callers must not modify it."""
+        key = _fixture_key(path)
+        with self._lock:
+            if key in self._docs:
+                return self._docs[key]
+            fixture = self._index.get(key)
+            doc = json.loads(fixture.read_text()) if fixture else None
+        if doc is None:
+            doc = self._inline_member(path)
+        with self._lock:
+            return self._docs.setdefault(key, doc)
+
+    def _inline_member(self, path: str) -> Optional[dict]:
+        """Inline body of path in the Members of its parent collection."""
+        path = path.rstrip("/")
+        parent, _, _ = path.rpartition("/")
+        if not parent.startswith(SERVICE_ROOT):
+            return None
+        members = (self.get(parent) or {}).get("Members")
+        for member in members if isinstance(members, list) else []:
+            # a bare link is not a body.
+            if isinstance(member, dict) and len(member) > 1 \
+                    and str(member.get("@odata.id", "")).rstrip("/").lower() == path.lower():
+                return member
+        return None
+
+
+class Latency:
+    """Per request latency drawn from a distribution spec."""
+
+    KINDS = {"fixed": 1, "uniform": 2, "normal": 2, "lognormal": 2, "exp": 1}
+
+    def __init__(self, spec: str = "fixed:0"):
+        """
+        :param spec: ``kind:p1[,p2]`` in seconds, see the module docstring
+        :raise ValueError: unknown kind or wrong number of parameters
+        """
+        kind, _, params = spec.partition(":")
+        try:
+            values = [float(v) for v in params.split(",")] if params else []
+        except ValueError:
+            raise ValueError(f"bad latency spec {spec}") from None
+        if kind not in self.KINDS or len(values) != self.KINDS[kind] or min(values) < 0:
+            raise ValueError(f"bad latency spec {spec}, expected one of "
+                             f"fixed:S uniform:A,B normal:MEAN,SD lognormal:MEDIAN,SIGMA exp:MEAN")
+        self.spec = spec
+        self.kind = kind
+        self.params = values
+
+    def sample(self, rng: random.Random) -> float:
+        """One latency in seconds, never negative."""
+        p = self.params
+        if self.kind == "fixed":
+            value = p[0]
+        elif self.kind == "uniform":
+            value = rng.uniform(p[0], p[1])
+        elif self.kind == "normal":
+            value = rng.gauss(p[0], p[1])
+        elif self.kind == "lognormal":
+            value = p[0] * math.exp(rng.gauss(0.0, p[1]))
+        else:
+            value = rng.expovariate(1.0 / p[0]) if p[0] > 0 else 0.0
+        return max(0.0, value)
+
+
+@dataclass
+class Faults:
+    """Per request fault rates, each in 0..1."""
+
+    error_rate: float = 0.0
+    throttle_rate: float = 0.0
+    auth_failure_rate: float = 0.0
+    timeout_rate: float = 0.0
+    # seconds a 503 asks the client to wait, also sent on running task monitors.
+    retry_after: int = 1
+    # seconds a timed out request holds the connection before closing it.
+    hang: float = 30.0
+
+    def draw(self, rng: random.Random) -> Optional[str]:
+        """Fault for one request: timeout, error, throttle, auth or None."""
+        roll = rng.random()
+        for name, rate in (("timeout", self.timeout_rate), ("error", self.error_rate),
+                           ("throttle", self.throttle_rate), ("auth", self.auth_failure_rate)):
+            if roll < rate:
+                return name
+            roll -= rate
+        return None
+
+
+@dataclass
+class SimTask:
+    """A task or Dell job that completes job_seconds after it was created."""
+
+    id: str
+    name: str
+    created: float
+    duration: float
+    job_uri: Optional[str] = None
+    job_type: str = "Unknown"
+    effect: Optional[Callable[[], None]] = None
+    done: bool = False
+
+    def progress(self, now: float) -> int:
+        if self.duration <= 0:
+            return 100
+        return max(0, min(100, int(100 * (now - self.created) / self.duration)))
+
+    def settle(self, now: float) -> int:
+        """Apply the effect once the task completed, return its progress."""
+        percent = self.progress(now)
+        if percent >= 100 and not self.done:
+            self.done = True
+            if self.effect is not None:
+                self.effect()
+        return percent
+
+
+@dataclass
+class Response:
+    status: int
+    body: Optional[object] = None
+    headers: Dict[str, str] = field(default_factory=dict)
+
+
+def _error(status: int, message: str) -> Response:
+    return Response(status, {"error": {"code": "Base.1.8.GeneralError", "message": message,
+                                       "@Message.ExtendedInfo": [{"Message": message,
+                                                                  "Severity": "Critical"}]}})
+
+
+class SimulatedBmc:
+    """State and request handling of one synthetic BMC."""
+
+    def __init__(self,
+                 index: int,
+                 corpus: FixtureCorpus,
+                 username: str = DEFAULT_USERNAME,
+                 password: str = DEFAULT_PASSWORD,
+                 job_seconds: float = DEFAULT_JOB_SECONDS,
+                 clock: Callable[[], float] = time.monotonic,
+                 page_size: Optional[int] = None):
+        """
+        :param index: position of the BMC in the fleet
+        :param corpus: fixture corpus of its vendor
+        :param username: accepted user name
+        :param password: accepted password
+        :param job_seconds: seconds a task or job takes to complete
+        :param clock: monotonic clock, replaced in tests
+        :param page_size: members per collection page, None answers whole collections
+        """
+        self.index = index
+        self.corpus = corpus
+        self.vendor = corpus.vendor
+        self.address = ""
+        self.username = username
+        self.password = password
+        self.job_seconds = job_seconds
+        self.clock = clock
+        self.page_size = page_size
+        self.uuid = str(uuid.uuid5(uuid.NAMESPACE_URL, f"idrac-ctl-sim/{index}"))
+        self.overlay: Dict[str, dict] = {}
+        self.tasks: Dict[str, SimTask] = {}
+        self.sessions: Dict[str, str] = {}
+        self._ids = itertools.count(1000)
+
+    # documents
+
+    def document(self, path: str) -> Optional[dict]:
+        """Current document at a path, overlay first."""
+        key = path.rstrip("/").lower() or "/"
+        if key in self.overlay:
+            return self.overlay[key]
+        doc = self.corpus.get(path)
+        if key == SERVICE_ROOT.lower():
+            doc = dict(doc or _SERVICE_ROOT, UUID=self.uuid)
+        return doc
+
+    def writable(self, path: str) -> dict:
+        """Overlay copy of a document, created on first write."""
+        key = path.rstrip("/").lower()
+        if key not in self.overlay:
+            self.overlay[key] = copy.deepcopy(self.corpus.get(path) or {"@odata.id": path})
+        return self.overlay[key]
+
+    # authentication
+
+    def authorized(self, headers: Dict[str, str]) -> bool:
+        token = headers.get("x-auth-token")
+        if token is not None:
+            return token in self.sessions
+        auth = headers.get("authorization", "")
+        if not auth.lower().startswith("basic "):
+            return False
+        try:
+            user, _, password = base64.b64decode(auth[6:]).decode().partition(":")
+        except (ValueError, UnicodeDecodeError):
+            return False
+        return user == self.username and password == self.password
+
+    # tasks and jobs
+
+    def _new_task(self, name: str, effect=None, job_uri: Optional[str] = None,
+                  job_type: str = "Unknown") -> SimTask:
+        task_id = f"JID_{self.index:04d}{next(self._ids):08d}"
+        task = SimTask(task_id, name, self.clock(), self.job_seconds, job_uri, job_type, effect)
+        self.tasks[task_id] = task
+        return task
+
+    def _task_doc(self, task: SimTask) -> Tuple[int, dict]:
+        percent = task.settle(self.clock())
+        done = percent >= 100
+        state = "Completed" if done else ("Running" if percent > 0 else "New")
+        doc = {"@odata.id": f"{TASKS}/{task.id}",
+               "@odata.type": "#Task.v1_6_0.Task",
+               "Id": task.id,
+               "Name": task.name,
+               "TaskState": state,
+               "TaskStatus": "OK",
+               "PercentComplete": percent,
+               "Messages": [{"Message": f"{task.name} {state.lower()}",
+                             "MessageId": "TaskEvent.1.0.TaskCompletedOK" if done
+                             else "TaskEvent.1.0.TaskProgressChanged"}]}
+        return (200 if done else 202), doc
+
+    def _job_doc(self, task: SimTask, uri: str) -> dict:
+        percent = task.settle(self.clock())
+        state = "Completed" if percent >= 100 else ("Running" if percent > 0 else "Scheduled")
+        return {"@odata.id": uri,
+                "@odata.type": "#DellJob.v1_5_0.DellJob",
+                "Id": task.id,
+                "Name": task.name,
+                "JobState": state,
+                "JobType": task.job_type,
+                "PercentComplete": percent,
+                "Message": "Job completed successfully." if state == "Completed"
+                else f"Task {state.lower()}.",
+                "MessageId": "PR19" if state == "Completed" else "PR20"}
+
+    def _apply_settings(self, target: str):
+        """Move pending Settings attributes into the resource they belong to."""
+        settings = self.overlay.get(target.rstrip("/").lower())
+        if not settings:
+            return
+        resource = target.rstrip("/")
+        if resource.lower().endswith("/settings"):
+            resource = resource[: -len("/settings")]
+        pending = settings.get("Attributes") or {}
+        if pending:
+            self.writable(resource).setdefault("Attributes", {}).update(pending)
+            settings["Attributes"] = {}
+
+    def _set_power(self, system: str, reset_type: str):
+        state = _POWER_AFTER_RESET.get(reset_type)
+        doc = self.writable(system)
+        if state is None:
+            state = "Off" if doc.get("PowerState") == "On" else "On"
+        doc["PowerState"] = state
+
+    def _set_media(self, media: str, body: dict, inserted: bool):
+        doc = self.writable(media)
+        doc["Inserted"] = inserted
+        doc["Image"] = body.get("Image") if inserted else None
+        doc["ConnectedVia"] = "URI" if inserted else "NotConnected"
+
+    # verbs
+
+    def get(self, path: str) -> Response:
+        parts = path.rstrip("/").split("/")
+        tail = parts[-1]
+        if tail in self.tasks:
+            task = self.tasks[tail]
+            if path.lower().startswith(TASKS.lower()):
+                status, doc = self._task_doc(task)
+                return Response(status, doc)
+            return Response(200, self._job_doc(task, path.rstrip("/")))
+        doc = self.document(path)
+        if tail in ("Jobs", "Tasks") and (doc is not None or self.tasks):
+            doc = copy.deepcopy(doc) if doc is not None else {"@odata.id": path.rstrip("/")}
+            members = [m for m in doc.get("Members", [])]
+            base = path.rstrip("/")
+            members += [{"@odata.id": f"{base}/{task_id}"} for task_id in self.tasks]
+            doc["Members"] = members
+            doc["Members@odata.count"] = len(members)
+        if doc is None:
+            return _error(404, f"resource {path} not found")
+        return Response(200, doc)
+
+    def _expand(self, doc: dict, mode: str, levels: int) -> dict:
+        """doc with its hyperlinks replaced by the linked documents, levels deep."""
+        if levels < 1:
+            return doc
+
+        def expand(value, in_links):
+            if isinstance(value, list):
+                return [expand(item, in_links) for item in value]
+            if not isinstance(value, dict):
+                return value
+            uri = value.get("@odata.id")
+            if len(value) == 1 and isinstance(uri, str) and \
+                    (mode == "*" or (mode == "~") == in_links):
+                linked = self.get(uri)
+                if linked.status == 200 and isinstance(linked.body, dict):
+                    return self._expand(linked.body, mode, levels - 1)
+                return value
+            return {k: expand(v, in_links or k == "Links") for k, v in value.items()}
+
+        return {k: expand(v, k == "Links") for k, v in doc.items()}
+
+    def _matches(self, member: dict, spec: str) -> bool:
+        """True when a collection member satisfies a $filter of eq / ne
+        comparisons joined by ``and`` / ``or`` (``and`` binds tighter)."""
+        if set(member) <= set(_SELECT_KEEP):
+            member = self.get(member.get("@odata.id", "")).body or {}
+        for alternative in re.split(r"\s+or\s+", spec.strip()):
+            matched = True
+            for clause in re.split(r"\s+and\s+", alternative):
+                found = re.fullmatch(r"\s*(\w+)\s+(eq|ne)\s+'([^']*)'\s*", clause)
+                if found is None:
+                    raise ValueError(spec)
+                name, op, value = found.groups()
+                equal = str(member.get(name)) == value
+                matched = matched and (equal if op == "eq" else not equal)
+            if matched:
+                return True
+        return False
+
+    def query(self, doc: dict, query: str) -> Response:
+        """Apply the query string of a GET to the document it returned."""
+        params = {}
+        for pair in filter(None, query.split("&")):
+            name, _, value = pair.partition("=")
+            params[unquote(name)] = unquote(value)
+        if self.vendor in ONE_QUERY_PARAM_PER_URI and len(params) > 1:
+            return _error(400, f"only one query parameter per URI is supported, got {query}")
+        supported = QUERY_SUPPORT.get(self.vendor, frozenset())
+        params = {name: value for name, value in params.items() if name in supported}
+        try:
+            if "$expand" in params:
+                spec = params["$expand"]
+                levels = 1
+                if "$levels=" in spec:
+                    levels = int(spec.split("$levels=", 1)[1].rstrip(")"))
+                if spec[:1] not in ("*", ".", "~") or levels < 1:
+                    raise ValueError(spec)
+                doc = self._expand(doc, spec[0], levels)
+            if "$filter" in params and isinstance(doc.get("Members"), list):
+                doc = dict(doc, Members=[m for m in doc["Members"]
+                                         if self._matches(m, params["$filter"])])
+                doc["Members@odata.count"] = len(doc["Members"])
+            if ("$top" in params or "$skip" in params) and isinstance(doc.get("Members"), list):
+                skip = int(params.get("$skip", 0))
+                top = int(params["$top"]) if "$top" in params else None
+                if skip < 0 or (top is not None and top < 0):
+                    raise ValueError(query)
+                members = doc["Members"][skip:]
+                doc = dict(doc, Members=members if top is None else members[:top])
+            if "$select" in params:
+                selected = {name.strip() for name in params["$select"].split(",")}
+                doc = {k: v for k, v in doc.items() if k in selected or k in _SELECT_KEEP}
+        except ValueError:
+            return _error(400, f"malformed query {query}")
+        return Response(200, doc)
+
+    def page(self, doc: dict, path: str, query: str) -> Response:
+        """Server side paging of a collection answer, see ``page_size``."""
+        members = doc.get("Members")
+        if not isinstance(members, list):
+            return Response(200, doc)
+        pairs = [pair for pair in query.split("&") if pair]
+        kept = [pair for pair in pairs if not unquote(pair).startswith("$skip=")]
+        offset = 0
+        for pair in pairs:
+            if unquote(pair).startswith("$skip="):
+                offset = int(unquote(pair).split("=", 1)[1] or 0)
+        if "$skip" not in QUERY_SUPPORT.get(self.vendor, frozenset()):
+            # the service honours its own links even where clients can not page.
+            members = members[offset:]
+        if len(members) <= self.page_size:
+            return Response(200, dict(doc, Members=members))
+        if self.vendor in ONE_QUERY_PARAM_PER_URI:
+            kept = []
+        link = "&".join(kept + [f"$skip={offset + self.page_size}"])
+        return Response(200, dict(doc, Members=members[:self.page_size],
+                                  **{"Members@odata.nextLink": f"{path}?{link}"}))
+
+    def patch(self, path: str, body: dict) -> Response:
+        if self.document(path) is None and not path.rstrip("/").lower().endswith("/settings"):
+            return _error(404, f"resource {path} not found")
+        _merge(self.writable(path), body)
+        return Response(200, {"@Message.ExtendedInfo": [
+            {"MessageId": "Base.1.12.Success", "Message": "Successfully Completed Request",
+             "Severity": "OK"}]})
+
+    def post(self, path: str, body: dict) -> Response:
+        path = path.rstrip("/")
+        if path.lower() == SESSIONS.lower():
+            if body.get("UserName") != self.username or body.get("Password") != self.password:
+                return _error(401, "invalid credentials")
+            session_id = str(next(self._ids))
+            token = uuid.uuid4().hex
+            self.sessions[token] = session_id
+            uri = f"{SESSIONS}/{session_id}"
+            return Response(201, {"@odata.id": uri, "Id": session_id, "UserName": self.username},
+                            {"X-Auth-Token": token, "Location": uri})
+        if "/Actions/" in path:
+            resource, _, action = path.partition("/Actions/")
+            if action.endswith("ComputerSystem.Reset"):
+                reset_type = body.get("ResetType", "On")
+                task = self._new_task(f"Reset {reset_type}",
+                                      lambda: self._set_power(resource, reset_type))
+            elif action.endswith("VirtualMedia.InsertMedia"):
+                task = self._new_task("Insert media",
+                                      lambda: self._set_media(resource, body, True))
+            elif action.endswith("VirtualMedia.EjectMedia"):
+                task = self._new_task("Eject media",
+                                      lambda: self._set_media(resource, body, False))
+            else:
+                task = self._new_task(action.rsplit(".", 1)[-1])
+            return Response(202, None, {"Location": f"{TASKS}/{task.id}",
+                                        "Retry-After": "1"})
+        if path.endswith("/Jobs"):
+            target = body.get("TargetSettingsURI", "")
+            job_type = "BIOSConfiguration" if "bios" in target.lower() else "ConfigurationJob"
+            task = self._new_task(f"Configure {target or 'job'}",
+                                  lambda: self._apply_settings(target),
+                                  job_type=job_type)
+            task.job_uri = f"{path}/{task.id}"
+            return Response(200, {"@Message.ExtendedInfo": [
+                {"MessageId": "IDRAC.2.8.SYS408", "Message": f"Job {task.id} created",
+                 "Severity": "Informational"}]}, {"Location": task.job_uri})
+        return Response(204)
+
+    def delete(self, path: str) -> Response:
+        tail = path.rstrip("/").split("/")[-1]
+        if tail in self.tasks:
+            del self.tasks[tail]
+            return Response(200)
+        for token, session_id in list(self.sessions.items()):
+            if path.rstrip("/") == f"{SESSIONS}/{session_id}":
+                del self.sessions[token]
+                return Response(204)
+        if self.document(path) is None:
+            return _error(404, f"resource {path} not found")
+        return Response(200)
+
+    def handle(self, method: str, path: str, headers: Dict[str, str], body: dict) -> Response:
+        """Answer one request, without faults and latency."""
+        path, _, query = path.partition("?")
+        public = path.rstrip("/").lower() == SERVICE_ROOT.lower() or (
+            method == "POST" and path.rstrip("/").lower() == SESSIONS.lower())
+        if not public and not self.authorized(headers):
+            return Response(401, _error(401, "authentication required").body,
+                            {"WWW-Authenticate": 'Basic realm="simulator"'})
+        if method in ("GET", "HEAD"):
+            response = self.get(path)
+            if query and response.status == 200 and isinstance(response.body, dict):
+                response = self.query(response.body, query)
+            if self.page_size and response.status == 200 and isinstance(response.body, dict):
+                response = self.page(response.body, path, query)
+            return response
+        if method == "PATCH":
+            return self.patch(path, body)
+        if method == "POST":
+            return self.post(path, body)
+        if method == "DELETE":
+            return self.delete(path)
+        return _error(405, f"{method} not allowed")
+
+
+class FleetSimulator:
+    """Serve a fleet of SimulatedBmc over HTTP from one asyncio loop."""
+
+    def __init__(self,
+                 bmcs: int = 1,
+                 vendors: Iterable[str] = ("dell",),
+                 latency: str = "fixed:0",
+                 faults: Optional[Faults] = None,
+                 mode: str = "port",
+                 bind: str = "127.0.0.1",
+                 base_port: int = 0,
+                 seed: Optional[int] = None,
+                 username: str = DEFAULT_USERNAME,
+                 password: str = DEFAULT_PASSWORD,
+                 job_seconds: float = DEFAULT_JOB_SECONDS,
+                 ssl_context: Optional[ssl.SSLContext] = None,
+                 fixtures_root: Path = FIXTURES_ROOT,
+                 page_size: Optional[int] = None):
+        """
+        :param bmcs: number of BMCs
+        :param vendors: vendors assigned to the BMCs round robin
+        :param latency: latency spec, see Latency
+        :param faults: fault rates, none by default
+        :param mode: port, one port per BMC, or host, one port and the Host header
+        :param bind: listen address
+        :param base_port: first port, 0 picks free ports
+        :param seed: seed of the latency and fault draws
+        :param username: user name every BMC accepts
+        :param password: password every BMC accepts
+        :param job_seconds: seconds a task or job takes
+        :param ssl_context: serve HTTPS with this context
+        :param fixtures_root: directory holding the <vendor>_fixtures trees
+        :param page_size: members per collection page, None answers whole collections
+        """
+        if mode not in ("port", "host"):
+            raise ValueError("mode must be port or host")
+        vendors = list(vendors)
+        corpora = {vendor: FixtureCorpus(vendor, fixtures_root) for vendor in set(vendors)}
+        self.bmcs = [SimulatedBmc(i, corpora[vendors[i % len(vendors)]], username, password,
+                                  job_seconds, page_size=page_size)
+                     for i in range(bmcs)]
+        self.latency = Latency(latency)
+        self.faults = faults or Faults()
+        self.mode = mode
+        self.bind = bind
+        self.base_port = base_port
+        self.ssl_context = ssl_context
+        self.rng = random.Random(seed)
+        self.by_host: Dict[str, SimulatedBmc] = {}
+        self.stats: Dict[str, int] = {}
+        self._servers: List[asyncio.AbstractServer] = []
+        self._connections = set()
+
+    @property
+    def targets(self) -> List[str]:
+        """BMC addresses, ``host:port``."""
+        return [bmc.address for bmc in self.bmcs]
+
+    async def start(self):
+        """Open the listening sockets."""
+        if self.mode == "port":
+            for i, bmc in enumerate(self.bmcs):
+                port = self.base_port + i if self.base_port else 0
+                server = await asyncio.start_server(
+                    lambda r, w, bmc=bmc: self._serve(r, w, bmc), self.bind, port,
+                    ssl=self.ssl_context, backlog=256)
+                self._servers.append(server)
+                bmc.address = f"{self.bind}:{server.sockets[0].getsockname()[1]}"
+            return
+        server = await asyncio.start_server(self._serve, self.bind, self.base_port,
+                                            ssl=self.ssl_context, backlog=4096)
+        self._servers.append(server)
+        port = server.sockets[0].getsockname()[1]
+        for i, bmc in enumerate(self.bmcs):
+            bmc.address = f"127.1.{i // 254}.{i % 254 + 1}:{port}"
+            self.by_host[bmc.address.rsplit(":", 1)[0]] = bmc
+
+    async def stop(self):
+        for server in self._servers:
+            server.close()
+        for task in list(self._connections):
+            task.cancel()
+        if self._connections:
+            await asyncio.gather(*self._connections, return_exceptions=True)
+        for server in self._servers:
+            await server.wait_closed()
+        self._servers = []
+
+    def _count(self, key: str):
+        self.stats[key] = self.stats.get(key, 0) + 1
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+                     bmc: Optional[SimulatedBmc] = None):
+        task = asyncio.current_task()
+        self._connections.add(task)
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                method, target, version = request_line.decode("latin-1").split(" ", 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                length = int(headers.get("content-length") or 0)
+                raw = await reader.readexactly(length) if length else b""
+                keep_alive = headers.get("connection", "").lower() != "close" \
+                    and not version.startswith("HTTP/1.0")
+                if not await self._respond(writer, bmc, method.upper(), target, headers, raw):
+                    break
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError,
+                asyncio.CancelledError):
+            pass
+        finally:
+            self._connections.discard(task)
+            writer.close()
+
+    async def _respond(self, writer, bmc, method, target, headers, raw) -> bool:
+        """Answer one request, False when the connection must be dropped."""
+        if bmc is None:
+            bmc = self.by_host.get(headers.get("host", "").rsplit(":", 1)[0])
+        self._count("requests")
+        fault = self.faults.draw(self.rng)
+        await asyncio.sleep(self.latency.sample(self.rng))
+        if fault == "timeout":
+            self._count("timeouts")
+            await asyncio.sleep(self.faults.hang)
+            return False
+        if bmc is None:
+            response = _error(404, f"no simulated BMC for host {headers.get('host')}")
+        elif fault == "error":
+            response = _error(500, "injected internal error")
+        elif fault == "throttle":
+            response = _error(503, "injected throttling")
+            response.headers["Retry-After"] = str(self.faults.retry_after)
+        elif fault == "auth":
+            response = _error(401, "injected authentication failure")
+        else:
+            try:
+                body = json.loads(raw) if raw else {}
+            except ValueError:
+                body = None
+            if not isinstance(body, dict):
+                response = _error(400, "request body is not a json object")
+            else:
+                response = bmc.handle(method, target, headers, body)
+        if response.status == 202 and "Retry-After" not in response.headers:
+            response.headers["Retry-After"] = str(self.faults.retry_after)
+        self._count(str(response.status))
+        raw = self._encode(response, method, headers)
+        self.stats["bytes"] = self.stats.get("bytes", 0) + len(raw)
+        writer.write(raw)
+        await writer.drain()
+        return True
+
+    @staticmethod
+    def _encode(response: Response, method: str, headers: Dict[str, str]) -> bytes:
+        status = response.status
+        payload = b"" if response.body is None else json.dumps(response.body).encode()
+        extra = dict(response.headers)
+        if payload and method in ("GET", "HEAD") and status == 200:
+            etag = f'W/"{zlib.crc32(payload):08x}"'
+            extra["ETag"] = etag
+            if headers.get("if-none-match") == etag:
+                status, payload = 304, b""
+        if payload:
+            extra["Content-Type"] = "application/json;charset=utf-8"
+        extra["OData-Version"] = "4.0"
+        extra["Content-Length"] = "0" if method == "HEAD" and not payload else str(len(payload))
+        reason = http.HTTPStatus(status).phrase
+        head = f"HTTP/1.1 {status} {reason}\r\n" + "".join(
+            f"{name}: {value}\r\n" for name, value in extra.items()) + "\r\n"
+        return head.encode("latin-1") + (b"" if method == "HEAD" else payload)
+
+
+class SimulatorThread:
+    """Run a FleetSimulator on its own loop in a daemon thread.
+
+    with SimulatorThread(FleetSimulator(bmcs=10)) as sim:
+        hosts = sim.targets
+    """
+
+    def __init__(self, simulator: FleetSimulator):
+        self.simulator = simulator
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, name="redfish-sim",
+                                        daemon=True)
+
+    def __enter__(self) -> FleetSimulator:
+        self._thread.start()
+        asyncio.run_coroutine_threadsafe(self.simulator.start(), self.loop).result(30)
+        return self.simulator
+
+    def __exit__(self, *exc):
+        asyncio.run_coroutine_threadsafe(self.simulator.stop(), self.loop).result(30)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join(5)
+        self.loop.close()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.simulator",
+                                     description="serve a synthetic Redfish fleet")
+    parser.add_argument("--bmcs", type=int, default=10, help="number of simulated BMCs")
+    parser.add_argument("--vendors", default="dell",
+                        help=f"comma separated, assigned round robin: {','.join(VENDOR_FIXTURES)}")
+    parser.add_argument("--mode", choices=("port", "host"), default="port",
+                        help="one port per BMC, or one port and the Host header")
+    parser.add_argument("--bind", default=None,
+                        help="listen address, 127.0.0.1 in port mode and 0.0.0.0 in host mode")
+    parser.add_argument("--base-port", dest="base_port", type=int, default=0,
+                        help="first port, 0 picks free ports")
+    parser.add_argument("--latency", default="fixed:0", help="per request latency spec")
+    parser.add_argument("--error-rate", dest="error_rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", dest="throttle_rate", type=float, default=0.0,
+                        help="rate of 503 answers with Retry-After")
+    parser.add_argument("--auth-failure-rate", dest="auth_failure_rate", type=float, default=0.0)
+    parser.add_argument("--timeout-rate", dest="timeout_rate", type=float, default=0.0)
+    parser.add_argument("--retry-after", dest="retry_after", type=int, default=1)
+    parser.add_argument("--hang", type=float, default=30.0,
+                        help="seconds a timed out request holds its connection")
+    parser.add_argument("--job-seconds", dest="job_seconds", type=float,
+                        default=DEFAULT_JOB_SECONDS, help="seconds a task or job takes")
+    parser.add_argument("--page-size", dest="page_size", type=int, default=None,
+                        help="members per collection page, linked with Members@odata.nextLink")
+    parser.add_argument("--username", default=DEFAULT_USERNAME)
+    parser.add_argument("--password", default=DEFAULT_PASSWORD)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--certfile", default=None, help="serve HTTPS with this certificate")
+    parser.add_argument("--keyfile", default=None)
+    parser.add_argument("--write-targets", dest="write_targets", default="",
+                        help="write the BMC addresses to this file, one per line")
+    args = parser.parse_args(argv)
+
+    context = None
+    if args.certfile:
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        context.load_cert_chain(args.certfile, args.keyfile)
+    faults = Faults(args.error_rate, args.throttle_rate, args.auth_failure_rate,
+                    args.timeout_rate, args.retry_after, args.hang)
+    simulator = FleetSimulator(
+        bmcs=args.bmcs, vendors=[v.strip() for v in args.vendors.split(",") if v.strip()],
+        latency=args.latency, faults=faults, mode=args.mode,
+        bind=args.bind or ("127.0.0.1" if args.mode == "port" else "0.0.0.0"),
+        base_port=args.base_port, seed=args.seed, username=args.username,
+        password=args.password, job_seconds=args.job_seconds, ssl_context=context,
+        page_size=args.page_size)
+
+    async def serve():
+        await simulator.start()
+        if args.write_targets:
+            Path(args.write_targets).write_text("\n".join(simulator.targets) + "\n")
+        print(f"serving {len(simulator.bmcs)} BMCs, first {simulator.targets[0]}", flush=True)
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await simulator.stop()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+    print(json.dumps(simulator.stats, indent=2, sort_keys=True))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,159 @@
+"""CLI startup benchmark.
+
+    python -m benchmarks.startup
+    python -m benchmarks.startup --runs 20 --command firmware --output reports/bench-startup.json
+
+Every idrac_ctl call is a new process, so import time and parser
+construction are paid on each command, before the first byte reaches the
+BMC. This benchmark runs the CLI in fresh interpreters and reports the
+median and max of:
+
+    import          import of idrac_ctl.idrac_main
+    help            ``idrac_ctl --help`` end to end
+    first_request   process start until a local stand-in BMC sees the first request
+    command         process start until the command exits
+
+The stand-in BMC answers every GET with an empty resource, so the command
+itself does no real work and the numbers are the fixed cost of the CLI.
+
+Author Mus spyroot@gmail.com
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+_IMPORT_SNIPPET = (
+    "import time; t = time.perf_counter(); import idrac_ctl.idrac_main; "
+    "print(time.perf_counter() - t)"
+)
+_CLI_SNIPPET = "import sys; from idrac_ctl.idrac_main import idrac_main_ctl; idrac_main_ctl()"
+
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    """Answers every request with an empty Redfish resource and records the
+    wall clock time of the first request it sees."""
+
+    protocol_version = "HTTP/1.1"
+    first_request = None
+
+    def _empty(self):
+        if type(self).first_request is None:
+            type(self).first_request = time.time()
+        raw = b'{"Members": [], "Members@odata.count": 0}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(raw)))
+        self.end_headers()
+        self.wfile.write(raw)
+
+    do_GET = do_POST = do_PATCH = _empty  # noqa: N815 - http.server naming
+
+    def log_message(self, *args):
+        pass
+
+
+def _env() -> Dict[str, str]:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(REPO_ROOT), env.get("PYTHONPATH")]))
+    for name in ("IDRAC_IP", "IDRAC_USERNAME", "IDRAC_PASSWORD", "IDRAC_PORT"):
+        env.pop(name, None)
+    return env
+
+
+def _python(snippet: str, *argv: str) -> subprocess.CompletedProcess:
+    return subprocess.run([sys.executable, "-c", snippet, *argv], env=_env(),
+                          capture_output=True, text=True, check=False)
+
+
+def measure_import() -> float:
+    """Seconds to import idrac_ctl.idrac_main in a fresh interpreter."""
+    return float(_python(_IMPORT_SNIPPET).stdout.strip())
+
+
+def measure_help() -> float:
+    """Seconds for ``idrac_ctl --help`` end to end."""
+    start = time.perf_counter()
+    _python(_CLI_SNIPPET, "--help")
+    return time.perf_counter() - start
+
+
+def measure_command(command: str, address: str) -> Dict[str, float]:
+    """Run one command against the stand-in BMC.
+    :param command: idrac_ctl command name
+    :param address: stand-in BMC ``host:port``
+    :return: first_request and command seconds
+    """
+    host, port = address.rsplit(":", 1)
+    _StandInHandler.first_request = None
+    start = time.time()
+    # --no-daemon: a running daemon would answer instead of a cold start.
+    _python(_CLI_SNIPPET, "--use_http", "--idrac_ip", host, "--idrac_port", port,
+            "--idrac_username", "root", "--idrac_password", "bench", "--no-daemon",
+            "--no-stdout", command)
+    done = time.time()
+    first = _StandInHandler.first_request
+    return {"first_request": (first if first is not None else done) - start,
+            "command": done - start}
+
+
+def _summary(values: List[float]) -> Dict[str, float]:
+    return {"median": round(statistics.median(values), 4),
+            "max": round(max(values), 4),
+            "runs": len(values)}
+
+
+def run(runs: int = 10, command: str = "sensors") -> Dict:
+    """Run every measurement ``runs`` times.
+    :return: report, metric -> {"median", "max", "runs"}
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StandInHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    address = f"127.0.0.1:{server.server_address[1]}"
+    samples = {"import": [], "help": [], "first_request": [], "command": []}
+    try:
+        for _ in range(runs):
+            samples["import"].append(measure_import())
+            samples["help"].append(measure_help())
+            for name, value in measure_command(command, address).items():
+                samples[name].append(value)
+    finally:
+        server.shutdown()
+        server.server_close()
+    return {"benchmark": "startup",
+            "command": command,
+            "python": sys.version.split()[0],
+            "results": {name: _summary(values) for name, values in samples.items()}}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.startup",
+                                     description="measure idrac_ctl CLI startup")
+    parser.add_argument("--runs", type=int, default=10, help="runs of each measurement")
+    parser.add_argument("--command", default="sensors",
+                        help="command sent to the stand-in BMC")
+    parser.add_argument("--output", default="", help="write the report to this json file")
+    args = parser.parse_args(argv)
+
+    report = run(max(1, args.runs), args.command)
+    for name, summary in report["results"].items():
+        print(f"{name:<14} median {summary['median'] * 1000:8.1f} ms  "
+              f"max {summary['max'] * 1000:8.1f} ms")
+    if args.output:
+        Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.output).write_text(json.dumps(report, indent=2) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
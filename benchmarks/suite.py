@@ -0,0 +1,356 @@
+"""Benchmark scenarios against the synthetic fleet, with a regression gate.
+
+    python -m benchmarks.suite run
+    python -m benchmarks.suite run --scenario fleet --bmcs 1000 --throttle-rate 0.1
+    python -m benchmarks.suite compare reports/baseline reports --threshold 0.25
+
+Scenarios, each run against ``benchmarks.simulator`` BMCs:
+
+    cold_command   a fresh idrac_ctl process runs ``sensors`` on one BMC
+    discovery      full ``discovery`` crawl of one BMC
+    exporter       one exporter scrape (``exporter --once``) of one BMC
+    sensors        ``sensors`` walk of one BMC
+    logs           ``logs`` walk of one BMC, always on the hpe corpus
+    fleet          ``sensors`` on --bmcs BMCs through the fleet runner
+
+``run`` measures every scenario in its own interpreter, so peak RSS and the
+process wide caches belong to that scenario alone, and writes
+``reports/bench-<scenario>.json``. One unmeasured warm-up run comes first;
+every measured run starts from fresh managers and caches. The report holds
+per run means of the requests the simulator served, the bytes it sent and
+non-2xx answers, wall time percentiles over the runs, CPU seconds and peak
+RSS. A scenario that walks data fails when it returns none, so it never
+ends up timing 404s.
+
+``compare`` reads two reports or two directories of ``bench-*.json``
+(``benchmarks.startup`` reports included) and exits 1 when a metric got
+worse than the threshold allows: a relative increase, or a relative
+decrease for metrics where higher is better: ``ok_ratio`` and the
+``rows`` and ``samples`` a scenario returned.
+
+Author Mus spyroot@gmail.com
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from .simulator import Faults, FleetSimulator, SimulatorThread
+from .startup import _CLI_SNIPPET, REPO_ROOT, _python
+
+DEFAULT_OUTPUT_DIR = "reports"
+DEFAULT_THRESHOLD = 0.25
+MANAGER_ARGS = dict(idrac_username="root", idrac_password="sim", is_http=True, insecure=True)
+HIGHER_IS_BETTER = frozenset({"ok_ratio", "rows", "samples"})
+
+
+def _reset_state():
+    """Drop managers, sessions and caches so the next run starts cold."""
+    from idrac_ctl.idrac_shared import Singleton
+    from idrac_ctl.redfish_auth import forget_sessions
+    from idrac_ctl.redfish_cache import clear_resource_cache
+    from idrac_ctl.redfish_pool import close_shared_sessions
+    Singleton._instances.clear()
+    forget_sessions()
+    close_shared_sessions()
+    clear_resource_cache()
+
+
+def _invoke(target: str, api_name: str, name: str, **kwargs):
+    from idrac_ctl.idrac_manager import IDracManager
+    from idrac_ctl.idrac_shared import ApiRequestType
+    manager = IDracManager(idrac_ip=target, **MANAGER_ARGS)
+    manager.check_api_version()
+    result = manager.sync_invoke(ApiRequestType[api_name], name, **kwargs)
+    if result.error is not None:
+        raise result.error
+    return result
+
+
+def cold_command(targets: List[str], options: argparse.Namespace) -> Dict[str, float]:
+    host, port = targets[0].rsplit(":", 1)
+    done = _python(_CLI_SNIPPET, "--use_http", "--idrac_ip", host, "--idrac_port", port,
+                   "--idrac_username", "root", "--idrac_password", "sim", "--no-daemon",
+                   "--no-stdout", "sensors")
+    if done.returncode != 0:
+        raise RuntimeError(f"idrac_ctl exited {done.returncode}: {done.stderr[-500:]}")
+    return {}
+
+
+def discovery(targets: List[str], options: argparse.Namespace) -> Dict[str, float]:
+    # discovery saves every resource under ~/.json_responses, keep that out of $HOME.
+    home = os.environ.get("HOME")
+    with tempfile.TemporaryDirectory() as tmp, contextlib.redirect_stdout(io.StringIO()):
+        os.environ["HOME"] = tmp
+        try:
+            _invoke(targets[0], "Discovery", "discovery")
+        finally:
+            if home is None:
+                os.environ.pop("HOME", None)
+            else:
+                os.environ["HOME"] = home
+    return {}
+
+
+def exporter(targets: List[str], options: argparse.Namespace) -> Dict[str, float]:
+    result = _invoke(targets[0], "Exporter", "exporter", once=True)
+    return {"samples": result.extra["sample_count"]}
+
+
+def sensors(targets: List[str], options: argparse.Namespace) -> Dict[str, float]:
+    return {"rows": len(_invoke(targets[0], "Sensors", "sensors").data)}
+
+
+def logs(targets: List[str], options: argparse.Namespace) -> Dict[str, float]:
+    rows = len(_invoke(targets[0], "Logs", "logs").data)
+    if not rows:
+        raise RuntimeError("logs returned no entries, the corpus has no log to walk")
+    return {"rows": rows}
+
+
+def fleet(targets: List[str], options: argparse.Namespace) -> Dict[str, float]:
+    from idrac_ctl.fleet import FleetRunner
+    from idrac_ctl.idrac_shared import ApiRequestType
+    results = FleetRunner(targets, ApiRequestType.Sensors, "sensors", MANAGER_ARGS,
+                          max_workers=options.max_workers, per_subnet=0).run()
+    return {"ok_ratio": sum(1 for r in results if r.ok) / len(results)}
+
+
+@dataclass
+class Scenario:
+    """One benchmark: a callable run once per measured run."""
+
+    name: str
+    run: Callable[[List[str], argparse.Namespace], Dict[str, float]]
+    fleet: bool = False
+    # corpus the scenario needs data from, overrides --vendor.
+    vendor: Optional[str] = None
+
+
+SCENARIOS = {s.name: s for s in (
+    Scenario("cold_command", cold_command),
+    Scenario("discovery", discovery),
+    Scenario("exporter", exporter),
+    Scenario("sensors", sensors),
+    # only the hpe capture holds log entries.
+    Scenario("logs", logs, vendor="hpe"),
+    Scenario("fleet", fleet, fleet=True),
+)}
+
+
+def _percentile(values: List[float], q: float) -> float:
+    from idrac_ctl.fleet import percentile
+    return round(percentile(values, q), 4)
+
+
+def _peak_rss_mb() -> Optional[float]:
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+               resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    # ru_maxrss is in KiB on Linux and in bytes on macOS.
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def measure(name: str, options: argparse.Namespace) -> Dict:
+    """Run one scenario ``options.runs`` times in this process.
+    :return: report, see the module docstring
+    """
+    scenario = SCENARIOS[name]
+    vendor = scenario.vendor or options.vendor
+    faults = Faults(error_rate=options.error_rate, throttle_rate=options.throttle_rate,
+                    timeout_rate=options.timeout_rate, hang=options.hang)
+    simulator = FleetSimulator(bmcs=options.bmcs if scenario.fleet else 1,
+                               vendors=[vendor], latency=options.latency,
+                               faults=faults, seed=options.seed)
+    seconds, extra = [], {}
+    with SimulatorThread(simulator) as sim:
+        scenario.run(sim.targets, options)
+        _reset_state()
+        served = dict(sim.stats)
+        cpu = time.process_time()
+        for _ in range(options.runs):
+            start = time.perf_counter()
+            for key, value in scenario.run(sim.targets, options).items():
+                extra[key] = extra.get(key, 0.0) + value
+            seconds.append(time.perf_counter() - start)
+            _reset_state()
+        cpu = time.process_time() - cpu
+        stats = {key: value - served.get(key, 0) for key, value in sim.stats.items()}
+
+    runs = len(seconds)
+    errors = sum(v for k, v in stats.items() if k.isdigit() and not k.startswith(("2", "3")))
+    results = {"requests": round(stats.get("requests", 0) / runs, 1),
+               "bytes": round(stats.get("bytes", 0) / runs),
+               "http_errors": round(errors / runs, 1),
+               "p50_seconds": _percentile(seconds, 50),
+               "p95_seconds": _percentile(seconds, 95),
+               "p99_seconds": _percentile(seconds, 99),
+               "max_seconds": round(max(seconds), 4),
+               "cpu_seconds": round(cpu / runs, 4),
+               "rss_mb": _peak_rss_mb()}
+    results.update({key: round(value / runs, 4) for key, value in extra.items()})
+    return {"benchmark": name,
+            "python": sys.version.split()[0],
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "config": {"runs": runs, "bmcs": len(simulator.bmcs), "vendor": vendor,
+                       "latency": options.latency, "error_rate": options.error_rate,
+                       "throttle_rate": options.throttle_rate,
+                       "timeout_rate": options.timeout_rate, "seed": options.seed},
+            "results": {key: value for key, value in results.items() if value is not None}}
+
+
+def _measure_argv(name: str, options: argparse.Namespace) -> List[str]:
+    argv = [sys.executable, "-m", "benchmarks.suite", "measure", name]
+    for option in ("runs", "bmcs", "vendor", "latency", "error_rate", "throttle_rate",
+                   "timeout_rate", "hang", "max_workers", "seed"):
+        value = getattr(options, option)
+        if value is not None:
+            argv += [f"--{option.replace('_', '-')}", str(value)]
+    return argv
+
+
+def run(names: List[str], options: argparse.Namespace) -> List[Dict]:
+    """Measure each scenario in a fresh interpreter and write its report.
+    :return: reports in scenario order
+    """
+    output = Path(options.output_dir)
+    output.mkdir(parents=True, exist_ok=True)
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(REPO_ROOT), env.get("PYTHONPATH")]))
+    reports = []
+    for name in names:
+        done = subprocess.run(_measure_argv(name, options), env=env, capture_output=True,
+                              text=True, check=False)
+        if done.returncode != 0:
+            raise RuntimeError(f"scenario {name} failed: {done.stderr[-2000:]}")
+        report = json.loads(done.stdout)
+        (output / f"bench-{name}.json").write_text(json.dumps(report, indent=2) + "\n")
+        reports.append(report)
+    return reports
+
+
+def load_reports(path: str) -> Dict[str, Dict]:
+    """Reports of a file or of the ``bench-*.json`` in a directory, by benchmark."""
+    path = Path(path)
+    files = sorted(path.glob("bench-*.json")) if path.is_dir() else [path]
+    reports = {}
+    for file in files:
+        report = json.loads(file.read_text())
+        reports[report.get("benchmark", file.stem)] = report
+    return reports
+
+
+def _value(value) -> Optional[float]:
+    """Scalar of a result, the median of a ``benchmarks.startup`` summary."""
+    if isinstance(value, dict):
+        value = value.get("median")
+    return value if isinstance(value, (int, float)) and not isinstance(value, bool) else None
+
+
+def compare(baseline: Dict[str, Dict],
+            current: Dict[str, Dict],
+            threshold: float = DEFAULT_THRESHOLD,
+            metrics: Optional[List[str]] = None) -> List[Dict]:
+    """Compare the metrics two report sets share.
+    :param baseline: stored reports, see load_reports
+    :param current: new reports
+    :param threshold: allowed relative change, 0.25 is 25 percent
+    :param metrics: compare only these metrics, all by default
+    :return: one row per metric with baseline, current, change and regressed
+    """
+    rows = []
+    for name in sorted(set(baseline) & set(current)):
+        base_results = baseline[name].get("results", {})
+        cur_results = current[name].get("results", {})
+        for metric in sorted(set(base_results) & set(cur_results)):
+            if metrics and metric not in metrics:
+                continue
+            base, cur = _value(base_results[metric]), _value(cur_results[metric])
+            if base is None or cur is None:
+                continue
+            if base:
+                change = (cur - base) / abs(base)
+            else:
+                change = 0.0 if cur == base else float("inf")
+            worse = -change if metric in HIGHER_IS_BETTER else change
+            rows.append({"benchmark": name, "metric": metric, "baseline": base,
+                         "current": cur, "change": change, "regressed": worse > threshold})
+    return rows
+
+
+def _options_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument("--runs", type=int, default=5, help="measured runs per scenario")
+    parser.add_argument("--bmcs", type=int, default=100, help="BMCs of the fleet scenario")
+    parser.add_argument("--vendor", default="supermicro",
+                        help="fixture corpus of the simulated BMCs")
+    parser.add_argument("--latency", default="fixed:0", help="simulator latency spec")
+    parser.add_argument("--error-rate", dest="error_rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", dest="throttle_rate", type=float, default=0.0)
+    parser.add_argument("--timeout-rate", dest="timeout_rate", type=float, default=0.0)
+    parser.add_argument("--hang", type=float, default=5.0,
+                        help="seconds a timed out request holds its connection")
+    parser.add_argument("--max-workers", dest="max_workers", type=int, default=32,
+                        help="fleet runner workers")
+    parser.add_argument("--seed", type=int, default=1)
+    return parser
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.suite",
+                                     description="run benchmark scenarios or compare reports")
+    actions = parser.add_subparsers(dest="action", required=True)
+    run_parser = actions.add_parser("run", parents=[_options_parser()],
+                                    help="run scenarios and write reports")
+    run_parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS),
+                            help="scenario to run, repeatable, all by default")
+    run_parser.add_argument("--output-dir", dest="output_dir", default=DEFAULT_OUTPUT_DIR)
+    measure_parser = actions.add_parser("measure", parents=[_options_parser()],
+                                        help="run one scenario here and print its report")
+    measure_parser.add_argument("scenario", choices=sorted(SCENARIOS))
+    compare_parser = actions.add_parser("compare", help="fail on regressions against a baseline")
+    compare_parser.add_argument("baseline", help="report file or directory")
+    compare_parser.add_argument("current", help="report file or directory")
+    compare_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                                help="allowed relative change, 0.25 is 25 percent")
+    compare_parser.add_argument("--metric", action="append", dest="metrics",
+                                help="compare only this metric, repeatable")
+    args = parser.parse_args(argv)
+
+    if args.action == "measure":
+        print(json.dumps(measure(args.scenario, args)))
+        return 0
+
+    if args.action == "run":
+        for report in run(args.scenario or list(SCENARIOS), args):
+            results = report["results"]
+            print(f"{report['benchmark']:<14} p50 {results['p50_seconds'] * 1000:9.1f} ms  "
+                  f"p99 {results['p99_seconds'] * 1000:9.1f} ms  "
+                  f"{results['requests']:8.1f} req  {results['bytes']:>10} B  "
+                  f"rss {results.get('rss_mb', 0):6.1f} MB")
+        return 0
+
+    rows = compare(load_reports(args.baseline), load_reports(args.current),
+                   args.threshold, args.metrics)
+    for row in rows:
+        print(f"{'REGRESSED' if row['regressed'] else 'ok':<10}{row['benchmark']:<14}"
+              f"{row['metric']:<14}{row['baseline']:>12g}{row['current']:>12g}"
+              f"{row['change'] * 100:+9.1f}%")
+    if not rows:
+        print("no shared benchmarks and metrics to compare")
+    return 1 if any(row["regressed"] for row in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
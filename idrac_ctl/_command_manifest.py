@@ -0,0 +1,558 @@
+"""Generated by ``python -m idrac_ctl.command_manifest``, do not edit.
+
+CLI command name -> module, ApiRequestType member, registry name and help.
+"""
+COMMANDS = {
+    "privilege-registry": {
+        "module": "idrac_ctl.accounts.cmd_privilage_registry",
+        "type": "PrivilegeRegistry",
+        "name": "query_privilege_registry",
+        "help": "command query privilege registry service."
+    },
+    "compute-query": {
+        "module": "idrac_ctl.compute.cmd_compute_setting",
+        "type": "ComputeQuery",
+        "name": "query",
+        "help": "command query compute settings."
+    },
+    "reboot": {
+        "module": "idrac_ctl.compute.cmd_power_state",
+        "type": "ComputerSystemReset",
+        "name": "reboot",
+        "help": "reboots the system"
+    },
+    "storage-convert-raid": {
+        "module": "idrac_ctl.storage.cmd_convert_to_raid",
+        "type": "ConvertToRaid",
+        "name": "convert_none_raid",
+        "help": "command converts none raid disk under controller to raid"
+    },
+    "storage-convert-noraid": {
+        "module": "idrac_ctl.storage.cmd_convert_none_raid",
+        "type": "ConvertNoneRaid",
+        "name": "convert_none_raid",
+        "help": "command converts raid disk under controller to none raid"
+    },
+    "oem-boot-netios": {
+        "module": "idrac_ctl.delloem.delloem_boot_netios",
+        "type": "ConvertNoneRaid",
+        "name": "delloem_netios_boot",
+        "help": "command boot from network iso "
+    },
+    "storage-drives": {
+        "module": "idrac_ctl.storage.cmd_drives",
+        "type": "Drives",
+        "name": "drives_query",
+        "help": "command fetch the storage drives information"
+    },
+    "volume-init": {
+        "module": "idrac_ctl.volumes.cmd_initilize",
+        "type": "VolumeInit",
+        "name": "chassis_service_query",
+        "help": "command initialize volume.."
+    },
+    "volume-get": {
+        "module": "idrac_ctl.volumes.cmd_volumes",
+        "type": "VolumeQuery",
+        "name": "vol_query",
+        "help": "command query volume from storage device."
+    },
+    "oem-net-iso-task": {
+        "module": "idrac_ctl.delloem.delloem_os_deployment",
+        "type": "DellOemTask",
+        "name": "dell_oem_actions",
+        "help": "command get supported dell os oem actions"
+    },
+    "dell-lc-svc": {
+        "module": "idrac_ctl.dell_lc.cmd_dell_lc_services",
+        "type": "DellLcQuery",
+        "name": "dell_lc_services",
+        "help": "command query dell-lc services"
+    },
+    "oem-disconnect": {
+        "module": "idrac_ctl.delloem.delloem_disconnect",
+        "type": "DellOemDisconnect",
+        "name": "delloem_disconnect",
+        "help": "command disconnect network iso"
+    },
+    "service-api-rs-status": {
+        "module": "idrac_ctl.dell_lc.cmd_dell_lc_rs",
+        "type": "RemoteServicesRssAPIStatus",
+        "name": "dell_lc_rs_status",
+        "help": "command fetch service api status"
+    },
+    "service-api-status": {
+        "module": "idrac_ctl.dell_lc.cmd_dell_lc_api",
+        "type": "RemoteServicesAPIStatus",
+        "name": "dell_lc_status",
+        "help": "command fetch service api status"
+    },
+    "tasks": {
+        "module": "idrac_ctl.tasks.cmd_tasks_list",
+        "type": "TasksList",
+        "name": "chassis_service_query",
+        "help": "command fetch tasks list"
+    },
+    "change-boot-order": {
+        "module": "idrac_ctl.bios.cmd_change_boot_order",
+        "type": "ChangeBootOrder",
+        "name": "change_boot_order",
+        "help": "command change boot order and boot options"
+    },
+    "oem-net-ios-status": {
+        "module": "idrac_ctl.delloem.delloem_get_networkios",
+        "type": "GetNetworkIsoAttachStatus",
+        "name": "net_ios_attach_status",
+        "help": "command get network iso status"
+    },
+    "oem-attach": {
+        "module": "idrac_ctl.delloem.delloem_attach",
+        "type": "OemAttach",
+        "name": "delloem_attach",
+        "help": "command attach network iso "
+    },
+    "oem-actions": {
+        "module": "idrac_ctl.delloem.delloem_actions",
+        "type": "DellOemActions",
+        "name": "dell_oem_actions",
+        "help": "command get supported dell os oem actions"
+    },
+    "query": {
+        "module": "idrac_ctl.cmd_query",
+        "type": "QueryIdrac",
+        "name": "query_idrac",
+        "help": "command query based on resource."
+    },
+    "boot-sources": {
+        "module": "idrac_ctl.boot_options.cmd_boot_option_list",
+        "type": "BootOptions",
+        "name": "boot_sources_query",
+        "help": "command fetch the boot source list"
+    },
+    "system-export": {
+        "module": "idrac_ctl.system.cmd_system_config",
+        "type": "SystemConfigQuery",
+        "name": "sysconfig_query",
+        "help": "command exports system configuration"
+    },
+    "firmware": {
+        "module": "idrac_ctl.firmware.cmd_firmware",
+        "type": "FirmwareQuery",
+        "name": "firmware_query",
+        "help": "command fetch the firmware view"
+    },
+    "firmware_inventory": {
+        "module": "idrac_ctl.firmware.cmd_firmware_inv",
+        "type": "FirmwareInventoryQuery",
+        "name": "firmware_inv_query",
+        "help": "command fetch the firmware inventory view"
+    },
+    "pci": {
+        "module": "idrac_ctl.pci.cmd_pci",
+        "type": "PciDeviceQuery",
+        "name": "pci_device_query",
+        "help": "command fetch the pci device or function"
+    },
+    "system": {
+        "module": "idrac_ctl.system.cmd_system",
+        "type": "SystemQuery",
+        "name": "system_query",
+        "help": "command fetch the system view."
+    },
+    "volumes": {
+        "module": "idrac_ctl.volumes.cmd_virtual_disk",
+        "type": "VirtualDiskQuery",
+        "name": "virtual_disk_query",
+        "help": "fetch the virtual disk data"
+    },
+    "raid": {
+        "module": "idrac_ctl.raid.cmd_raid_service",
+        "type": "RaidServiceQuery",
+        "name": "raid_service_query",
+        "help": "command raid information"
+    },
+    "storage-controllers": {
+        "module": "idrac_ctl.storage.cmd_storage_controllers",
+        "type": "StorageQuery",
+        "name": "storage_query",
+        "help": "command fetch the storage information"
+    },
+    "task-watch": {
+        "module": "idrac_ctl.tasks.cmd_task_watch",
+        "type": "GetTask",
+        "name": "task_query",
+        "help": "command watch task progress."
+    },
+    "system-import": {
+        "module": "idrac_ctl.system.cmd_system_import",
+        "type": "ImportSystem",
+        "name": "import_sysconfig",
+        "help": "command import system configuration"
+    },
+    "get_vm": {
+        "module": "idrac_ctl.virtual_media.cmd_virtual_media_get",
+        "type": "VirtualMediaGet",
+        "name": "virtual_disk_query",
+        "help": "command fetch the virtual media."
+    },
+    "insert_vm": {
+        "module": "idrac_ctl.virtual_media.cmd_virtual_media_insert",
+        "type": "VirtualMediaInsert",
+        "name": "virtual_disk_insert",
+        "help": "command insert virtual media"
+    },
+    "eject_vm": {
+        "module": "idrac_ctl.virtual_media.cmd_virtual_media_eject",
+        "type": "VirtualMediaEject",
+        "name": "virtual_disk_eject",
+        "help": "command eject the virtual media"
+    },
+    "current_boot": {
+        "module": "idrac_ctl.cmd_current_boot",
+        "type": "CurrentBoot",
+        "name": "current_boot_query",
+        "help": "command fetch the boot source for device/devices"
+    },
+    "storage-get": {
+        "module": "idrac_ctl.storage.cmd_storage_get",
+        "type": "StorageViewQuery",
+        "name": "storage_get",
+        "help": "command fetch the storage information"
+    },
+    "storage-list": {
+        "module": "idrac_ctl.storage.cmd_storage_list",
+        "type": "StorageListQuery",
+        "name": "storage_list",
+        "help": "command fetch the storage devices"
+    },
+    "boot-options": {
+        "module": "idrac_ctl.boot_options.cmd_boot_options_query",
+        "type": "BootOptionQuery",
+        "name": "boot_options_query",
+        "help": "command fetch the boot options"
+    },
+    "boot-options-clear": {
+        "module": "idrac_ctl.boot_source.cmd_clear_pending",
+        "type": "BootOptionsClearPending",
+        "name": "clear_pending",
+        "help": "command clear boot source pending values"
+    },
+    "boot-source": {
+        "module": "idrac_ctl.boot_source.cmd_boot_source_get",
+        "type": "QueryBootOption",
+        "name": "boot_source_query",
+        "help": "command fetch the boot source for device/devices"
+    },
+    "boot-one-shot": {
+        "module": "idrac_ctl.boot_source.cmd_boot_one_shot",
+        "type": "BootOneShot",
+        "name": "boot_one_shot",
+        "help": "command change one shoot boot"
+    },
+    "boot-settings": {
+        "module": "idrac_ctl.boot_source.cmd_boot_settings",
+        "type": "BootSettingsQuery",
+        "name": "boot_settings_query",
+        "help": "command fetch the boot setting and pending"
+    },
+    "boot-source-enable": {
+        "module": "idrac_ctl.boot_source.cmd_enable",
+        "type": "EnableBootOptions",
+        "name": "boot_enable",
+        "help": "command enable the boot on a particular device."
+    },
+    "sensors": {
+        "module": "idrac_ctl.sensors.cmd_sensors",
+        "type": "Sensors",
+        "name": "sensors",
+        "help": "command read all chassis sensor readings"
+    },
+    "metric-reports": {
+        "module": "idrac_ctl.telemetry.cmd_metric_reports",
+        "type": "MetricReports",
+        "name": "metric-reports",
+        "help": "command read TelemetryService metric reports (incl. OOB GPU)"
+    },
+    "metric-definitions": {
+        "module": "idrac_ctl.telemetry.cmd_metric_definitions",
+        "type": "MetricReportDefinitions",
+        "name": "metric-definitions",
+        "help": "command read TelemetryService metric report definitions"
+    },
+    "component-integrity": {
+        "module": "idrac_ctl.component_integrity.cmd_component_integrity",
+        "type": "ComponentIntegrity",
+        "name": "component-integrity",
+        "help": "command read ComponentIntegrity (SPDM attestation) state"
+    },
+    "network-adapters": {
+        "module": "idrac_ctl.network.cmd_network_adapters",
+        "type": "NetworkAdapters",
+        "name": "network-adapters",
+        "help": "command read all chassis NetworkAdapters (NICs and DPUs)"
+    },
+    "nvlink-ports": {
+        "module": "idrac_ctl.ports.cmd_nvlink_ports",
+        "type": "NvLinkPorts",
+        "name": "nvlink-ports",
+        "help": "command read GPU NVLink ports and per-port metrics"
+    },
+    "exporter": {
+        "module": "idrac_ctl.telemetry.cmd_exporter",
+        "type": "Exporter",
+        "name": "exporter",
+        "help": "serve Redfish telemetry as Prometheus /metrics or SignalFx datapoints"
+    },
+    "actions": {
+        "module": "idrac_ctl.actions.cmd_action_list",
+        "type": "ActionList",
+        "name": "action_list",
+        "help": "command list every Redfish action this box exposes and its risk level"
+    },
+    "event-submit-test": {
+        "module": "idrac_ctl.events.cmd_event_submit_test",
+        "type": "EventSubmitTest",
+        "name": "event_submit_test",
+        "help": "command submit a Redfish test event"
+    },
+    "system-reset": {
+        "module": "idrac_ctl.compute.cmd_system_reset",
+        "type": "SystemReset",
+        "name": "system_reset",
+        "help": "command reset the host system (guarded)"
+    },
+    "logs": {
+        "module": "idrac_ctl.logs.cmd_logs",
+        "type": "Logs",
+        "name": "logs",
+        "help": "command read system/manager log service entries"
+    },
+    "ethernet-interfaces": {
+        "module": "idrac_ctl.network.cmd_ethernet_interfaces",
+        "type": "EthernetInterfaces",
+        "name": "ethernet-interfaces",
+        "help": "command read host and BMC EthernetInterfaces (IP/MAC/VLAN)"
+    },
+    "secure-boot": {
+        "module": "idrac_ctl.security.cmd_secure_boot",
+        "type": "SecureBoot",
+        "name": "secure-boot",
+        "help": "command read SecureBoot state and key databases (PK/KEK/db/dbx)"
+    },
+    "firmware-update": {
+        "module": "idrac_ctl.firmware.cmd_firmware_update",
+        "type": "FirmwareUpdate",
+        "name": "firmware-update",
+        "help": "command flash firmware via SimpleUpdate (guarded)"
+    },
+    "telemetry-triggers": {
+        "module": "idrac_ctl.telemetry.cmd_telemetry_triggers",
+        "type": "Triggers",
+        "name": "telemetry-triggers",
+        "help": "command read TelemetryService triggers (metric alert thresholds)"
+    },
+    "network-ports": {
+        "module": "idrac_ctl.network.cmd_network_ports",
+        "type": "NetworkPorts",
+        "name": "network-ports",
+        "help": "command read NetworkAdapter port link state (up/speed) per chassis"
+    },
+    "oem-info": {
+        "module": "idrac_ctl.oem.cmd_oem_info",
+        "type": "OemInfo",
+        "name": "oem-info",
+        "help": "command inventory vendor OEM extensions (Dell/HPE/NVIDIA/OpenBMC)"
+    },
+    "console-info": {
+        "module": "idrac_ctl.manager.cmd_console_info",
+        "type": "ConsoleInfo",
+        "name": "console-info",
+        "help": "command report console access (serial/graphical/shell) per manager"
+    },
+    "boot-pending": {
+        "module": "idrac_ctl.boot_source.cmd_pending",
+        "type": "BootSourcePending",
+        "name": "query_pending",
+        "help": "command query for boot source a current pending values"
+    },
+    "boot-source-update": {
+        "module": "idrac_ctl.boot_source.cmd_update",
+        "type": "BootSourceUpdate",
+        "name": "update",
+        "help": "command updates boot sources"
+    },
+    "boot-source-registry": {
+        "module": "idrac_ctl.boot_source.cmd_boot_source_registry",
+        "type": "BootSourceRegistry",
+        "name": "boot_source_registry",
+        "help": "command query boot source registry."
+    },
+    "boot": {
+        "module": "idrac_ctl.cmd_boot",
+        "type": "BootQuery",
+        "name": "boot_query",
+        "help": "command fetch the boot source"
+    },
+    "oem-attach-status": {
+        "module": "idrac_ctl.delloem.delloem_attach_status",
+        "type": "GetAttachStatus",
+        "name": "get_attach_status",
+        "help": "command get attach status "
+    },
+    "oem-detach": {
+        "module": "idrac_ctl.delloem.delloem_detach",
+        "type": "DellOemDetach",
+        "name": "delloem_detach",
+        "help": "command detach network iso"
+    },
+    "task-get": {
+        "module": "idrac_ctl.tasks.cmd_tasks_get",
+        "type": "TaskGet",
+        "name": "chassis_service_query",
+        "help": "command fetch current task"
+    },
+    "attr": {
+        "module": "idrac_ctl.attribute.cmd_attribute",
+        "type": "AttributesQuery",
+        "name": "attribute_inventory",
+        "help": "command fetch the attribute view"
+    },
+    "attr-update": {
+        "module": "idrac_ctl.attribute.cmd_attribute_update",
+        "type": "AttributesUpdate",
+        "name": "attribute_update",
+        "help": "command fetch the attribute view"
+    },
+    "attr-clear-pending": {
+        "module": "idrac_ctl.attribute.cmd_attribute_clear_pending",
+        "type": "AttributeClearPending",
+        "name": "clear_pending",
+        "help": "command clear attribute pending values"
+    },
+    "manager": {
+        "module": "idrac_ctl.manager.cmd_manager",
+        "type": "ManagerQuery",
+        "name": "manager_query",
+        "help": "command fetch the manager view"
+    },
+    "manager-reboot": {
+        "module": "idrac_ctl.manager.cmd_manager_reset",
+        "type": "ManagerReset",
+        "name": "manager_reset",
+        "help": "command reboot idrac manager"
+    },
+    "bios-registry": {
+        "module": "idrac_ctl.bios.bios_registry",
+        "type": "BiosRegistry",
+        "name": "bios_registry",
+        "help": "command query bios registry attributes"
+    },
+    "bios-change": {
+        "module": "idrac_ctl.bios.cmd_change_bios",
+        "type": "BiosChangeSettings",
+        "name": "bios_change_settings",
+        "help": "command change bios configuration attributes"
+    },
+    "bios-clear-pending": {
+        "module": "idrac_ctl.bios.cmd_bios_clear_pending",
+        "type": "BiosClearPending",
+        "name": "clear_pending",
+        "help": "command clear bios pending values"
+    },
+    "bios-pending": {
+        "module": "idrac_ctl.bios.cmd_bios_pending",
+        "type": "BiosQueryPending",
+        "name": "bios_query_pending",
+        "help": "command query for bios pending values"
+    },
+    "bios": {
+        "module": "idrac_ctl.bios.cmd_bios",
+        "type": "BiosQuery",
+        "name": "bios_inventory",
+        "help": "command fetch the bios information"
+    },
+    "account": {
+        "module": "idrac_ctl.accounts.cmd_query_account",
+        "type": "QueryAccount",
+        "name": "query_account",
+        "help": "command query based on resource."
+    },
+    "accounts": {
+        "module": "idrac_ctl.accounts.cmd_accounts",
+        "type": "QueryAccounts",
+        "name": "query_accounts",
+        "help": "command query accounts."
+    },
+    "account-svc": {
+        "module": "idrac_ctl.accounts.cmd_account_svc",
+        "type": "QueryAccountService",
+        "name": "query_account_svc",
+        "help": "command query account service."
+    },
+    "chassis": {
+        "module": "idrac_ctl.chassis.cmd_chassis_query",
+        "type": "ChassisQuery",
+        "name": "chassis_service_query",
+        "help": "command query chassis services"
+    },
+    "chassis-reset": {
+        "module": "idrac_ctl.chassis.cmd_chasis_reset",
+        "type": "ChassisReset",
+        "name": "reboot",
+        "help": "command change power state of a chassis"
+    },
+    "job": {
+        "module": "idrac_ctl.jobs.cmd_job_get",
+        "type": "JobGet",
+        "name": "job_query",
+        "help": "command fetch a job"
+    },
+    "job-rm": {
+        "module": "idrac_ctl.jobs.cmd_job_del",
+        "type": "JobDel",
+        "name": "job_del",
+        "help": "command deletes an existing job"
+    },
+    "jobs": {
+        "module": "idrac_ctl.jobs.cmd_jobs",
+        "type": "Jobs",
+        "name": "jobs_sources_query",
+        "help": "command fetch a list of jobs"
+    },
+    "job-apply": {
+        "module": "idrac_ctl.jobs.cmd_job_apply",
+        "type": "JobApply",
+        "name": "job_apply",
+        "help": "command apply current pending jobs"
+    },
+    "job-watch": {
+        "module": "idrac_ctl.jobs.cmd_job_watch",
+        "type": "JobWatch",
+        "name": "job_watch",
+        "help": "command watch a job"
+    },
+    "jobs-service": {
+        "module": "idrac_ctl.jobs.cmd_job_services",
+        "type": "JobServices",
+        "name": "job_service_query",
+        "help": "command query jobs services"
+    },
+    "job-rm-all": {
+        "module": "idrac_ctl.jobs.cmd_job_delete_all",
+        "type": "JobRmDellServices",
+        "name": "job_delete_all",
+        "help": "command deletes all existing job"
+    },
+    "jobs-dell-service": {
+        "module": "idrac_ctl.jobs.cmd_job_dell_services",
+        "type": "JobDellServices",
+        "name": "job_service_query",
+        "help": "command query jobs services"
+    },
+    "discovery": {
+        "module": "idrac_ctl.discovery.cmd_discovery",
+        "type": "Discovery",
+        "name": "discovery",
+        "help": "command discovery all action."
+    }
+}
@@ -134,3 +134,45 @@ def save_if_needed(filename: str, raw_data,
             yaml.dump(raw_data, file)
     else:
         raise ValueError(f"Unknown data format '{data_format}'.")
+
+
+def cache_dir(*parts: str) -> Path:
+    """Return the idrac_ctl cache directory, optionally a sub path inside it.
+
+    IDRAC_CTL_CACHE_DIR overrides the location, otherwise
+    $XDG_CACHE_HOME/idrac_ctl or ~/.cache/idrac_ctl is used.
+    The directory is not created.
+
+    :param parts: optional sub path components, i.e. a bmc address.
+    :return: Path
+    """
+    root = os.environ.get("IDRAC_CTL_CACHE_DIR")
+    if not root:
+        xdg = os.environ.get("XDG_CACHE_HOME")
+        root = os.path.join(xdg, "idrac_ctl") if xdg else "~/.cache/idrac_ctl"
+    return Path(root, *parts).expanduser()
+
+
+def atomic_write_json(path: Path, data, mode: Optional[int] = None) -> None:
+    """Write json to a temp file next to path and rename it over path,
+    so readers never see a partially written file.
+
+    :param path: destination file
+    :param data: json serializable object
+    :param mode: optional file mode, i.e. 0o600 for secrets.
+    :return: Nothing
+    """
+    import tempfile
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=str(path.parent), prefix=f".{path.name}.")
+    try:
+        if mode is not None:
+            os.chmod(tmp, mode)
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
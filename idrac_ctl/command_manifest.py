@@ -0,0 +1,140 @@
+"""Static manifest of the idrac_ctl commands.
+
+    python -m idrac_ctl.command_manifest            regenerate _command_manifest.py
+    python -m idrac_ctl.command_manifest --check    exit 1 when it is out of date
+
+Building the CLI used to import every command module and build every
+subcommand parser, so ``idrac_ctl power`` paid for the whole tree on each
+call. The manifest maps each CLI name to the module that defines it, its
+registry key and its help text. The CLI builds a stub subparser for every
+command from the manifest, imports only the selected command module and
+builds only its parser. IDracManager.command_class imports a command from
+the manifest when another command invokes it.
+
+The manifest is generated from commands.py; a test fails when it is stale.
+
+Author Mus spyroot@gmail.com
+"""
+import argparse
+import importlib
+import json
+import sys
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+MANIFEST_FILE = Path(__file__).with_name("_command_manifest.py")
+
+_HEADER = '''"""Generated by ``python -m idrac_ctl.command_manifest``, do not edit.
+
+CLI command name -> module, ApiRequestType member, registry name and help.
+"""
+'''
+
+
+def load_manifest() -> Dict[str, dict]:
+    """Return the static manifest, CLI name -> entry."""
+    from ._command_manifest import COMMANDS
+    return COMMANDS
+
+
+def build_manifest() -> Dict[str, dict]:
+    """Import every command module and build the manifest from the registry.
+    :return: CLI name -> {"module", "type", "name", "help"}
+    """
+    importlib.import_module("idrac_ctl.commands")
+    from .idrac_manager import IDracManager
+
+    manifest = {}
+    registry = IDracManager.get_registry()
+    for api_type in registry:
+        for name, cls in registry[api_type].items():
+            if not hasattr(cls, "register_subcommand"):
+                continue
+            _, cmd_name, cmd_help = cls.register_subcommand(cls)
+            manifest[cmd_name] = {
+                "module": cls.__module__,
+                "type": api_type.name,
+                "name": name,
+                "help": str(cmd_help),
+            }
+    return manifest
+
+
+def render_manifest(manifest: Dict[str, dict]) -> str:
+    """Source of the generated manifest module."""
+    # every value is a string, so the json text is also a python literal.
+    return f"{_HEADER}COMMANDS = {json.dumps(manifest, indent=4)}\n"
+
+
+def import_command(api_call, name: str) -> bool:
+    """Import the module of a registered command that was not imported yet.
+    :param api_call: ApiRequestType of the command
+    :param name: registry name of the command
+    :return: True when the manifest knows the command
+    """
+    for entry in load_manifest().values():
+        if entry["type"] == api_call.name and entry["name"] == name:
+            importlib.import_module(entry["module"])
+            return True
+    return False
+
+
+def command_index(parser: argparse.ArgumentParser,
+                  argv: List[str],
+                  names: Iterable[str]) -> Optional[int]:
+    """Find the position of the subcommand in argv without parsing it,
+    skipping the values of global options such as ``--idrac_ip``.
+    :param parser: top level parser that holds the global options
+    :param argv: command line, without the program name
+    :param names: command names
+    :return: index of the command in argv, None when argv has no command
+    """
+    names = set(names)
+    i = 0
+    while i < len(argv):
+        arg = argv[i]
+        if arg == "--":
+            break
+        if arg.startswith("-"):
+            action = parser._option_string_actions.get(arg)
+            if action is not None and action.nargs != 0 and "=" not in arg:
+                i += 1
+            i += 1
+            continue
+        return i if arg in names else None
+    return None
+
+
+def select_command(parser: argparse.ArgumentParser,
+                   argv: Iterable[str],
+                   names: Iterable[str]) -> Optional[str]:
+    """Find the subcommand in argv without parsing it, see command_index.
+    :return: command name, None when argv has no command
+    """
+    argv = list(argv)
+    i = command_index(parser, argv, names)
+    return None if i is None else argv[i]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m idrac_ctl.command_manifest",
+        description="regenerate the static idrac_ctl command manifest")
+    parser.add_argument("--check", action="store_true",
+                        help="exit 1 when the manifest is out of date instead of writing it")
+    args = parser.parse_args(argv)
+    source = render_manifest(build_manifest())
+    current = MANIFEST_FILE.read_text() if MANIFEST_FILE.exists() else ""
+    if args.check:
+        if source != current:
+            print(f"{MANIFEST_FILE} is out of date, run python -m idrac_ctl.command_manifest")
+            return 1
+        return 0
+    if source != current:
+        MANIFEST_FILE.write_text(source)
+    print(f"{MANIFEST_FILE}: {source.count(chr(10))} lines")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -73,22 +73,14 @@ class QueryComponentIntegrity(IDracManager,
 
         Tolerant of a host without the collection (returns an empty list) or a
         leaf missing the SPDM/cert sub-structure (CertificateURI is None).
+        Leaves are fetched in one bounded fan-out, see ``walk_members``.
         """
         rows = []
         coll_uri = f"{RedfishApi.Version}/ComponentIntegrity"
-        try:
-            coll = self.base_query(coll_uri, do_async=do_async,
-                                   do_expanded=do_expanded).data or {}
-        except Exception:
-            return CommandResult(rows, None, None, None)
-
-        for leaf_uri in self._members(coll):
-            try:
-                ci = self.base_query(leaf_uri, do_async=do_async).data or {}
-            except Exception:
-                continue
+        leaves, = self.walk_members([coll_uri], do_async=do_async, do_expanded=do_expanded)
+        for leaf_uri, ci in leaves:
             rows.append({
-                "Id": ci.get("Id") or leaf_uri.rsplit("/", 1)[-1],
+                "Id": ci.get("Id") or str(leaf_uri).rsplit("/", 1)[-1],
                 "Type": ci.get("ComponentIntegrityType"),
                 "Version": ci.get("ComponentIntegrityTypeVersion"),
                 "Enabled": ci.get("ComponentIntegrityEnabled"),
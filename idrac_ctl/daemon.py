@@ -0,0 +1,416 @@
+"""Resident idrac_ctl daemon, reached over a local Unix socket.
+
+    idrac_ctl daemon                 run in the foreground
+    idrac_ctl daemon status          pid, uptime and warm BMCs
+    idrac_ctl daemon stop
+
+Automation that shells out to idrac_ctl pays the same fixed cost on every
+call: python imports, authentication, ``check_api_version`` and the manager,
+system and chassis id lookups. The daemon keeps that state warm. It holds one
+``IDracManager`` per BMC, the pooled keep-alive connections under it, and the
+command singletons with their resolved ids. The CLI forwards
+``sync_invoke(api_call, name, **kwargs)`` to it when the socket answers and
+runs the command in process otherwise, or with ``--no-daemon``.
+
+The socket lives in ``daemon/`` of the cache directory
+(``IDRAC_CTL_DAEMON_SOCKET`` overrides it). That directory is made and kept
+mode 0700 before the bind, and the socket is bound under a 0177 umask, so it
+is mode 0600 from the moment it exists: only the owner can connect. The
+protocol is one json request line and one json response line per connection.
+
+The daemon runs one command at a time, in the caller's working directory, and
+returns what the command printed so the CLI prints it as if it ran in process.
+A BMC seen again with different credentials or transport options gets fresh
+managers. The resource cache is expired before every command, so a command
+through the daemon never reads older state than it would in process.
+
+Author Mus spyroot@gmail.com
+"""
+import argparse
+import builtins
+import contextlib
+import importlib
+import io
+import json
+import logging
+import os
+import signal
+import socket
+import socketserver
+import sys
+import threading
+import time
+from enum import Enum
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from .cmd_utils import cache_dir
+from .idrac_shared import ApiRequestType, RedfishAction, Singleton
+from .redfish_cache import expire_resource_cache
+from .redfish_exceptions import RedfishException
+from .redfish_manager import CommandResult
+
+DAEMON_SOCKET_ENV = "IDRAC_CTL_DAEMON_SOCKET"
+DAEMON_SOCKET_DIR = "daemon"
+DAEMON_SOCKET_FILE = "daemon.sock"
+# seconds without a request before the daemon exits, 0 keeps it running.
+DEFAULT_IDLE_TIMEOUT = 1800.0
+CONNECT_TIMEOUT = 1.0
+
+# IDracManager arguments that identify a warm manager.
+MANAGER_ARGS = ("idrac_ip", "idrac_username", "idrac_password", "idrac_port",
+                "insecure", "is_http", "session_auth", "token_cache",
+                "walk_concurrency", "resource_cache", "inventory_cache")
+
+# modules an exception raised by a command is rebuilt from on the client.
+_EXCEPTION_MODULES = ("idrac_ctl.cmd_exceptions", "idrac_ctl.redfish_exceptions",
+                      "requests.exceptions", "builtins")
+
+logger = logging.getLogger(__name__)
+
+
+def socket_path() -> Path:
+    """Path of the daemon socket."""
+    path = os.environ.get(DAEMON_SOCKET_ENV)
+    return Path(path).expanduser() if path else cache_dir(DAEMON_SOCKET_DIR, DAEMON_SOCKET_FILE)
+
+
+def private_socket_dir(path: Path):
+    """Create the directory of a socket, and make the dedicated default one
+    mode 0700 even when it already existed with a looser mode.
+    :param path: socket path
+    :raise PermissionError: the default directory belongs to another user
+    """
+    directory = path.parent
+    directory.mkdir(mode=0o700, parents=True, exist_ok=True)
+    if directory != cache_dir(DAEMON_SOCKET_DIR):
+        # a directory the caller picked, only the socket itself is private.
+        return
+    st = os.stat(directory)
+    if st.st_uid != os.getuid():
+        raise PermissionError(f"{directory} belongs to another user")
+    if st.st_mode & 0o077:
+        os.chmod(directory, 0o700)
+
+
+def _encode_default(obj):
+    """json fallback for values a command returns."""
+    if isinstance(obj, RedfishAction):
+        return {"__redfish_action__": dict(obj)}
+    if isinstance(obj, BaseException):
+        return {"__exception__": f"{type(obj).__module__}.{type(obj).__qualname__}",
+                "args": list(obj.args),
+                "json_error": getattr(obj, "json_error", None)}
+    if isinstance(obj, Enum):
+        return obj.value
+    if isinstance(obj, (bytes, bytearray)):
+        return obj.decode("utf-8", "replace")
+    if isinstance(obj, (set, tuple)):
+        return list(obj)
+    if hasattr(obj, "__dict__"):
+        return obj.__dict__
+    return str(obj)
+
+
+def _exception(entry: dict) -> BaseException:
+    """Rebuild an exception the daemon reported, RedfishException when the
+    type is not one idrac_ctl raises."""
+    module, _, name = entry["__exception__"].rpartition(".")
+    args = entry.get("args") or []
+    if module in _EXCEPTION_MODULES:
+        cls = getattr(builtins if module == "builtins" else importlib.import_module(module),
+                      name, None)
+        if isinstance(cls, type) and issubclass(cls, BaseException):
+            try:
+                exc = cls(*args)
+            except Exception:  # noqa: BLE001 - odd constructor, keep the message
+                exc = None
+            if exc is not None:
+                exc.args = tuple(args)
+                if entry.get("json_error") is not None:
+                    exc.json_error = entry["json_error"]
+                return exc
+    return RedfishException(*args)
+
+
+def _decode_hook(obj: dict):
+    if "__redfish_action__" in obj:
+        fields = obj["__redfish_action__"]
+        action = RedfishAction(fields.get("action_name", ""), fields.get("target", ""),
+                               fields.get("full_redfish_name", ""))
+        action.args = fields.get("args")
+        return action
+    if "__exception__" in obj:
+        return _exception(obj)
+    return obj
+
+
+def encode(message: dict) -> bytes:
+    """One protocol line."""
+    return json.dumps(message, default=_encode_default).encode() + b"\n"
+
+
+def decode(line: bytes) -> dict:
+    """Parse one protocol line."""
+    return json.loads(line, object_hook=_decode_hook)
+
+
+class DaemonServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Unix socket server that runs idrac_ctl commands on warm managers."""
+
+    daemon_threads = True
+
+    def __init__(self, path: Path, idle_timeout: float = DEFAULT_IDLE_TIMEOUT):
+        """
+        :param path: socket path
+        :param idle_timeout: seconds without a request before the daemon exits, 0 never
+        """
+        self.path = Path(path)
+        self.idle_timeout = idle_timeout
+        self.started = time.time()
+        self.last_request = time.monotonic()
+        self.requests = 0
+        # (ip, port, username) -> (manager arguments, IDracManager)
+        self._managers: Dict[Tuple, Tuple[dict, object]] = {}
+        # commands run one at a time, they share the cwd and sys.stdout.
+        self._invoke_lock = threading.Lock()
+        # the socket is created by bind(), with the umask permissions.
+        umask = os.umask(0o177)
+        try:
+            super().__init__(str(self.path), _Handler)
+        finally:
+            os.umask(umask)
+
+    @staticmethod
+    def _endpoint(manager_args: dict) -> Tuple:
+        return (manager_args.get("idrac_ip"), manager_args.get("idrac_port"),
+                manager_args.get("idrac_username"))
+
+    def manager(self, manager_args: dict):
+        """Warm IDracManager for a BMC, a new one when the credentials or
+        options changed since the last request."""
+        from .idrac_manager import IDracManager
+
+        endpoint = self._endpoint(manager_args)
+        warm = self._managers.get(endpoint)
+        if warm is not None and warm[0] == manager_args:
+            return warm[1]
+        if warm is not None:
+            # Singleton keys on the endpoint only, so drop every command
+            # instance built with the old credentials.
+            with Singleton._lock:
+                for instances in Singleton._instances.values():
+                    instances.pop(endpoint, None)
+        mgr = IDracManager(**manager_args)
+        mgr.check_api_version()
+        self._managers[endpoint] = (dict(manager_args), mgr)
+        return mgr
+
+    def invoke(self, request: dict) -> dict:
+        """Run one forwarded sync_invoke.
+        :param request: {"type", "name", "manager", "kwargs", "cwd"}
+        :return: response message
+        """
+        out, err = io.StringIO(), io.StringIO()
+        with self._invoke_lock:
+            cwd = os.getcwd()
+            try:
+                if request.get("cwd"):
+                    os.chdir(request["cwd"])
+                # entries of an earlier command are revalidated, never served blind.
+                expire_resource_cache()
+                with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+                    mgr = self.manager(request["manager"])
+                    result = mgr.sync_invoke(ApiRequestType[request["type"]],
+                                             request["name"], **request.get("kwargs", {}))
+                    vendor = mgr.redfish_vendor
+                    info = {"vendor": vendor}
+                    if vendor == "Dell":
+                        info["idrac_manager_version"] = mgr.idrac_manager_version
+                        info["redfish_version"] = mgr.redfish_version
+                response = {"ok": True, "result": list(result), "manager": info}
+            except Exception as exc:  # noqa: BLE001 - the client re-raises it
+                response = {"ok": False, "error": exc}
+            finally:
+                os.chdir(cwd)
+        response.update(stdout=out.getvalue(), stderr=err.getvalue())
+        return response
+
+    def status(self) -> dict:
+        return {"ok": True,
+                "pid": os.getpid(),
+                "socket": str(self.path),
+                "uptime": round(time.time() - self.started, 3),
+                "requests": self.requests,
+                "bmcs": sorted(str(endpoint[0]) for endpoint in self._managers)}
+
+    def handle_message(self, request: dict) -> dict:
+        """Dispatch one request by its ``op``."""
+        self.requests += 1
+        self.last_request = time.monotonic()
+        op = request.get("op")
+        if op == "invoke":
+            return self.invoke(request)
+        if op == "status":
+            return self.status()
+        if op == "stop":
+            threading.Thread(target=self.shutdown, daemon=True).start()
+            return {"ok": True}
+        return {"ok": False, "error": RedfishException(f"unknown daemon op {op}")}
+
+    def _watch_idle(self):
+        while True:
+            time.sleep(min(self.idle_timeout, 5.0))
+            if time.monotonic() - self.last_request > self.idle_timeout:
+                logger.info("idrac_ctl daemon idle, exiting")
+                self.shutdown()
+                return
+
+    def serve(self):
+        """Serve until stopped, idle or signalled, then remove the socket."""
+        if self.idle_timeout > 0:
+            threading.Thread(target=self._watch_idle, name="daemon-idle", daemon=True).start()
+        try:
+            self.serve_forever()
+        finally:
+            self.server_close()
+            with contextlib.suppress(FileNotFoundError):
+                self.path.unlink()
+
+
+class _Handler(socketserver.StreamRequestHandler):
+
+    def handle(self):
+        line = self.rfile.readline()
+        if not line:
+            return
+        try:
+            request = decode(line)
+        except ValueError as err:
+            response = {"ok": False, "error": RedfishException(f"bad daemon request: {err}")}
+        else:
+            response = self.server.handle_message(request)
+        self.wfile.write(encode(response))
+
+
+def connect(path: Optional[Path] = None) -> Optional[socket.socket]:
+    """Connect to the daemon.
+    :param path: socket path, socket_path() by default
+    :return: connected socket, None when no daemon listens
+    """
+    path = Path(path) if path is not None else socket_path()
+    if not path.exists():
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(CONNECT_TIMEOUT)
+    try:
+        sock.connect(str(path))
+    except OSError:
+        # a stale socket left by a daemon that was killed.
+        sock.close()
+        return None
+    sock.settimeout(None)
+    return sock
+
+
+def call(sock: socket.socket, message: dict) -> dict:
+    """Send one request on a connected socket and read the response.
+    :raise RedfishException: the daemon closed the connection without answering
+    """
+    with sock, sock.makefile("rb") as reader:
+        sock.sendall(encode(message))
+        line = reader.readline()
+    if not line:
+        raise RedfishException("idrac_ctl daemon closed the connection")
+    return decode(line)
+
+
+def forward(api_call: ApiRequestType,
+            name: str,
+            manager_args: dict,
+            kwargs: dict,
+            path: Optional[Path] = None) -> Optional[Tuple[CommandResult, dict]]:
+    """Run a command on the daemon, the way IDracManager.sync_invoke runs it.
+
+    A command that reached the daemon is never re-run in process, so a
+    mutating command cannot fire twice.
+
+    :param api_call: command type
+    :param name: command registry name
+    :param manager_args: IDracManager arguments, see MANAGER_ARGS
+    :param kwargs: command arguments
+    :param path: socket path, socket_path() by default
+    :return: (CommandResult, {"vendor", ...}), None when no daemon listens
+    :raise: the exception the command raised in the daemon
+    """
+    sock = connect(path)
+    if sock is None:
+        return None
+    response = call(sock, {"op": "invoke",
+                           "type": api_call.name,
+                           "name": name,
+                           "manager": {k: manager_args[k] for k in MANAGER_ARGS},
+                           "kwargs": kwargs,
+                           "cwd": os.getcwd()})
+    if response.get("stdout"):
+        print(response["stdout"], end="")
+    if response.get("stderr"):
+        print(response["stderr"], end="", file=sys.stderr)
+    if not response.get("ok"):
+        raise response["error"]
+    return CommandResult(*response["result"]), response["manager"]
+
+
+def serve(path: Optional[Path] = None, idle_timeout: float = DEFAULT_IDLE_TIMEOUT) -> int:
+    """Run the daemon in the foreground.
+    :return: process exit code
+    """
+    path = Path(path) if path is not None else socket_path()
+    sock = connect(path)
+    if sock is not None:
+        sock.close()
+        print(f"idrac_ctl daemon already listens on {path}")
+        return 1
+    private_socket_dir(path)
+    with contextlib.suppress(FileNotFoundError):
+        path.unlink()
+    server = DaemonServer(path, idle_timeout)
+    signal.signal(signal.SIGTERM,
+                  lambda *_: threading.Thread(target=server.shutdown, daemon=True).start())
+    print(f"idrac_ctl daemon listening on {path}")
+    try:
+        server.serve()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def daemon_main(argv) -> int:
+    """``idrac_ctl daemon`` entry point.
+    :param argv: arguments after ``daemon``
+    :return: process exit code
+    """
+    parser = argparse.ArgumentParser(
+        prog="idrac_ctl daemon",
+        description="keep BMC sessions, connections and resolved ids warm "
+                    "for repeated idrac_ctl calls")
+    parser.add_argument("action", nargs="?", default="run", choices=("run", "status", "stop"),
+                        help="run the daemon in the foreground, or query or stop a running one")
+    parser.add_argument("--socket", default=None,
+                        help=f"socket path, by default {DAEMON_SOCKET_ENV} or the cache directory")
+    parser.add_argument("--idle-timeout", dest="idle_timeout", type=float,
+                        default=DEFAULT_IDLE_TIMEOUT,
+                        help="seconds without a request before the daemon exits, 0 never exits")
+    args = parser.parse_args(argv)
+    path = Path(args.socket).expanduser() if args.socket else socket_path()
+
+    if args.action == "run":
+        return serve(path, args.idle_timeout)
+    sock = connect(path)
+    if sock is None:
+        print(f"no idrac_ctl daemon listens on {path}")
+        return 1
+    response = call(sock, {"op": args.action})
+    if args.action == "status":
+        print(json.dumps({k: v for k, v in response.items() if k != "ok"}, indent=4))
+    return 0 if response.get("ok") else 1
@@ -2,24 +2,40 @@
 
 This package implements ``redfish-discover``: a non-mutating tool that probes a
 list of hosts for a Redfish service root (``/redfish/v1/``) and classifies the
-vendor of each reachable service. Nothing here opens a real network connection
-or stores credentials — the scan helper takes an async GET callable supplied by
-the caller, so the pure logic (vendor classification, result shaping, table
-rendering) stays fully offline-testable.
+vendor of each reachable service. No credentials are stored or sent — the scan
+helpers take an async GET callable supplied by the caller, so the pure logic
+(vendor classification, result shaping, table rendering) stays fully
+offline-testable. The CLI injects :class:`ServiceRootFetcher`, the only piece
+that opens sockets.
 
 Public surface:
 
 * :func:`classify_vendor` — pure ServiceRoot dict -> vendor string.
 * :func:`scan_subnet` — async probe of many hosts via an injected GET callable.
+* :func:`scan_stream` — lazy sweep yielding services as they answer, sized by
+  :class:`AdaptiveConcurrency`.
+* :func:`expand_targets` — CIDR blocks and ranges -> host addresses.
+* :class:`ServiceRootFetcher` — the network GET, with a TCP pre-probe.
 * :func:`redfish_discover_main` — console entry point (rich if available).
 
 Author Mus spyroot@gmail.com
 """
 from idrac_ctl.discover.classifier import classify_vendor
-from idrac_ctl.discover.scanner import DiscoveredService, scan_subnet
+from idrac_ctl.discover.fetcher import ServiceRootFetcher
+from idrac_ctl.discover.scanner import (
+    AdaptiveConcurrency,
+    DiscoveredService,
+    expand_targets,
+    scan_stream,
+    scan_subnet,
+)
 
 __all__ = [
     "classify_vendor",
     "scan_subnet",
+    "scan_stream",
+    "expand_targets",
+    "AdaptiveConcurrency",
+    "ServiceRootFetcher",
     "DiscoveredService",
 ]
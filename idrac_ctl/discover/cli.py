@@ -1,25 +1,35 @@
 """Console entry point for ``redfish-discover``.
 
 This wires the pure pieces (:func:`idrac_ctl.discover.classifier.classify_vendor`
-and :func:`idrac_ctl.discover.scanner.scan_subnet`) into a CLI and renders the
+and :func:`idrac_ctl.discover.scanner.scan_stream`) to the network fetcher
+(:class:`idrac_ctl.discover.fetcher.ServiceRootFetcher`) and renders the
 results as a table. Rendering prefers ``rich`` when it is importable and the
 output is a real terminal; otherwise it falls back to a fixed-width plain-text
-table so the tool works in pipes, logs, and CI.
+table so the tool works in pipes, logs, and CI. With ``--jsonl`` each service
+is printed as a JSON line the moment it answers instead::
 
-The default network fetcher is intentionally a stub that returns no services:
-real discovery requires a transport/auth policy the operator supplies. Keeping
-the default inert means importing or invoking this module never opens a socket
-and never uses credentials, which is what lets the rest of the package stay
-offline-testable.
+    redfish-discover 10.0.0.0/22 10.0.8.10-40 --jsonl > bmcs.jsonl
+
+The fetcher only reads the anonymous ServiceRoot, the scan never uses
+credentials. Importing this module opens no socket.
 
 Author Mus spyroot@gmail.com
 """
 import argparse
 import asyncio
+import ipaddress
+import json
 import sys
 from typing import Any, Dict, List, Optional, Sequence, TextIO
 
-from idrac_ctl.discover.scanner import DiscoveredService, scan_subnet
+from idrac_ctl.discover.fetcher import DEFAULT_CONNECT_TIMEOUT, DEFAULT_TIMEOUT, ServiceRootFetcher
+from idrac_ctl.discover.scanner import (
+    AdaptiveConcurrency,
+    AsyncGet,
+    DiscoveredService,
+    expand_targets,
+    scan_stream,
+)
 
 # Column order for both renderers; (header, record-key) pairs.
 _COLUMNS = (
@@ -118,14 +128,32 @@ def _render_plain(records: List[Dict[str, Any]], out: TextIO) -> None:
         out.write(_fmt(row) + "\n")
 
 
-async def _default_get(_ip: str) -> Optional[Dict[str, Any]]:
-    """Default fetcher: a no-op that discovers nothing.
+def _sort_key(service: DiscoveredService):
+    """Order services by address, hostnames after addresses."""
+    host = service.ip.rsplit(":", 1)[0] if service.ip.count(":") == 1 else service.ip
+    try:
+        return 0, int(ipaddress.ip_address(host.strip("[]"))), service.ip
+    except ValueError:
+        return 1, 0, service.ip
 
-    Real discovery needs an operator-supplied transport/auth policy. The default
-    deliberately performs no network call and holds no credentials, so running
-    the CLI without wiring a fetcher is safe and inert.
-    """
-    return None
+
+async def _sweep(args: argparse.Namespace,
+                 get: AsyncGet,
+                 limiter: AdaptiveConcurrency,
+                 out: TextIO) -> List[DiscoveredService]:
+    """Run the scan, printing JSON lines as services answer when asked to."""
+    services = []
+    try:
+        async for service in scan_stream(expand_targets(args.hosts), get, limiter=limiter):
+            services.append(service)
+            if args.jsonl:
+                out.write(json.dumps(service.as_dict()) + "\n")
+                out.flush()
+    finally:
+        close = getattr(get, "close", None)
+        if close is not None:
+            await close()
+    return services
 
 
 def _parse_args(argv: Optional[Sequence[str]]) -> argparse.Namespace:
@@ -141,37 +169,94 @@ def _parse_args(argv: Optional[Sequence[str]]) -> argparse.Namespace:
     parser.add_argument(
         "hosts",
         nargs="*",
-        help="Host addresses to probe (e.g. 10.0.0.10 10.0.0.11).",
+        help="Hosts, CIDR blocks or ranges to probe "
+             "(e.g. 10.0.0.10 10.0.0.0/22 10.0.1.5-40 bmc1:8443).",
     )
     parser.add_argument(
         "--concurrency",
         type=int,
         default=32,
-        help="Maximum number of concurrent probes (default: 32).",
+        help="Initial number of concurrent probes, adapted to the "
+             "observed timeout rate (default: 32).",
+    )
+    parser.add_argument(
+        "--max-concurrency",
+        dest="max_concurrency",
+        type=int,
+        default=512,
+        help="Upper bound for the adaptive concurrency (default: 512).",
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=443,
+        help="Port of hosts given without one (default: 443).",
+    )
+    parser.add_argument(
+        "--http",
+        action="store_true",
+        help="Use plain http instead of https.",
+    )
+    parser.add_argument(
+        "--no-probe",
+        dest="probe",
+        action="store_false",
+        help="Send the request without a TCP connect probe first.",
+    )
+    parser.add_argument(
+        "--connect-timeout",
+        dest="connect_timeout",
+        type=float,
+        default=DEFAULT_CONNECT_TIMEOUT,
+        help=f"Seconds to wait for a TCP connect (default: {DEFAULT_CONNECT_TIMEOUT}).",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=DEFAULT_TIMEOUT,
+        help=f"Seconds to wait for the ServiceRoot (default: {DEFAULT_TIMEOUT}).",
+    )
+    parser.add_argument(
+        "--jsonl",
+        action="store_true",
+        help="Print each service as a JSON line as soon as it answers.",
     )
     return parser.parse_args(argv)
 
 
-def redfish_discover_main(argv: Optional[Sequence[str]] = None) -> int:
+def redfish_discover_main(argv: Optional[Sequence[str]] = None,
+                          get: Optional[AsyncGet] = None) -> int:
     """Console entry point for ``redfish-discover``.
 
     :param argv: argument vector (defaults to ``sys.argv[1:]``).
+    :param get: ServiceRoot fetcher, defaults to a
+        :class:`~idrac_ctl.discover.fetcher.ServiceRootFetcher` built from argv.
     :return: process exit code. ``0`` always for a completed scan; ``2`` when no
-        hosts were supplied (nothing to do).
+        hosts were supplied (nothing to do) or a target is malformed.
 
-    With the default fetcher the scan discovers nothing — wiring a real fetcher
-    is an operator responsibility, kept out of this module so it never performs
-    network I/O or touches credentials on its own.
+    A summary of the sweep goes to stderr, so ``--jsonl`` output stays clean.
     """
     args = _parse_args(argv)
     if not args.hosts:
         sys.stderr.write("redfish-discover: no hosts supplied; nothing to scan.\n")
         return 2
 
-    services = asyncio.run(
-        scan_subnet(args.hosts, _default_get, concurrency=args.concurrency)
-    )
-    render_table(services)
+    if get is None:
+        get = ServiceRootFetcher(port=args.port, use_http=args.http,
+                                 connect_timeout=args.connect_timeout,
+                                 timeout=args.timeout, probe=args.probe,
+                                 workers=args.max_concurrency)
+    try:
+        limiter = AdaptiveConcurrency(args.concurrency, maximum=args.max_concurrency)
+        services = asyncio.run(_sweep(args, get, limiter, sys.stdout))
+    except ValueError as err:
+        sys.stderr.write(f"redfish-discover: {err}\n")
+        return 2
+    if not args.jsonl:
+        render_table(sorted(services, key=_sort_key))
+    sys.stderr.write(f"redfish-discover: {limiter.completed} hosts probed, "
+                     f"{len(services)} services, {limiter.timeouts} timeouts, "
+                     f"concurrency {limiter.limit}\n")
     return 0
 
 
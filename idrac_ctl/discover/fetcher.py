@@ -0,0 +1,151 @@
+"""Network fetcher for ``redfish-discover``.
+
+:class:`ServiceRootFetcher` is the async ``get`` callable the scanner
+injects: it fetches the unauthenticated ServiceRoot (``/redfish/v1/``) of
+one host and returns it parsed, or ``None`` when the host is not a Redfish
+service. It holds no credentials, the Redfish spec requires the service
+root to be readable anonymously.
+
+A sweep spends most of its time on addresses nobody answers, so the fetcher
+first opens a bare TCP connection to the port (``probe``) under a short
+connect timeout: a refused or silent address is dead and costs one connect
+attempt instead of a TLS handshake and an HTTP timeout. Only a host that
+accepted the connection and then stalled raises ``TimeoutError``, which is
+the signal :class:`~idrac_ctl.discover.scanner.AdaptiveConcurrency` sizes
+the sweep by.
+
+HTTP goes through aiohttp when it is installed, otherwise through
+``requests`` on a bounded thread pool, like ``idrac_ctl.redfish_async``.
+
+Author Mus spyroot@gmail.com
+"""
+import asyncio
+import functools
+import json
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional, Tuple
+
+from idrac_ctl.discover.scanner import REDFISH_ROOT_PATH
+from idrac_ctl.redfish_async import HAS_AIOHTTP
+
+DEFAULT_CONNECT_TIMEOUT = 1.0
+DEFAULT_TIMEOUT = 5.0
+
+
+def split_host_port(host: str, default_port: int) -> Tuple[str, int]:
+    """Split ``host``, ``host:port`` or ``[v6]:port`` into (host, port)."""
+    if host.startswith("["):
+        address, _, rest = host[1:].partition("]")
+        return address, int(rest[1:]) if rest.startswith(":") else default_port
+    if host.count(":") == 1:
+        address, port = host.split(":")
+        return address, int(port)
+    return host, default_port
+
+
+class ServiceRootFetcher:
+    """Async ``get`` for :func:`~idrac_ctl.discover.scanner.scan_stream`."""
+
+    def __init__(self,
+                 port: int = 443,
+                 use_http: bool = False,
+                 connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+                 timeout: float = DEFAULT_TIMEOUT,
+                 probe: bool = True,
+                 verify: bool = False,
+                 use_aiohttp: Optional[bool] = None,
+                 workers: int = 64):
+        """
+        :param port: port of hosts given without one.
+        :param use_http: plain http instead of https.
+        :param connect_timeout: seconds for the TCP connect, probe included.
+        :param timeout: seconds for the whole ServiceRoot request.
+        :param probe: connect to the port before sending any request.
+        :param verify: verify TLS certificates, BMCs ship self-signed ones.
+        :param use_aiohttp: force or disable aiohttp, None uses it when installed.
+        :param workers: threads of the requests fallback.
+        """
+        if use_aiohttp and not HAS_AIOHTTP:
+            raise ImportError("aiohttp is not installed, pip install idrac_ctl[async]")
+        self.port = port
+        self.scheme = "http" if use_http else "https"
+        self.connect_timeout = connect_timeout
+        self.timeout = timeout
+        self.use_probe = probe
+        self.verify = verify
+        self.backend = "aiohttp" if HAS_AIOHTTP and use_aiohttp is not False else "executor"
+        self.workers = workers
+        self._session = None
+        self._executor = None
+
+    async def probe(self, host: str, port: int) -> bool:
+        """True when something accepts a TCP connection on host:port."""
+        try:
+            _, writer = await asyncio.wait_for(
+                asyncio.open_connection(host, port), self.connect_timeout)
+        except (OSError, asyncio.TimeoutError):
+            return False
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except OSError:
+            pass
+        return True
+
+    async def __call__(self, host: str) -> Optional[Dict[str, Any]]:
+        """ServiceRoot of host, None when it is not a Redfish service.
+
+        :raises TimeoutError: the host accepted the connection and stalled.
+        """
+        address, port = split_host_port(host, self.port)
+        if self.use_probe and not await self.probe(address, port):
+            return None
+        netloc = f"[{address}]:{port}" if ":" in address else f"{address}:{port}"
+        url = f"{self.scheme}://{netloc}{REDFISH_ROOT_PATH}"
+        try:
+            if self.backend == "aiohttp":
+                status, body = await self._aiohttp_get(url)
+            else:
+                status, body = await self._executor_get(url)
+        except asyncio.TimeoutError:
+            raise TimeoutError(f"{host} did not answer within {self.timeout}s")
+        if status != 200:
+            return None
+        try:
+            root = json.loads(body)
+        except ValueError:
+            return None
+        return root if isinstance(root, dict) else None
+
+    async def _aiohttp_get(self, url: str) -> Tuple[int, bytes]:
+        import aiohttp
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=0, ssl=None if self.verify else False),
+                timeout=aiohttp.ClientTimeout(total=self.timeout,
+                                              sock_connect=self.connect_timeout))
+        async with self._session.get(url, headers={"Accept": "application/json"}) as resp:
+            return resp.status, await resp.read()
+
+    async def _executor_get(self, url: str) -> Tuple[int, bytes]:
+        import requests
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers,
+                                                thread_name_prefix="redfish-discover")
+        try:
+            resp = await asyncio.get_running_loop().run_in_executor(
+                self._executor, functools.partial(
+                    requests.get, url, headers={"Accept": "application/json"},
+                    timeout=(self.connect_timeout, self.timeout), verify=self.verify))
+        except requests.Timeout:
+            raise asyncio.TimeoutError()
+        return resp.status_code, resp.content
+
+    async def close(self):
+        """Close pooled connections and worker threads."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
@@ -10,11 +10,29 @@ pass a fake async GET.
 Concurrency is bounded by an :class:`asyncio.Semaphore` so a large host list
 cannot open an unbounded number of sockets at once.
 
+:func:`scan_stream` is the sweep variant for whole management networks: it
+takes a lazy host iterable (see :func:`expand_targets` for CIDR and range
+inputs), yields each service as soon as it answers, and sizes the number of
+probes in flight with :class:`AdaptiveConcurrency` from the timeout rate it
+observes.
+
 Author Mus spyroot@gmail.com
 """
 import asyncio
+import ipaddress
 from dataclasses import dataclass
-from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+)
 
 from idrac_ctl.discover.classifier import classify_vendor
 
@@ -132,3 +150,182 @@ async def scan_subnet(
         *(_probe_host(host, get, semaphore) for host in ordered_hosts)
     )
     return [svc for svc in results if svc is not None]
+
+
+def expand_targets(specs: Iterable[str]) -> Iterator[str]:
+    """Expand target specs into host addresses, lazily.
+
+    Accepted forms: a CIDR block (``10.0.0.0/22``, hosts only, no network or
+    broadcast address), an IPv4 range (``10.0.0.10-10.0.0.20`` or
+    ``10.0.0.10-20``), or a plain address or hostname, passed through as is.
+
+    :param specs: target specs, e.g. the positional CLI arguments.
+    :return: an iterator of host strings; a /16 is never materialized.
+    :raises ValueError: for a malformed CIDR or range.
+    """
+    for spec in specs:
+        spec = (spec or "").strip()
+        if not spec:
+            continue
+        if "/" in spec:
+            network = ipaddress.ip_network(spec, strict=False)
+            if network.num_addresses == 1:
+                yield str(network.network_address)
+            else:
+                yield from (str(host) for host in network.hosts())
+            continue
+        first, sep, last = spec.partition("-")
+        try:
+            start = ipaddress.IPv4Address(first)
+        except ValueError:
+            # a hostname, hostnames may contain "-".
+            yield spec
+            continue
+        if not sep:
+            yield spec
+            continue
+        end = ipaddress.IPv4Address(
+            last if "." in last else f"{first.rsplit('.', 1)[0]}.{last}")
+        if end < start:
+            raise ValueError(f"range {spec} ends before it starts")
+        for value in range(int(start), int(end) + 1):
+            yield str(ipaddress.IPv4Address(value))
+
+
+class AdaptiveConcurrency:
+    """Concurrency limit that follows the observed timeout rate.
+
+    Every ``window`` completed probes the limit is halved when more than
+    ``high`` of them timed out, and raised by a quarter when at most ``low``
+    did, always within ``[minimum, maximum]``. A timeout here means a host
+    that started to answer and then stalled, the sign of a saturated network
+    or BMC; fetchers report silent addresses as dead, not as timeouts.
+    """
+
+    def __init__(self,
+                 initial: int = 32,
+                 minimum: int = 1,
+                 maximum: Optional[int] = None,
+                 window: int = 32,
+                 high: float = 0.2,
+                 low: float = 0.02):
+        """
+        :param initial: limit of the first window.
+        :param minimum: lowest limit the rate can push it to.
+        :param maximum: highest limit, defaults to 16 times ``initial``.
+        :param window: number of completed probes between two adjustments.
+        :param high: timeout fraction above which the limit is halved.
+        :param low: timeout fraction at or below which the limit grows.
+        :raises ValueError: if ``initial`` or ``minimum`` < 1.
+        """
+        if initial < 1 or minimum < 1:
+            raise ValueError("concurrency must be >= 1")
+        self.minimum = minimum
+        self.maximum = max(maximum or initial * 16, initial)
+        self.limit = min(max(initial, minimum), self.maximum)
+        self.window = max(1, window)
+        self.high = high
+        self.low = low
+        self.in_flight = 0
+        self.completed = 0
+        self.timeouts = 0
+        self._window_done = 0
+        self._window_timeouts = 0
+        self._changed = None
+
+    async def acquire(self):
+        """Wait until fewer than ``limit`` probes are in flight."""
+        if self._changed is None:
+            self._changed = asyncio.Condition()
+        async with self._changed:
+            await self._changed.wait_for(lambda: self.in_flight < self.limit)
+            self.in_flight += 1
+
+    async def release(self, timed_out: bool = False):
+        """Record one finished probe and adjust the limit at window ends.
+
+        :param timed_out: the probe ended in a timeout.
+        """
+        async with self._changed:
+            self.in_flight -= 1
+            self.completed += 1
+            self._window_done += 1
+            if timed_out:
+                self.timeouts += 1
+                self._window_timeouts += 1
+            if self._window_done >= self.window:
+                rate = self._window_timeouts / self._window_done
+                if rate > self.high:
+                    self.limit = max(self.minimum, self.limit // 2)
+                elif rate <= self.low:
+                    self.limit = min(self.maximum, self.limit + max(1, self.limit // 4))
+                self._window_done = self._window_timeouts = 0
+            self._changed.notify_all()
+
+
+async def scan_stream(
+        hosts: Iterable[str],
+        get: AsyncGet,
+        *,
+        concurrency: int = 32,
+        limiter: Optional[AdaptiveConcurrency] = None) -> AsyncIterator[DiscoveredService]:
+    """Probe ``hosts`` and yield each Redfish service as soon as it answers.
+
+    Unlike :func:`scan_subnet`, hosts are consumed lazily and results come in
+    completion order, so a caller can print a /16 sweep while it runs. Only
+    ``limiter.limit`` probes are in flight at any time. Duplicate and empty
+    hosts are skipped; hosts that error are omitted, and a ``TimeoutError``
+    from ``get`` counts as a timeout for the limiter.
+
+    :param hosts: host addresses, e.g. ``expand_targets(["10.0.0.0/16"])``.
+    :param get: async ServiceRoot fetcher, as for :func:`scan_subnet`.
+    :param concurrency: initial limit when no ``limiter`` is given.
+    :param limiter: concurrency controller, its counters describe the scan.
+    :return: async iterator of :class:`DiscoveredService`.
+    """
+    limiter = limiter if limiter is not None else AdaptiveConcurrency(concurrency)
+    results: asyncio.Queue = asyncio.Queue()
+    done = object()
+    probes = set()
+
+    async def probe(host: str):
+        service, timed_out = None, False
+        try:
+            service = _service_from_root(host, await get(host))
+        except (TimeoutError, asyncio.TimeoutError):
+            timed_out = True
+        except Exception:
+            pass
+        finally:
+            await limiter.release(timed_out)
+        if service is not None:
+            results.put_nowait(service)
+
+    async def feed():
+        seen = set()
+        try:
+            for host in hosts:
+                if not host or host in seen:
+                    continue
+                seen.add(host)
+                await limiter.acquire()
+                task = asyncio.ensure_future(probe(host))
+                probes.add(task)
+                task.add_done_callback(probes.discard)
+            while probes:
+                await asyncio.wait(list(probes))
+        finally:
+            # also on a bad target spec, await feeder below raises it.
+            results.put_nowait(done)
+
+    feeder = asyncio.ensure_future(feed())
+    try:
+        while True:
+            item = await results.get()
+            if item is done:
+                break
+            yield item
+        await feeder
+    finally:
+        for task in [feeder, *probes]:
+            task.cancel()
@@ -6,14 +6,28 @@ Author Mus spyroot@gmail.com
 """
 import json
 import os
+import sys
 from abc import abstractmethod
+from dataclasses import asdict
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, List, Optional, Tuple
 
 from ..idrac_manager import IDracManager
 from ..idrac_shared import ApiRequestType, Singleton
-from ..redfish_exceptions import RedfishForbidden
+from ..redfish_exceptions import RedfishForbidden, RedfishNotFound
 from ..redfish_manager import CommandResult
+from .crawler import CrawlProgress, FrontierCrawler
+from .incremental import (
+    CHANGES_FILE,
+    ChangeReport,
+    ResourceState,
+    body_hash,
+    carried_over,
+    load_crawl_state,
+    member_set,
+    save_crawl_state,
+)
+from .snapshot import CrawlSnapshot, load_rest_api_map, resource_filename, save_rest_api_map
 
 # Upper bound on how deep recursive_discovery will walk below a top-level
 # resource. Real Redfish trees are far shallower than this; the bound exists
@@ -21,6 +35,9 @@ from ..redfish_manager import CommandResult
 # cyclic back-reference.
 DEFAULT_DISCOVERY_MAX_DEPTH = 32
 
+# visited set and frontier of an unfinished crawl, next to the json files.
+CHECKPOINT_FILE = "crawl_checkpoint.json"
+
 
 class Discovery(IDracManager,
                 scm_type=ApiRequestType.Discovery,
@@ -28,6 +45,8 @@ class Discovery(IDracManager,
                 metaclass=Singleton):
     """A command discovery all redfish resource  based on a resource path
     """
+    # CrawlSnapshot a --snapshot crawl writes resources to, None for json files.
+    _snapshot = None
 
     def __init__(self, *args, **kwargs):
         """
@@ -38,6 +57,8 @@ class Discovery(IDracManager,
         super(Discovery, self).__init__(*args, **kwargs)
         self._discovered_url_file_mapping = {}
         self._api_allowed_methods = {}
+        # path -> ResourceState, saved to crawl_state.json for --incremental.
+        self._resource_state = {}
 
         self.visited_urls = {}
         home_dir = str(Path.home())
@@ -60,6 +81,31 @@ class Discovery(IDracManager,
         :return:
         """
         cmd_parser = cls.base_parser()
+        cmd_parser.add_argument(
+            '--workers', type=int, required=False, default=0,
+            help="max number of resources fetched at once, defaults to --walk-concurrency")
+        cmd_parser.add_argument(
+            '--rate', type=float, required=False, default=0.0,
+            help="max requests per second for the crawl, 0 no limit")
+        cmd_parser.add_argument(
+            '--max-depth', dest="max_depth", type=int, required=False,
+            default=DEFAULT_DISCOVERY_MAX_DEPTH,
+            help="max depth below the service root")
+        cmd_parser.add_argument(
+            '--resume', action='store_true', required=False, default=False,
+            help=f"resume an interrupted crawl from {CHECKPOINT_FILE}")
+        cmd_parser.add_argument(
+            '--incremental', action='store_true', required=False, default=False,
+            help="revalidate the previous crawl with ETags and rewrite only changed "
+                 "resources, outputs a change report")
+        cmd_parser.add_argument(
+            '--no-prune', dest="no_prune", action='store_true', required=False, default=False,
+            help="incremental: also revalidate members of collections whose members "
+                 "did not change")
+        cmd_parser.add_argument(
+            '--snapshot', type=str, required=False, default=None,
+            help="write the crawl to this single sqlite file instead of one json "
+                 "file per resource and rest_api_map.npy")
         help_text = "command discovery all action."
         return cmd_parser, "discovery", help_text
 
@@ -149,26 +195,11 @@ class Discovery(IDracManager,
             return
 
         try:
-            result = self.base_query(resource_path)
-            allow_header = result.extra
-            if allow_header is not None:
-                allowed_methods = [method.strip() for method in allow_header.split(",")]
-            else:
-                allowed_methods = []
-
-            print("Discovery: {} {}".format(resource_path, allowed_methods))
-
+            data = self.save_resource(resource_path)
+            print("Discovery: {} {}".format(
+                resource_path, self._api_allowed_methods[resource_path]))
             self.visited_urls[resource_path] = True
-            response_filename = os.path.join(
-                self.json_response_dir, resource_path.replace("/", "_") + ".json")
-
-            with open(response_filename, "w") as file:
-                json.dump(result.data, file, indent=4)
-
-            self._discovered_url_file_mapping[resource_path] = response_filename
-            self._api_allowed_methods[resource_path] = allowed_methods
-
-            odata_ids = list(self.extract_odata_ids(result.data))
+            odata_ids = list(self.extract_odata_ids(data))
 
             for r in odata_ids:
                 self.recursive_discovery(r, depth + 1, max_depth)
@@ -179,6 +210,275 @@ class Discovery(IDracManager,
             self.visited_urls[resource_path] = True
             print("Discovery error at {}: {}".format(resource_path, other_err))
 
+    def save_resource(self, resource_path: str):
+        """Fetch one resource, write it to its json file and record its
+        file and allowed methods.
+        :param resource_path: normalized resource path
+        :return: the resource body
+        """
+        return self._save_resource(resource_path)[0]
+
+    def _save_resource(self, resource_path: str) -> Tuple[object, Optional[str]]:
+        """save_resource that also returns the ETag the resource was sent with."""
+        data, allow_header, etag = self._conditional_get(resource_path)
+        self._write_resource(resource_path, data, allow_header, etag=etag)
+        return data, etag
+
+    def _resource_filename(self, resource_path: str) -> str:
+        return resource_filename(self.json_response_dir, resource_path)
+
+    def _write_resource(self, resource_path: str, data, allow_header: Optional[str],
+                        write: Optional[bool] = True, etag: Optional[str] = None):
+        """Write a resource body to its json file and record its file and
+        allowed methods; with write False only the mappings are updated.
+        With a snapshot open the resource goes to the snapshot instead."""
+        if allow_header is not None:
+            allowed_methods = [method.strip() for method in allow_header.split(",")]
+        else:
+            allowed_methods = []
+
+        if self._snapshot is not None:
+            self._snapshot.put(resource_path, data, allowed_methods, etag)
+            self._api_allowed_methods[resource_path] = allowed_methods
+            return
+
+        response_filename = self._resource_filename(resource_path)
+        if write:
+            with open(response_filename, "w") as file:
+                json.dump(data, file, indent=4)
+
+        self._discovered_url_file_mapping[resource_path] = response_filename
+        self._api_allowed_methods[resource_path] = allowed_methods
+
+    def _conditional_get(self, resource_path: str, etag: Optional[str] = None):
+        """GET a resource, with If-None-Match when etag is known.
+        :return: None on 304 Not Modified, else (data, allow header, etag)
+        :raise RedfishNotFound: the resource is gone
+        """
+        headers = dict(self.json_content_type)
+        if etag:
+            headers["If-None-Match"] = etag
+        response = self.api_get_call(self._query_url(resource_path), headers)
+        self.count_query()
+        if response.status_code == 304:
+            return None
+        if response.status_code in (404, 410):
+            raise RedfishNotFound(resource_path)
+        self.default_error_handler(response)
+        return response.json(), response.headers.get("Allow"), response.headers.get("ETag")
+
+    def _links(self, data) -> List[str]:
+        return sorted({self.normalize_resource_path(r) for r in self.extract_odata_ids(data)})
+
+    def _skip_resource(self, resource_path: str) -> bool:
+        """True for a resource the crawl marks visited without a fetch."""
+        if not resource_path.startswith("/redfish/v1"):
+            return True
+        return any(query_filter in resource_path for query_filter in self.default_query_filter)
+
+    def _write_checkpoint(self, frontier: List[Tuple[str, int]]):
+        """Atomically save the visited set, the frontier, the mappings and
+        the resource state crawl_state.json is written from."""
+        if self._snapshot is not None:
+            # every resource the checkpoint lists as visited must survive a kill.
+            self._snapshot.commit()
+        checkpoint = {
+            "visited": sorted(self.visited_urls),
+            "frontier": frontier,
+            "url_file_mapping": dict(self._discovered_url_file_mapping),
+            "allowed_methods_mapping": dict(self._api_allowed_methods),
+            "resource_state": {p: asdict(state)
+                               for p, state in dict(self._resource_state).items()},
+        }
+        path = os.path.join(self.json_response_dir, CHECKPOINT_FILE)
+        with open(path + ".tmp", "w") as file:
+            json.dump(checkpoint, file)
+        os.replace(path + ".tmp", path)
+
+    def _load_checkpoint(self) -> Optional[List[Tuple[str, int]]]:
+        """Restore an unfinished crawl, return its frontier or None."""
+        path = os.path.join(self.json_response_dir, CHECKPOINT_FILE)
+        if not os.path.isfile(path):
+            return None
+        with open(path) as file:
+            checkpoint = json.load(file)
+        self.visited_urls.update({p: True for p in checkpoint.get("visited", [])})
+        self._discovered_url_file_mapping.update(checkpoint.get("url_file_mapping", {}))
+        self._api_allowed_methods.update(checkpoint.get("allowed_methods_mapping", {}))
+        self._resource_state.update({p: ResourceState(**entry) for p, entry
+                                     in checkpoint.get("resource_state", {}).items()})
+        return [(p, int(depth)) for p, depth in checkpoint.get("frontier", [])]
+
+    def crawl(self,
+              resource_paths: Iterable[str],
+              workers: Optional[int] = None,
+              rate: Optional[float] = 0.0,
+              max_depth: int = DEFAULT_DISCOVERY_MAX_DEPTH,
+              resume: Optional[bool] = False,
+              quiet: Optional[bool] = False) -> CrawlProgress:
+        """Breadth-first crawl of everything reachable from resource_paths.
+
+        The visited set and the frontier are checkpointed to
+        ``crawl_checkpoint.json`` while the crawl runs and when it is
+        interrupted; with ``resume`` a crawl continues from that file
+        instead of resource_paths. The file is removed once a crawl completes
+        without errors, otherwise it keeps the failed paths as the frontier.
+
+        :param resource_paths: paths to start from, at depth 0
+        :param workers: max number of resources fetched at once, defaults to walk_concurrency
+        :param rate: max requests per second, 0 no limit
+        :param max_depth: max depth below resource_paths
+        :param resume: continue an interrupted crawl
+        :param quiet: do not report progress on stderr
+        :return: crawl counters
+        """
+        frontier = self._load_checkpoint() if resume else None
+        if frontier is None:
+            frontier = [(p, 0) for p in resource_paths]
+        progress = self._run_crawl(frontier, self.save_resource_links, workers, rate,
+                                   max_depth, quiet, on_checkpoint=self._write_checkpoint)
+        checkpoint = os.path.join(self.json_response_dir, CHECKPOINT_FILE)
+        if progress.errors:
+            # the checkpoint holds the failed paths, --resume retries them.
+            if not quiet:
+                print(f"discovery: {progress.errors} resources failed, "
+                      f"--resume retries them", file=sys.stderr, flush=True)
+        elif os.path.exists(checkpoint):
+            os.remove(checkpoint)
+        if self._snapshot is None:
+            save_crawl_state(self.json_response_dir, self._resource_state)
+        return progress
+
+    def _crawl_to_snapshot(self, path: str, root: CommandResult, resource_paths: List[str],
+                           resume: Optional[bool] = False, **kwargs) -> CommandResult:
+        """Crawl into a single file snapshot, the service root included.
+        A new crawl replaces an existing snapshot, a resumed one adds to it."""
+        if not resume and os.path.exists(path):
+            os.remove(path)
+        with CrawlSnapshot(path) as snapshot:
+            self._snapshot = snapshot
+            try:
+                snapshot.set_meta("redfish_ip", self.redfish_ip)
+                self._write_resource("/redfish/v1", root.data, root.extra)
+                self.crawl(resource_paths, resume=resume, **kwargs)
+            finally:
+                self._snapshot = None
+        return root
+
+    def _run_crawl(self, frontier, visit, workers, rate, max_depth, quiet,
+                   on_checkpoint=None) -> CrawlProgress:
+        crawler = FrontierCrawler(
+            visit, self.normalize_resource_path, self._skip_resource,
+            workers=workers or getattr(self, "walk_concurrency", 1), rate=rate,
+            max_depth=max_depth,
+            on_progress=None if quiet else lambda p: print(p, file=sys.stderr, flush=True),
+            on_checkpoint=on_checkpoint)
+        return crawler.crawl(frontier, self.visited_urls)
+
+    def save_resource_links(self, resource_path: str) -> List[str]:
+        """Save one resource and return the references it holds."""
+        data, etag = self._save_resource(resource_path)
+        links = self._links(data)
+        self._resource_state[resource_path] = ResourceState(
+            body_hash(data), etag, member_set(data, self.normalize_resource_path), links)
+        return links
+
+    def _load_url_file_mapping(self):
+        """Load the mappings of the previous crawl, if there is one."""
+        mappings = load_rest_api_map(self.json_response_dir)
+        if mappings is None:
+            return
+        self._discovered_url_file_mapping.update(mappings.get("url_file_mapping", {}))
+        self._api_allowed_methods.update(mappings.get("allowed_methods_mapping", {}))
+
+    def incremental_crawl(self,
+                          resource_paths: Iterable[str],
+                          workers: Optional[int] = None,
+                          rate: Optional[float] = 0.0,
+                          max_depth: int = DEFAULT_DISCOVERY_MAX_DEPTH,
+                          prune: Optional[bool] = True,
+                          quiet: Optional[bool] = False) -> ChangeReport:
+        """Re-crawl against the previous crawl in json_response_dir.
+
+        Each resource is revalidated with If-None-Match when the previous
+        crawl saw an ETag, and its file is rewritten only when the body
+        hash changed. With ``prune``, a collection that lists the same
+        members as before is not descended into: its members and their
+        subtrees are carried over from the previous crawl. Files of
+        resources that disappeared are removed.
+
+        :param resource_paths: paths to start from, at depth 0
+        :param workers: max number of resources fetched at once, defaults to walk_concurrency
+        :param rate: max requests per second, 0 no limit
+        :param max_depth: max depth below resource_paths
+        :param prune: carry over members of unchanged collections
+        :param quiet: do not report progress on stderr
+        :return: ChangeReport, also written to changes.json
+        """
+        previous = load_crawl_state(self.json_response_dir)
+        self._load_url_file_mapping()
+        report = ChangeReport()
+        pruned = set()
+
+        def revalidate(resource_path: str) -> List[str]:
+            prior = previous.get(resource_path)
+            filename = self._resource_filename(resource_path)
+            etag = prior.etag if prior is not None and os.path.exists(filename) else None
+            report.count("requests")
+            try:
+                fetched = self._conditional_get(resource_path, etag)
+            except RedfishNotFound:
+                return []
+            except Exception:
+                if prior is not None:
+                    # keep what we had, a transient error is not a removal.
+                    self._resource_state[resource_path] = prior
+                    pruned.update(prior.links)
+                raise
+
+            if fetched is None:
+                report.count("not_modified")
+                state = prior
+            else:
+                data, allow_header, etag = fetched
+                state = ResourceState(body_hash(data), etag,
+                                      member_set(data, self.normalize_resource_path),
+                                      self._links(data))
+                if prior is None:
+                    report.count("added", resource_path)
+                elif state.hash != prior.hash or not os.path.exists(filename):
+                    report.count("changed", resource_path)
+                else:
+                    report.count("unchanged")
+                self._write_resource(resource_path, data, allow_header,
+                                     write=prior is None or state.hash != prior.hash
+                                     or not os.path.exists(filename), etag=etag)
+            self._resource_state[resource_path] = state
+
+            if prune and prior is not None and state.members is not None \
+                    and state.members == prior.members:
+                pruned.update(state.members)
+                return [link for link in state.links if link not in set(state.members)]
+            return state.links
+
+        self._run_crawl([(p, 0) for p in resource_paths], revalidate, workers, rate,
+                        max_depth, quiet)
+
+        for path in carried_over(previous, pruned, self.visited_urls):
+            self._resource_state[path] = previous[path]
+            report.carried += 1
+        for path in set(previous) - set(self._resource_state):
+            report.removed.append(path)
+            filename = self._discovered_url_file_mapping.pop(path, None)
+            self._api_allowed_methods.pop(path, None)
+            if filename and os.path.exists(filename):
+                os.remove(filename)
+
+        save_crawl_state(self.json_response_dir, self._resource_state)
+        with open(os.path.join(self.json_response_dir, CHANGES_FILE), "w") as file:
+            json.dump(report.to_dict(), file, indent=4)
+        return report
+
     def save_url_file_mapping(self):
         """Save the URL-to-file mapping to a JSON respond file
         and what each api allow.
@@ -186,15 +486,8 @@ class Discovery(IDracManager,
         numpy is imported lazily here so importing this module does not
         require numpy to be installed; it is only needed for ``np.save``.
         """
-        import numpy as np
-
-        filename = os.path.join(self.json_response_dir, "rest_api_map.npy")
-        mappings = {
-            "url_file_mapping": self._discovered_url_file_mapping,
-            "allowed_methods_mapping": self._api_allowed_methods
-        }
-        filename = os.path.join(self.json_response_dir, filename)
-        np.save(filename, mappings)
+        save_rest_api_map(self.json_response_dir,
+                          self._discovered_url_file_mapping, self._api_allowed_methods)
 
     def execute(self,
                 filename: Optional[str] = None,
@@ -202,21 +495,46 @@ class Discovery(IDracManager,
                 verbose: Optional[bool] = False,
                 do_async: Optional[bool] = False,
                 do_expanded: Optional[bool] = False,
+                workers: Optional[int] = 0,
+                rate: Optional[float] = 0.0,
+                max_depth: Optional[int] = DEFAULT_DISCOVERY_MAX_DEPTH,
+                resume: Optional[bool] = False,
+                incremental: Optional[bool] = False,
+                no_prune: Optional[bool] = False,
+                snapshot: Optional[str] = None,
                 **kwargs) -> CommandResult:
         """Executes discovery action command
         python idrac_ctl discovery
+        python idrac_ctl discovery --workers 16 --rate 50 --resume
+        python idrac_ctl discovery --incremental
+        python idrac_ctl discovery --snapshot crawl.db
 
         :param do_async: note async will subscribe to an event loop.
         :param do_expanded:  will do expand query
         :param filename: if filename indicate call will save a bios setting to a file.
         :param verbose: enables verbose output
         :param data_type: json or xml
+        :param workers: max number of resources fetched at once, 0 walk_concurrency
+        :param rate: max requests per second, 0 no limit
+        :param max_depth: max depth below the service root
+        :param resume: resume an interrupted crawl from its checkpoint
+        :param incremental: revalidate the previous crawl, data is the change report
+        :param no_prune: incremental, also revalidate members of unchanged collections
+        :param snapshot: write the crawl to this single file instead of json files
         :return: CommandResult and if filename provide will save to a file.
         """
+        if snapshot and incremental:
+            raise ValueError("--incremental revalidates a crawl directory, "
+                             "it can not be combined with --snapshot")
 
         os.makedirs(self.json_response_dir, exist_ok=True)
         if not os.path.isdir(self.json_response_dir):
             raise ValueError("Failed to create directory: {}".format(self.json_response_dir))
+        # the command is a singleton, each run starts from an empty crawl.
+        self.visited_urls = {}
+        self._discovered_url_file_mapping = {}
+        self._api_allowed_methods = {}
+        self._resource_state = {}
 
         result = self.base_query("/redfish/v1/",
                                  filename=filename,
@@ -228,7 +546,16 @@ class Discovery(IDracManager,
         self.visited_urls[self.normalize_resource_path("/redfish/v1/")] = True
         self.visited_urls[self.normalize_resource_path("/redfish/v1/CompositionService")] = True
         odata_ids = list(self.extract_odata_ids(result.data))
-        for r in odata_ids:
-            self.recursive_discovery(r)
+        if snapshot:
+            return self._crawl_to_snapshot(snapshot, result, odata_ids, workers=workers,
+                                           rate=rate, max_depth=max_depth, resume=resume)
+        # the service root is part of the dump, a replay of the crawl starts there.
+        self._write_resource("/redfish/v1", result.data, result.extra)
+        if incremental:
+            report = self.incremental_crawl(odata_ids, workers=workers, rate=rate,
+                                            max_depth=max_depth, prune=not no_prune)
+            self.save_url_file_mapping()
+            return CommandResult(report.to_dict(), None, None, None)
+        self.crawl(odata_ids, workers=workers, rate=rate, max_depth=max_depth, resume=resume)
         self.save_url_file_mapping()
         return result
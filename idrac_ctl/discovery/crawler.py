@@ -0,0 +1,204 @@
+"""Breadth-first Redfish crawl driven by a frontier queue.
+
+The recursive walker fetches one resource at a time, depth first. A full
+iDRAC or GB300 tree is thousands of resources, so ``FrontierCrawler`` keeps
+a queue of discovered paths and fetches up to ``workers`` of them at once,
+optionally under a per crawl request rate. Paths are normalized before the
+visited check, so URI variants of one resource are fetched once.
+
+The caller owns the state: ``visit`` fetches and stores one resource and
+returns its links, ``on_checkpoint`` receives the pending frontier
+(in-flight and failed paths included) so an interrupted crawl can be resumed
+from the visited set and that frontier. A path whose fetch failed is never
+marked visited, and a crawl that ends with failures checkpoints them as its
+last frontier, so a resumed crawl tries them again.
+
+Author Mus spyroot@gmail.com
+"""
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PROGRESS_INTERVAL = 2.0
+DEFAULT_CHECKPOINT_INTERVAL = 5.0
+
+
+class RateLimiter:
+    """Spread calls of all threads evenly at ``rate`` per second."""
+
+    def __init__(self, rate: Optional[float] = 0.0):
+        """
+        :param rate: calls per second, 0 or None no limit
+        """
+        self.interval = 1.0 / rate if rate and rate > 0 else 0.0
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until the caller's slot."""
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next)
+            self._next = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+@dataclass
+class CrawlProgress:
+    """Counters of a running crawl."""
+
+    fetched: int = 0
+    errors: int = 0
+    skipped: int = 0
+    frontier: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def rate(self) -> float:
+        """Resources fetched per second."""
+        return self.fetched / self.elapsed if self.elapsed > 0 else 0.0
+
+    def __str__(self):
+        return (f"discovery: {self.fetched} resources, {self.rate:.1f}/s, "
+                f"frontier {self.frontier}, errors {self.errors}")
+
+
+class FrontierCrawler:
+    """Breadth-first crawl with ``workers`` concurrent fetches."""
+
+    def __init__(self,
+                 visit: Callable[[str], Iterable[str]],
+                 normalize: Callable[[str], str],
+                 skip: Optional[Callable[[str], bool]] = None,
+                 workers: int = 8,
+                 rate: Optional[float] = 0.0,
+                 max_depth: int = 32,
+                 on_progress: Optional[Callable[[CrawlProgress], None]] = None,
+                 progress_interval: float = DEFAULT_PROGRESS_INTERVAL,
+                 on_checkpoint: Optional[Callable[[List[Tuple[str, int]]], None]] = None,
+                 checkpoint_interval: float = DEFAULT_CHECKPOINT_INTERVAL):
+        """
+        :param visit: fetches and stores one resource, returns the paths it links to
+        :param normalize: canonical form of a path, the dedup key
+        :param skip: True for a path that must be marked visited without a fetch
+        :param workers: max number of fetches in flight
+        :param rate: max fetches per second over all workers, 0 no limit
+        :param max_depth: depth below the first frontier at which the crawl stops
+        :param on_progress: called with the counters every progress_interval and at the end
+        :param progress_interval: seconds between two progress reports
+        :param on_checkpoint: called with the pending frontier every checkpoint_interval,
+                              when the crawl is interrupted, and with the failed
+                              paths when a crawl ends with failures
+        :param checkpoint_interval: seconds between two checkpoints
+        """
+        self.visit = visit
+        self.normalize = normalize
+        self.skip = skip
+        self.workers = max(1, int(workers))
+        self.limiter = RateLimiter(rate)
+        self.max_depth = max_depth
+        self.on_progress = on_progress
+        self.progress_interval = progress_interval
+        self.on_checkpoint = on_checkpoint
+        self.checkpoint_interval = checkpoint_interval
+
+    def _fetch(self, path: str) -> List[str]:
+        self.limiter.acquire()
+        return list(self.visit(path))
+
+    def crawl(self,
+              frontier: Iterable[Tuple[str, int]],
+              visited: Dict[str, bool]) -> CrawlProgress:
+        """Crawl from a frontier until no path is left.
+
+        :param frontier: (path, depth) pairs to start from
+        :param visited: normalized path -> True, updated in place; a visited
+                        path is never fetched again, a failed one is not added
+        :return: final counters
+        """
+        progress = CrawlProgress()
+        seen = set(visited)
+        pending = deque()
+        in_flight = {}
+        # fetched without success, part of every checkpoint frontier.
+        failed: List[Tuple[str, int]] = []
+
+        def push(path: str, depth: int):
+            if not isinstance(path, str):
+                return
+            path = self.normalize(path)
+            if depth > self.max_depth or path in seen:
+                return
+            seen.add(path)
+            if self.skip is not None and self.skip(path):
+                visited[path] = True
+                progress.skipped += 1
+                return
+            pending.append((path, depth))
+
+        def snapshot() -> List[Tuple[str, int]]:
+            return list(in_flight.values()) + list(pending) + failed
+
+        for path, depth in frontier:
+            push(path, depth)
+
+        start = last_progress = last_checkpoint = time.monotonic()
+        callbacks = [i for cb, i in ((self.on_progress, self.progress_interval),
+                                     (self.on_checkpoint, self.checkpoint_interval)) if cb]
+        pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="redfish-crawl")
+        try:
+            while pending or in_flight:
+                while pending and len(in_flight) < self.workers:
+                    path, depth = pending.popleft()
+                    in_flight[pool.submit(self._fetch, path)] = (path, depth)
+                done, _ = wait(list(in_flight), timeout=min(callbacks, default=None),
+                               return_when=FIRST_COMPLETED)
+                for future in done:
+                    # stays in flight, and so in the checkpoint, if result() is interrupted.
+                    path, depth = in_flight[future]
+                    try:
+                        links = future.result()
+                    except Exception as err:
+                        links = None
+                        logger.debug(f"discovery error at {path}: {err}")
+                    del in_flight[future]
+                    if links is None:
+                        failed.append((path, depth))
+                        progress.errors += 1
+                        continue
+                    visited[path] = True
+                    progress.fetched += 1
+                    for link in links:
+                        push(link, depth + 1)
+
+                now = time.monotonic()
+                progress.frontier = len(pending) + len(in_flight)
+                progress.elapsed = now - start
+                if self.on_progress and now - last_progress >= self.progress_interval:
+                    last_progress = now
+                    self.on_progress(progress)
+                if self.on_checkpoint and now - last_checkpoint >= self.checkpoint_interval:
+                    last_checkpoint = now
+                    self.on_checkpoint(snapshot())
+        except BaseException:
+            if self.on_checkpoint:
+                self.on_checkpoint(snapshot())
+            pool.shutdown(wait=False, cancel_futures=True)
+            raise
+        pool.shutdown()
+        if failed and self.on_checkpoint:
+            self.on_checkpoint(snapshot())
+        progress.frontier = 0
+        progress.elapsed = time.monotonic() - start
+        if self.on_progress:
+            self.on_progress(progress)
+        return progress
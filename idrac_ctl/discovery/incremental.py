@@ -0,0 +1,119 @@
+"""Per resource state of a discovery crawl, for incremental re-discovery.
+
+A crawl records, next to its json files, one entry per resource in
+``crawl_state.json``::
+
+    {"/redfish/v1/Systems": {"etag": "W/\\"4f2a\\"", "hash": "9c1e...",
+                             "members": ["/redfish/v1/Systems/1"],
+                             "links": ["/redfish/v1/Systems/1"]}}
+
+The next ``discovery --incremental`` revalidates each resource with
+If-None-Match when it has an ETag, and compares body hashes otherwise, so
+unchanged files are not rewritten. ``Members`` of a collection are the cheap
+change signal: when a collection lists the same members as before, its
+members and everything below them are carried over from the previous crawl
+instead of being fetched again.
+
+Author Mus spyroot@gmail.com
+"""
+import hashlib
+import json
+import os
+import threading
+from dataclasses import asdict, dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+STATE_FILE = "crawl_state.json"
+CHANGES_FILE = "changes.json"
+
+
+def body_hash(data) -> str:
+    """Hash of a resource body that ignores key order and whitespace."""
+    raw = json.dumps(data, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def member_set(data, normalize: Callable[[str], str]) -> Optional[List[str]]:
+    """Sorted member paths of a collection, None for any other resource."""
+    if not isinstance(data, dict) or not isinstance(data.get("Members"), list):
+        return None
+    return sorted({normalize(m["@odata.id"]) for m in data["Members"]
+                   if isinstance(m, dict) and isinstance(m.get("@odata.id"), str)})
+
+
+@dataclass
+class ResourceState:
+    """What a crawl saw of one resource."""
+
+    hash: str
+    etag: Optional[str] = None
+    members: Optional[List[str]] = None
+    links: List[str] = field(default_factory=list)
+
+
+def load_crawl_state(directory: str) -> Dict[str, ResourceState]:
+    """State of the previous crawl in directory, empty when there is none."""
+    path = os.path.join(directory, STATE_FILE)
+    if not os.path.isfile(path):
+        return {}
+    with open(path) as file:
+        raw = json.load(file)
+    return {p: ResourceState(**entry) for p, entry in raw.items()}
+
+
+def save_crawl_state(directory: str, states: Dict[str, ResourceState]):
+    """Atomically write the state of a crawl."""
+    path = os.path.join(directory, STATE_FILE)
+    with open(path + ".tmp", "w") as file:
+        json.dump({p: asdict(s) for p, s in sorted(states.items())}, file)
+    os.replace(path + ".tmp", path)
+
+
+def carried_over(previous: Dict[str, ResourceState],
+                 roots: Iterable[str],
+                 visited: Iterable[str]) -> Set[str]:
+    """Previously crawled resources reachable from roots without passing a
+    resource the current crawl visited."""
+    visited = set(visited)
+    carried, stack = set(), [r for r in roots if r in previous and r not in visited]
+    while stack:
+        path = stack.pop()
+        if path in carried:
+            continue
+        carried.add(path)
+        stack.extend(link for link in previous[path].links
+                     if link in previous and link not in visited and link not in carried)
+    return carried
+
+
+@dataclass
+class ChangeReport:
+    """Outcome of an incremental crawl."""
+
+    added: List[str] = field(default_factory=list)
+    changed: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    unchanged: int = 0
+    not_modified: int = 0
+    carried: int = 0
+    requests: int = 0
+
+    def __post_init__(self):
+        self._lock = threading.Lock()
+
+    def count(self, name: str, path: Optional[str] = None):
+        """Thread safe update, append path to a list or add one to a counter."""
+        with self._lock:
+            if path is None:
+                setattr(self, name, getattr(self, name) + 1)
+            else:
+                getattr(self, name).append(path)
+
+    def to_dict(self) -> dict:
+        return {"added": sorted(self.added),
+                "changed": sorted(self.changed),
+                "removed": sorted(self.removed),
+                "unchanged": self.unchanged,
+                "not_modified": self.not_modified,
+                "carried": self.carried,
+                "requests": self.requests}
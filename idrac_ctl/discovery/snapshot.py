@@ -0,0 +1,285 @@
+"""Single file crawl snapshot.
+
+A discovery crawl is a directory with one indented json file per resource
+plus ``rest_api_map.npy``, a pickled dict the igc project loads with
+``np.load(..., allow_pickle=True)``. A snapshot holds the same crawl in one
+SQLite file, one row per resource::
+
+    uri TEXT PRIMARY KEY, body BLOB (zlib compressed json),
+    allowed_methods TEXT (json list), etag TEXT, fetched_at REAL
+
+The primary key is the URI index, so ``CrawlSnapshot.get`` reads and
+decompresses a single resource without loading the rest, and no numpy is
+needed to read or write it. ``pack`` and ``unpack`` convert between a
+snapshot and the directory layout, ``unpack`` writes the same
+``rest_api_map.npy`` the crawl does::
+
+    python -m idrac_ctl.discovery.snapshot pack ~/.json_responses/10.0.0.1 crawl.db
+    python -m idrac_ctl.discovery.snapshot unpack crawl.db /tmp/crawl
+
+Author Mus spyroot@gmail.com
+"""
+import argparse
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional
+
+REST_API_MAP = "rest_api_map.npy"
+SNAPSHOT_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS resources (
+    uri TEXT PRIMARY KEY,
+    body BLOB NOT NULL,
+    allowed_methods TEXT NOT NULL,
+    etag TEXT,
+    fetched_at REAL NOT NULL
+);
+"""
+
+
+def resource_filename(directory: str, uri: str) -> str:
+    """Json file of a resource in the directory layout."""
+    return os.path.join(directory, uri.replace("/", "_") + ".json")
+
+
+def save_rest_api_map(directory: str,
+                      url_file_mapping: Dict[str, str],
+                      allowed_methods_mapping: Dict[str, List[str]]) -> str:
+    """Write rest_api_map.npy, the mapping file igc loads.
+
+    :return: path of the written file
+    """
+    import numpy as np
+
+    filename = os.path.join(directory, REST_API_MAP)
+    np.save(filename, {"url_file_mapping": url_file_mapping,
+                       "allowed_methods_mapping": allowed_methods_mapping})
+    return filename
+
+
+def load_rest_api_map(directory: str) -> Optional[dict]:
+    """Mappings of rest_api_map.npy in directory, None when there is none."""
+    filename = os.path.join(directory, REST_API_MAP)
+    if not os.path.isfile(filename):
+        return None
+    import numpy as np
+
+    return np.load(filename, allow_pickle=True).item()
+
+
+@dataclass
+class SnapshotEntry:
+    """One resource of a snapshot."""
+
+    uri: str
+    data: dict
+    allowed_methods: List[str]
+    etag: Optional[str]
+    fetched_at: float
+
+
+class CrawlSnapshot:
+    """Crawl stored in a single SQLite file, indexed by URI.
+
+    Writes are serialized, so one snapshot can be filled by the crawl
+    workers; commit() makes the writes so far durable, use it as a context
+    manager or call close() to commit the rest.
+    """
+
+    def __init__(self, path: str, readonly: Optional[bool] = False):
+        """
+        :param path: snapshot file, created unless readonly
+        :param readonly: open an existing snapshot for reading only
+        """
+        if readonly and not os.path.isfile(path):
+            raise FileNotFoundError(f"snapshot {path} does not exist")
+        self.path = path
+        self.readonly = readonly
+        uri = f"file:{os.path.abspath(path)}{'?mode=ro' if readonly else ''}"
+        self._conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+        self._lock = threading.Lock()
+        if not readonly:
+            with self._lock:
+                self._conn.executescript(_SCHEMA)
+                self._conn.execute("INSERT OR IGNORE INTO meta VALUES ('version', ?)",
+                                   (str(SNAPSHOT_VERSION),))
+                self._conn.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def commit(self):
+        """Commit pending writes, the file stays open."""
+        with self._lock:
+            if self._conn is not None and not self.readonly:
+                self._conn.commit()
+
+    def close(self):
+        """Commit pending writes and close the file."""
+        with self._lock:
+            if self._conn is not None:
+                if not self.readonly:
+                    self._conn.commit()
+                self._conn.close()
+                self._conn = None
+
+    def put(self,
+            uri: str,
+            data,
+            allowed_methods: Optional[List[str]] = None,
+            etag: Optional[str] = None,
+            fetched_at: Optional[float] = None):
+        """Store or replace one resource.
+
+        :param uri: normalized resource path
+        :param data: resource body
+        :param allowed_methods: methods of the Allow header
+        :param etag: ETag of the response
+        :param fetched_at: epoch seconds of the fetch, defaults to now
+        """
+        body = zlib.compress(json.dumps(data, separators=(",", ":")).encode())
+        row = (uri, body, json.dumps(list(allowed_methods or [])), etag,
+               time.time() if fetched_at is None else fetched_at)
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO resources VALUES (?, ?, ?, ?, ?)", row)
+
+    def delete(self, uri: str):
+        """Remove one resource, if present."""
+        with self._lock:
+            self._conn.execute("DELETE FROM resources WHERE uri = ?", (uri,))
+
+    def get(self, uri: str) -> Optional[SnapshotEntry]:
+        """One resource by URI, None when the snapshot does not hold it."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT uri, body, allowed_methods, etag, fetched_at "
+                "FROM resources WHERE uri = ?", (uri,)).fetchone()
+        if row is None:
+            return None
+        return SnapshotEntry(row[0], json.loads(zlib.decompress(row[1])),
+                             json.loads(row[2]), row[3], row[4])
+
+    def __contains__(self, uri: str) -> bool:
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM resources WHERE uri = ?",
+                                      (uri,)).fetchone() is not None
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM resources").fetchone()[0]
+
+    def uris(self) -> List[str]:
+        """Sorted URIs of all resources, bodies are not read."""
+        with self._lock:
+            return [r[0] for r in self._conn.execute("SELECT uri FROM resources ORDER BY uri")]
+
+    def __iter__(self) -> Iterator[SnapshotEntry]:
+        for uri in self.uris():
+            entry = self.get(uri)
+            if entry is not None:
+                yield entry
+
+    def allowed_methods_mapping(self) -> Dict[str, List[str]]:
+        """URI -> allowed methods, the igc ``allowed_methods_mapping``."""
+        with self._lock:
+            rows = self._conn.execute("SELECT uri, allowed_methods FROM resources").fetchall()
+        return {uri: json.loads(methods) for uri, methods in rows}
+
+    def set_meta(self, key: str, value: str):
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO meta VALUES (?, ?)", (key, value))
+
+    def meta(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return None if row is None else row[0]
+
+
+def pack(directory: str, path: str) -> int:
+    """Convert a crawl directory into a snapshot.
+
+    URIs and allowed methods come from rest_api_map.npy, ETags from
+    crawl_state.json when the crawl recorded them, fetch times from the
+    file modification times.
+
+    :param directory: crawl directory holding rest_api_map.npy
+    :param path: snapshot file to write
+    :return: number of resources packed
+    """
+    mappings = load_rest_api_map(directory)
+    if mappings is None:
+        raise FileNotFoundError(f"{directory} has no {REST_API_MAP}")
+    from .incremental import load_crawl_state
+
+    states = load_crawl_state(directory)
+    allowed = mappings.get("allowed_methods_mapping", {})
+    count = 0
+    with CrawlSnapshot(path) as snapshot:
+        for uri, filename in sorted(mappings.get("url_file_mapping", {}).items()):
+            # mappings hold the absolute paths of the crawl host, the file is local.
+            local = os.path.join(directory, os.path.basename(filename))
+            if not os.path.isfile(local):
+                continue
+            with open(local) as file:
+                data = json.load(file)
+            state = states.get(uri)
+            snapshot.put(uri, data, allowed.get(uri, []),
+                         state.etag if state is not None else None, os.path.getmtime(local))
+            count += 1
+    return count
+
+
+def unpack(path: str, directory: str) -> int:
+    """Convert a snapshot into a crawl directory with rest_api_map.npy.
+
+    :param path: snapshot file
+    :param directory: directory to write, created when missing
+    :return: number of resources written
+    """
+    os.makedirs(directory, exist_ok=True)
+    url_file_mapping, allowed_methods_mapping = {}, {}
+    with CrawlSnapshot(path, readonly=True) as snapshot:
+        for entry in snapshot:
+            filename = resource_filename(directory, entry.uri)
+            with open(filename, "w") as file:
+                json.dump(entry.data, file, indent=4)
+            os.utime(filename, (entry.fetched_at, entry.fetched_at))
+            url_file_mapping[entry.uri] = filename
+            allowed_methods_mapping[entry.uri] = entry.allowed_methods
+    save_rest_api_map(directory, url_file_mapping, allowed_methods_mapping)
+    return len(url_file_mapping)
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(
+        prog="python -m idrac_ctl.discovery.snapshot",
+        description="convert between a crawl directory and a single file snapshot")
+    commands = parser.add_subparsers(dest="command", required=True)
+    pack_parser = commands.add_parser("pack", help="crawl directory to snapshot")
+    pack_parser.add_argument("directory")
+    pack_parser.add_argument("snapshot")
+    unpack_parser = commands.add_parser("unpack", help="snapshot to crawl directory")
+    unpack_parser.add_argument("snapshot")
+    unpack_parser.add_argument("directory")
+    args = parser.parse_args(argv)
+
+    if args.command == "pack":
+        count = pack(args.directory, args.snapshot)
+        print(f"packed {count} resources into {args.snapshot}")
+    else:
+        count = unpack(args.snapshot, args.directory)
+        print(f"unpacked {count} resources into {args.directory}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,308 @@
+"""Run one idrac_ctl command across a fleet of BMCs.
+
+    idrac_ctl fleet --targets hosts.txt sensors
+    idrac_ctl --idrac_username root fleet --targets 10.0.1.0/24 --max-workers 64 \\
+        --per-subnet 8 --output firmware.jsonl firmware
+
+Every command targets one BMC. ``FleetRunner`` runs a registered command
+against every target of a target list, with at most ``max_workers`` BMCs in
+flight overall and at most ``per_subnet`` in one subnet, so a large rollout
+does not flood a single management switch or rack controller. Each target
+gets its own manager and command objects (``Singleton`` keys instances by
+BMC endpoint).
+
+Results stream as JSON Lines, one line per target as it completes::
+
+    {"target": "10.0.1.7", "ok": true, "seconds": 0.412, "data": {...}, "error": null}
+
+followed by a summary with p50/p95/p99 latency and failures by error type.
+
+Author Mus spyroot@gmail.com
+"""
+import argparse
+import ipaddress
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import asdict, dataclass
+from typing import Callable, Dict, Iterable, List, Optional
+
+from .idrac_shared import ApiRequestType
+
+DEFAULT_MAX_WORKERS = 32
+DEFAULT_PER_SUBNET = 8
+DEFAULT_SUBNET_PREFIX = 24
+
+
+def _expand_target(token: str) -> List[str]:
+    """Expand one address or CIDR into BMC addresses."""
+    token = token.strip()
+    if not token:
+        return []
+    if "/" in token:
+        network = ipaddress.ip_network(token, strict=False)
+        hosts = list(network.hosts()) or [network.network_address]
+        return [str(host) for host in hosts]
+    return [token]
+
+
+def load_targets(spec: str) -> List[str]:
+    """Return the BMC addresses of a target spec.
+
+    :param spec: path to a file with one address or CIDR per line (``#``
+        starts a comment), or a comma separated list of addresses and CIDRs.
+    :return: addresses in spec order, duplicates dropped.
+    """
+    if os.path.isfile(spec):
+        with open(spec) as f:
+            tokens = [line.split("#", 1)[0].strip() for line in f]
+    else:
+        tokens = spec.split(",")
+    targets = []
+    for token in tokens:
+        targets.extend(_expand_target(token))
+    return list(dict.fromkeys(targets))
+
+
+def target_host(target: str) -> str:
+    """Address part of ``host[:port]``."""
+    return target.rsplit(":", 1)[0] if target.count(":") == 1 else target
+
+
+def subnet_of(target: str, prefix: int = DEFAULT_SUBNET_PREFIX) -> str:
+    """Subnet a target belongs to, the host name itself for a name."""
+    host = target_host(target)
+    try:
+        address = ipaddress.ip_address(host)
+    except ValueError:
+        return host
+    if address.version == 6:
+        prefix = max(prefix, 64)
+    return str(ipaddress.ip_network(f"{address}/{prefix}", strict=False))
+
+
+def percentile(values: List[float], q: float) -> Optional[float]:
+    """Nearest-rank percentile, None for no values.
+    :param values: samples
+    :param q: percentile in 0..100
+    """
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * q // 100))
+    return ordered[int(rank) - 1]
+
+
+@dataclass
+class HostResult:
+    """Outcome of the command on one target."""
+
+    target: str
+    ok: bool
+    seconds: float
+    data: object = None
+    error: Optional[str] = None
+    error_type: Optional[str] = None
+
+
+def summarize(results: List[HostResult], wall: float) -> dict:
+    """Latency percentiles and failure counts of a fleet run.
+    :param results: per target results
+    :param wall: wall time of the whole run in seconds
+    """
+    seconds = [r.seconds for r in results]
+    failures: Dict[str, int] = {}
+    for r in results:
+        if not r.ok:
+            failures[r.error_type or "Error"] = failures.get(r.error_type or "Error", 0) + 1
+
+    def rounded(value):
+        return None if value is None else round(value, 4)
+
+    return {"targets": len(results),
+            "ok": sum(1 for r in results if r.ok),
+            "failed": sum(1 for r in results if not r.ok),
+            "failures": dict(sorted(failures.items())),
+            "latency": {"p50": rounded(percentile(seconds, 50)),
+                        "p95": rounded(percentile(seconds, 95)),
+                        "p99": rounded(percentile(seconds, 99)),
+                        "max": rounded(max(seconds) if seconds else None)},
+            "wall_seconds": round(wall, 4)}
+
+
+class FleetRunner:
+    """Run one command on many BMCs with a global and a per subnet cap."""
+
+    def __init__(self,
+                 targets: Iterable[str],
+                 api_call: ApiRequestType,
+                 name: str,
+                 manager_args: dict,
+                 command_args: Optional[dict] = None,
+                 max_workers: int = DEFAULT_MAX_WORKERS,
+                 per_subnet: int = DEFAULT_PER_SUBNET,
+                 subnet_prefix: int = DEFAULT_SUBNET_PREFIX):
+        """
+        :param targets: BMC addresses, ``host`` or ``host:port``
+        :param api_call: command type
+        :param name: command registry name
+        :param manager_args: IDracManager arguments shared by all targets, without idrac_ip
+        :param command_args: arguments passed to the command
+        :param max_workers: max number of BMCs in flight
+        :param per_subnet: max number of BMCs in flight in one subnet, 0 no cap
+        :param subnet_prefix: prefix length that groups IPv4 targets into subnets
+        """
+        if max_workers < 1:
+            raise ValueError("max_workers must be positive")
+        if per_subnet < 0:
+            raise ValueError("per_subnet must not be negative")
+        self.targets = list(targets)
+        self.api_call = api_call
+        self.name = name
+        self.manager_args = dict(manager_args)
+        self.manager_args.pop("idrac_ip", None)
+        self.command_args = dict(command_args or {})
+        self.max_workers = max_workers
+        self.per_subnet = per_subnet
+        self.subnet_prefix = subnet_prefix
+        self._subnet_slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._slots_lock = threading.Lock()
+
+    def _slot(self, target: str) -> Optional[threading.BoundedSemaphore]:
+        if not self.per_subnet:
+            return None
+        subnet = subnet_of(target, self.subnet_prefix)
+        with self._slots_lock:
+            if subnet not in self._subnet_slots:
+                self._subnet_slots[subnet] = threading.BoundedSemaphore(self.per_subnet)
+            return self._subnet_slots[subnet]
+
+    def schedule(self) -> List[str]:
+        """Targets in submission order, subnets interleaved round robin so a
+        worker rarely waits on a busy subnet while another one is idle."""
+        by_subnet: Dict[str, List[str]] = {}
+        for target in self.targets:
+            by_subnet.setdefault(subnet_of(target, self.subnet_prefix), []).append(target)
+        queues = list(by_subnet.values())
+        order = []
+        for i in range(max((len(q) for q in queues), default=0)):
+            order.extend(q[i] for q in queues if i < len(q))
+        return order
+
+    def invoke(self, target: str):
+        """Run the command on one target, the way the CLI runs it on one BMC.
+        :return: CommandResult
+        """
+        from .idrac_manager import IDracManager
+        manager = IDracManager(idrac_ip=target, **self.manager_args)
+        manager.check_api_version()
+        return manager.sync_invoke(self.api_call, self.name, **self.command_args)
+
+    def run_target(self, target: str) -> HostResult:
+        """Run on one target within its subnet cap. Never raises."""
+        slot = self._slot(target)
+        if slot is not None:
+            slot.acquire()
+        start = time.monotonic()
+        try:
+            result = self.invoke(target)
+            error = result.error
+            return HostResult(target, error is None, time.monotonic() - start, result.data,
+                              None if error is None else str(error),
+                              None if error is None else type(error).__name__)
+        except Exception as exc:  # noqa: BLE001 - one dead BMC must not fail the fleet
+            return HostResult(target, False, time.monotonic() - start, None,
+                              str(exc), type(exc).__name__)
+        finally:
+            if slot is not None:
+                slot.release()
+
+    def run(self, on_result: Optional[Callable[[HostResult], None]] = None) -> List[HostResult]:
+        """Run on every target.
+        :param on_result: called with each result as its target completes
+        :return: results in completion order
+        """
+        results = []
+        if not self.targets:
+            return results
+        workers = min(self.max_workers, len(self.targets))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="fleet") as pool:
+            futures = [pool.submit(self.run_target, target) for target in self.schedule()]
+            for future in as_completed(futures):
+                result = future.result()
+                results.append(result)
+                if on_result is not None:
+                    on_result(result)
+        return results
+
+
+def _json_default(obj):
+    return obj.__dict__ if hasattr(obj, "__dict__") else str(obj)
+
+
+def fleet_parser() -> argparse.ArgumentParser:
+    """Parser of the options between ``fleet`` and the command."""
+    parser = argparse.ArgumentParser(
+        prog="idrac_ctl fleet",
+        description="run an idrac_ctl command on many BMCs, global options such as "
+                    "--idrac_username go before fleet")
+    parser.add_argument("--targets", required=True,
+                        help="file with one address or CIDR per line, or a comma separated list")
+    parser.add_argument("--max-workers", dest="max_workers", type=int,
+                        default=DEFAULT_MAX_WORKERS, help="max number of BMCs in flight")
+    parser.add_argument("--per-subnet", dest="per_subnet", type=int,
+                        default=DEFAULT_PER_SUBNET,
+                        help="max number of BMCs in flight in one subnet, 0 no cap")
+    parser.add_argument("--subnet-prefix", dest="subnet_prefix", type=int,
+                        default=DEFAULT_SUBNET_PREFIX,
+                        help="prefix length that groups IPv4 targets into subnets")
+    parser.add_argument("--output", default="",
+                        help="write the JSON Lines results to this file instead of stdout")
+    parser.add_argument("command", nargs=argparse.REMAINDER,
+                        help="idrac_ctl command and its arguments")
+    return parser
+
+
+def run_fleet(cmd_args: argparse.Namespace,
+              command,
+              manager_args: dict,
+              fleet_args: argparse.Namespace) -> int:
+    """Run a parsed CLI command on the fleet.
+    :param cmd_args: parsed idrac_ctl arguments
+    :param command: Command(type, name) of the selected command
+    :param manager_args: IDracManager arguments shared by all targets
+    :param fleet_args: parsed fleet options
+    :return: process exit code, 1 when a target failed
+    """
+    targets = load_targets(fleet_args.targets)
+    if not targets:
+        print(f"No targets found in {fleet_args.targets}.")
+        return 1
+    command_args = {k: v for k, v in vars(cmd_args).items() if k != "message_type"}
+    runner = FleetRunner(targets, command.type, command.name, manager_args, command_args,
+                         max_workers=fleet_args.max_workers,
+                         per_subnet=fleet_args.per_subnet,
+                         subnet_prefix=fleet_args.subnet_prefix)
+
+    out = open(fleet_args.output, "w") if fleet_args.output else sys.stdout
+    lock = threading.Lock()
+
+    def emit(result: HostResult):
+        line = json.dumps(dict(asdict(result), seconds=round(result.seconds, 4)),
+                          default=_json_default)
+        with lock:
+            out.write(line + "\n")
+            out.flush()
+
+    start = time.monotonic()
+    try:
+        results = runner.run(emit)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    summary = summarize(results, time.monotonic() - start)
+    print(json.dumps(summary, indent=4), file=sys.stderr)
+    return 0 if summary["failed"] == 0 else 1
@@ -47,10 +47,12 @@ from .cmd_exceptions import (
     UnsupportedAction,
 )
 from .cmd_utils import save_if_needed
+from .command_manifest import command_index, load_manifest, select_command
 from .custom_argparser.customer_argdefault import CustomArgumentDefaultsHelpFormatter
-from .idrac_manager import IDracManager
-from .idrac_shared import RedfishAction, RedfishActionEncoder
-from .telemetry.exporter import apply_exporter_env_file, exporter_argv_uses_secret
+from .daemon import daemon_main, forward, socket_path
+from .fleet import fleet_parser, run_fleet
+from .idrac_manager import DEFAULT_WALK_CONCURRENCY, IDracManager
+from .idrac_shared import ApiRequestType, RedfishAction, RedfishActionEncoder
 
 try:
     urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
@@ -231,26 +233,54 @@ def process_respond(cmd_args, command_result):
     return query_request
 
 
-def main(cmd_args: argparse.Namespace, command_name_to_cmd: Dict) -> None:
-    """Main entry point
+def manager_args(cmd_args: argparse.Namespace) -> Dict:
+    """IDracManager arguments from the parsed command line.
+    :param cmd_args: parsed idrac_ctl arguments
+    :return: keyword arguments for IDracManager
     """
     # BMCs ship self-signed certs, so verification is opt-in via --verify-ssl.
     # We skip verification by default; --insecure stays as an explicit "skip".
     verify_ssl = getattr(cmd_args, "verify_ssl", False)
     insecure = not verify_ssl
 
-    if insecure:
+    # --token-cache only makes sense for a session token, so it implies --session-auth.
+    token_cache = getattr(cmd_args, "token_cache", False)
+    session_auth = getattr(cmd_args, "session_auth", False) or token_cache
+    cmd_args.session_auth = session_auth
+
+    # a replay answers from a crawl, it needs no address or credentials.
+    replay = getattr(cmd_args, "replay", None)
+    return dict(idrac_ip=cmd_args.idrac_ip or ("replay" if replay else ""),
+                idrac_username=cmd_args.idrac_username,
+                idrac_password=cmd_args.idrac_password,
+                idrac_port=cmd_args.idrac_port,
+                insecure=insecure,
+                is_http=cmd_args.use_http,
+                session_auth=session_auth,
+                token_cache=token_cache,
+                walk_concurrency=getattr(cmd_args, "walk_concurrency",
+                                         DEFAULT_WALK_CONCURRENCY),
+                resource_cache=not getattr(cmd_args, "no_resource_cache", False),
+                inventory_cache=getattr(cmd_args, "inventory_cache", False),
+                replay=replay)
+
+
+def main(cmd_args: argparse.Namespace, command_name_to_cmd: Dict) -> None:
+    """Main entry point
+    """
+    mgr_args = manager_args(cmd_args)
+    if mgr_args["insecure"]:
         urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
-    # idrac manager main interface main uses to interact with IDRAC.
-    redfish_api = IDracManager(idrac_ip=cmd_args.idrac_ip,
-                               idrac_username=cmd_args.idrac_username,
-                               idrac_password=cmd_args.idrac_password,
-                               idrac_port=cmd_args.idrac_port,
-                               insecure=insecure,
-                               is_http=cmd_args.use_http,
-                               is_debug=cmd_args.debug)
-    _ = redfish_api.check_api_version()
+    # a running idrac_ctl daemon keeps the managers warm, otherwise the
+    # command runs in this process.
+    use_daemon = not getattr(cmd_args, "no_daemon", False) \
+        and not mgr_args["replay"] and socket_path().exists()
+    redfish_api = None
+    if not use_daemon:
+        # idrac manager main interface main uses to interact with IDRAC.
+        redfish_api = IDracManager(is_debug=cmd_args.debug, **mgr_args)
+        _ = redfish_api.check_api_version()
 
     if cmd_args.verbose:
         logger.info("verbose is set on")
@@ -268,14 +298,27 @@ def main(cmd_args: argparse.Namespace, command_name_to_cmd: Dict) -> None:
             json_printer(arg_dict, cmd_args, colorized=cmd_args.nocolor)
 
         # invoke cmd
-        command_result = redfish_api.sync_invoke(
-            cmd.type, cmd.name, **arg_dict
-        )
+        forwarded = forward(cmd.type, cmd.name, mgr_args, arg_dict) \
+            if use_daemon else None
+        if forwarded is None:
+            if redfish_api is None:
+                # the daemon socket was stale.
+                redfish_api = IDracManager(is_debug=cmd_args.debug, **mgr_args)
+                _ = redfish_api.check_api_version()
+            command_result = redfish_api.sync_invoke(
+                cmd.type, cmd.name, **arg_dict
+            )
+            manager_info = {"vendor": redfish_api.redfish_vendor}
+            if manager_info["vendor"] == "Dell":
+                manager_info["idrac_manager_version"] = redfish_api.idrac_manager_version
+                manager_info["redfish_version"] = redfish_api.redfish_version
+        else:
+            command_result, manager_info = forwarded
 
-        if redfish_api.redfish_vendor == "Dell":
+        if manager_info["vendor"] == "Dell":
             if isinstance(command_result.data, dict):
-                command_result.data["idrac_version"] = redfish_api.idrac_manager_version
-                command_result.data["redfish_version"] = redfish_api.redfish_version
+                command_result.data["idrac_version"] = manager_info["idrac_manager_version"]
+                command_result.data["redfish_version"] = manager_info["redfish_version"]
             # if isinstance(command_result.data, list) and len(command_result.data) > 0:
             #     command_result.data[0]["idrac_version"] = redfish_api.idrac_manager_version
             #     command_result.data[0]["redfish_version"] = redfish_api.redfish_version
@@ -314,13 +357,19 @@ def main(cmd_args: argparse.Namespace, command_name_to_cmd: Dict) -> None:
         console_error_printer(f"Error:{upc}")
 
 
-def create_cmd_tree(arg_parser, debug=False) -> Dict:
+def create_cmd_tree(arg_parser, debug=False, selected: Optional[str] = None) -> Dict:
     """Create command tree structure.
+
+    Every command gets a subparser named from the static command manifest,
+    so help lists all of them, but only the ``selected`` command module is
+    imported and only its parser is built.
+
+    :param arg_parser: top level parser
+    :param debug: log every registered command
+    :param selected: command found on the command line, None builds only stubs.
     :return: a dict that store mapping for each command.
     """
-    redfish_api = IDracManager()
     command_name_to_cmd = {}
-    commands_registry = redfish_api.get_registry()
     command_name = collections.namedtuple("Command", "type name")
 
     subparsers = arg_parser.add_subparsers(
@@ -334,24 +383,24 @@ def create_cmd_tree(arg_parser, debug=False) -> Dict:
         required=True
     )
 
-    for k in commands_registry:
-        for sub_key in commands_registry[k]:
-            cls = commands_registry[k][sub_key]
+    for cmd_name, entry in load_manifest().items():
+        api_type = ApiRequestType[entry["type"]]
+        parents = []
+        if cmd_name == selected:
+            cls = IDracManager.command_class(api_type, entry["name"])
+            # register each command
+            cli_arg_parser, _, _ = cls.register_subcommand(cls)
+            parents = [cli_arg_parser]
             if debug:
-                logger.debug(f"Registering command {k} {sub_key}")
-            if hasattr(cls, "register_subcommand"):
-                # register each command
-                cli_arg_parser, cmd_name, cmd_help = cls.register_subcommand(cls)
-                if debug:
-                    logger.debug(f"Registering command name {cmd_name} {cmd_help}")
-
-                subparsers.add_parser(
-                    cmd_name,
-                    parents=[cli_arg_parser],
-                    help=f"{str(cmd_help)}",
-                    formatter_class=CustomArgumentDefaultsHelpFormatter,
-                )
-                command_name_to_cmd[cmd_name] = command_name(k, sub_key)
+                logger.debug(f"Registering command name {cmd_name} {entry['help']}")
+
+        subparsers.add_parser(
+            cmd_name,
+            parents=parents,
+            help=entry["help"],
+            formatter_class=CustomArgumentDefaultsHelpFormatter,
+        )
+        command_name_to_cmd[cmd_name] = command_name(api_type, entry["name"])
 
     return command_name_to_cmd
 
@@ -409,6 +458,41 @@ def idrac_main_ctl():
     credentials.add_argument(
         '--use_http', action='store_true', required=False, default=False,
         help="use http instead https as transport.")
+    credentials.add_argument(
+        '--session-auth', dest='session_auth',
+        action='store_true', required=False, default=False,
+        help="authenticate once through SessionService and send an "
+             "X-Auth-Token instead of basic credentials on every request.")
+    credentials.add_argument(
+        '--token-cache', dest='token_cache',
+        action='store_true', required=False, default=False,
+        help="keep the session token in the local cache so the next "
+             "invocation reuses it, implies --session-auth.")
+    credentials.add_argument(
+        '--walk-concurrency', dest='walk_concurrency',
+        type=int, required=False, default=DEFAULT_WALK_CONCURRENCY,
+        help="max number of member GETs in flight while a command walks "
+             "a collection, 1 walks sequentially.")
+    credentials.add_argument(
+        '--no-resource-cache', dest='no_resource_cache',
+        action='store_true', required=False, default=False,
+        help="send every GET to the BMC instead of reusing documents "
+             "already read, and revalidated with ETags, in this process.")
+    credentials.add_argument(
+        '--inventory-cache', dest='inventory_cache',
+        action='store_true', required=False, default=False,
+        help="keep the service root, registries and resolved manager, system "
+             "and chassis ids under the local cache directory so the next "
+             "invocation skips the discovery requests.")
+    credentials.add_argument(
+        '--replay', required=False, type=str, default=None,
+        help="answer requests from a discovery crawl, a --snapshot file or a "
+             "crawl directory, instead of the idrac. Read only commands only.")
+    credentials.add_argument(
+        '--no-daemon', dest='no_daemon',
+        action='store_true', required=False, default=False,
+        help="run the command in this process even when an idrac_ctl "
+             "daemon listens, see idrac_ctl daemon --help.")
 
     verbose_group = parser.add_argument_group('verbose', '# verbose and debug options')
     verbose_group.add_argument(
@@ -452,12 +536,28 @@ def idrac_main_ctl():
     parser.add_argument('-v', '--version', action='version',
                         version="%(prog)s " + __version__)
 
-    cmd_dict = create_cmd_tree(parser)
-    args = parser.parse_args()
+    manifest = load_manifest()
+    argv = sys.argv[1:]
+    at = command_index(parser, argv, [*manifest, "daemon", "fleet"])
+    selected = None if at is None else argv[at]
+    if selected == "daemon":
+        sys.exit(daemon_main(argv[at + 1:]))
+    fleet_args = None
+    if selected == "fleet":
+        # global options stay before fleet, the command and its options follow it.
+        fleet_args = fleet_parser().parse_args(argv[at + 1:])
+        argv = argv[:at] + fleet_args.command
+        selected = select_command(parser, argv, manifest)
+        if selected is None:
+            parser.error("fleet needs a command, i.e. idrac_ctl fleet --targets hosts.txt sensors")
+    cmd_dict = create_cmd_tree(parser, selected=selected)
+    args = parser.parse_args(argv)
     if args.debug:
         logger.setLevel(args.log)
 
     if getattr(args, "subcommand", None) == "exporter":
+        from .telemetry.exporter import apply_exporter_env_file, exporter_argv_uses_secret
+        from .telemetry.fleet import run_fleet_exporter
         if exporter_argv_uses_secret(sys.argv):
             print(
                 "Please provide exporter credentials through environment "
@@ -469,28 +569,39 @@ def idrac_main_ctl():
         except FileNotFoundError as fne:
             console_error_printer(f"Error:{fne}")
             sys.exit(1)
+        if getattr(args, "targets", None):
+            sys.exit(run_fleet_exporter(args))
 
-    if args.idrac_ip is None or len(args.idrac_ip) == 0:
-        print(
-            "Please indicate the idrac ip. "
-            "--idrac_ip or set IDRAC_IP environment variable. "
-            "(export IDRAC_IP=ip_address)"
-        )
-        sys.exit(1)
-    if args.idrac_username is None or len(args.idrac_username) == 0:
-        print(
-            "Please indicate the idrac username."
-            "--idrac_username or set IDRAC_USERNAME environment variable. "
-            "(export IDRAC_USERNAME=ip_address)"
-        )
-        sys.exit(1)
-    if args.idrac_password is None or len(args.idrac_password) == 0:
-        print(
-            "Please indicate the idrac password. "
-            "--idrac_password or set IDRAC_PASSWORD environment."
-            "(export IDRAC_PASSWORD=ip_address)"
-        )
-        sys.exit(1)
+    if fleet_args is not None:
+        if not args.idrac_username or not args.idrac_password:
+            print("Please provide fleet credentials through --idrac_username and "
+                  "--idrac_password or the IDRAC_USERNAME and IDRAC_PASSWORD environment.")
+            sys.exit(1)
+        sys.exit(run_fleet(args, cmd_dict[args.subcommand], manager_args(args), fleet_args))
+
+    # a replay answers from a crawl, it needs no address or credentials.
+    if not args.replay:
+        if args.idrac_ip is None or len(args.idrac_ip) == 0:
+            print(
+                "Please indicate the idrac ip. "
+                "--idrac_ip or set IDRAC_IP environment variable. "
+                "(export IDRAC_IP=ip_address)"
+            )
+            sys.exit(1)
+        if args.idrac_username is None or len(args.idrac_username) == 0:
+            print(
+                "Please indicate the idrac username."
+                "--idrac_username or set IDRAC_USERNAME environment variable. "
+                "(export IDRAC_USERNAME=ip_address)"
+            )
+            sys.exit(1)
+        if args.idrac_password is None or len(args.idrac_password) == 0:
+            print(
+                "Please indicate the idrac password. "
+                "--idrac_password or set IDRAC_PASSWORD environment."
+                "(export IDRAC_PASSWORD=ip_address)"
+            )
+            sys.exit(1)
     try:
         main(args, cmd_dict)
     except AuthenticationFailed as af:
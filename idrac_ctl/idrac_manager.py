@@ -26,11 +26,11 @@ import asyncio
 import functools
 import json
 import logging
-import time
 from abc import abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from functools import cached_property
-from typing import Optional, Tuple, Dict
+from typing import Callable, Dict, List, Optional, Tuple
 
 import requests
 from tqdm import tqdm
@@ -40,6 +40,7 @@ from .redfish_exceptions import RedfishUnauthorized
 from .redfish_exceptions import RedfishForbidden
 
 from .redfish_manager import RedfishManager
+from .redfish_pool import DEFAULT_POOL_SIZE
 from .redfish_task_state import TaskState
 from .redfish_task_state import TaskStatus
 from .redfish_shared import RedfishJsonSpec, RedfishJson, RedfishApi
@@ -72,6 +73,9 @@ from .cmd_exceptions import UnsupportedAction
 
 module_logger = logging.getLogger('idrac_ctl.idrac_manager')
 
+# max member GETs a collection walk keeps in flight against one BMC.
+DEFAULT_WALK_CONCURRENCY = 8
+
 
 class IDracManager(RedfishManager):
     """
@@ -89,7 +93,15 @@ class IDracManager(RedfishManager):
                  x_auth: Optional[str] = None,
                  is_http: Optional[bool] = False,
                  is_debug: Optional[bool] = False,
-                 log_level=logging.NOTSET):
+                 log_level=logging.NOTSET,
+                 pool_size: Optional[int] = DEFAULT_POOL_SIZE,
+                 shared_pool: Optional[bool] = True,
+                 session_auth: Optional[bool] = False,
+                 token_cache: Optional[bool] = False,
+                 walk_concurrency: Optional[int] = DEFAULT_WALK_CONCURRENCY,
+                 resource_cache: Optional[bool] = False,
+                 inventory_cache: Optional[bool] = False,
+                 replay: Optional[str] = None):
         """Default constructor for idrac requires credentials.
            By default, iDRAC Manager uses json to serialize a data to callee
            and uses json content type.
@@ -101,7 +113,25 @@ class IDracManager(RedfishManager):
             skipped. iDRAC/BMC controllers present self-signed certificates, so
             verification is opt-in: pass ``insecure=False`` to verify the cert.
         :param x_auth: X-Authentication header.
-        """
+        :param pool_size: max number of keep-alive connections kept to the iDRAC.
+        :param shared_pool: share the keep-alive session with every manager
+            in the process that talks to the same iDRAC.
+        :param session_auth: authenticate with a SessionService X-Auth-Token
+            instead of basic credentials on every request.
+        :param token_cache: keep the session token on disk for the next invocation.
+        :param walk_concurrency: max number of member GETs a collection walk
+            keeps in flight, 1 walks sequentially.
+        :param resource_cache: serve repeated GETs from the process wide
+            resource cache, see redfish_cache.
+        :param inventory_cache: keep resolved ids, the service root and registries
+            on disk for the next invocation, see redfish_inventory.
+        :param replay: snapshot file or crawl directory that answers requests
+            instead of the iDRAC, see redfish_replay.
+        """
+        if walk_concurrency is None or int(walk_concurrency) < 1:
+            walk_concurrency = 1
+        # keep a pooled connection for every concurrent walker.
+        pool_size = max(pool_size or DEFAULT_POOL_SIZE, int(walk_concurrency))
         super().__init__(redfish_ip=idrac_ip,
                          redfish_username=idrac_username,
                          redfish_password=idrac_password,
@@ -109,7 +139,14 @@ class IDracManager(RedfishManager):
                          insecure=insecure,
                          is_http=is_http,
                          x_auth=x_auth,
-                         is_debug=is_debug)
+                         is_debug=is_debug,
+                         pool_size=pool_size,
+                         shared_pool=shared_pool,
+                         session_auth=session_auth,
+                         token_cache=token_cache,
+                         resource_cache=resource_cache,
+                         inventory_cache=inventory_cache,
+                         replay=replay)
 
         self.logger = logging.getLogger(__name__)
         self._logger_level = log_level
@@ -201,6 +238,7 @@ class IDracManager(RedfishManager):
         }
 
         self._redfish_error = None
+        self.walk_concurrency = int(walk_concurrency)
 
         # run time
         self.action_targets = None
@@ -255,6 +293,23 @@ class IDracManager(RedfishManager):
         """
         return dict(cls._registry)
 
+    @classmethod
+    def command_class(cls, api_call: ApiRequestType, name: str):
+        """Return the class registered for a command. A command whose module
+        was not imported yet is imported through the command manifest.
+        :param api_call: api request type of the command
+        :param name: registry name of the command
+        :return: command class
+        :raise UnsupportedAction: unknown command
+        """
+        z = cls._registry[api_call]
+        if name not in z:
+            from .command_manifest import import_command
+            import_command(api_call, name)
+        if name not in z:
+            raise UnsupportedAction(f"Unknown {name} command.")
+        return z[name]
+
     @classmethod
     def invoke(cls,
                api_call: ApiRequestType,
@@ -266,16 +321,19 @@ class IDracManager(RedfishManager):
         :param kwargs: args passed to command.
         :return:
         """
-        z = cls._registry[api_call]
-        if name not in z:
-            raise UnsupportedAction(f"Unknown {name} command.")
-        disp = z[name]
+        disp = cls.command_class(api_call, name)
         _idrac_ip = kwargs.pop("idrac_ip")
         _username = kwargs.pop("username")
         _password = kwargs.pop("password")
         _port = kwargs.pop("port")
         _insecure = kwargs.pop("insecure")
         _is_http = kwargs.pop("is_http")
+        _session_auth = kwargs.pop("session_auth", False)
+        _token_cache = kwargs.pop("token_cache", False)
+        _walk_concurrency = kwargs.pop("walk_concurrency", DEFAULT_WALK_CONCURRENCY)
+        _resource_cache = kwargs.pop("resource_cache", False)
+        _inventory_cache = kwargs.pop("inventory_cache", False)
+        _replay = kwargs.pop("replay", None)
 
         inst = disp(
             idrac_ip=_idrac_ip,
@@ -283,7 +341,13 @@ class IDracManager(RedfishManager):
             idrac_password=_password,
             idrac_port=_port,
             insecure=_insecure,
-            is_http=_is_http
+            is_http=_is_http,
+            session_auth=_session_auth,
+            token_cache=_token_cache,
+            walk_concurrency=_walk_concurrency,
+            resource_cache=_resource_cache,
+            inventory_cache=_inventory_cache,
+            replay=_replay
         )
 
         return inst.execute(**kwargs)
@@ -296,16 +360,19 @@ class IDracManager(RedfishManager):
         :param kwargs: argument passed to command
         :return: CommandResult
         """
-        z = cls._registry[api_call]
-        disp = z[name]
-        if name not in z:
-            raise UnsupportedAction(f"Unknown {name} command.")
+        disp = cls.command_class(api_call, name)
         _idrac_ip = kwargs.pop("idrac_ip")
         _username = kwargs.pop("username")
         _password = kwargs.pop("password")
         _port = kwargs.pop("port")
         _insecure = kwargs.pop("insecure")
         _is_http = kwargs.pop("is_http")
+        _session_auth = kwargs.pop("session_auth", False)
+        _token_cache = kwargs.pop("token_cache", False)
+        _walk_concurrency = kwargs.pop("walk_concurrency", DEFAULT_WALK_CONCURRENCY)
+        _resource_cache = kwargs.pop("resource_cache", False)
+        _inventory_cache = kwargs.pop("inventory_cache", False)
+        _replay = kwargs.pop("replay", None)
         module_logger.debug(f"dispatching {name} to idrac port {_port}")
 
         inst = disp(
@@ -314,7 +381,13 @@ class IDracManager(RedfishManager):
             idrac_password=_password,
             idrac_port=_port,
             insecure=_insecure,
-            is_http=_is_http
+            is_http=_is_http,
+            session_auth=_session_auth,
+            token_cache=_token_cache,
+            walk_concurrency=_walk_concurrency,
+            resource_cache=_resource_cache,
+            inventory_cache=_inventory_cache,
+            replay=_replay
         )
         return inst.execute(**kwargs)
 
@@ -327,27 +400,9 @@ class IDracManager(RedfishManager):
         :param hdr: http header dict that will append to HTTP/HTTPS request.
         :return: request.
         """
-        headers = {}
-        headers.update(self.content_type)
-        if hdr is not None:
-            headers.update(hdr)
-
-        if self.x_auth is not None:
-            return loop.run_in_executor(
-                None, functools.partial(
-                    requests.get, req,
-                    verify=self._is_verify_cert,
-                    headers=headers
-                )
-            )
-        else:
-            return loop.run_in_executor(
-                None, functools.partial(
-                    requests.get, req,
-                    verify=self._is_verify_cert,
-                    auth=(self._username, self._password)
-                )
-            )
+        return loop.run_in_executor(
+            None, functools.partial(self.http_request, "GET", req, hdr)
+        )
 
     async def api_async_get_until_complete(
             self, req, hdr: Dict, loop=None) -> requests.models.Response:
@@ -370,21 +425,7 @@ class IDracManager(RedfishManager):
         :param hdr: http header dict that will append to HTTP/HTTPS request.
         :return: request.
         """
-        headers = {}
-        headers.update(self.content_type)
-        if hdr is not None:
-            headers.update(hdr)
-
-        if self.x_auth is not None:
-            headers.update({'X-Auth-Token': self.x_auth})
-            return requests.get(
-                req, verify=self._is_verify_cert, headers=headers
-            )
-        else:
-            return requests.get(
-                req, verify=self._is_verify_cert,
-                auth=(self._username, self._password)
-            )
+        return self.http_request("GET", req, hdr)
 
     def sync_invoke(self, api_call: ApiRequestType, name: str, **kwargs) -> CommandResult:
         """Synchronous invocation of target command
@@ -394,9 +435,9 @@ class IDracManager(RedfishManager):
         :return: Return result depends on actual command,
                  encapsulated in generic CommandResult
         """
-        if len(self._username) == 0:
+        if not self._username and not self._replay:
             raise ValueError("Username is empty string.")
-        if len(self._password) == 0:
+        if not self._password and not self._replay:
             raise ValueError("Password is empty string.")
         if len(self.redfish_ip) == 0:
             raise ValueError("IDRAC IP is empty string.")
@@ -411,6 +452,12 @@ class IDracManager(RedfishManager):
                 # is the inverse (requests' verify flag), so flip it back here.
                 "insecure": not self._is_verify_cert,
                 "is_http": self._is_http,
+                "session_auth": self._session_auth,
+                "token_cache": self._token_cache,
+                "walk_concurrency": self.walk_concurrency,
+                "resource_cache": self._resource_cache,
+                "inventory_cache": self._inventory_cache,
+                "replay": self._replay,
             }
         )
         return self.invoke(api_call, name, **kwargs)
@@ -483,6 +530,29 @@ class IDracManager(RedfishManager):
         task_status = self._task_status_mapping[resp_status.lower()]
         return task_state, task_status
 
+    @property
+    def task_waiter(self):
+        """Process wide TaskWaiter of this BMC, shared by every command.
+        :return: redfish_task_wait.TaskWaiter
+        """
+        from .redfish_task_wait import shared_task_waiter
+        return shared_task_waiter(self)
+
+    async def async_wait_task(self,
+                              task_id: str,
+                              wait_for: Optional[int] = 0,
+                              wait_for_state: Optional[TaskState] = TaskState.Unknown) -> TaskState:
+        """Await a task without blocking the event loop. Any number of
+        concurrent waits share the BMC's poller and event stream.
+
+        :param task_id: task id or task monitor path
+        :param wait_for: status code that ends the wait, 0 waits for 200.
+        :param wait_for_state: state that ends the wait, Unknown waits for completion.
+        :return: TaskState
+        """
+        return await self.task_waiter.wait(task_id, wait_for=wait_for,
+                                           wait_for_state=wait_for_state)
+
     def fetch_task(self,
                    task_id: str,
                    sleep_time: Optional[int] = 10,
@@ -508,20 +578,21 @@ class IDracManager(RedfishManager):
 
         THus, for a caller it amke sense to re-check task services.
 
+        The wait goes through ``task_waiter``: polls back off from half a
+        second up to ``sleep_time`` and honour Retry-After, and on a BMC that
+        streams events a task event polls the task at once.
+
         :param wait_for: by default, we wait status code 200 based on spec.
                          in case API return something else. 204 for example.
         :param task_id: task id as it returned from a task by task services.
-        :param sleep_time: a default sleep and wait, if server ask for retry_after, it takes precedence
-                           only if retry_after > sleep_time.
+        :param sleep_time: the longest pause between two polls, if server ask for
+                           retry_after, it takes precedence.
         :param wait_for_state: wait a specific state. Example caller only care
                                it Running and will resume later to monitor progress
 
-        :return: Nothing
-        :raise AuthenticationFailed MissingResource
+        :return: TaskState
+        :raise AuthenticationFailed UnexpectedResponse
         """
-        last_update = 0
-        percent_done = 0
-
         # job might be already done.
         jb = self.get_job(task_id)
 
@@ -540,94 +611,20 @@ class IDracManager(RedfishManager):
                 self.logger.info(f"Job {task_id} is {current_state}..bouncing off.")
                 return self._job_state_mapping[current_state]
 
-        # in case server will ask to wait.
-        retry_after = 0
-        # initial state we don't know
-        task_state = TaskState.Unknown
         with tqdm(total=100) as pbar:
-            while True:
-                # /redfish/v1/TaskService/Tasks/{TaskId}
-                resp = self.api_get_call(f"{self._default_method}{self.idrac_ip}"
-                                         f"{IDRAC_API.Tasks}{task_id}", hdr={})
-
-                if 'Retry-After' in resp.headers:
-                    retry_after = int(resp.headers["Retry-After"])
-                    self.logger.info(
-                        f"Remote server responded "
-                        f"with Retry-After {retry_after}"
-                    )
-                if resp.status_code == 401:
-                    self.logger.error(f"task service returned 401")
-                    AuthenticationFailed("Authentication failed.")
-                # if server failed, meanwhile HTTP exception propagate
-                # up on the stack.
-                if resp.status_code > 499:
-                    self.logger.critical(
-                        f"task service return http error code "
-                        f"{resp.status_code}"
-                    )
-                    break
-                # Cancellation: A subsequent GET request on the task monitor URI
-                # returns either the HTTP 410 Gone or 404 Not Found status code.
-                elif resp.status_code == 404 or resp.status_code == 410:
-                    self.logger.info(f"task service returned {resp.status_code}")
-                    # at the end we check a state and return it might fail, exception etc.
-                    break
-                # if client expect something else than 200 or something else, we return result.
-                elif 0 < wait_for == resp.status_code:
-                    task_state, task_status = self.get_task_state(resp)
-                    return task_state
-                # As long as the operation is in process, the service shall return the HTTP 202 Accepted status code
-                # when the client performs a GET request on the task monitor URI.
-                elif resp.status_code == 202:
-                    self.logger.info(f"task service returned 202")
-                    # state acquisition and update state
-                    resp_data = resp.json()
-                    task_state, task_status = self.get_task_state(resp)
-                    self.logger.info(f"Updating state, new state "
-                                     f"{task_state.value}, status {task_status.value}")
-
-                    # update description so caller see.
-                    pbar.set_description(task_state.value)
-                    if task_status == TaskStatus.Critical or task_status == TaskStatus.Warning:
-                        # we bounce, if status not ok
-                        break
-
-                    percent_done = self.update_progress(resp_data, percent_done)
-                    if percent_done > last_update:
-                        last_update = percent_done
-                        inc = percent_done - pbar.n
-                        pbar.update(n=inc)
-
-                    # update retry time, we've been asked
-                    if retry_after > sleep_time:
-                        sleep_time = retry_after
-                    time.sleep(sleep_time)
-
-                # The appropriate HTTP status code, such as but not limited to 200 OK
-                # for most operations or 201 Created for POST to create a resource.
-                # if client passed wait_for for example 204 we need have handle for 200
-                elif resp.status_code == 200:
-                    task_state, task_status = self.get_task_state(resp)
-                    self.logger.info(
-                        f"Server return status code 200, Task state "
-                        f"{task_state.value}, {task_status.value}"
-                    )
-                    return task_state
-                # client wait for specific state
-                elif task_state == wait_for_state:
-                    self.logger.info(f"caller asked for wait for a state {wait_for_state.value}")
-                    task_state, task_status = self.get_task_state(resp)
-                    return task_state
-                else:
-                    # in all other cases update state and go back sleep.
-                    task_state, task_status = self.get_task_state(resp)
-                    self.logger.error("unexpected status code", resp.status_code)
-                    if retry_after > sleep_time:
-                        sleep_time = retry_after
-                    time.sleep(sleep_time)
-
-        return task_state
+            def progress(task_state, task_status, resp_data):
+                self.logger.info(f"Updating state, new state "
+                                 f"{task_state.value}, status {task_status.value}")
+                # update description so caller see.
+                pbar.set_description(task_state.value)
+                percent_done = self.update_progress(resp_data, pbar.n)
+                if percent_done > pbar.n:
+                    pbar.update(n=percent_done - pbar.n)
+
+            future = self.task_waiter.watch(task_id, wait_for=wait_for,
+                                            wait_for_state=wait_for_state,
+                                            on_update=progress, cap=sleep_time)
+            return future.result()
 
     def default_error_handler(
             self, response: requests.models.Response) -> IdracApiRespond:
@@ -674,15 +671,18 @@ class IDracManager(RedfishManager):
         # response = self.api_get_call(r, headers)
         # # print("Response:", response.text)
 
-        response = self.api_get_call(r, headers)
-        if response.status_code == 404:
-            r = f"{self._default_method}" \
-                f"{self.redfish_ip}" \
-                f"{RedfishApi.Version}"
+        def fetch():
+            nonlocal r
             response = self.api_get_call(r, headers)
-        self.default_error_handler(response)
-
-        data = response.json()
+            if response.status_code == 404:
+                r = f"{self._default_method}" \
+                    f"{self.redfish_ip}" \
+                    f"{RedfishApi.Version}"
+                response = self.api_get_call(r, headers)
+            self.default_error_handler(response)
+            return response.json()
+
+        data = self._inventory_value("api_endpoints", fetch, "resource")
         self.api_endpoints = data
         if IDRAC_JSON.Actions in self.api_endpoints:
             actions = self.api_endpoints[IDRAC_JSON.Actions]
@@ -896,23 +896,7 @@ class IDracManager(RedfishManager):
         :param hdr: http header dict that will append to HTTP/HTTPS request.
         :return: request.
         """
-        headers = {}
-        headers.update(self.content_type)
-        if hdr is not None:
-            headers.update(hdr)
-
-        if self.x_auth is not None:
-            headers.update({'X-Auth-Token': self.x_auth})
-            return requests.delete(
-                req, verify=self._is_verify_cert,
-                headers=headers
-            )
-        else:
-            return requests.delete(
-                req, verify=self._is_verify_cert,
-                auth=(self._username, self._password),
-                headers=headers
-            )
+        return self.http_request("DELETE", req, hdr)
 
     def api_post_call(
             self, req: str, payload: str, hdr: dict) -> requests.models.Response:
@@ -922,26 +906,7 @@ class IDracManager(RedfishManager):
         :param hdr: header that will append.
         :return: response.
         """
-        headers = {}
-        headers.update(self.content_type)
-        if hdr is not None:
-            headers.update(hdr)
-
-        if self.x_auth is not None:
-            headers.update({'X-Auth-Token': self.x_auth})
-            return requests.post(
-                req,
-                data=payload,
-                verify=self._is_verify_cert,
-                headers=headers
-            )
-        else:
-            return requests.post(
-                req, data=payload,
-                verify=self._is_verify_cert,
-                headers=headers,
-                auth=(self._username, self._password)
-            )
+        return self.http_request("POST", req, hdr, payload=payload)
 
     async def api_async_post_call(
             self, loop, req: str, payload: str, hdr: Dict):
@@ -952,30 +917,9 @@ class IDracManager(RedfishManager):
         :param hdr: http header dict that will append to HTTP/HTTPS request.
         :return: request.
         """
-        headers = {}
-        headers.update(self.content_type)
-        if hdr is not None:
-            headers.update(hdr)
-
-        if self.x_auth is not None:
-            return loop.run_in_executor(
-                None, functools.partial(
-                    requests.post, req,
-                    data=payload,
-                    verify=self._is_verify_cert,
-                    headers=headers
-                )
-            )
-        else:
-            return loop.run_in_executor(
-                None, functools.partial(
-                    requests.post, req,
-                    data=payload,
-                    headers=headers,
-                    verify=self._is_verify_cert,
-                    auth=(self._username, self._password)
-                )
-            )
+        return loop.run_in_executor(
+            None, functools.partial(self.http_request, "POST", req, hdr, payload)
+        )
 
     async def api_async_patch_until_complete(
             self, r: str,
@@ -1064,25 +1008,7 @@ class IDracManager(RedfishManager):
         :param hdr: header that will append.
         :return: response.
         """
-        headers = {}
-        headers.update(self.content_type)
-        if hdr is not None:
-            headers.update(hdr)
-
-        if self.x_auth is not None:
-            headers.update({'X-Auth-Token': self.x_auth})
-            return requests.patch(
-                req, data=payload,
-                verify=self._is_verify_cert,
-                headers=headers
-            )
-        else:
-            return requests.patch(
-                req, data=payload,
-                verify=self._is_verify_cert,
-                headers=headers,
-                auth=(self._username, self._password)
-            )
+        return self.http_request("PATCH", req, hdr, payload=payload)
 
     async def api_async_patch_call(
             self, loop, req, payload: str, hdr: Dict):
@@ -1095,26 +1021,9 @@ class IDracManager(RedfishManager):
         :param hdr: http header dict that will append to HTTP/HTTPS request.
         :return: request.
         """
-        headers = {}
-        headers.update(self.content_type)
-        if hdr is not None:
-            headers.update(hdr)
-
-        if self.x_auth is not None:
-            return loop.run_in_executor(
-                None, functools.partial(requests.patch, req,
-                                        data=payload,
-                                        verify=self._is_verify_cert,
-                                        headers=headers)
-            )
-        else:
-            return loop.run_in_executor(
-                None, functools.partial(
-                    requests.patch, req, data=payload,
-                    verify=self._is_verify_cert, headers=headers,
-                    auth=(self._username, self._password)
-                )
-            )
+        return loop.run_in_executor(
+            None, functools.partial(self.http_request, "PATCH", req, hdr, payload)
+        )
 
     async def api_async_delete_call(
             self, loop, req, payload: str, hdr: Dict):
@@ -1127,27 +1036,9 @@ class IDracManager(RedfishManager):
         :param hdr: http header dict that will append to HTTP/HTTPS request.
         :return: request.
         """
-        headers = {}
-        headers.update(self.content_type)
-        if hdr is not None:
-            headers.update(hdr)
-
-        if self.x_auth is not None:
-            return loop.run_in_executor(
-                None, functools.partial(
-                    requests.delete, req, data=payload,
-                    verify=self._is_verify_cert,
-                    headers=headers)
-            )
-        else:
-            return loop.run_in_executor(
-                None, functools.partial(
-                    requests.delete, req, data=payload,
-                    verify=self._is_verify_cert,
-                    headers=headers,
-                    auth=(self._username, self._password)
-                )
-            )
+        return loop.run_in_executor(
+            None, functools.partial(self.http_request, "DELETE", req, hdr, payload)
+        )
 
     def read_api_respond(
             self,
@@ -1411,6 +1302,18 @@ class IDracManager(RedfishManager):
                 pf, exc_info=self._is_debug)
             err = pf
 
+        return self._request_result(response, api_resp, err)
+
+    def _request_result(
+            self, response, api_resp: IdracApiRespond, err) -> tuple[CommandResult, IdracApiRespond]:
+        """Shape the response of a post/patch/delete into the
+        CommandResult, IdracApiRespond tuple base_request_respond returns.
+
+        :param response: HTTP response or None if the request failed.
+        :param api_resp: api respond status
+        :param err: request error if any
+        :return: Tuple of CommandResult, IdracApiRespond
+        """
         redfish_resp = None
         if response is not None:
             redfish_resp = self.parse_json_respond_msg(response)
@@ -1428,6 +1331,101 @@ class IDracManager(RedfishManager):
 
         return CommandResult(api_resp_msg, None, None, err), api_resp
 
+    async def async_base_request_respond(
+            self,
+            resource: str,
+            method: HTTPMethod,
+            payload: Optional[dict] = None,
+            data_type: Optional[str] = "json",
+            expected_status: Optional[int] = 200,
+            ignore_error_code: Optional[int] = 0) -> tuple[CommandResult, IdracApiRespond]:
+        """Awaitable base_request_respond, the request never blocks the event loop.
+
+        :param resource:  a request to api,  /redfish/v1/
+        :param method: http method POST/PATCH/DELETE.
+        :param payload: a json payload if payload is empty caller need pass empty dict
+        :param data_type: a data-type json/xml
+        :param expected_status: expected status code depend on patch msg.
+        :param ignore_error_code: error code that don't consider an error.
+        :return: Tuple of CommandResult, IdracApiRespond
+        """
+        headers = {}
+        if data_type == "json":
+            headers.update(self.json_content_type)
+
+        pd = payload if payload is not None else {}
+        success_handlers = {
+            HTTPMethod.PATCH: self.default_patch_success,
+            HTTPMethod.POST: self.default_post_success,
+            HTTPMethod.DELETE: self.default_delete_success,
+        }
+        if method not in success_handlers:
+            raise UnsupportedAction(f"Unsupported http method {method}")
+
+        err = None
+        response = None
+        api_resp = IdracApiRespond.Error
+        try:
+            r = f"{self._default_method}{self.redfish_ip}{resource}"
+            body = None if method == HTTPMethod.DELETE else json.dumps(pd)
+            response = await self.async_http_request(method.name, r, headers, body)
+            api_resp = success_handlers[method](
+                response, expected=expected_status,
+                ignore_error_code=ignore_error_code
+            )
+        except (PatchRequestFailed, PostRequestFailed, DeleteRequestFailed) as pf:
+            self.logger.critical(
+                pf, exc_info=self._is_debug
+            )
+            err = pf
+
+        return self._request_result(response, api_resp, err)
+
+    async def async_base_post(
+            self,
+            resource: str,
+            payload: Optional[dict] = None,
+            data_type: Optional[str] = "json",
+            expected_status: Optional[int] = 204,
+            ignore_error_code: Optional[int] = 0) -> tuple[CommandResult, IdracApiRespond]:
+        """Awaitable base_post.
+        :return: Tuple[CommandResult, IdracApiRespond]
+        """
+        return await self.async_base_request_respond(
+            resource, HTTPMethod.POST, payload=payload, data_type=data_type,
+            expected_status=expected_status, ignore_error_code=ignore_error_code,
+        )
+
+    async def async_base_patch(
+            self,
+            resource: str,
+            payload: Optional[dict] = None,
+            data_type: Optional[str] = "json",
+            expected_status: Optional[int] = 204,
+            ignore_error_code: Optional[int] = 0) -> tuple[CommandResult, IdracApiRespond]:
+        """Awaitable base_patch.
+        :return: Tuple[CommandResult, IdracApiRespond]
+        """
+        return await self.async_base_request_respond(
+            resource, HTTPMethod.PATCH, payload=payload, data_type=data_type,
+            expected_status=expected_status, ignore_error_code=ignore_error_code,
+        )
+
+    async def async_base_delete(
+            self,
+            resource: str,
+            payload: Optional[dict] = None,
+            data_type: Optional[str] = "json",
+            expected_status: Optional[int] = 204,
+            ignore_error_code: Optional[int] = 0) -> tuple[CommandResult, IdracApiRespond]:
+        """Awaitable base_delete.
+        :return: Tuple[CommandResult, IdracApiRespond]
+        """
+        return await self.async_base_request_respond(
+            resource, HTTPMethod.DELETE, payload=payload, data_type=data_type,
+            expected_status=expected_status, ignore_error_code=ignore_error_code,
+        )
+
     def base_post(self,
                   resource: str,
                   payload: Optional[dict] = None,
@@ -1796,6 +1794,10 @@ class IDracManager(RedfishManager):
         """Shared method return idrac managed chassis list as json
         :return: str: manage chassis i.e. /redfish/v1/Chassis/System.Embedded.1
         """
+        return self._inventory_value("idrac_manage_chassis", self._resolve_manage_chassis)
+
+    def _resolve_manage_chassis(self) -> str:
+        """Resolve idrac_manage_chassis against the BMC."""
         api_resp = self.base_query(self.idrac_members, key=IDRAC_JSON.Links)
         if api_resp.data is not None and IDRAC_JSON.ManageChassis in api_resp.data:
             if isinstance(api_resp.data, dict):
@@ -1821,6 +1823,10 @@ class IDracManager(RedfishManager):
         """Remote idrac version.
         :return:
         """
+        return self._inventory_value("idrac_manager_version", self._resolve_manager_version)
+
+    def _resolve_manager_version(self) -> str:
+        """Resolve idrac_manager_version against the BMC."""
         cmd_result = self.base_query(
             f"{IDRAC_API.IDRAC_MANAGER}", key=IDRAC_JSON.Members)
 
@@ -1848,8 +1854,10 @@ class IDracManager(RedfishManager):
         Upon first call , result cached all follow-up call will return cached result.
         :return:
         """
-        cmd_result = self.base_query(f"{IDRAC_API.IDRAC_MANAGER}", key=IDRAC_JSON.Members)
-        return self.value_from_json_list(cmd_result.data, IDRAC_JSON.Data_id)
+        def resolve():
+            cmd_result = self.base_query(f"{IDRAC_API.IDRAC_MANAGER}", key=IDRAC_JSON.Members)
+            return self.value_from_json_list(cmd_result.data, IDRAC_JSON.Data_id)
+        return self._inventory_value("idrac_members", resolve)
 
     @staticmethod
     def _member_ids(members) -> list:
@@ -1863,6 +1871,173 @@ class IDracManager(RedfishManager):
         return [m[IDRAC_JSON.Data_id] for m in members
                 if isinstance(m, dict) and isinstance(m.get(IDRAC_JSON.Data_id), str)]
 
+    @staticmethod
+    def link_uri(data, key: str) -> Optional[str]:
+        """Return the ``@odata.id`` of a single ``{key: {@odata.id}}`` link, or None.
+        :param data: resource body
+        :param key: link property name, i.e. Sensors, LogServices
+        :return: uri or None
+        """
+        if not isinstance(data, dict):
+            return None
+        link = data.get(key)
+        uri = link.get(IDRAC_JSON.Data_id) if isinstance(link, dict) else None
+        return uri if isinstance(uri, str) and uri else None
+
+    def fetch_resources(self,
+                        uris: List[str],
+                        do_async: Optional[bool] = False,
+                        do_expanded: Optional[bool] = False,
+                        max_workers: Optional[int] = None,
+                        on_result: Optional[Callable[[str], None]] = None) -> List[Optional[dict]]:
+        """GET every uri with at most ``max_workers`` requests in flight.
+
+        The result is aligned with ``uris``: entry i is the body of uris[i],
+        or None when that GET failed, so a caller keeps the usual
+        tolerate-and-skip semantics and a deterministic order. Workers
+        share the manager's keep-alive pool; with more than one worker
+        every GET is issued synchronously from its worker thread and
+        ``do_async`` only applies to a sequential walk.
+
+        :param uris: resource paths
+        :param do_async: issue asyncio requests when walking sequentially.
+        :param do_expanded: $expand each resource.
+        :param max_workers: parallelism cap, defaults to walk_concurrency.
+        :param on_result: optional callback called with each uri once it is done.
+        :return: list of resource bodies or None
+        """
+        workers = self.walk_concurrency if max_workers is None else max_workers
+        workers = max(1, min(int(workers), len(uris)))
+
+        def _fetch(uri):
+            try:
+                body = self.base_query(uri, do_async=do_async and workers == 1,
+                                       do_expanded=do_expanded).data
+            except Exception as err:
+                self.logger.debug(f"skipping {uri}: {err}")
+                body = None
+            if on_result is not None:
+                on_result(uri)
+            return body if isinstance(body, dict) else None
+
+        if workers <= 1:
+            return [_fetch(uri) for uri in uris]
+        with ThreadPoolExecutor(max_workers=workers,
+                                thread_name_prefix="redfish-walk") as pool:
+            return list(pool.map(_fetch, uris))
+
+    def walk_members(self,
+                     collection_uris: List[str],
+                     do_async: Optional[bool] = False,
+                     do_expanded: Optional[bool] = False,
+                     max_workers: Optional[int] = None,
+                     limit: Optional[int] = None,
+                     inline: Optional[Callable[[dict], bool]] = None) -> List[List[Tuple[str, dict]]]:
+        """Fetch several collections and every member of them.
+
+        All collections are fetched concurrently, then all their members in a
+        single fan-out, so walking N collections of M members costs two round
+        trip latencies instead of N * (M + 1). The result is aligned with
+        ``collection_uris``; each entry lists ``(member_uri, body)`` in
+        collection order. A collection or member that fails is skipped. The
+        further pages of a collection the service splits with
+        ``Members@odata.nextLink`` are read up to ``limit``.
+
+        :param collection_uris: collection paths
+        :param do_async: issue asyncio requests when walking sequentially.
+        :param do_expanded: $expand the collections, expanded members are used inline.
+        :param max_workers: parallelism cap, defaults to walk_concurrency.
+        :param limit: max members taken from each collection.
+        :param inline: predicate telling that a member entry already carries
+                       its body, by default any expanded member does.
+        :return: per collection list of (member uri, member body)
+        """
+        if inline is None:
+            def inline(member):
+                return bool(do_expanded) and len(member) > 1
+
+        collections = self.fetch_resources(
+            collection_uris, do_async=do_async,
+            do_expanded=do_expanded, max_workers=max_workers)
+
+        plan = []
+        pending = []
+        for coll in collections:
+            members = coll.get(IDRAC_JSON.Members) if isinstance(coll, dict) else None
+            if not isinstance(members, list):
+                members = []
+            next_link = coll.get(IDRAC_JSON.MembersNext) if isinstance(coll, dict) else None
+            if isinstance(next_link, str) and next_link and (limit is None or len(members) < limit):
+                # the rest of a paged collection, only as far as the limit reaches.
+                remaining = None if limit is None else limit - len(members)
+                members = members + list(self.iter_collection(next_link, limit=remaining))
+            if limit is not None:
+                members = members[:max(0, limit)]
+            entries = []
+            for member in members:
+                if not isinstance(member, dict):
+                    continue
+                uri = member.get(IDRAC_JSON.Data_id)
+                if inline(member):
+                    entries.append((uri, member))
+                elif isinstance(uri, str):
+                    entries.append((uri, len(pending)))
+                    pending.append(uri)
+            plan.append(entries)
+
+        bodies = self.fetch_resources(pending, do_async=do_async, max_workers=max_workers)
+        walked = []
+        for entries in plan:
+            rows = []
+            for uri, body in entries:
+                if isinstance(body, int):
+                    body = bodies[body]
+                if isinstance(body, dict):
+                    rows.append((uri, body))
+            walked.append(rows)
+        return walked
+
+    def planning_capabilities(self):
+        """Vendor capability profile used to plan queries, the generic
+        profile when the service root can not be classified.
+        :return: vendors.VendorCapabilities
+        """
+        from .vendors import get_vendor
+
+        try:
+            return self.vendor_capabilities
+        except Exception as err:
+            self.logger.debug(f"planning with the generic profile: {err}")
+            return get_vendor(None)
+
+    def walk(self,
+             walk,
+             do_async: Optional[bool] = False,
+             expand: Optional[bool] = None,
+             max_workers: Optional[int] = None):
+        """Run a walk with the cheapest request plan the target supports.
+
+        The plan comes from ``redfish_planner.plan_walk`` and the remote
+        vendor capability profile: ``$expand`` where it is honored, ``$select``
+        of the walk fields, member GETs otherwise. Each step is one bounded
+        fan-out, see ``fetch_resources``. Collections split in pages are
+        followed through ``Members@odata.nextLink``.
+
+        :param walk: redfish_planner.Walk
+        :param do_async: issue asyncio requests when walking sequentially.
+        :param expand: force (True) or forbid (False) $expand, None follows the profile.
+        :param max_workers: parallelism cap, defaults to walk_concurrency.
+        :return: redfish_planner.WalkResult, rows and the requests it cost
+        """
+        from .redfish_planner import plan_walk
+
+        plan = plan_walk(walk, self.planning_capabilities(), expand=expand)
+        result = plan.run(lambda urls: self.fetch_resources(
+            urls, do_async=do_async, max_workers=max_workers),
+            pages=self.iter_collection_pages)
+        self.logger.debug(result.summary())
+        return result
+
     def discover_computer_system_ids(self) -> list:
         """Return ALL ComputerSystem ids from ``/redfish/v1/Systems``.
 
@@ -1919,6 +2094,10 @@ class IDracManager(RedfishManager):
         system -- the one exposing a Bios/Boot link. Single-system hosts (Dell)
         and hosts without a reachable Systems collection keep the original result.
         """
+        return self._inventory_value("idrac_manage_servers", self._resolve_manage_servers)
+
+    def _resolve_manage_servers(self) -> str:
+        """Resolve idrac_manage_servers against the BMC."""
         resolved = ""
         api_resp = self.base_query(self.idrac_members, key=IDRAC_JSON.Links)
         if api_resp.data is not None and IDRAC_JSON.ManagerServers in api_resp.data:
@@ -1946,11 +2125,25 @@ class IDracManager(RedfishManager):
         id cached all follow-up calls and will return cached result.
         :return:
         """
-        self.base_query(self.idrac_manage_servers, key=IDRAC_JSON.Id)
-        api_resp = self.base_query(self.idrac_manage_servers, key=IDRAC_JSON.Id)
-        if api_resp is None:
-            self.logger.critical(f"failed obtain {IDRAC_JSON.Id}")
-        return api_resp.data
+        def resolve():
+            api_resp = self.base_query(self.idrac_manage_servers, key=IDRAC_JSON.Id)
+            if api_resp is None:
+                self.logger.critical(f"failed obtain {IDRAC_JSON.Id}")
+            return api_resp.data
+        return self._inventory_value("idrac_id", resolve)
+
+    @cached_property
+    def vendor_capabilities(self):
+        """Capability profile of the remote vendor, classified from the
+        service root and kept in the inventory cache when it is on.
+        :return: VendorCapabilities
+        """
+        from .discover.classifier import classify_vendor
+        from .vendors import get_vendor
+
+        def classify():
+            return classify_vendor(self.base_query(RedfishApi.Version).data)
+        return get_vendor(self._inventory_value("vendor", classify))
 
     @staticmethod
     def base_parser(is_async: Optional[bool] = True,
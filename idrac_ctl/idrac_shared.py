@@ -7,6 +7,7 @@ Author Mus spyroot@gmail.com
 
 """
 import json
+import threading
 from enum import Enum, auto
 from json import JSONEncoder
 from typing import Optional
@@ -216,9 +217,15 @@ class RedfishAction:
 
 
 class Singleton(type):
-    """This idrac_ctl class for all action that singleton
+    """This idrac_ctl class for all action that singleton.
+
+    There is one instance per command class and BMC endpoint (address,
+    port, user and replay source), so a process that drives several BMCs,
+    i.e. the fleet exporter, gets a command object per BMC instead of the
+    first one it created. ``_instances`` maps a class to its {endpoint: instance} dict.
     """
     _instances = {}
+    _lock = threading.RLock()
 
     def __call__(cls, *args, **kwargs):
         """
@@ -226,9 +233,16 @@ class Singleton(type):
         :param kwargs:
         :return:
         """
-        if cls not in cls._instances:
-            cls._instances[cls] = super(Singleton, cls).__call__(*args, **kwargs)
-        return cls._instances[cls]
+        endpoint = (kwargs.get("idrac_ip", args[0] if args else None),
+                    kwargs.get("idrac_port"),
+                    kwargs.get("idrac_username"))
+        if kwargs.get("replay"):
+            endpoint += (kwargs["replay"],)
+        with Singleton._lock:
+            instances = cls._instances.setdefault(cls, {})
+            if endpoint not in instances:
+                instances[endpoint] = super(Singleton, cls).__call__(*args, **kwargs)
+            return instances[endpoint]
 
 
 class BootSource(Enum):
@@ -479,6 +493,8 @@ class IDRAC_JSON:
     Data_content = "@odata.context"
     # Indicates the "nextLink" when the payload contains partial results
     Data_next = "@odata.nextLink"
+    # next page of a collection that the service returns in pages.
+    MembersNext = RedfishJson.MembersNext
 
     Actions = "Actions"
     Members = "Members"
@@ -1,16 +1,23 @@
-"""iDRAC delete job from iDRAC action
+"""iDRAC watch job action
 
-Command provides the option to delete a
-job from iDRAC.
+Command watches a job until it reaches a terminal state. With
+more than one job id, all jobs are watched together from one poll
+of the Jobs collection per tick and every state change is written
+to stderr as a JSON line.
+
+idrac_ctl job-watch -j JID_744718373591,JID_744718373592
 
 Author Mus spyroot@gmail.com
 """
 import argparse
+import json
+import sys
 from abc import abstractmethod
 from typing import Optional
 
 from ..idrac_manager import IDracManager
 from ..idrac_shared import Singleton, ApiRequestType
+from ..redfish_job_watch import DEFAULT_INTERVAL, watch_jobs
 from ..redfish_manager import CommandResult
 
 
@@ -38,7 +45,12 @@ class JobWatch(IDracManager,
 
         cmd_parser.add_argument(
             '-j', '--job_id', required=True, dest="job_id", type=str,
-            default=None, help="Job id. Example JID_744718373591")
+            default=None, help="Job id, or comma separated job ids. Example JID_744718373591")
+
+        cmd_parser.add_argument(
+            '--interval', required=False, dest="interval", type=float,
+            default=DEFAULT_INTERVAL,
+            help="seconds between two polls of the Jobs collection when watching many jobs.")
 
         cmd_parser.add_argument(
             '-f', '--filename', required=False, type=str,
@@ -54,16 +66,27 @@ class JobWatch(IDracManager,
                 data_type: Optional[str] = "json",
                 verbose: Optional[bool] = False,
                 do_async: Optional[bool] = False,
+                interval: Optional[float] = DEFAULT_INTERVAL,
                 **kwargs) -> CommandResult:
         """Watch current job state and monitor progress.
         python idrac_ctl job-watch --j JID_766061334802
 
-        :param job_id: iDRAC job_id JID_744718373591
+        :param job_id: iDRAC job_id JID_744718373591, comma separated for many jobs
+        :param interval: seconds between two polls when watching many jobs
         :param do_async: note async will subscribe to an event loop.
         :param verbose: enables verbose output
         :param data_type: json or xml
         :param filename: if filename indicate call will save a bios setting to a file.
         :return: CommandResult and if filename provide will save to a file.
         """
-        data = self.fetch_task(job_id)
+        job_ids = [j.strip() for j in job_id.split(",") if j.strip()]
+        if len(job_ids) == 1:
+            data = self.fetch_task(job_ids[0])
+            return CommandResult(data, None, None, None)
+
+        def on_transition(change):
+            print(json.dumps(change.as_dict()), file=sys.stderr, flush=True)
+
+        final = watch_jobs({self: job_ids}, on_transition, interval=interval)
+        data = {k: v.value for k, v in final.get(self.idrac_ip, {}).items()}
         return CommandResult(data, None, None, None)
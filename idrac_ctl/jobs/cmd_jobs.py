@@ -11,17 +11,117 @@ List of scheduled jobs
 
 idrac_ctl.py jobs --scheduled
 
+With state flags the states go to the BMC as ``$filter=JobState eq '...'``
+where the vendor profile supports it, so a BMC with thousands of historical
+jobs sends only the ones asked for. iDRAC takes one query parameter per URI:
+the filtered collection comes back as links and the matching jobs are
+fetched one GET each, so there the filter is only sent for states that
+select a few jobs (running, scheduled, failed, reboot pending). Completed
+jobs pile up in the thousands and are read from the one expanded collection
+instead. Where parameters combine, the filter goes with
+``$expand`` and, with ``--page_size``, the collection is paged with
+``$top``/``$skip``. ``Members@odata.nextLink`` is followed either way, a
+refused query falls back to the plain expanded collection, and the state
+flags are always applied again on the client.
+
+``--stream`` writes each job as a JSON line as its page arrives instead of
+building and sorting the whole list.
+
 Author Mus spyroot@gmail.com
 """
 import argparse
+import json
 from abc import abstractmethod
 from datetime import datetime
-from typing import Optional
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
 from ..cmd_exceptions import InvalidArgumentFormat
 from ..idrac_manager import IDracManager
 from ..idrac_shared import Singleton, ApiRequestType
 from ..redfish_manager import CommandResult
+from ..redfish_query import RedfishQuery
+
+# command flag -> JobState values it selects, in output order.
+JOB_STATE_FILTERS = (
+    ("filter_scheduled", ("Scheduled", "Scheduling")),
+    ("filter_completed", ("Completed", "RebootFailed", "Waiting", "Paused")),
+    ("reboot_completed", ("RebootCompleted",)),
+    ("running", ("Running",)),
+    ("reboot_pending", ("RebootPending",)),
+    ("failed", ("Failed",)),
+)
+
+# states few jobs are in at a time. With one query parameter per URI the
+# filtered collection is links only, worth it for these states alone.
+SELECTIVE_JOB_STATES = frozenset({"Running", "Scheduled", "Scheduling", "Failed",
+                                  "RebootPending"})
+
+
+def state_filter(states: Iterable[str]) -> str:
+    """$filter selecting jobs in any of the states."""
+    return " or ".join(f"JobState eq '{state}'" for state in states)
+
+
+def jobs_query(caps,
+               states: Optional[List[str]] = None,
+               page_size: Optional[int] = 0) -> RedfishQuery:
+    """Query of the first page of the Jobs collection for a vendor profile.
+
+    :param caps: vendors.VendorCapabilities of the BMC
+    :param states: JobState values to keep, None keeps every job
+    :param page_size: jobs per page, 0 reads the collection in one request
+    :return: RedfishQuery
+    """
+    job_filter = state_filter(states) if states and caps.query_filter else None
+    if caps.one_query_param_per_uri:
+        # the filter alone costs one GET per matching job, $expand one in all.
+        if job_filter and SELECTIVE_JOB_STATES.issuperset(states):
+            return RedfishQuery(filter=job_filter)
+        return RedfishQuery(expand=True)
+    top = page_size if page_size and caps.query_top else None
+    return RedfishQuery(filter=job_filter, expand=True, top=top, skip=0 if top else None)
+
+
+class JobIndex:
+    """Jobs grouped by JobState in one pass, start times parsed once."""
+
+    def __init__(self, jobs: Iterable[dict] = ()):
+        self.by_state: Dict[str, List[Tuple[Optional[float], dict]]] = {}
+        self.count = 0
+        for job in jobs:
+            self.add(job)
+
+    @staticmethod
+    def start_time(job: dict) -> Optional[float]:
+        """StartTime of a job that ran as a timestamp, None otherwise."""
+        if 'ActualRunningStartTime' not in job:
+            return None
+        try:
+            return datetime.fromisoformat(job['StartTime']).timestamp()
+        except (KeyError, TypeError, ValueError):
+            return None
+
+    def add(self, job: dict):
+        self.by_state.setdefault(job.get('JobState'), []).append((self.start_time(job), job))
+        self.count += 1
+
+    def jobs(self,
+             states: Optional[Iterable[str]] = None,
+             sort_by_time: Optional[bool] = True) -> List[dict]:
+        """Jobs in the states, all jobs when None.
+
+        :param states: JobState values, in output order
+        :param sort_by_time: newest start first, jobs that never ran last
+        :return: list of jobs
+        """
+        if states is None:
+            entries = [e for group in self.by_state.values() for e in group]
+        else:
+            entries = [e for state in dict.fromkeys(states) for e in self.by_state.get(state, [])]
+        if sort_by_time:
+            entries = sorted(entries, reverse=True,
+                             key=lambda e: (e[0] is not None, e[0] or 0.0))
+        return [job for _, job in entries]
 
 
 class JobList(IDracManager,
@@ -123,6 +223,19 @@ class JobList(IDracManager,
             help="will return only list of ids"
         )
 
+        cmd_parser.add_argument(
+            '--page_size', required=False, dest="page_size",
+            default=0, type=int,
+            help="page the jobs collection with $top/$skip where the BMC supports it."
+        )
+
+        cmd_parser.add_argument(
+            '--stream', action='store_true',
+            required=False, dest="stream",
+            default=False,
+            help="write each job as a JSON line as it arrives, unsorted."
+        )
+
         # RebootCompleted
         help_text = "command fetch a list of jobs"
         return cmd_parser, "jobs", help_text
@@ -140,6 +253,32 @@ class JobList(IDracManager,
         else:
             ValueError("Unknown job type")
 
+    def iter_jobs(self,
+                  states: Optional[List[str]] = None,
+                  page_size: Optional[int] = 0) -> Iterator[dict]:
+        """Jobs of the BMC, one page at a time.
+
+        :param states: JobState values the BMC is asked to filter on,
+                       None returns every job. A BMC may ignore the filter.
+        :param page_size: jobs per page where $top/$skip are supported
+        :return: iterator of job documents
+        """
+        caps = self.planning_capabilities()
+        pages = self.iter_collection_pages(
+            f"{self.idrac_members}/Jobs", page_size=page_size or None,
+            query=jobs_query(caps, states, page_size),
+            one_param_per_uri=caps.one_query_param_per_uri,
+            fallback=RedfishQuery(expand=True))
+        for data in pages:
+            members = [m for m in data.get('Members', []) if isinstance(m, dict)]
+            # links only: a filter alone on iDRAC, or a BMC that ignored $expand.
+            links = [m['@odata.id'] for m in members if 'JobState' not in m and '@odata.id' in m]
+            fetched = dict(zip(links, self.fetch_resources(links))) if links else {}
+            for member in members:
+                job = member if 'JobState' in member else fetched.get(member.get('@odata.id'))
+                if job is not None:
+                    yield job
+
     def execute(self,
                 filename: [str] = None,
                 filter_scheduled: Optional[bool] = False,
@@ -155,6 +294,8 @@ class JobList(IDracManager,
                 do_expanded: Optional[bool] = False,
                 job_type: Optional[str] = "",
                 job_ids: Optional[bool] = False,
+                page_size: Optional[int] = 0,
+                stream: Optional[bool] = False,
                 **kwargs) -> CommandResult:
         """Command return list idrac jobs
 
@@ -172,67 +313,18 @@ class JobList(IDracManager,
         :param do_expanded: returns expanded result for API call
         :param job_type: filter on job_type
         :param job_ids: filter by job id only.
-        :return: CommandResult and if filename provide will save to a file.
+        :param page_size: jobs per page where the BMC supports $top/$skip, 0 for one request.
+        :param stream: write each job to stdout as a JSON line instead of returning a list.
+        :return: CommandResult with the list of jobs, or the Jobs collection
+                 when neither a state flag nor sort_by_time nor job_ids is set.
         """
-        headers = {}
-        if data_type == "json":
-            headers.update(self.json_content_type)
-
-        r = f"https://{self.idrac_ip}{self.idrac_members}" \
-            f"/Jobs?$expand=*($levels=1)"
-
-        response = self.api_get_call(r, headers)
-        data = response.json()
-        self.default_error_handler(response)
-        filtered_data = []
-
-        if filter_scheduled:
-            scheduled_jobs = [job for job in data['Members'] if job['JobState'] == 'Scheduled'
-                              or job['JobState'] == 'Scheduling']
-            filtered_data += scheduled_jobs
-        if filter_completed:
-            completed_jobs = [job for job in data['Members'] if job['JobState'] == 'Completed']
-            filtered_data += completed_jobs
-        if reboot_completed:
-            reboot_completed_jobs = [job for job in data['Members'] if job['JobState'] == 'RebootCompleted']
-            filtered_data += reboot_completed_jobs
-        if running:
-            reboot_completed_jobs = [job for job in data['Members'] if job['JobState'] == 'Running']
-            filtered_data += reboot_completed_jobs
-        if reboot_pending:
-            reboot_pending_jobs = [job for job in data['Members'] if job['JobState'] == 'RebootPending']
-            filtered_data += reboot_pending_jobs
-        if filter_completed:
-            completed_jobs = [job for job in data['Members'] if job['JobState'] == 'RebootFailed']
-            filtered_data += completed_jobs
-        if filter_completed:
-            completed_jobs = [job for job in data['Members'] if job['JobState'] == 'Waiting']
-            filtered_data += completed_jobs
-        if filter_completed:
-            completed_jobs = [job for job in data['Members'] if job['JobState'] == 'Paused']
-            filtered_data += completed_jobs
-        if failed:
-            reboot_pending_jobs = [job for job in data['Members'] if job['JobState'] == 'Failed']
-            filtered_data += reboot_pending_jobs
-        # default
-        if filter_scheduled is False and filter_completed \
-                is False and reboot_completed is False and running is False and reboot_pending is False:
-            filtered_data = data
-
-        if sort_by_time:
-            if isinstance(filtered_data, dict) and 'Members' in filtered_data:
-                member_data = filtered_data['Members']
-            elif isinstance(filtered_data, list):
-                member_data = filtered_data
-            else:
-                member_data = [filtered_data]
-            # sort
-            filtered_data = sorted(
-                member_data, reverse=True, key=lambda
-                    x: datetime.fromisoformat(x['StartTime']).timestamp()
-                if 'ActualRunningStartTime' in x else None
-            )
+        flags = {"filter_scheduled": filter_scheduled, "filter_completed": filter_completed,
+                 "reboot_completed": reboot_completed, "running": running,
+                 "reboot_pending": reboot_pending, "failed": failed}
+        states = [state for flag, flag_states in JOB_STATE_FILTERS if flags[flag]
+                  for state in flag_states] or None
 
+        idrac_job_type = None
         if job_type is not None and len(job_type) > 0:
             if job_type in self._cli_job_type_mapping:
                 idrac_job_type = self._cli_job_type_mapping[job_type]
@@ -241,11 +333,26 @@ class JobList(IDracManager,
                 # supported = supported
                 raise InvalidArgumentFormat(f"{job_type} unknown job type, supported {supported}")
 
-            if isinstance(filtered_data, list):
-                filtered_data = [d for d in filtered_data
-                                 if 'JobType' in d and d['JobType'] == idrac_job_type
-                                 ]
-
+        wanted = None if states is None else set(states)
+        jobs = (job for job in self.iter_jobs(states, page_size)
+                if (wanted is None or job.get('JobState') in wanted)
+                and (idrac_job_type is None or job.get('JobType') == idrac_job_type))
+
+        if stream:
+            count = 0
+            for job in jobs:
+                print(json.dumps(job.get("Id") if job_ids else job), flush=True)
+                count += 1
+            return CommandResult({"jobs": count}, None, None, None)
+
+        if states is None and not sort_by_time and not job_ids:
+            # unsorted and unfiltered, the Jobs collection itself, as it always was.
+            members = list(jobs)
+            return CommandResult({"@odata.id": f"{self.idrac_members}/Jobs",
+                                  "Members": members,
+                                  "Members@odata.count": len(members)}, None, None, None)
+
+        filtered_data = JobIndex(jobs).jobs(states, sort_by_time)
         if job_ids:
             filtered_data = [f["Id"] for f in filtered_data if "Id" in f]
 
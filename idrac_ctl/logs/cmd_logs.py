@@ -9,12 +9,14 @@ Severity, Created, Message}. Navigation is by link/``@odata.id`` with no hardcod
 ids, so it reads Dell (SEL/Lclog), HPE iLO (IML/SL/Event/IEL), Supermicro, etc.
 
 Entries are capped per service (``--limit``) because a real box can carry
-hundreds (an iLO IML alone has ~700).
+hundreds (an iLO IML alone has ~700). Where the vendor profile supports
+``$top`` only the first ``--limit`` entries are listed, a page at a time.
 
 Author Mus spyroot@gmail.com
 """
 from abc import abstractmethod
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
 
 from ..idrac_manager import IDracManager
 from ..idrac_shared import ApiRequestType, Singleton
@@ -80,6 +82,32 @@ class Logs(IDracManager,
             pass
         return roots
 
+    def _entry_links(self, entries_uri, limit, caps):
+        """Links of the first ``limit`` entries of a log service, listed in
+        ``$top`` windows of ``limit``; an unreadable service has none."""
+        try:
+            members = list(self.iter_collection(
+                entries_uri, limit=limit, page_size=limit,
+                one_param_per_uri=caps.one_query_param_per_uri))
+        except Exception as err:
+            self.logger.debug(f"skipping {entries_uri}: {err}")
+            return []
+        return self._members({"Members": members})
+
+    def _paged_entries(self, entries_uris, limit, caps) -> List[List[Tuple[str, dict]]]:
+        """Entries of every log service, aligned with ``entries_uris`` like
+        ``walk_members``. The services are listed concurrently, then every
+        entry is fetched in one fan-out."""
+        if not entries_uris:
+            return []
+        workers = max(1, min(int(self.walk_concurrency), len(entries_uris)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="redfish-logs") as pool:
+            links = list(pool.map(lambda uri: self._entry_links(uri, limit, caps), entries_uris))
+        pending = [uri for service in links for uri in service]
+        bodies = dict(zip(pending, self.fetch_resources(pending)))
+        return [[(uri, bodies[uri]) for uri in service if bodies.get(uri) is not None]
+                for service in links]
+
     def execute(self,
                 limit: Optional[int] = 50,
                 filename: Optional[str] = None,
@@ -88,30 +116,44 @@ class Logs(IDracManager,
                 do_async: Optional[bool] = False,
                 do_expanded: Optional[bool] = False,
                 **kwargs) -> CommandResult:
-        """Walk LogServices on every system/manager and collect capped entries."""
+        """Walk LogServices on every system/manager and collect capped entries.
+
+        Each level (roots, log services, entries) is fetched in one bounded
+        fan-out, see ``walk_members``; an unreachable resource is skipped.
+        Where the profile supports ``$top``, entries are listed in pages of
+        ``limit``, so a long log is never read whole.
+        """
         rows = []
-        for root_uri in self._roots():
-            rdata = self._get(root_uri, do_async)
-            services_uri = self._link(rdata, "LogServices")
-            if not services_uri:
-                continue
-            for svc_uri in self._members(self._get(services_uri, do_async)):
-                svc = self._get(svc_uri, do_async)
-                svc_id = svc.get("Id") or svc_uri.rsplit("/", 1)[-1]
+        roots = self._roots()
+        root_data = self.fetch_resources(roots, do_async=do_async)
+        roots = [(r, self._link(d, "LogServices")) for r, d in zip(roots, root_data)]
+        roots = [(r, uri) for r, uri in roots if uri]
+        services = self.walk_members([uri for _, uri in roots], do_async=do_async,
+                                     inline=lambda m: False)
+
+        walked = []
+        for (root_uri, _), members in zip(roots, services):
+            for svc_uri, svc in members:
                 entries_uri = self._link(svc, "Entries")
-                if not entries_uri:
-                    continue
-                coll = self._get(entries_uri, do_async)
-                for member in self._members(coll)[:max(0, limit or 0)]:
-                    entry = self._get(member, do_async)
-                    if not isinstance(entry, dict):
-                        continue
-                    rows.append({
-                        "Source": root_uri.rsplit("/", 1)[-1],
-                        "Service": svc_id,
-                        "Id": entry.get("Id"),
-                        "Severity": entry.get("Severity"),
-                        "Created": entry.get("Created"),
-                        "Message": entry.get("Message"),
-                    })
+                if entries_uri:
+                    svc_id = svc.get("Id") or svc_uri.rsplit("/", 1)[-1]
+                    walked.append((root_uri, svc_id, entries_uri))
+        limit = max(0, limit or 0)
+        caps = self.planning_capabilities()
+        if limit and caps.query_top:
+            entries = self._paged_entries([uri for _, _, uri in walked], limit, caps)
+        else:
+            entries = self.walk_members([uri for _, _, uri in walked], do_async=do_async,
+                                        limit=limit, inline=lambda m: False)
+
+        for (root_uri, svc_id, _), members in zip(walked, entries):
+            for _, entry in members:
+                rows.append({
+                    "Source": root_uri.rsplit("/", 1)[-1],
+                    "Service": svc_id,
+                    "Id": entry.get("Id"),
+                    "Severity": entry.get("Severity"),
+                    "Created": entry.get("Created"),
+                    "Message": entry.get("Message"),
+                })
         return CommandResult(rows, None, None, None)
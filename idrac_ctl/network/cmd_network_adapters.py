@@ -20,6 +20,9 @@ from typing import Optional
 from ..idrac_manager import IDracManager
 from ..idrac_shared import IDRAC_API, ApiRequestType, Singleton
 from ..redfish_manager import CommandResult
+from ..redfish_planner import Walk
+
+ADAPTER_FIELDS = ("Id", "Model", "Manufacturer", "SerialNumber", "PartNumber", "Status")
 
 
 class NetworkAdapters(IDracManager,
@@ -71,38 +74,22 @@ class NetworkAdapters(IDracManager,
         """Walk every chassis NetworkAdapters collection and collect adapters.
 
         Tolerant of a chassis with no NetworkAdapters link or an unreachable
-        collection (skips it).
+        collection (skips it). The walk is planned for the target, see
+        ``redfish_planner``; ``do_expanded`` forces $expand.
         """
         rows = []
-        chassis = self.base_query(IDRAC_API.Chassis, do_async=do_async)
-        for chassis_uri in self._members(chassis.data):
-            try:
-                cdata = self.base_query(chassis_uri, do_async=do_async).data or {}
-            except Exception:
-                continue
-            link = cdata.get("NetworkAdapters")
-            adapters_uri = link.get("@odata.id") if isinstance(link, dict) else None
-            if not adapters_uri:
-                continue
-            try:
-                coll = self.base_query(adapters_uri, do_async=do_async,
-                                       do_expanded=do_expanded).data or {}
-            except Exception:
-                continue
-            for adapter_uri in self._members(coll):
-                try:
-                    ad = self.base_query(adapter_uri, do_async=do_async).data or {}
-                except Exception:
-                    continue
-                status = ad.get("Status") or {}
-                rows.append({
-                    "Chassis": chassis_uri.rsplit("/", 1)[-1],
-                    "Id": ad.get("Id") or adapter_uri.rsplit("/", 1)[-1],
-                    "Model": ad.get("Model"),
-                    "Manufacturer": ad.get("Manufacturer"),
-                    "DeviceClass": self._device_class(ad.get("Model")),
-                    "SerialNumber": ad.get("SerialNumber"),
-                    "PartNumber": ad.get("PartNumber"),
-                    "Health": status.get("Health") if isinstance(status, dict) else None,
-                })
+        walked = self.walk(Walk(IDRAC_API.Chassis, link="NetworkAdapters", fields=ADAPTER_FIELDS),
+                           do_async=do_async, expand=True if do_expanded else None)
+        for chassis_uri, adapter_uri, ad in walked.rows:
+            status = ad.get("Status") or {}
+            rows.append({
+                "Chassis": chassis_uri.rsplit("/", 1)[-1],
+                "Id": ad.get("Id") or adapter_uri.rsplit("/", 1)[-1],
+                "Model": ad.get("Model"),
+                "Manufacturer": ad.get("Manufacturer"),
+                "DeviceClass": self._device_class(ad.get("Model")),
+                "SerialNumber": ad.get("SerialNumber"),
+                "PartNumber": ad.get("PartNumber"),
+                "Health": status.get("Health") if isinstance(status, dict) else None,
+            })
         return CommandResult(rows, None, None, None)
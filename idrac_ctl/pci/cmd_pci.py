@@ -94,15 +94,13 @@ class PciDeviceQuery(IDracManager,
             coll = self.base_query(endpoints["@odata.id"], do_async=do_async).data or {}
             endpoints = coll.get("Members", [])
         if isinstance(endpoints, list):
+            uris = [ep.get("@odata.id") for ep in endpoints if isinstance(ep, dict)]
+            uris = [uri for uri in uris if uri]
             with tqdm(total=len(endpoints)) as pbar:
-                for ep in endpoints:
-                    uri = ep.get("@odata.id") if isinstance(ep, dict) else None
-                    if uri:
-                        try:
-                            pci_data.append(self.base_query(uri, do_async=do_async).data)
-                        except Exception:
-                            pass
-                    pbar.update(1)
+                fetched = self.fetch_resources(uris, do_async=do_async,
+                                               on_result=lambda _: pbar.update(1))
+                pbar.update(len(endpoints) - len(uris))
+            pci_data = [d for d in fetched if d is not None]
 
         # Dell hangs PCIeDevices off the ComputerSystem; iLO/Supermicro hang them
         # off Chassis. Fall back to the Chassis layout when the System select was
@@ -117,32 +115,28 @@ class PciDeviceQuery(IDracManager,
         """Collect PCIe devices/functions from the Chassis layout, tolerantly.
 
         Walks /redfish/v1/Chassis -> each chassis PCIeDevices collection -> each
-        device (and, for PCIeFunctions, that device's PCIeFunctions collection).
-        Skips a chassis or leaf that is missing/unreachable rather than failing.
+        device (and, for PCIeFunctions, that device's PCIeFunctions collection),
+        one bounded fan-out per level. Skips a chassis or leaf that is
+        missing/unreachable rather than failing.
         """
-        def get(uri):
-            try:
-                return self.base_query(uri, do_async=do_async).data or {}
-            except Exception:
-                return {}
-
-        def members(data):
-            return [m["@odata.id"] for m in (data.get("Members") or [])
-                    if isinstance(m, dict) and isinstance(m.get("@odata.id"), str)]
-
-        out = []
-        for chassis_uri in members(get(f"{RedfishApi.Version}/Chassis")):
-            link = get(chassis_uri).get("PCIeDevices")
-            coll_uri = link.get("@odata.id") if isinstance(link, dict) else None
-            if not coll_uri:
-                continue
-            for dev_uri in members(get(coll_uri)):
-                dev = get(dev_uri)
-                if pci_type == "PCIeFunctions":
-                    fn_link = dev.get("PCIeFunctions")
-                    fn_coll = fn_link.get("@odata.id") if isinstance(fn_link, dict) else None
-                    for fn_uri in members(get(fn_coll)) if fn_coll else []:
-                        out.append(get(fn_uri))
-                elif dev:
-                    out.append(dev)
-        return out
+        try:
+            chassis = self.base_query(f"{RedfishApi.Version}/Chassis",
+                                      do_async=do_async).data or {}
+        except Exception:
+            return []
+        chassis_uris = [m["@odata.id"] for m in (chassis.get("Members") or [])
+                        if isinstance(m, dict) and isinstance(m.get("@odata.id"), str)]
+        coll_uris = [self.link_uri(d, "PCIeDevices")
+                     for d in self.fetch_resources(chassis_uris, do_async=do_async)]
+        devices = [dev for coll in self.walk_members([u for u in coll_uris if u],
+                                                     do_async=do_async,
+                                                     inline=lambda m: False)
+                   for _, dev in coll]
+        if pci_type != "PCIeFunctions":
+            return [dev for dev in devices if dev]
+
+        fn_colls = [self.link_uri(dev, "PCIeFunctions") for dev in devices]
+        return [fn for coll in self.walk_members([u for u in fn_colls if u],
+                                                 do_async=do_async,
+                                                 inline=lambda m: False)
+                for _, fn in coll]
@@ -50,17 +50,6 @@ class NvLinkPorts(IDracManager,
         return [m["@odata.id"] for m in data.get("Members", [])
                 if isinstance(m, dict) and isinstance(m.get("@odata.id"), str)]
 
-    def _link(self, data, key, do_async):
-        """Follow a single ``{key: {@odata.id}}`` link, returning its body or {}."""
-        link = (data or {}).get(key)
-        uri = link.get("@odata.id") if isinstance(link, dict) else None
-        if not uri:
-            return {}
-        try:
-            return self.base_query(uri, do_async=do_async).data or {}
-        except Exception:
-            return {}
-
     def execute(self,
                 filename: Optional[str] = None,
                 data_type: Optional[str] = "json",
@@ -73,6 +62,7 @@ class NvLinkPorts(IDracManager,
         On a multi-system host (e.g. a host System plus an HGX baseboard System)
         the GPUs live under whichever System exposes them; both are walked. A
         port whose Metrics leaf is absent still yields a row with None counters.
+        Each level is fetched in one bounded fan-out, see ``walk_members``.
         """
         rows = []
         try:
@@ -81,40 +71,44 @@ class NvLinkPorts(IDracManager,
         except Exception:
             return CommandResult(rows, None, None, None)
 
-        for system_uri in self._members(systems):
-            try:
-                sdata = self.base_query(system_uri, do_async=do_async).data or {}
-            except Exception:
-                continue
-            procs = self._link(sdata, "Processors", do_async)
-            for proc_uri in self._members(procs):
-                try:
-                    proc = self.base_query(proc_uri, do_async=do_async).data or {}
-                except Exception:
-                    continue
-                if proc.get("ProcessorType") != "GPU":
-                    continue
-                gpu_id = proc.get("Id") or proc_uri.rsplit("/", 1)[-1]
-                ports = self._link(proc, "Ports", do_async)
-                for port_uri in self._members(ports):
-                    try:
-                        port = self.base_query(port_uri, do_async=do_async).data or {}
-                    except Exception:
-                        continue
-                    if port.get("PortProtocol") != "NVLink":
-                        continue
-                    metrics = self._link(port, "Metrics", do_async)
-                    oem = (metrics.get("Oem") or {}).get("Nvidia") or {}
-                    rows.append({
-                        "System": system_uri.rsplit("/", 1)[-1],
-                        "GPU": gpu_id,
-                        "Port": port.get("Id") or port_uri.rsplit("/", 1)[-1],
-                        "LinkState": port.get("LinkState"),
-                        "LinkStatus": port.get("LinkStatus"),
-                        "CurrentSpeedGbps": port.get("CurrentSpeedGbps"),
-                        "MaxSpeedGbps": port.get("MaxSpeedGbps"),
-                        "RXBytes": metrics.get("RXBytes"),
-                        "TXBytes": metrics.get("TXBytes"),
-                        "BitErrorRate": oem.get("BitErrorRate"),
-                    })
+        system_uris = self._members(systems)
+        system_data = self.fetch_resources(system_uris, do_async=do_async)
+        walked = [(s, self.link_uri(d, "Processors")) for s, d in zip(system_uris, system_data)]
+        walked = [(s, uri) for s, uri in walked if uri]
+        procs = self.walk_members([uri for _, uri in walked], do_async=do_async,
+                                  inline=lambda m: False)
+
+        gpus = []
+        for (system_uri, _), members in zip(walked, procs):
+            for proc_uri, proc in members:
+                ports_uri = self.link_uri(proc, "Ports")
+                if proc.get("ProcessorType") == "GPU" and ports_uri:
+                    gpu_id = proc.get("Id") or proc_uri.rsplit("/", 1)[-1]
+                    gpus.append((system_uri, gpu_id, ports_uri))
+        ports = self.walk_members([uri for _, _, uri in gpus], do_async=do_async,
+                                  inline=lambda m: False)
+
+        nvlink = [(system_uri, gpu_id, port_uri, port)
+                  for (system_uri, gpu_id, _), members in zip(gpus, ports)
+                  for port_uri, port in members
+                  if port.get("PortProtocol") == "NVLink"]
+        metric_uris = [self.link_uri(port, "Metrics") for *_, port in nvlink]
+        fetched = iter(self.fetch_resources([u for u in metric_uris if u], do_async=do_async))
+        metrics_data = [next(fetched) if u else None for u in metric_uris]
+
+        for (system_uri, gpu_id, port_uri, port), metrics in zip(nvlink, metrics_data):
+            metrics = metrics or {}
+            oem = (metrics.get("Oem") or {}).get("Nvidia") or {}
+            rows.append({
+                "System": system_uri.rsplit("/", 1)[-1],
+                "GPU": gpu_id,
+                "Port": port.get("Id") or port_uri.rsplit("/", 1)[-1],
+                "LinkState": port.get("LinkState"),
+                "LinkStatus": port.get("LinkStatus"),
+                "CurrentSpeedGbps": port.get("CurrentSpeedGbps"),
+                "MaxSpeedGbps": port.get("MaxSpeedGbps"),
+                "RXBytes": metrics.get("RXBytes"),
+                "TXBytes": metrics.get("TXBytes"),
+                "BitErrorRate": oem.get("BitErrorRate"),
+            })
         return CommandResult(rows, None, None, None)
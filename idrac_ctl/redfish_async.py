@@ -0,0 +1,198 @@
+"""Non-blocking Redfish transport for asyncio callers.
+
+The ``api_async_*`` helpers push blocking ``requests`` calls onto the default
+thread pool, so concurrency is capped by the executor and every in-flight
+request holds a thread. This module provides a client that awaits sockets
+directly through aiohttp, with one connection pool per event loop that all
+managers share, and a per-host limit so a walk over a whole subtree never
+hammers a single BMC with more than ``per_host_limit`` requests at a time.
+
+aiohttp is an optional dependency (``pip install idrac_ctl[async]``). Without
+it the client falls back to a bounded executor that runs the manager's
+pooled keep-alive session, with the same per-host limits, so callers can use
+the async API either way::
+
+    async def main(mgr):
+        chassis, systems = await asyncio.gather(
+            mgr.async_base_query("/redfish/v1/Chassis"),
+            mgr.async_base_query("/redfish/v1/Systems"))
+        await mgr.async_close()
+
+Author Mus spyroot@gmail.com
+"""
+import asyncio
+import base64
+import functools
+import importlib.util
+import json
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+# aiohttp takes longer to import than the rest of the CLI, it is only
+# imported once an async client sends its first request.
+HAS_AIOHTTP = importlib.util.find_spec("aiohttp") is not None
+
+DEFAULT_ASYNC_POOL_SIZE = 100
+DEFAULT_PER_HOST_LIMIT = 8
+
+_clients = weakref.WeakKeyDictionary()
+
+
+def basic_auth_header(username: str, password: str) -> str:
+    """Authorization header value for HTTP Basic auth, latin-1 like requests."""
+    token = base64.b64encode(f"{username}:{password}".encode("latin1")).decode("ascii")
+    return f"Basic {token}"
+
+
+class AsyncRedfishResponse:
+    """Fully read response exposing the subset of ``requests.Response``
+    that the managers' error handlers and parsers use."""
+
+    def __init__(self, status_code: int, headers, content: bytes, url: str = ""):
+        self.status_code = status_code
+        self.headers = CaseInsensitiveDict(headers or {})
+        self.content = content or b""
+        self.url = url
+
+    @property
+    def ok(self) -> bool:
+        return self.status_code < 400
+
+    @property
+    def text(self) -> str:
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self):
+        try:
+            return json.loads(self.content)
+        except json.JSONDecodeError as err:
+            raise requests.exceptions.JSONDecodeError(err.msg, err.doc, err.pos)
+
+    def __repr__(self):
+        return f"<AsyncRedfishResponse [{self.status_code}]>"
+
+
+class AsyncRedfishClient:
+    """Connection pool and per-host concurrency limits for one event loop."""
+
+    def __init__(self,
+                 pool_size: Optional[int] = DEFAULT_ASYNC_POOL_SIZE,
+                 per_host_limit: Optional[int] = DEFAULT_PER_HOST_LIMIT,
+                 use_aiohttp: Optional[bool] = None):
+        """
+        :param pool_size: max number of connections across all hosts.
+        :param per_host_limit: max number of in-flight requests per host.
+        :param use_aiohttp: force (True) or disable (False) the aiohttp
+            backend, None picks aiohttp when it is installed.
+        """
+        if pool_size < 1 or per_host_limit < 1:
+            raise ValueError("pool_size and per_host_limit must be positive")
+        if use_aiohttp and not HAS_AIOHTTP:
+            raise ImportError("aiohttp is not installed, pip install idrac_ctl[async]")
+        self.pool_size = pool_size
+        self.per_host_limit = per_host_limit
+        self.backend = "aiohttp" if HAS_AIOHTTP and use_aiohttp is not False \
+            else "executor"
+        self._host_limits: Dict[str, asyncio.Semaphore] = {}
+        self._session = None
+        self._executor = None
+
+    def _host_limit(self, url: str) -> asyncio.Semaphore:
+        host = urlsplit(url).netloc
+        sem = self._host_limits.get(host)
+        if sem is None:
+            sem = asyncio.Semaphore(self.per_host_limit)
+            self._host_limits[host] = sem
+        return sem
+
+    async def request(self,
+                      method: str,
+                      url: str,
+                      headers: Optional[Dict] = None,
+                      data: Optional[str] = None,
+                      auth: Optional[Tuple[str, str]] = None,
+                      verify: bool = False,
+                      http_session: Optional[requests.Session] = None) -> AsyncRedfishResponse:
+        """Send a request and read the whole body.
+
+        :param method: HTTP method
+        :param url: full url
+        :param headers: request headers
+        :param data: request body
+        :param auth: basic auth tuple, None when a token header is used
+        :param verify: verify the TLS certificate
+        :param http_session: keep-alive session for the executor backend
+        :return: AsyncRedfishResponse
+        """
+        async with self._host_limit(url):
+            if self.backend == "aiohttp":
+                return await self._aiohttp_request(method, url, headers, data, auth, verify)
+            return await self._executor_request(
+                method, url, headers, data, auth, verify, http_session)
+
+    async def _aiohttp_request(self, method, url, headers, data, auth, verify):
+        import aiohttp
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.pool_size, limit_per_host=self.per_host_limit)
+            self._session = aiohttp.ClientSession(connector=connector)
+        if auth is not None:
+            # aiohttp deprecates auth= and BasicAuth, send the header itself.
+            headers = dict(headers or {}, Authorization=basic_auth_header(*auth))
+        kwargs = {"headers": headers, "data": data}
+        if not verify:
+            kwargs["ssl"] = False
+        async with self._session.request(method, url, **kwargs) as resp:
+            body = await resp.read()
+            return AsyncRedfishResponse(resp.status, resp.headers, body, str(resp.url))
+
+    async def _executor_request(self, method, url, headers, data, auth, verify, http_session):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.pool_size, thread_name_prefix="redfish-async")
+        session = http_session if http_session is not None else requests
+        loop = asyncio.get_running_loop()
+        resp = await loop.run_in_executor(
+            self._executor, functools.partial(
+                session.request, method, url, headers=headers,
+                data=data, auth=auth, verify=verify))
+        return AsyncRedfishResponse(resp.status_code, resp.headers, resp.content, resp.url)
+
+    async def close(self):
+        """Close pooled connections and worker threads."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+def async_client(pool_size: Optional[int] = DEFAULT_ASYNC_POOL_SIZE,
+                 per_host_limit: Optional[int] = DEFAULT_PER_HOST_LIMIT,
+                 use_aiohttp: Optional[bool] = None) -> AsyncRedfishClient:
+    """Return the client shared by every manager on the running event loop.
+    Settings of the first caller win, so a caller that wants other limits
+    calls this before the first request.
+
+    :return: AsyncRedfishClient
+    """
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None:
+        client = AsyncRedfishClient(pool_size=pool_size, per_host_limit=per_host_limit,
+                                    use_aiohttp=use_aiohttp)
+        _clients[loop] = client
+    return client
+
+
+async def close_async_client():
+    """Close and forget the client of the running event loop."""
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.close()
@@ -0,0 +1,262 @@
+"""Redfish SessionService token authentication.
+
+With HTTP Basic auth a BMC re-validates the credentials on every request,
+often through PAM or LDAP. A Redfish session trades the credentials once for
+an X-Auth-Token that the BMC checks much faster.
+
+    POST /redfish/v1/SessionService/Sessions {"UserName": .., "Password": ..}
+    201 Created
+    X-Auth-Token: <token>
+    Location: /redfish/v1/SessionService/Sessions/<id>
+
+A session is kept per process and per BMC/user, so every command object the
+CLI instantiates uses the same token. When a request comes back 401 the token
+is refreshed once and the request is replayed. Sessions are deleted at
+process exit, unless the token cache is enabled, in which case the token is
+kept in a user only file under the idrac_ctl cache directory and reused by
+the next CLI invocation until the BMC expires it.
+
+If the service has no SessionService (404, 405 or 501 on login), the manager
+silently stays on Basic auth. Rejected credentials (401, 403) raise
+AuthenticationFailed. Any other failure, a connection error, a 503 or an
+answer without a token, uses Basic auth for that request only and the next
+request tries to log in again. A session is kept per BMC and user; a different
+password for the same user replaces it.
+
+Author Mus spyroot@gmail.com
+"""
+import atexit
+import json
+import logging
+import threading
+from typing import Dict, Optional, Tuple
+
+import requests
+
+from .cmd_exceptions import AuthenticationFailed
+from .cmd_utils import atomic_write_json, cache_dir
+from .redfish_shared import RedfishApi, RedfishJson, RedfishJsonSpec
+
+X_AUTH_TOKEN = "X-Auth-Token"
+TOKEN_CACHE_FILE = "tokens.json"
+# login answers of a service without a SessionService.
+UNSUPPORTED_STATUS = frozenset({404, 405, 501})
+
+_sessions: Dict[Tuple, "RedfishSessionAuth"] = {}
+_sessions_lock = threading.Lock()
+_cache_lock = threading.Lock()
+
+logger = logging.getLogger(__name__)
+
+
+def token_cache_path():
+    """Path to the on-disk token cache."""
+    return cache_dir(TOKEN_CACHE_FILE)
+
+
+def _read_token_cache() -> Dict:
+    try:
+        with open(token_cache_path()) as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _update_token_cache(cache_key: str, entry: Optional[Dict]):
+    """Store or drop (entry=None) one cached token."""
+    with _cache_lock:
+        data = _read_token_cache()
+        if entry is None:
+            if cache_key not in data:
+                return
+            data.pop(cache_key)
+        else:
+            data[cache_key] = entry
+        try:
+            atomic_write_json(token_cache_path(), data, mode=0o600)
+        except OSError as err:
+            logger.debug(f"failed to update token cache: {err}")
+
+
+class RedfishSessionAuth:
+    """X-Auth-Token session for one BMC and one user."""
+
+    def __init__(self,
+                 base_url: str,
+                 username: str,
+                 password: str,
+                 http_session: requests.Session,
+                 verify: bool = False,
+                 token_cache: bool = False):
+        """
+        :param base_url: scheme and host, i.e. https://10.0.0.1
+        :param username: redfish username
+        :param password: redfish password
+        :param http_session: keep-alive session used for login and logout
+        :param verify: TLS verification flag passed to requests
+        :param token_cache: persist the token across processes
+        """
+        self.base_url = base_url
+        self._username = username
+        self._password = password
+        self._http_session = http_session
+        self._verify = verify
+        self._token_cache = token_cache
+        self._lock = threading.Lock()
+        self.token = None
+        self.location = None
+        # set once the service answered that it has no SessionService
+        self.unsupported = False
+        self.logins = 0
+
+        if token_cache:
+            entry = _read_token_cache().get(self.cache_key)
+            if isinstance(entry, dict) and entry.get("token"):
+                self.token = entry["token"]
+                self.location = entry.get("location")
+
+    @property
+    def cache_key(self) -> str:
+        return f"{self.base_url} {self._username}"
+
+    def login(self) -> Optional[str]:
+        """Create a new session and return its token, None if the
+        service does not support sessions or the login failed this time.
+        :raise AuthenticationFailed: the service rejected the credentials
+        """
+        payload = json.dumps({"UserName": self._username, "Password": self._password})
+        try:
+            resp = self._http_session.post(
+                f"{self.base_url}{RedfishApi.Sessions}",
+                data=payload,
+                verify=self._verify,
+                headers={'Content-Type': 'application/json; charset=utf-8'},
+            )
+        except requests.exceptions.RequestException as err:
+            logger.debug(f"session login failed, basic auth until the next login: {err}")
+            self.token = None
+            return None
+
+        if resp.status_code in (401, 403):
+            self.token = None
+            raise AuthenticationFailed(
+                f"session login rejected for {self._username}, status {resp.status_code}")
+        if resp.status_code in UNSUPPORTED_STATUS:
+            logger.debug("SessionService unavailable, falling back to basic auth")
+            self.unsupported = True
+            self.token = None
+            return None
+        token = resp.headers.get(X_AUTH_TOKEN)
+        if resp.status_code not in (200, 201) or not token:
+            logger.debug(f"session login failed with status {resp.status_code}, "
+                         f"basic auth until the next login")
+            self.token = None
+            return None
+
+        location = resp.headers.get(RedfishJsonSpec.Location)
+        if not location:
+            try:
+                location = resp.json().get(RedfishJson.Data_id)
+            except ValueError:
+                location = None
+
+        self.token = token
+        self.location = location
+        self.logins += 1
+        if self._token_cache:
+            _update_token_cache(self.cache_key, {"token": token, "location": location})
+        return token
+
+    def current_token(self) -> Optional[str]:
+        """Return the session token, creating a session on first use."""
+        with self._lock:
+            if self.token is None and not self.unsupported:
+                self.login()
+            return self.token
+
+    def refresh(self, stale_token: Optional[str]) -> Optional[str]:
+        """Replace a token the BMC rejected. Concurrent callers that
+        saw the same stale token share a single login.
+        """
+        with self._lock:
+            if self.token is not None and self.token != stale_token:
+                return self.token
+            if self._token_cache:
+                _update_token_cache(self.cache_key, None)
+            self.token = None
+            self.unsupported = False
+            return self.login()
+
+    def logout(self):
+        """Delete the session on the BMC and drop the cached token."""
+        with self._lock:
+            token, location = self.token, self.location
+            self.token = None
+            self.location = None
+        if token is None:
+            return
+        if self._token_cache:
+            _update_token_cache(self.cache_key, None)
+        if not location:
+            return
+        if location.startswith("/"):
+            location = f"{self.base_url}{location}"
+        try:
+            self._http_session.delete(
+                location, verify=self._verify, headers={X_AUTH_TOKEN: token})
+        except requests.exceptions.RequestException as err:
+            logger.debug(f"session logout failed: {err}")
+
+
+def session_auth_for(base_url: str,
+                     username: str,
+                     password: str,
+                     http_session: requests.Session,
+                     verify: bool = False,
+                     token_cache: bool = False) -> RedfishSessionAuth:
+    """Return the process wide session for a BMC and user. A session
+    created with another password is logged out and replaced.
+    :return: RedfishSessionAuth
+    """
+    key = (base_url, username)
+    with _sessions_lock:
+        auth = _sessions.get(key)
+        if auth is not None and auth._password == password:
+            return auth
+        _sessions.pop(key, None)
+    if auth is not None:
+        # drops the cached token as well, the new password logs in on its own.
+        auth.logout()
+    with _sessions_lock:
+        auth = _sessions.get(key)
+        if auth is None or auth._password != password:
+            auth = RedfishSessionAuth(base_url, username, password, http_session,
+                                      verify=verify, token_cache=token_cache)
+            _sessions[key] = auth
+        return auth
+
+
+def close_sessions(keep_cached: bool = True):
+    """Delete every session this process created.
+
+    :param keep_cached: leave sessions backed by the token cache alive,
+        so the next invocation can reuse them.
+    """
+    with _sessions_lock:
+        sessions = list(_sessions.values())
+        _sessions.clear()
+    for auth in sessions:
+        if keep_cached and auth._token_cache:
+            continue
+        auth.logout()
+
+
+def forget_sessions():
+    """Drop every session without contacting the BMC, i.e. in a forked
+    child that must not log out its parent's sessions."""
+    with _sessions_lock:
+        _sessions.clear()
+
+
+atexit.register(close_sessions)
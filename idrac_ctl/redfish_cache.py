@@ -0,0 +1,299 @@
+"""Per-process Redfish resource cache with ETag revalidation.
+
+A single CLI invocation or exporter scrape reads the same documents many
+times: the service root for ``redfish_version`` and ``redfish_vendor``, the
+Chassis and Managers collections, the host system. Each read is a round trip
+plus a JSON parse. This module keeps parsed resources in a size bounded LRU
+keyed by the normalized URL, so::
+
+    fresh entry              -> no request at all
+    stale entry with an ETag -> GET with If-None-Match, a 304 skips the body
+                                transfer and the JSON parse
+    stale entry, no ETag     -> plain GET, the entry is replaced
+
+How long an entry stays fresh depends on the resource class. Static documents
+(service root, registries, schemas) live for minutes, inventory for a minute,
+and telemetry or job state is never served without revalidation. A
+``Cache-Control: max-age`` from the service overrides the class TTL and
+``no-store`` keeps a resource out of the cache.
+
+Any POST, PATCH or DELETE sent to a BMC drops every cached entry of that BMC,
+so a write is always visible to the next read. A long-lived process that
+serves many invocations expires the entries before each one: the daemon
+before every command, the exporters before every scrape. The ETags still
+save the transfer, a TTL never outlives the invocation.
+
+Author Mus spyroot@gmail.com
+"""
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+DEFAULT_CACHE_ENTRIES = 512
+
+# seconds an entry is served without asking the BMC, per resource class.
+DEFAULT_CACHE_TTLS = {
+    "static": 300.0,
+    "inventory": 60.0,
+    "telemetry": 0.0,
+    "volatile": 0.0,
+}
+
+# first match wins, anything else is inventory.
+_RESOURCE_CLASSES = (
+    ("telemetry", re.compile(
+        r"/(Sensors|Thermal|ThermalSubsystem|Power|PowerSubsystem|EnvironmentMetrics"
+        r"|Metrics|MetricReports|ProcessorMetrics|MemoryMetrics|PortMetrics)(/|$)", re.I)),
+    ("volatile", re.compile(
+        r"/(Tasks|Jobs|JobService|TaskService|Entries|Sessions|EventService)(/|$)", re.I)),
+    ("static", re.compile(
+        r"^/redfish/v1$|/(Registries|JsonSchemas|MetricDefinitions|Roles)(/|$)", re.I)),
+)
+
+_shared_cache = None
+_shared_lock = threading.Lock()
+
+
+def resource_class(path: str) -> str:
+    """Classify a resource path as static, inventory, telemetry or volatile.
+    :param path: resource path, i.e. /redfish/v1/Chassis/1/Sensors
+    :return: class name, a key of DEFAULT_CACHE_TTLS
+    """
+    for name, pattern in _RESOURCE_CLASSES:
+        if pattern.search(path):
+            return name
+    return "inventory"
+
+
+def normalize_url(url: str) -> Tuple[str, str]:
+    """Split a url into a cache host and a normalized resource.
+
+    Scheme and host are lower cased, duplicate slashes collapsed and a
+    trailing slash dropped, so /redfish/v1/ and /redfish/v1 share an entry.
+    The query string is kept since $expand or $select change the document.
+
+    :param url: full request url
+    :return: tuple of (scheme://host, path?query)
+    """
+    parts = urlsplit(url)
+    path = re.sub(r"/{2,}", "/", parts.path or "/")
+    if len(path) > 1:
+        path = path.rstrip("/") or "/"
+    resource = f"{path}?{parts.query}" if parts.query else path
+    return f"{parts.scheme.lower()}://{parts.netloc.lower()}", resource
+
+
+def parse_cache_control(value: Optional[str]) -> Dict[str, Optional[str]]:
+    """Parse a Cache-Control header into {directive: value}.
+    :param value: header value or None
+    :return: dict, i.e. {"max-age": "30", "no-cache": None}
+    """
+    directives = {}
+    for item in (value or "").split(","):
+        name, _, arg = item.strip().partition("=")
+        if name:
+            directives[name.lower()] = arg.strip('"') if arg else None
+    return directives
+
+
+def _clone(obj):
+    """Copy a parsed JSON document, much cheaper than copy.deepcopy."""
+    if isinstance(obj, dict):
+        return {k: _clone(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [_clone(v) for v in obj]
+    return obj
+
+
+class CacheEntry:
+    """One cached resource."""
+
+    __slots__ = ("data", "etag", "allow", "expires", "resource_class")
+
+    def __init__(self, data, etag, allow, expires, resource_class):
+        self.data = data
+        self.etag = etag
+        self.allow = allow
+        self.expires = expires
+        self.resource_class = resource_class
+
+    def is_fresh(self, now: Optional[float] = None) -> bool:
+        return (now if now is not None else time.monotonic()) < self.expires
+
+
+class ResourceCache:
+    """Thread safe LRU of parsed Redfish resources."""
+
+    def __init__(self,
+                 max_entries: Optional[int] = DEFAULT_CACHE_ENTRIES,
+                 ttls: Optional[Dict[str, float]] = None):
+        """
+        :param max_entries: max number of resources kept, least recently used go first.
+        :param ttls: per resource class TTL in seconds, merged over DEFAULT_CACHE_TTLS.
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be positive")
+        self.max_entries = max_entries
+        self.ttls = dict(DEFAULT_CACHE_TTLS)
+        self.ttls.update(ttls or {})
+        self._entries: "OrderedDict[Tuple, CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "revalidated": 0,
+                       "stores": 0, "evictions": 0, "invalidations": 0}
+
+    @staticmethod
+    def key(url: str, username: Optional[str] = None) -> Tuple:
+        """Cache key of a request url, scoped to a user since a
+        BMC may return different documents per role."""
+        host, resource = normalize_url(url)
+        return host, username or "", resource
+
+    def _count(self, name: str, n: int = 1):
+        self._stats[name] += n
+
+    def lookup(self, key: Tuple) -> Optional[CacheEntry]:
+        """Return the entry for a key, fresh or stale, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._count("misses")
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def read(self, entry: CacheEntry, revalidated: bool = False):
+        """Return a private copy of an entry's document and count the hit.
+        :param entry: entry returned by lookup
+        :param revalidated: the entry was confirmed by a 304
+        :return: parsed document
+        """
+        with self._lock:
+            self._count("revalidated" if revalidated else "hits")
+        return _clone(entry.data)
+
+    def ttl_for(self, resource: str, headers=None) -> Optional[float]:
+        """TTL of a response, None when it must not be cached.
+        :param resource: normalized resource path
+        :param headers: response headers
+        :return: seconds or None
+        """
+        directives = parse_cache_control((headers or {}).get("Cache-Control"))
+        if "no-store" in directives:
+            return None
+        if "no-cache" in directives:
+            return 0.0
+        max_age = directives.get("max-age")
+        if max_age is not None:
+            try:
+                return max(0.0, float(max_age))
+            except ValueError:
+                pass
+        return self.ttls.get(resource_class(resource.split("?", 1)[0]),
+                             self.ttls["inventory"])
+
+    def store(self, key: Tuple, data, headers=None, allow=None):
+        """Cache a freshly parsed document.
+        :param key: cache key
+        :param data: parsed json
+        :param headers: response headers, for ETag and Cache-Control
+        :param allow: Allow header kept next to the document
+        """
+        ttl = self.ttl_for(key[2], headers)
+        etag = (headers or {}).get("ETag")
+        if ttl is None or (ttl <= 0 and not etag):
+            # nothing to gain, the next read would refetch the body anyway.
+            with self._lock:
+                self._entries.pop(key, None)
+            return
+        entry = CacheEntry(_clone(data), etag, allow, time.monotonic() + ttl,
+                           resource_class(key[2].split("?", 1)[0]))
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            self._count("stores")
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._count("evictions")
+
+    def refresh(self, key: Tuple, entry: CacheEntry, headers=None):
+        """Extend an entry after the BMC answered 304 Not Modified."""
+        ttl = self.ttl_for(key[2], headers)
+        entry.expires = time.monotonic() + (ttl or 0.0)
+        etag = (headers or {}).get("ETag")
+        if etag:
+            entry.etag = etag
+
+    def expire(self, url: Optional[str] = None):
+        """Mark every entry of the url's BMC stale, or every entry when url
+        is None. Entries with an ETag are revalidated by the next read, the
+        others are fetched again."""
+        host = normalize_url(url)[0] if url is not None else None
+        with self._lock:
+            for key, entry in self._entries.items():
+                if host is None or key[0] == host:
+                    entry.expires = 0.0
+
+    def invalidate(self, url: Optional[str] = None):
+        """Drop every entry of the url's BMC, or everything when url is None."""
+        with self._lock:
+            if url is None:
+                dropped = len(self._entries)
+                self._entries.clear()
+            else:
+                host, _ = normalize_url(url)
+                stale = [k for k in self._entries if k[0] == host]
+                for k in stale:
+                    del self._entries[k]
+                dropped = len(stale)
+            if dropped:
+                self._count("invalidations", dropped)
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit, miss, 304 revalidation and eviction counters."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = len(self._entries)
+        return stats
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def shared_resource_cache() -> ResourceCache:
+    """Return the process wide resource cache.
+    :return: ResourceCache
+    """
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = ResourceCache()
+        return _shared_cache
+
+
+def expire_resource_cache(url: Optional[str] = None):
+    """Mark the entries of the url's BMC, or every entry when url is None,
+    of the process wide resource cache stale, if there is one."""
+    with _shared_lock:
+        cache = _shared_cache
+    if cache is not None:
+        cache.expire(url)
+
+
+def invalidate_resource_cache(url: str):
+    """Drop every entry of the url's BMC from the process wide resource cache,
+    if there is one. Called on every write, whether the writer reads through
+    the cache or not, since other managers of the BMC may."""
+    with _shared_lock:
+        cache = _shared_cache
+    if cache is not None:
+        cache.invalidate(url)
+
+
+def clear_resource_cache():
+    """Forget the process wide resource cache."""
+    global _shared_cache
+    with _shared_lock:
+        _shared_cache = None
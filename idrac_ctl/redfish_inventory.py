@@ -0,0 +1,187 @@
+"""On-disk inventory cache shared by idrac_ctl invocations.
+
+Every CLI invocation used to start cold. Before the command runs, main()
+reads the service root and the Dell LC service, resolves the manager, the
+host system and the chassis through a chain of cached properties, and asks
+for the vendor and firmware, which costs 4 to 8 GETs per call. Scripts that
+call idrac_ctl dozens of times per host pay that on every call.
+
+This module keeps those slow changing facts on disk, one directory per BMC::
+
+    ~/.cache/idrac_ctl/<bmc>/
+        _meta.json             firmware fingerprint and when it was checked
+        idrac_members.json     /redfish/v1/Managers/iDRAC.Embedded.1
+        idrac_manage_servers.json
+        res_redfish_v1.json    service root
+        res_redfish_v1_Registries_....json
+
+Each entry has a TTL and records the firmware it was read under. The
+firmware version is re-checked every ``fingerprint_ttl`` seconds; when it
+changed, every entry of the BMC is dropped, since an update can move ids
+and registries. Files are written with a rename, so concurrent invocations
+never read a partial file, and an entry written under another firmware is
+ignored.
+
+Author Mus spyroot@gmail.com
+"""
+import json
+import logging
+import re
+import time
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+from .cmd_utils import atomic_write_json, cache_dir
+
+# seconds an entry stays valid, per kind of data.
+DEFAULT_INVENTORY_TTLS = {
+    "ids": 24 * 3600.0,
+    "resource": 24 * 3600.0,
+    "registry": 7 * 24 * 3600.0,
+}
+
+# seconds between two firmware version checks.
+DEFAULT_FINGERPRINT_TTL = 600.0
+
+META_FILE = "_meta.json"
+
+logger = logging.getLogger(__name__)
+
+
+def _safe_name(name: str) -> str:
+    """Turn a bmc address or a resource path into a file name."""
+    return re.sub(r"[^A-Za-z0-9._-]+", "_", name).strip("_") or "_"
+
+
+class InventoryCache:
+    """Cached inventory of one BMC."""
+
+    def __init__(self,
+                 bmc: str,
+                 fingerprint: Optional[Callable[[], str]] = None,
+                 ttls: Optional[Dict[str, float]] = None,
+                 fingerprint_ttl: Optional[float] = DEFAULT_FINGERPRINT_TTL,
+                 root: Optional[Path] = None):
+        """
+        :param bmc: bmc address, host or host:port
+        :param fingerprint: returns the current firmware version, called at
+            most once every fingerprint_ttl seconds.
+        :param ttls: per kind TTL in seconds, merged over DEFAULT_INVENTORY_TTLS.
+        :param fingerprint_ttl: seconds between two firmware checks.
+        :param root: cache directory, defaults to cache_dir()
+        """
+        self.bmc = bmc
+        self.path = Path(root if root is not None else cache_dir()) / _safe_name(bmc)
+        self.ttls = dict(DEFAULT_INVENTORY_TTLS)
+        self.ttls.update(ttls or {})
+        self.fingerprint_ttl = fingerprint_ttl
+        self._fingerprint = fingerprint
+        self._firmware = None
+        self._validating = False
+
+    def _file(self, name: str) -> Path:
+        return self.path / f"{_safe_name(name)}.json"
+
+    @staticmethod
+    def _read(path: Path) -> Optional[dict]:
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return data if isinstance(data, dict) else None
+
+    def _write(self, path: Path, data: dict):
+        try:
+            atomic_write_json(path, data)
+        except OSError as err:
+            logger.debug(f"failed to write {path}: {err}")
+
+    @property
+    def firmware(self) -> Optional[str]:
+        """Firmware version the cached entries belong to, re-checked
+        once the fingerprint TTL expired. None while it is being checked."""
+        if self._firmware is not None or self._validating:
+            return self._firmware
+
+        now = time.time()
+        meta = self._read(self.path / META_FILE) or {}
+        if (meta.get("firmware") is not None
+                and now - meta.get("checked", 0) < self.fingerprint_ttl):
+            self._firmware = meta["firmware"]
+            return self._firmware
+
+        current = ""
+        if self._fingerprint is not None:
+            # the fingerprint may itself go through the cache, don't recurse.
+            self._validating = True
+            try:
+                current = self._fingerprint() or ""
+            except Exception as err:
+                logger.debug(f"firmware fingerprint failed: {err}")
+                current = meta.get("firmware") or ""
+            finally:
+                self._validating = False
+
+        if meta.get("firmware") is not None and meta["firmware"] != current:
+            logger.info(f"{self.bmc} firmware changed "
+                        f"{meta['firmware']} -> {current}, dropping inventory cache")
+            self.clear()
+        self._write(self.path / META_FILE, {"firmware": current, "checked": now})
+        self._firmware = current
+        return current
+
+    def get(self, name: str):
+        """Return a cached value, or None when missing, expired or
+        written under another firmware."""
+        firmware = self.firmware
+        if firmware is None:
+            return None
+        entry = self._read(self._file(name))
+        if entry is None or entry.get("firmware") != firmware:
+            return None
+        if time.time() - entry.get("stored", 0) >= entry.get("ttl", 0):
+            return None
+        return entry.get("value")
+
+    def put(self, name: str, value, kind: Optional[str] = "ids"):
+        """Store a json serializable value.
+        :param name: entry name
+        :param value: value, None or an empty value is not stored
+        :param kind: ids, resource or registry, selects the TTL
+        """
+        if value is None or value == "" or value == [] or value == {}:
+            return
+        firmware = self.firmware
+        if firmware is None:
+            return
+        self._write(self._file(name), {
+            "firmware": firmware,
+            "stored": time.time(),
+            "ttl": self.ttls.get(kind, self.ttls["ids"]),
+            "value": value,
+        })
+
+    def cached(self, name: str, compute: Callable, kind: Optional[str] = "ids"):
+        """Return a cached value or compute and store it.
+        :param name: entry name
+        :param compute: called without arguments on a miss
+        :param kind: ids, resource or registry
+        :return: value
+        """
+        value = self.get(name)
+        if value is None:
+            value = compute()
+            self.put(name, value, kind)
+        return value
+
+    def clear(self):
+        """Drop every entry of this BMC."""
+        if not self.path.is_dir():
+            return
+        for f in self.path.glob("*.json"):
+            try:
+                f.unlink()
+            except OSError:
+                pass
+        self._firmware = None
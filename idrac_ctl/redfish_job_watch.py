@@ -0,0 +1,295 @@
+"""Watch many jobs on many BMCs from one asyncio loop.
+
+``fetch_task`` follows one task at a time. During a rolling BIOS or firmware
+change there are hundreds of job ids in flight, and one GET per job per tick
+does not scale. ``JobBatchWatcher`` polls the expanded Jobs collection of
+each BMC instead, the same ``Jobs?$expand=*($levels=1)`` query the ``jobs``
+command sends, and updates every outstanding job on that BMC from that one
+answer. Traffic grows with the number of BMCs, not with the number of jobs.
+
+    watcher = JobBatchWatcher(interval=5)
+    watcher.add(mgr_a, ["JID_1", "JID_2"])
+    watcher.add(mgr_b, ["JID_9"])
+    async for change in watcher.transitions():
+        print(change.as_dict())
+
+Every BMC runs its own poll loop on the event loop, so a slow BMC never
+delays the others, and all loops feed one stream of ``JobTransition``. The
+first answer reports each job's current state (previous state Unknown).
+A job leaves the watch once it reaches a terminal state, or once it is
+missing from the collection for ``missing_ticks`` ticks in a row (deleted).
+A Jobs collection the BMC splits in pages is read to its last page through
+``Members@odata.nextLink``. A member the BMC did not expand is fetched on its
+own, only while it is still watched. A Retry-After on the collection delays the next tick of that
+BMC, and an error ends the watch of its jobs with the error in the
+transition.
+
+Author Mus spyroot@gmail.com
+"""
+import asyncio
+import logging
+import time
+from dataclasses import asdict, dataclass
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Tuple
+
+from .idrac_shared import JobState
+from .redfish_async import close_async_client
+from .redfish_task_wait import retry_after_seconds
+
+# seconds between two polls of the Jobs collection of one BMC.
+DEFAULT_INTERVAL = 5.0
+# ticks a watched job may be missing from the collection before it counts as gone.
+DEFAULT_MISSING_TICKS = 3
+JOBS_EXPAND = "?$expand=*($levels=1)"
+
+TERMINAL_JOB_STATES = frozenset({
+    JobState.Completed,
+    JobState.CompletedWithErrors,
+    JobState.Failed,
+    JobState.RebootFailed,
+    JobState.RebootCompleted,
+})
+
+logger = logging.getLogger(__name__)
+
+
+def job_state(doc: dict) -> JobState:
+    """JobState of a job document, Unknown when absent or not a known state."""
+    try:
+        return JobState(doc.get("JobState"))
+    except ValueError:
+        return JobState.Unknown
+
+
+@dataclass
+class JobTransition:
+    """A watched job changed state."""
+
+    target: str
+    job_id: str
+    previous: JobState
+    state: JobState
+    percent: Optional[int] = None
+    message: Optional[str] = None
+    # seconds since the watch started.
+    seconds: float = 0.0
+    # set when the watch of the job ended on an error instead of a state.
+    error: Optional[str] = None
+    # the job is no longer watched after this transition.
+    final: bool = False
+
+    def as_dict(self) -> dict:
+        data = asdict(self)
+        data["previous"] = self.previous.value
+        data["state"] = self.state.value
+        return data
+
+
+class _Bmc:
+    """Outstanding jobs of one BMC."""
+
+    def __init__(self, manager):
+        self.manager = manager
+        self.target = manager.idrac_ip
+        self.states: Dict[str, JobState] = {}
+        self.missing: Dict[str, int] = {}
+        self.collection: Optional[str] = None
+
+
+class JobBatchWatcher:
+    """One Jobs collection poll per BMC per tick, see the module docstring."""
+
+    def __init__(self,
+                 interval: Optional[float] = DEFAULT_INTERVAL,
+                 terminal: Iterable[JobState] = TERMINAL_JOB_STATES,
+                 missing_ticks: Optional[int] = DEFAULT_MISSING_TICKS,
+                 timeout: Optional[float] = None):
+        """
+        :param interval: seconds between two polls of one BMC
+        :param terminal: states that end the watch of a job
+        :param missing_ticks: ticks a job may be absent before it counts as deleted
+        :param timeout: seconds after which the remaining jobs stop being watched
+        """
+        self.interval = interval
+        self.terminal = frozenset(terminal)
+        self.missing_ticks = missing_ticks
+        self.timeout = timeout
+        # GETs sent, collections and unexpanded members together.
+        self.requests = 0
+        # Jobs collection GETs, one per BMC per tick.
+        self.polls = 0
+        self.final: Dict[str, Dict[str, JobState]] = {}
+        self._bmcs: Dict[str, _Bmc] = {}
+        self._start = 0.0
+
+    def add(self, manager, job_ids: Iterable[str], collection: Optional[str] = None):
+        """Watch jobs of the BMC a manager talks to.
+
+        :param manager: IDracManager bound to the BMC
+        :param job_ids: job ids, JID_744718373591
+        :param collection: Jobs collection path, the manager's ``{idrac_members}/Jobs``
+                           by default
+        """
+        bmc = self._bmcs.get(manager.idrac_ip)
+        if bmc is None:
+            bmc = self._bmcs[manager.idrac_ip] = _Bmc(manager)
+        if collection is not None:
+            bmc.collection = collection
+        for job_id in job_ids:
+            bmc.states.setdefault(job_id, JobState.Unknown)
+
+    @property
+    def watched(self) -> int:
+        """Jobs still watched."""
+        return sum(len(bmc.states) for bmc in self._bmcs.values())
+
+    def _transition(self, bmc: _Bmc, job_id: str, state: JobState,
+                    doc: Optional[dict] = None, error: Optional[str] = None,
+                    gone: bool = False) -> JobTransition:
+        doc = doc or {}
+        percent = doc.get("PercentComplete")
+        final = gone or error is not None or state in self.terminal
+        change = JobTransition(bmc.target, job_id, bmc.states.get(job_id, JobState.Unknown), state,
+                               percent if isinstance(percent, int) else None,
+                               doc.get("Message"), round(time.monotonic() - self._start, 3),
+                               error, final)
+        if final:
+            bmc.states.pop(job_id, None)
+            bmc.missing.pop(job_id, None)
+            self.final.setdefault(bmc.target, {})[job_id] = state
+        else:
+            bmc.states[job_id] = state
+        return change
+
+    async def _get(self, bmc: _Bmc, path: str):
+        manager = bmc.manager
+        self.requests += 1
+        return await manager.async_http_request(
+            "GET", f"{manager._default_method}{manager.idrac_ip}{path}", {})
+
+    async def _members(self, bmc: _Bmc) -> Tuple[Optional[Dict[str, dict]], Optional[float]]:
+        """Job documents by id from one collection poll and the Retry-After
+        of the answer. Documents are None when the BMC asked to retry later."""
+        self.polls += 1
+        resp = await self._get(bmc, f"{bmc.collection}{JOBS_EXPAND}")
+        retry_after = retry_after_seconds(resp.headers)
+        bmc.manager.default_error_handler(resp)
+        if resp.status_code == 202:
+            return None, retry_after
+        body = resp.json()
+        members = list(body.get("Members", []))
+        next_link = body.get("Members@odata.nextLink")
+        if next_link:
+            async for page in bmc.manager.async_iter_collection_pages(next_link):
+                self.requests += 1
+                members.extend(page.get("Members", []))
+        docs, unexpanded = {}, []
+        for member in members:
+            uri = member.get("@odata.id", "")
+            job_id = member.get("Id") or uri.rstrip("/").rsplit("/", 1)[-1]
+            if "JobState" in member:
+                docs[job_id] = member
+            elif job_id in bmc.states:
+                unexpanded.append((job_id, uri))
+        # the BMC ignored $expand: fetch only the members still watched.
+        answers = await asyncio.gather(*[self._get(bmc, uri) for _, uri in unexpanded])
+        for (job_id, _), member_resp in zip(unexpanded, answers):
+            if member_resp.status_code == 200:
+                docs[job_id] = member_resp.json()
+        return docs, retry_after
+
+    def _tick(self, bmc: _Bmc, docs: Dict[str, dict]) -> List[JobTransition]:
+        changes = []
+        for job_id in list(bmc.states):
+            doc = docs.get(job_id)
+            if doc is None:
+                bmc.missing[job_id] = bmc.missing.get(job_id, 0) + 1
+                if bmc.missing[job_id] >= self.missing_ticks:
+                    changes.append(self._transition(bmc, job_id, JobState.Unknown, gone=True))
+                continue
+            bmc.missing.pop(job_id, None)
+            state = job_state(doc)
+            if state != bmc.states[job_id]:
+                changes.append(self._transition(bmc, job_id, state, doc))
+        return changes
+
+    async def _watch(self, bmc: _Bmc, queue: asyncio.Queue):
+        loop = asyncio.get_running_loop()
+        try:
+            if bmc.collection is None:
+                members = await loop.run_in_executor(None, lambda: bmc.manager.idrac_members)
+                bmc.collection = f"{members}/Jobs"
+            while bmc.states:
+                docs, retry_after = await self._members(bmc)
+                if docs is not None:
+                    for change in self._tick(bmc, docs):
+                        await queue.put(change)
+                if not bmc.states:
+                    break
+                if self.timeout is not None and time.monotonic() - self._start >= self.timeout:
+                    logger.info(f"{bmc.target}: stopped watching {len(bmc.states)} jobs")
+                    break
+                await asyncio.sleep(max(self.interval or 0.0, retry_after or 0.0))
+        except asyncio.CancelledError:
+            raise
+        except Exception as err:
+            logger.error(f"{bmc.target}: job watch failed: {type(err).__name__}: {err}")
+            for job_id in list(bmc.states):
+                await queue.put(self._transition(bmc, job_id, bmc.states[job_id],
+                                                 error=f"{type(err).__name__}: {err}"))
+        finally:
+            await queue.put(None)
+
+    async def transitions(self) -> AsyncIterator[JobTransition]:
+        """Stream the state transitions of every watched job as they happen.
+        The stream ends once no job is left or the timeout passed."""
+        self._start = time.monotonic()
+        queue: asyncio.Queue = asyncio.Queue()
+        bmcs = [bmc for bmc in self._bmcs.values() if bmc.states]
+        tasks = [asyncio.ensure_future(self._watch(bmc, queue)) for bmc in bmcs]
+        running = len(tasks)
+        try:
+            while running:
+                change = await queue.get()
+                if change is None:
+                    running -= 1
+                    continue
+                yield change
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def run(self, on_transition=None) -> Dict[str, Dict[str, JobState]]:
+        """Watch until every job ended.
+
+        :param on_transition: called with every JobTransition
+        :return: final state of each job, by target and job id
+        """
+        async for change in self.transitions():
+            if on_transition is not None:
+                on_transition(change)
+        return self.final
+
+
+def watch_jobs(jobs: Dict[object, Iterable[str]],
+               on_transition=None,
+               **kwargs) -> Dict[str, Dict[str, JobState]]:
+    """Blocking face of ``JobBatchWatcher.run`` on a new event loop.
+
+    :param jobs: job ids to watch, keyed by the IDracManager of their BMC
+    :param on_transition: called with every JobTransition
+    :param kwargs: JobBatchWatcher options
+    :return: final state of each job, by target and job id
+    """
+    watcher = JobBatchWatcher(**kwargs)
+    for manager, job_ids in jobs.items():
+        watcher.add(manager, job_ids)
+
+    async def run():
+        try:
+            return await watcher.run(on_transition)
+        finally:
+            await close_async_client()
+
+    return asyncio.run(run())
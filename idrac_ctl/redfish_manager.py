@@ -8,23 +8,44 @@ Author Mus spyroot@gmail.com
 
 import asyncio
 import collections
+import copy
 import functools
 import logging
 import re
+import threading
+import urllib.parse
 from abc import abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from functools import cached_property
-from typing import Dict, Optional
+from typing import AsyncIterator, Dict, Iterator, Optional, Tuple
 
 import requests
 
-from .cmd_exceptions import AuthenticationFailed, ResourceNotFound, TaskIdUnavailable
+from .cmd_exceptions import (
+    AuthenticationFailed,
+    ResourceNotFound,
+    TaskIdUnavailable,
+    UnexpectedResponse,
+)
 from .cmd_utils import save_if_needed
+from .redfish_async import AsyncRedfishResponse, async_client, close_async_client
+from .redfish_auth import X_AUTH_TOKEN, RedfishSessionAuth, session_auth_for
+from .redfish_cache import (
+    CacheEntry,
+    ResourceCache,
+    invalidate_resource_cache,
+    normalize_url,
+    resource_class,
+    shared_resource_cache,
+)
 from .redfish_exceptions import (
     RedfishForbidden,
     RedfishMethodNotAllowed,
     RedfishNotAcceptable,
     RedfishUnauthorized,
 )
+from .redfish_inventory import InventoryCache
+from .redfish_pool import DEFAULT_POOL_SIZE, new_session, session_stats, shared_session
 from .redfish_query import RedfishQuery
 from .redfish_respond import RedfishRespondMessage
 from .redfish_respond_error import RedfishError
@@ -40,6 +61,68 @@ from .redfish_shared import (
 CommandResult = collections.namedtuple("cmd_result",
                                        ("data", "discovered", "extra", "error"))
 
+# query_counter is bumped from walk, paging and task poll worker threads.
+_query_counter_lock = threading.Lock()
+
+
+class _PageCursor:
+    """Paging state of one collection read, see RedfishManager.iter_collection_pages."""
+
+    def __init__(self,
+                 resource: str,
+                 page_size: Optional[int],
+                 query: Optional[RedfishQuery],
+                 limit: Optional[int],
+                 one_param_per_uri: Optional[bool],
+                 fallback: Optional[RedfishQuery]):
+        self.resource = resource
+        self.limit = limit
+        self.one_param_per_uri = one_param_per_uri
+        self.query = copy.copy(query) if query is not None else RedfishQuery()
+        self.paged = bool(page_size) and "?" not in resource and (
+            self.query.is_empty() or not one_param_per_uri)
+        if self.paged:
+            self.query.top = page_size if limit is None else max(1, min(page_size, limit))
+            self.query.skip = 0
+            if one_param_per_uri:
+                # $top and $skip are two parameters, the first window needs only one.
+                self.query.skip = None
+        self.first = self.query.apply(resource, one_param_per_uri)
+        self.plain = fallback.apply(resource) if fallback is not None else resource
+        self.seen = 0
+
+    def refused(self) -> Optional[str]:
+        """Path read after the service refused the first page, None when
+        there is nothing else to try."""
+        if self.first == self.plain:
+            return None
+        self.paged = False
+        return self.plain
+
+    def _window(self, skip: int) -> str:
+        self.query.skip = skip
+        if self.one_param_per_uri:
+            # past the first window, skip alone: the service answers the rest
+            # or links it, no further window follows.
+            self.paged = False
+            return self.resource + RedfishQuery(skip=skip).to_query_string()
+        return self.query.apply(self.resource)
+
+    def next_path(self, page: dict) -> Optional[str]:
+        """Count the members of a page and return the path of the next one,
+        None once the collection or the limit is exhausted."""
+        members = page.get(RedfishJson.Members)
+        count = len(members) if isinstance(members, list) else 0
+        self.seen += count
+        next_link = page.get(RedfishJson.MembersNext)
+        if self.limit is not None and self.seen >= self.limit:
+            return None
+        if isinstance(next_link, str) and next_link:
+            return urllib.parse.urlsplit(next_link)._replace(scheme="", netloc="").geturl()
+        if self.paged and count and count >= (self.query.top or 0):
+            return self._window(self.seen)
+        return None
+
 
 class RedfishManager:
 
@@ -51,7 +134,14 @@ class RedfishManager:
                  insecure: Optional[bool] = True,
                  is_http: Optional[bool] = False,
                  x_auth: Optional[str] = None,
-                 is_debug: Optional[bool] = False):
+                 is_debug: Optional[bool] = False,
+                 pool_size: Optional[int] = DEFAULT_POOL_SIZE,
+                 shared_pool: Optional[bool] = True,
+                 session_auth: Optional[bool] = False,
+                 token_cache: Optional[bool] = False,
+                 resource_cache: Optional[bool] = False,
+                 inventory_cache: Optional[bool] = False,
+                 replay: Optional[str] = None):
         """Default constructor for Redfish Manager.
            it requires a credentials to interact with redfish endpoint.
            By default, Redfish Manager uses json to serialize a data to callee
@@ -64,7 +154,25 @@ class RedfishManager:
             skipped. BMCs ship self-signed certificates, so verification is
             opt-in: pass ``insecure=False`` to verify the server certificate.
         :param x_auth: X-Authentication header.
+        :param pool_size: max number of keep-alive connections kept to the endpoint.
+        :param shared_pool: when True (the default) the keep-alive session is shared
+            by every manager in the process that talks to the same endpoint,
+            otherwise the manager owns a private session.
+        :param session_auth: authenticate with a SessionService X-Auth-Token
+            instead of sending basic credentials on every request.
+        :param token_cache: keep the session token in the local token cache so
+            the next process reuses it, instead of deleting the session on exit.
+        :param resource_cache: serve repeated GETs from the process wide resource
+            cache and revalidate stale entries with If-None-Match.
+        :param inventory_cache: keep the service root, registries and resolved
+            ids on disk for the next invocation, see redfish_inventory.
+        :param replay: snapshot file or crawl directory that answers requests
+            instead of the endpoint, see redfish_replay. Session auth and the
+            caches are off for a replay.
         """
+        self._replay = replay
+        if replay:
+            session_auth = token_cache = resource_cache = inventory_cache = False
         self._redfish_ip = redfish_ip
         self._username = redfish_username
         self._password = redfish_password
@@ -96,6 +204,16 @@ class RedfishManager:
         self._manage_chassis_obs = []
         # mainly to track query sent , for unit test
         self.query_counter = 0
+        # keep-alive pool, created on first request. see connection_stats()
+        self._pool_size = pool_size
+        self._shared_pool = shared_pool
+        self._http_session = None
+        self._session_auth = session_auth
+        self._token_cache = token_cache
+        self._auth = None
+        self._resource_cache = resource_cache
+        self._inventory_cache = inventory_cache
+        self._inventory = None
         # run time
         self.action_targets = None
         self.api_endpoints = None
@@ -166,36 +284,217 @@ class RedfishManager:
             return True
         RedfishManager.redfish_error_handlers(response.status_code)
 
-    async def api_async_get_call(self, loop, req, hdr: Dict):
-        """Make api request either with x-auth authentication header or base authentication
-        to redfish endpoint.
+    @property
+    def http_session(self) -> requests.Session:
+        """Keep-alive session used for every request to this endpoint.
+        :return: requests.Session
+        """
+        if self._http_session is None:
+            if self._replay:
+                from .redfish_replay import replay_session
+                self._http_session = replay_session(self._replay)
+            elif self._shared_pool:
+                key = (self._default_method, self.redfish_ip, self._username)
+                self._http_session = shared_session(key, self._pool_size)
+            else:
+                self._http_session = new_session(self._pool_size)
+        return self._http_session
 
-        :param loop: asyncio event loop
+    @property
+    def session_auth(self) -> Optional[RedfishSessionAuth]:
+        """SessionService token holder, None when basic auth is used.
+        :return: RedfishSessionAuth or None
+        """
+        if not self._session_auth:
+            return None
+        if self._auth is None:
+            self._auth = session_auth_for(
+                f"{self._default_method}{self.redfish_ip}",
+                self._username, self._password, self.http_session,
+                verify=self._is_verify_cert, token_cache=self._token_cache)
+        return self._auth
+
+    @property
+    def resource_cache(self) -> Optional[ResourceCache]:
+        """Process wide resource cache, None when caching is off.
+        :return: ResourceCache or None
+        """
+        if not self._resource_cache:
+            return None
+        return shared_resource_cache()
+
+    @property
+    def inventory(self) -> Optional[InventoryCache]:
+        """On-disk inventory cache of this BMC, None when it is off.
+        :return: InventoryCache or None
+        """
+        if not self._inventory_cache:
+            return None
+        if self._inventory is None:
+            self._inventory = InventoryCache(
+                self.redfish_ip, fingerprint=self.firmware_fingerprint)
+        return self._inventory
+
+    def firmware_fingerprint(self) -> str:
+        """Firmware version of the first manager, used to tell that
+        the inventory cached on disk is still valid.
+        :return: firmware version or empty string
+        """
+        managers = self.base_query(RedfishApi.Managers, key=RedfishJson.Members).data
+        if not isinstance(managers, list) or not managers:
+            return ""
+        uri = managers[0].get(RedfishJson.Data_id) if isinstance(managers[0], dict) else None
+        if not uri:
+            return ""
+        firmware = self.base_query(uri, key="FirmwareVersion").data
+        return firmware if isinstance(firmware, str) else ""
+
+    def _inventory_value(self, name: str, compute, kind: Optional[str] = "ids"):
+        """Return compute() through the inventory cache when it is on."""
+        inventory = self.inventory
+        if inventory is None:
+            return compute()
+        return inventory.cached(name, compute, kind)
+
+    def _inventory_name(self, req: str) -> Optional[str]:
+        """Inventory entry name of a static resource, None for anything
+        that must not outlive the process."""
+        if self.inventory is None:
+            return None
+        _, resource = normalize_url(req)
+        if resource_class(resource.split("?", 1)[0]) != "static":
+            return None
+        return f"res{resource}"
+
+    def _cache_lookup(self, req: str, headers: Dict) -> Tuple:
+        """Look a GET up in the resource cache. A stale entry with an ETag
+        adds If-None-Match to headers so the BMC can answer 304.
+
+        :param req: full request url
+        :param headers: request headers, updated in place
+        :return: tuple of (key, entry, fresh) where fresh is True when
+                 the entry can be served without a request.
+        """
+        cache = self.resource_cache
+        if cache is None:
+            return None, None, False
+        key = cache.key(req, self._username)
+        entry = cache.lookup(key)
+        if entry is None:
+            return key, None, False
+        if entry.is_fresh():
+            return key, entry, True
+        if entry.etag:
+            headers["If-None-Match"] = entry.etag
+        return key, entry, False
+
+    def _cache_response(self,
+                        key: Optional[Tuple],
+                        entry: Optional[CacheEntry],
+                        response,
+                        check_status: Optional[bool] = True) -> Tuple:
+        """Turn a GET response into (data, allow header), reusing the cached
+        document on 304 Not Modified and caching a new one otherwise.
+        :param check_status: pass the response to default_error_handler first.
+        :return: tuple of (data, allow header)
+        """
+        cache = self.resource_cache
+        if response.status_code == 304 and entry is not None and cache is not None:
+            cache.refresh(key, entry, response.headers)
+            return cache.read(entry, revalidated=True), entry.allow
+
+        if check_status:
+            self.default_error_handler(response)
+        allow_header = response.headers.get("Allow")
+        data = response.json()
+        if key is not None and cache is not None and response.status_code == 200:
+            cache.store(key, data, response.headers, allow_header)
+        return data, allow_header
+
+    def count_query(self):
+        """Count one GET sent in query_counter, from any thread."""
+        with _query_counter_lock:
+            self.query_counter += 1
+
+    def connection_stats(self) -> Dict[str, int]:
+        """Return connections opened vs reused by the keep-alive pool.
+
+        Counters belong to the pool, so managers that share a pool
+        report the same numbers.
+        :return: dict with requests, opened and reused counters.
+        """
+        if self._http_session is None:
+            return {"requests": 0, "opened": 0, "reused": 0}
+        return session_stats(self._http_session)
+
+    def http_request(self,
+                     method: str,
+                     req: str,
+                     hdr: Optional[Dict] = None,
+                     payload: Optional[str] = None,
+                     stream: Optional[bool] = False,
+                     timeout=None) -> requests.models.Response:
+        """Send a request over the keep-alive session, either with x-auth
+        authentication header or base authentication.
+
+        :param method: HTTP method, GET, POST, PATCH, DELETE
         :param req: request
         :param hdr: http header dict that will append to HTTP/HTTPS request.
-        :return: request.
+        :param payload: optional request body
+        :param stream: don't read the body, i.e. for a Server-Sent Events stream.
+        :param timeout: requests timeout, seconds or (connect, read) tuple
+        :return: response.
         """
         headers = {}
         headers.update(self.content_type)
         if hdr is not None:
             headers.update(hdr)
 
+        kwargs = {"verify": self._is_verify_cert, "headers": headers}
+        if payload is not None:
+            kwargs["data"] = payload
+        if stream:
+            kwargs["stream"] = True
+        if timeout is not None:
+            kwargs["timeout"] = timeout
+
+        token = None
         if self.x_auth is not None:
-            return loop.run_in_executor(
-                None, functools.partial(
-                    requests.get, req,
-                    verify=self._is_verify_cert,
-                    headers=headers
-                )
-            )
-        else:
-            return loop.run_in_executor(
-                None, functools.partial(
-                    requests.get, req,
-                    verify=self._is_verify_cert,
-                    auth=(self._username, self._password)
-                )
-            )
+            headers.update({X_AUTH_TOKEN: self.x_auth})
+        elif self.session_auth is not None:
+            token = self.session_auth.current_token()
+
+        if token is not None:
+            headers.update({X_AUTH_TOKEN: token})
+        elif self.x_auth is None:
+            kwargs["auth"] = (self._username, self._password)
+
+        response = self.http_session.request(method, req, **kwargs)
+        if response.status_code == 401 and token is not None:
+            # session expired or was deleted on the BMC, log in again and replay once.
+            token = self.session_auth.refresh(token)
+            if token is not None:
+                headers.update({X_AUTH_TOKEN: token})
+            else:
+                headers.pop(X_AUTH_TOKEN, None)
+                kwargs["auth"] = (self._username, self._password)
+            response = self.http_session.request(method, req, **kwargs)
+        if method != "GET":
+            invalidate_resource_cache(req)
+        return response
+
+    async def api_async_get_call(self, loop, req, hdr: Dict):
+        """Make api request either with x-auth authentication header or base authentication
+        to redfish endpoint.
+
+        :param loop: asyncio event loop
+        :param req: request
+        :param hdr: http header dict that will append to HTTP/HTTPS request.
+        :return: request.
+        """
+        return loop.run_in_executor(
+            None, functools.partial(self.http_request, "GET", req, hdr)
+        )
 
     def api_get_call(
             self, req: str, hdr: Dict) -> requests.models.Response:
@@ -205,25 +504,7 @@ class RedfishManager:
         :param hdr: http header dict that will append to HTTP/HTTPS request.
         :return: request.
         """
-        headers = {}
-        headers.update(self.content_type)
-        if hdr is not None:
-            headers.update(hdr)
-
-        if self._x_auth is not None:
-            headers.update(
-                {
-                    'X-Auth-Token': self._x_auth
-                }
-            )
-            return requests.get(
-                req, verify=self._is_verify_cert, headers=headers
-            )
-        else:
-            return requests.get(
-                req, verify=self._is_verify_cert,
-                auth=(self._username, self._password)
-            )
+        return self.http_request("GET", req, hdr)
 
     def get_with_query(
             self, req: str,
@@ -314,6 +595,27 @@ class RedfishManager:
         """
         return f"?$select={select_property}"
 
+    def _query_url(self,
+                   resource: str,
+                   do_expanded: Optional[bool] = False,
+                   select_target: Optional[str] = "",
+                   query_expansion: Optional[str] = "") -> str:
+        """Build the full url base_query and async_base_query send a GET to.
+        :return: url
+        """
+        # for expanded
+        if len(query_expansion) > 0:
+            r = f"{self._default_method}{self.redfish_ip}{resource}{self.expanded()}"
+        elif do_expanded:
+            r = f"{self._default_method}{self.redfish_ip}{resource}{self.expanded()}"
+        else:
+            r = f"{self._default_method}{self.redfish_ip}{resource}"
+
+        if len(select_target) > 0:
+            r = f"{self._default_method}{self.redfish_ip}" \
+                f"{resource}{self.select(select_property=select_target)}"
+        return r
+
     def base_query(self,
                    resource: str,
                    filename: Optional[str] = None,
@@ -363,41 +665,269 @@ class RedfishManager:
         if data_type == "json":
             headers.update(self.json_content_type)
 
-        # for expanded
-        if len(query_expansion) > 0:
-            r = f"{self._default_method}{self.redfish_ip}{resource}{self.expanded()}"
-        elif do_expanded:
-            r = f"{self._default_method}{self.redfish_ip}{resource}{self.expanded()}"
+        r = self._query_url(resource, do_expanded, select_target, query_expansion)
+        cache_key, entry, fresh = self._cache_lookup(r, headers)
+        inventory_name = self._inventory_name(r)
+        stored = self.inventory.get(inventory_name) if inventory_name else None
+        if stored is not None:
+            data, allow_header = stored.get("data"), stored.get("allow")
+        elif fresh:
+            data, allow_header = self.resource_cache.read(entry), entry.allow
         else:
-            r = f"{self._default_method}{self.redfish_ip}{resource}"
+            logging.debug(f"Sending request to {r}")
+            if not do_async:
+                response = self.api_get_call(r, headers)
+                self.count_query()
+            else:
+                loop = asyncio.get_event_loop()
+                response = loop.run_until_complete(
+                    self.api_async_get_until_complete(
+                        r, headers
+                    )
+                )
+            data, allow_header = self._cache_response(
+                cache_key, entry, response, check_status=not do_async)
+            if inventory_name and response.status_code == 200:
+                self.inventory.put(inventory_name, {"data": data, "allow": allow_header},
+                                   "registry" if "/Registries/" in r else "resource")
 
-        if len(select_target) > 0:
-            r = f"{self._default_method}{self.redfish_ip}" \
-                f"{resource}{self.select(select_property=select_target)}"
+        if key is not None and len(key) > 0 and key in data:
+            data = data[key]
 
-        logging.debug(f"Sending request to {r}")
+        save_if_needed(filename, data)
+        return CommandResult(data, None, allow_header, None)
 
-        if not do_async:
-            response = self.api_get_call(r, headers)
-            self.query_counter += 1
-            self.default_error_handler(response)
-        else:
-            loop = asyncio.get_event_loop()
-            response = loop.run_until_complete(
-                self.api_async_get_until_complete(
-                    r, headers
-                )
-            )
+    def iter_collection_pages(self,
+                              resource: str,
+                              page_size: Optional[int] = None,
+                              query: Optional[RedfishQuery] = None,
+                              limit: Optional[int] = None,
+                              one_param_per_uri: Optional[bool] = False,
+                              prefetch: Optional[bool] = True,
+                              fallback: Optional[RedfishQuery] = None) -> Iterator[dict]:
+        """Pages of a collection, read lazily.
+
+        The first page is ``resource`` with ``query``. The next page is the
+        ``Members@odata.nextLink`` of the service when it returns one, else,
+        with ``page_size``, the next ``$top``/``$skip`` window until a short
+        page. While the caller works on a page the next one is already on its
+        way (``prefetch``), unless ``limit`` members were reached: a page past
+        the limit is never requested. A first page refused with its query is
+        read again with ``fallback``, plain by default, without paging.
+
+        :param resource: collection path, a nextLink path with its query works as well
+        :param page_size: members per page for $top/$skip, None takes the pages the service sends
+        :param query: query parameters sent with every page, $expand for example
+        :param limit: members the caller reads at most
+        :param one_param_per_uri: the service takes one query parameter per URI,
+                                  $top/$skip are then only sent without ``query``
+        :param prefetch: request the next page while the current one is consumed
+        :param fallback: query of the first page when the service refused ``query``
+        :return: iterator of collection bodies
+        """
+        cursor = _PageCursor(resource, page_size, query, limit, one_param_per_uri, fallback)
 
-        allow_header = response.headers.get("Allow")
+        def get(path: str) -> dict:
+            data = self.base_query(path).data
+            return data if isinstance(data, dict) else {}
+
+        try:
+            page = get(cursor.first)
+        except (ResourceNotFound, UnexpectedResponse):
+            # iDRAC answers 400 to a query it does not take.
+            plain = cursor.refused()
+            if plain is None:
+                raise
+            self.logger.info(f"{cursor.first} refused, reading {plain}")
+            page = get(plain)
+
+        pool = None
+        try:
+            while True:
+                next_path = cursor.next_path(page)
+                future = None
+                if next_path is not None and prefetch:
+                    if pool is None:
+                        pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="redfish-page")
+                    future = pool.submit(get, next_path)
+                yield page
+                if next_path is None:
+                    return
+                page = future.result() if future is not None else get(next_path)
+        finally:
+            if pool is not None:
+                pool.shutdown(wait=False)
+
+    async def async_iter_collection_pages(self,
+                                          resource: str,
+                                          page_size: Optional[int] = None,
+                                          query: Optional[RedfishQuery] = None,
+                                          limit: Optional[int] = None,
+                                          one_param_per_uri: Optional[bool] = False,
+                                          prefetch: Optional[bool] = True,
+                                          fallback: Optional[RedfishQuery] = None
+                                          ) -> AsyncIterator[dict]:
+        """Awaitable counterpart of ``iter_collection_pages``, same options.
+        The next page is prefetched as a task on the running event loop.
+
+        :return: async iterator of collection bodies
+        """
+        cursor = _PageCursor(resource, page_size, query, limit, one_param_per_uri, fallback)
+
+        async def get(path: str) -> dict:
+            data = (await self.async_base_query(path)).data
+            return data if isinstance(data, dict) else {}
+
+        try:
+            page = await get(cursor.first)
+        except (ResourceNotFound, UnexpectedResponse):
+            plain = cursor.refused()
+            if plain is None:
+                raise
+            self.logger.info(f"{cursor.first} refused, reading {plain}")
+            page = await get(plain)
+
+        task = None
+        try:
+            while True:
+                next_path = cursor.next_path(page)
+                if next_path is not None and prefetch:
+                    task = asyncio.ensure_future(get(next_path))
+                yield page
+                if next_path is None:
+                    return
+                page = await task if task is not None else await get(next_path)
+                task = None
+        finally:
+            if task is not None and not task.done():
+                task.cancel()
+
+    def iter_collection(self,
+                        resource: str,
+                        limit: Optional[int] = None,
+                        **kwargs) -> Iterator[dict]:
+        """Members of a collection across all its pages, read lazily.
+        See ``iter_collection_pages``; iteration ends after ``limit`` members.
+
+        :param resource: collection path
+        :param limit: members returned at most, None for all of them
+        :param kwargs: iter_collection_pages options
+        :return: iterator of member entries, links or expanded bodies as the service sent them
+        """
+        if limit is not None and limit <= 0:
+            return
+        taken = 0
+        for page in self.iter_collection_pages(resource, limit=limit, **kwargs):
+            members = page.get(RedfishJson.Members)
+            for member in members if isinstance(members, list) else []:
+                yield member
+                taken += 1
+                if limit is not None and taken >= limit:
+                    return
+
+    async def async_http_request(self,
+                                 method: str,
+                                 req: str,
+                                 hdr: Optional[Dict] = None,
+                                 payload: Optional[str] = None) -> AsyncRedfishResponse:
+        """Non-blocking counterpart of http_request. Requests go through the
+        connection pool shared by every manager on the running event loop.
+
+        :param method: HTTP method, GET, POST, PATCH, DELETE
+        :param req: request
+        :param hdr: http header dict that will append to HTTP/HTTPS request.
+        :param payload: optional request body
+        :return: AsyncRedfishResponse
+        """
+        loop = asyncio.get_running_loop()
+        if self._replay:
+            response = await loop.run_in_executor(
+                None, functools.partial(self.http_request, method, req, hdr, payload))
+            return AsyncRedfishResponse(
+                response.status_code, response.headers, response.content, response.url)
+
+        headers = {}
+        headers.update(self.content_type)
+        if hdr is not None:
+            headers.update(hdr)
+
+        auth = None
+        token = None
+        if self.x_auth is not None:
+            headers.update({X_AUTH_TOKEN: self.x_auth})
+        elif self.session_auth is not None:
+            token = await loop.run_in_executor(None, self.session_auth.current_token)
+
+        if token is not None:
+            headers.update({X_AUTH_TOKEN: token})
+        elif self.x_auth is None:
+            auth = (self._username, self._password)
+
+        client = async_client()
+        response = await client.request(
+            method, req, headers=headers, data=payload, auth=auth,
+            verify=self._is_verify_cert, http_session=self.http_session)
+        if response.status_code == 401 and token is not None:
+            token = await loop.run_in_executor(None, self.session_auth.refresh, token)
+            if token is not None:
+                headers.update({X_AUTH_TOKEN: token})
+            else:
+                headers.pop(X_AUTH_TOKEN, None)
+                auth = (self._username, self._password)
+            response = await client.request(
+                method, req, headers=headers, data=payload, auth=auth,
+                verify=self._is_verify_cert, http_session=self.http_session)
+        if method != "GET":
+            invalidate_resource_cache(req)
+        return response
+
+    async def async_base_query(self,
+                               resource: str,
+                               filename: Optional[str] = None,
+                               do_expanded: Optional[bool] = False,
+                               select_target: Optional[str] = "",
+                               query_expansion: Optional[str] = "",
+                               data_type: Optional[str] = "json",
+                               key: Optional[str] = None,
+                               **kwargs) -> CommandResult:
+        """Awaitable base_query. Unlike base_query(do_async=True) it never
+        blocks the event loop, so callers can gather many queries at once.
+
+        :param resource: path to a redfish resource
+        :param filename: if filename indicate call will save a result to a file.
+        :param do_expanded: will do expand query based on spec.
+        :param select_target: select particular attribute
+        :param query_expansion: allow to overwrite expansion.
+        :param data_type: json or xml
+        :param key: Optional json key in case we want to get something from a root element only.
+        :return: CommandResult
+        :raise RedfishException
+        """
+        headers = {}
+        if data_type == "json":
+            headers.update(self.json_content_type)
+
+        r = self._query_url(resource, do_expanded, select_target, query_expansion)
+        cache_key, entry, fresh = self._cache_lookup(r, headers)
+        if fresh:
+            data, allow_header = self.resource_cache.read(entry), entry.allow
+        else:
+            response = await self.async_http_request("GET", r, headers)
+            self.count_query()
+            data, allow_header = self._cache_response(cache_key, entry, response)
 
-        data = response.json()
         if key is not None and len(key) > 0 and key in data:
             data = data[key]
 
         save_if_needed(filename, data)
         return CommandResult(data, None, allow_header, None)
 
+    @staticmethod
+    async def async_close():
+        """Close the async connection pool of the running event loop.
+        Call it before the loop ends once async requests are done."""
+        await close_async_client()
+
     @staticmethod
     def parse_error(error_response: requests.models.Response) -> RedfishError:
         """Default Parser for error msg from a JSON error.
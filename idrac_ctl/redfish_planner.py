@@ -0,0 +1,238 @@
+"""Plan collection walks around the query parameters a target supports.
+
+A walk is described once, independent of the target: a root collection, an
+optional link followed from each of its members, and the properties the
+caller needs from the members at the end::
+
+    Walk("/redfish/v1/Chassis", link="Sensors", fields=("Reading", "Status"))
+
+``plan_walk`` turns it into a request plan for a vendor capability profile:
+
+ * ``expand``  collections are fetched with ``$expand=.($levels=N)`` so the
+   members, and with enough levels the linked collections, come back inline.
+ * ``select``  members are fetched one by one with ``$select`` of the needed
+   properties only, smaller bodies for the same request count.
+ * ``members`` plain GETs of every member, the fallback.
+
+A plan never puts two query parameters on one URI when the profile forbids
+it (Dell iDRAC). Running a plan tolerates a service that ignores a query
+parameter: members that did not come back inline are fetched, and a URI
+that was refused with a query is fetched again without it, and a
+collection the service splits with ``Members@odata.nextLink`` is read to
+its last page when the caller passes a page reader. ``WalkResult``
+counts the requests sent against the plain member by member walk, so the
+savings of a plan are visible per target.
+
+Author Mus spyroot@gmail.com
+"""
+from dataclasses import dataclass, field
+from typing import Callable, Iterable, List, Optional, Tuple
+
+from .redfish_query import RedfishQuery
+from .vendors import VendorCapabilities
+
+EXPAND = "expand"
+SELECT = "select"
+MEMBERS = "members"
+
+# fetch(urls) -> bodies aligned with urls, None where a GET failed
+Fetch = Callable[[List[str]], List[Optional[dict]]]
+# pages(next link) -> the following pages of a collection, one GET each
+Pages = Callable[[str], Iterable[dict]]
+
+
+@dataclass(frozen=True)
+class Walk:
+    """Root collection -> optional link of each member -> members, fields needed."""
+
+    collection: str
+    link: Optional[str] = None
+    fields: Tuple[str, ...] = ()
+
+    @property
+    def depth(self) -> int:
+        """$expand levels that inline the whole walk."""
+        return 3 if self.link else 1
+
+
+@dataclass
+class WalkResult:
+    """Rows of a walk and the requests it cost.
+
+    ``rows`` holds ``(parent, member uri, member body)`` in collection order;
+    the parent is the root member that carried the link, or the root
+    collection for a walk without a link.
+    """
+
+    plan: "WalkPlan"
+    rows: List[Tuple[str, str, dict]] = field(default_factory=list)
+    requests: int = 0
+    baseline: int = 0
+
+    @property
+    def savings(self) -> int:
+        """Requests saved against the plain member by member walk."""
+        return self.baseline - self.requests
+
+    def summary(self) -> str:
+        return (f"{self.plan.walk.collection}: {self.plan.strategy} plan sent "
+                f"{self.requests} requests, {self.baseline} walking member by member, "
+                f"{self.savings} saved")
+
+
+def _is_inline(member) -> bool:
+    """True when a member entry carries more than its own link."""
+    return isinstance(member, dict) and any(k != "@odata.id" for k in member)
+
+
+def _member_entries(collection) -> List[Tuple[str, Optional[dict]]]:
+    """(uri, inline body or None) of every member of a collection body."""
+    members = collection.get("Members") if isinstance(collection, dict) else None
+    entries = []
+    for member in members if isinstance(members, list) else []:
+        uri = member.get("@odata.id") if isinstance(member, dict) else None
+        if isinstance(uri, str):
+            entries.append((uri, member if _is_inline(member) else None))
+    return entries
+
+
+@dataclass(frozen=True)
+class WalkPlan:
+    """Queries a walk sends at each step, None for a plain GET."""
+
+    walk: Walk
+    strategy: str
+    collection_query: Optional[RedfishQuery] = None
+    link_query: Optional[RedfishQuery] = None
+    parent_query: Optional[RedfishQuery] = None
+    member_query: Optional[RedfishQuery] = None
+    one_param_per_uri: bool = False
+
+    def url(self, uri: str, query: Optional[RedfishQuery]) -> str:
+        """uri with the query string of a step applied."""
+        if query is None or "?" in uri:
+            return uri
+        return query.apply(uri, self.one_param_per_uri)
+
+    def run(self, fetch: Fetch, pages: Optional[Pages] = None) -> WalkResult:
+        """Execute the plan.
+
+        Every step is a single call to ``fetch``, so members of all the
+        collections of a step go out in one bounded fan-out.
+
+        :param fetch: GETs a list of urls, bodies aligned, None on failure
+        :param pages: reads the pages after a Members@odata.nextLink,
+                      None keeps the first page of each collection only
+        :return: WalkResult
+        """
+        result = WalkResult(self)
+
+        def follow(body):
+            link = body.get("Members@odata.nextLink") if isinstance(body, dict) else None
+            if pages is None or not isinstance(link, str) or not link:
+                return body
+            members = list(body.get("Members") or [])
+            for page in pages(link):
+                # a plain walk reads the same pages.
+                result.requests += 1
+                result.baseline += 1
+                members.extend(page.get("Members") or [])
+            return dict(body, Members=members)
+
+        def get(uris: List[str], query: Optional[RedfishQuery]) -> List[Optional[dict]]:
+            if not uris:
+                return []
+            urls = [self.url(uri, query) for uri in uris]
+            bodies = list(fetch(urls))
+            result.requests += len(urls)
+            # a service that refuses a query gets the plain GET.
+            retry = [i for i, (url, body) in enumerate(zip(urls, bodies))
+                     if body is None and url != uris[i]]
+            if retry:
+                for i, body in zip(retry, fetch([uris[i] for i in retry])):
+                    bodies[i] = body
+                result.requests += len(retry)
+            return bodies
+
+        def resolve(entries, query) -> List[Tuple[str, dict]]:
+            pending = [uri for uri, body in entries if body is None]
+            fetched = iter(get(pending, query))
+            resolved = []
+            for uri, body in entries:
+                if body is None:
+                    body = next(fetched)
+                if isinstance(body, dict):
+                    resolved.append((uri, body))
+            return resolved
+
+        walk = self.walk
+        root, = get([walk.collection], self.collection_query)
+        entries = _member_entries(follow(root))
+        result.baseline += 1 + len(entries)
+        if walk.link is None:
+            result.rows = [(walk.collection, uri, body)
+                           for uri, body in resolve(entries, self.member_query)]
+            return result
+
+        parents = resolve(entries, self.parent_query)
+        collections = []
+        for parent_uri, body in parents:
+            link = body.get(walk.link)
+            uri = link.get("@odata.id") if isinstance(link, dict) else None
+            if isinstance(uri, str) and uri:
+                collections.append((parent_uri, uri, link if "Members" in link else None))
+        result.baseline += len(collections)
+        fetched = iter(get([uri for _, uri, body in collections if body is None],
+                           self.link_query))
+        leaves = []
+        for parent_uri, uri, body in collections:
+            if body is None:
+                body = next(fetched)
+            for entry in _member_entries(follow(body)):
+                leaves.append((parent_uri, entry))
+        result.baseline += len(leaves)
+        resolved = iter(get([uri for _, (uri, body) in leaves if body is None],
+                            self.member_query))
+        for parent_uri, (uri, body) in leaves:
+            if body is None:
+                body = next(resolved)
+            if isinstance(body, dict):
+                result.rows.append((parent_uri, uri, body))
+        return result
+
+
+def plan_walk(walk: Walk,
+              caps: VendorCapabilities,
+              expand: Optional[bool] = None) -> WalkPlan:
+    """Cheapest request plan of a walk for a capability profile.
+
+    ``$expand`` is preferred whenever the profile honors it: it turns the
+    member GETs of a collection into a single request. ``$select`` trims the
+    members that still have to be fetched one by one. With one query
+    parameter per URI each request carries exactly one of them.
+
+    :param walk: walk description
+    :param caps: capability profile of the target
+    :param expand: force (True) or forbid (False) $expand, None follows caps
+    :return: WalkPlan
+    """
+    use_expand = caps.query_expand if expand is None else expand
+    member_query = parent_query = None
+    if caps.query_select:
+        if walk.fields:
+            member_query = RedfishQuery(select=list(walk.fields))
+        if walk.link:
+            parent_query = RedfishQuery(select=[walk.link])
+    collection_query = link_query = None
+    if use_expand:
+        levels = max(1, min(walk.depth, caps.query_expand_levels))
+        collection_query = RedfishQuery(expand=".", expand_levels=levels)
+        if walk.link:
+            link_query = RedfishQuery(expand=".", expand_levels=1)
+        strategy = EXPAND
+    elif member_query is not None or parent_query is not None:
+        strategy = SELECT
+    else:
+        strategy = MEMBERS
+    return WalkPlan(walk, strategy, collection_query, link_query, parent_query,
+                    member_query, caps.one_query_param_per_uri)
@@ -0,0 +1,166 @@
+"""Pooled keep-alive HTTP sessions for Redfish endpoints.
+
+Every HTTP call used to go through the module level ``requests.get/post/...``
+helpers, which build a throwaway ``requests.Session`` per call. Against a BMC
+that means a fresh TCP connect and a full TLS handshake for each resource,
+and BMC TLS stacks are slow. This module hands out ``requests.Session``
+objects backed by a bounded urllib3 pool, so consecutive calls to the same
+BMC reuse an already established keep-alive connection.
+
+Sessions are either private to one manager or shared per process and per BMC.
+Commands are instantiated per invocation (``IDracManager.invoke``), so the
+shared mode is what lets ``idrac_main``, the command it dispatches and every
+nested ``sync_invoke`` reuse the same connections.
+
+Each pool counts connections it opened and requests it sent, so a caller can
+tell how often a connection was reused::
+
+    mgr.connection_stats()
+    {'requests': 12, 'opened': 1, 'reused': 11}
+
+Author Mus spyroot@gmail.com
+"""
+import threading
+from typing import Dict, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3 import PoolManager
+
+DEFAULT_POOL_SIZE = 10
+
+_shared_sessions: Dict[Tuple, requests.Session] = {}
+_shared_lock = threading.Lock()
+
+
+class ConnectionStats:
+    """Thread safe counters for a single HTTP pool."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.opened = 0
+
+    def on_request(self):
+        with self._lock:
+            self.requests += 1
+
+    def on_open(self):
+        with self._lock:
+            self.opened += 1
+
+    @property
+    def reused(self) -> int:
+        """Number of requests that went over an already open connection."""
+        return max(0, self.requests - self.opened)
+
+    def as_dict(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "opened": self.opened,
+                "reused": max(0, self.requests - self.opened),
+            }
+
+
+class _CountingPoolManager(PoolManager):
+    """urllib3 PoolManager that reports every new connection to ``stats``."""
+
+    def __init__(self, stats: ConnectionStats, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = stats
+
+    def _new_pool(self, scheme, host, port, request_context=None):
+        pool = super()._new_pool(scheme, host, port, request_context=request_context)
+        new_conn = pool._new_conn
+        stats = self.stats
+
+        def _counting_new_conn():
+            stats.on_open()
+            return new_conn()
+
+        pool._new_conn = _counting_new_conn
+        return pool
+
+
+class RedfishHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter with a bounded keep-alive pool and connection counters."""
+
+    def __init__(self, pool_size: Optional[int] = DEFAULT_POOL_SIZE, **kwargs):
+        """
+        :param pool_size: max number of keep-alive connections kept per host.
+        """
+        if pool_size is None or int(pool_size) < 1:
+            raise ValueError(f"pool size must be a positive integer, got {pool_size}")
+        self.stats = ConnectionStats()
+        super().__init__(pool_connections=1, pool_maxsize=int(pool_size), **kwargs)
+
+    def init_poolmanager(self, connections, maxsize, block=False, **pool_kwargs):
+        self._pool_connections = connections
+        self._pool_maxsize = maxsize
+        self._pool_block = block
+        self.poolmanager = _CountingPoolManager(
+            self.stats, num_pools=connections, maxsize=maxsize,
+            block=block, **pool_kwargs
+        )
+
+    def send(self, request, **kwargs):
+        self.stats.on_request()
+        return super().send(request, **kwargs)
+
+
+def new_session(pool_size: Optional[int] = DEFAULT_POOL_SIZE) -> requests.Session:
+    """Create a keep-alive session with a bounded, counting connection pool.
+    :param pool_size: max number of pooled connections per host.
+    :return: requests.Session
+    """
+    session = requests.Session()
+    adapter = RedfishHTTPAdapter(pool_size=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def shared_session(key: Tuple,
+                   pool_size: Optional[int] = DEFAULT_POOL_SIZE) -> requests.Session:
+    """Return the process wide session for ``key``, creating it on first use.
+
+    The key identifies a BMC (scheme, host:port and user), so two managers
+    that talk to the same BMC as the same user share one pool. The pool size
+    of the first caller wins.
+
+    :param key: tuple that identifies the endpoint.
+    :param pool_size: max number of pooled connections per host.
+    :return: requests.Session
+    """
+    with _shared_lock:
+        session = _shared_sessions.get(key)
+        if session is None:
+            session = new_session(pool_size)
+            _shared_sessions[key] = session
+        return session
+
+
+def close_shared_sessions():
+    """Close and forget every process wide session."""
+    with _shared_lock:
+        sessions = list(_shared_sessions.values())
+        _shared_sessions.clear()
+    for session in sessions:
+        session.close()
+
+
+def session_stats(session: requests.Session) -> Dict[str, int]:
+    """Return connection counters for a session created by this module.
+    :param session: session returned by new_session or shared_session
+    :return: dict with requests, opened and reused counters.
+    """
+    stats = {"requests": 0, "opened": 0, "reused": 0}
+    seen = set()
+    for adapter in session.adapters.values():
+        if not isinstance(adapter, RedfishHTTPAdapter) or id(adapter) in seen:
+            continue
+        seen.add(id(adapter))
+        for k, v in adapter.stats.as_dict().items():
+            stats[k] += v
+    return stats
@@ -1,7 +1,7 @@
 """Redfish query-parameter builder.
 
 Builds the standard Redfish query string for a GET request — ``$select``,
-``$filter``, ``$expand``, ``$top`` and ``only`` — with validation. These move
+``$filter``, ``$expand``, ``$top``, ``$skip`` and ``only`` — with validation. These move
 work to the server (smaller, faster responses), which matters at fleet scale.
 
 Vendor note: some services (Dell iDRAC) accept only ONE query parameter per URI.
@@ -26,6 +26,8 @@ class RedfishQuery:
     '?$select=ProcCStates,SysMemSize'
     >>> RedfishQuery(top=5).to_query_string()
     '?$top=5'
+    >>> RedfishQuery(top=50, skip=100).to_query_string()
+    '?$top=50&$skip=100'
     >>> RedfishQuery(expand=True, expand_levels=2).to_query_string()
     '?$expand=*($levels=2)'
     """
@@ -38,6 +40,7 @@ class RedfishQuery:
         expand_levels: int = 1,
         top: Optional[int] = None,
         only: bool = False,
+        skip: Optional[int] = None,
     ):
         self.select = select
         self.filter = filter
@@ -45,6 +48,7 @@ class RedfishQuery:
         self.expand_levels = expand_levels
         self.top = top
         self.only = bool(only)
+        self.skip = skip
 
     def is_empty(self) -> bool:
         """True when no query parameter is set."""
@@ -60,6 +64,8 @@ class RedfishQuery:
             names.append("$expand")
         if self.top is not None:
             names.append("$top")
+        if self.skip is not None:
+            names.append("$skip")
         if self.only:
             names.append("only")
         return names
@@ -67,6 +73,8 @@ class RedfishQuery:
     def _validate(self, one_param_per_uri: bool) -> None:
         if self.top is not None and (not isinstance(self.top, int) or self.top < 0):
             raise ValueError("$top must be an integer >= 0")
+        if self.skip is not None and (not isinstance(self.skip, int) or self.skip < 0):
+            raise ValueError("$skip must be an integer >= 0")
         if self.expand_levels is not None and (
             not isinstance(self.expand_levels, int) or self.expand_levels < 1
         ):
@@ -90,6 +98,8 @@ class RedfishQuery:
             pairs.append(f"$expand={mode}($levels={self.expand_levels})")
         if self.top is not None:
             pairs.append(f"$top={self.top}")
+        if self.skip is not None:
+            pairs.append(f"$skip={self.skip}")
         if self.only:
             pairs.append("only")
         return pairs
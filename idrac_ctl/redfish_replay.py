@@ -0,0 +1,208 @@
+"""Serve Redfish GETs from a discovery crawl instead of a BMC.
+
+``RedfishManager(replay=path)`` mounts ``ReplayAdapter`` on its session, so
+every request that would go to the BMC is answered from a crawl: a single
+file snapshot (``discovery --snapshot``) or a crawl directory with one json
+file per resource. Read only commands then run against captured state::
+
+    idrac_ctl --replay crawl.db sensors
+    idrac_ctl --replay ~/.json_responses/10.0.0.1 firmware-inv
+
+The adapter answers like a BMC would:
+
+ * GET and HEAD of a captured resource return 200 with its Allow header and
+   ETag, If-None-Match on a matching ETag returns 304.
+ * ``$select`` keeps the selected properties, ``$expand`` inlines the
+   captured resources it links to, ``$top`` and ``$skip`` page the members.
+ * A resource that was not captured is a 404, an unsupported query such as
+   ``$filter`` a 501 and any other method a 405, a replay is read only.
+
+Author Mus spyroot@gmail.com
+"""
+import json
+import os
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, unquote, urlsplit
+
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+
+from .discovery.snapshot import CrawlSnapshot, SnapshotEntry, load_rest_api_map, resource_filename
+
+REPLAY_METHODS = ["GET", "HEAD"]
+_SELECT_KEEP = ("@odata.id", "@odata.type", "@odata.context", "@odata.etag")
+
+
+def normalize_path(path: str) -> str:
+    """Resource path as a crawl keys it, without trailing or duplicate slashes."""
+    path = unquote(path)
+    while "//" in path:
+        path = path.replace("//", "/")
+    if len(path) > 1:
+        path = path.rstrip("/") or path
+    return path
+
+
+class ReplaySource:
+    """Captured resources of a snapshot file or a crawl directory."""
+
+    def __init__(self, path: str):
+        """
+        :param path: snapshot file or crawl directory
+        :raise FileNotFoundError: path does not exist
+        """
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"replay source {path} does not exist")
+        self.path = path
+        self._snapshot = None
+        self._allowed = None
+        if os.path.isdir(path):
+            self._allowed = self._directory_methods(path)
+        else:
+            self._snapshot = CrawlSnapshot(path, readonly=True)
+
+    @staticmethod
+    def _directory_methods(directory: str) -> Dict[str, List[str]]:
+        try:
+            mappings = load_rest_api_map(directory)
+        except ImportError:
+            # rest_api_map.npy needs numpy, without it every resource allows GET.
+            mappings = None
+        return dict((mappings or {}).get("allowed_methods_mapping", {}))
+
+    def get(self, uri: str) -> Optional[SnapshotEntry]:
+        """One captured resource, None when the crawl does not hold it."""
+        if self._snapshot is not None:
+            return self._snapshot.get(uri)
+        filename = resource_filename(self.path, uri)
+        if not os.path.isfile(filename):
+            return None
+        with open(filename) as file:
+            data = json.load(file)
+        return SnapshotEntry(uri, data, self._allowed.get(uri) or list(REPLAY_METHODS),
+                             None, os.path.getmtime(filename))
+
+    def close(self):
+        if self._snapshot is not None:
+            self._snapshot.close()
+
+
+def _error(status_code: int, message_id: str, message: str) -> dict:
+    return {"error": {"code": f"Base.1.8.{message_id}", "message": message,
+                      "@Message.ExtendedInfo": [{"MessageId": f"Base.1.8.{message_id}",
+                                                 "Message": message, "Severity": "Warning"}]}}
+
+
+class ReplayAdapter(BaseAdapter):
+    """requests transport adapter that answers from a ReplaySource."""
+
+    def __init__(self, source: ReplaySource):
+        super().__init__()
+        self.source = source
+
+    def _response(self, request, status_code: int, body=None, headers=None) -> requests.Response:
+        response = requests.Response()
+        response.status_code = status_code
+        response.reason = requests.status_codes._codes.get(status_code, ("",))[0].upper()
+        response.headers = CaseInsensitiveDict(headers or {})
+        response._content = b"" if body is None or request.method == "HEAD" \
+            else json.dumps(body).encode()
+        if body is not None:
+            response.headers.setdefault("Content-Type", "application/json")
+        response.encoding = "utf-8"
+        response.url = request.url
+        response.request = request
+        return response
+
+    def _expand(self, data: dict, spec: str) -> dict:
+        """data with hyperlinks replaced by the captured resources.
+
+        ``*`` expands every hyperlink, ``.`` those outside ``Links`` and ``~``
+        those inside, ``$levels`` deep. A link the crawl did not capture
+        stays a link.
+        """
+        mode = spec[:1]
+        levels = int(spec.split("$levels=", 1)[1].rstrip(")")) if "$levels=" in spec else 1
+        if mode not in ("*", ".", "~") or levels < 1:
+            raise ValueError(spec)
+
+        def expand(value, in_links, depth):
+            if isinstance(value, list):
+                return [expand(item, in_links, depth) for item in value]
+            if not isinstance(value, dict):
+                return value
+            uri = value.get("@odata.id")
+            if len(value) == 1 and isinstance(uri, str) and \
+                    (mode == "*" or (mode == "~") == in_links):
+                entry = self.source.get(normalize_path(uri))
+                if entry is None or depth == 1:
+                    return entry.data if entry is not None else value
+                return {k: expand(v, k == "Links", depth - 1) for k, v in entry.data.items()}
+            return {k: expand(v, in_links or k == "Links", depth) for k, v in value.items()}
+
+        return {k: expand(v, k == "Links", levels) for k, v in data.items()}
+
+    def _apply_query(self, data, query: Dict[str, List[str]]):
+        """Apply $select, $expand, $top and $skip, None for an unsupported query."""
+        if set(query) - {"$select", "$expand", "$top", "$skip"}:
+            return None
+        if not isinstance(data, dict):
+            return data
+        if "$expand" in query:
+            data = self._expand(data, query["$expand"][0])
+        if ("$top" in query or "$skip" in query) and isinstance(data.get("Members"), list):
+            skip = int(query.get("$skip", ["0"])[0])
+            top = query.get("$top")
+            members = data["Members"][skip:]
+            if top is not None:
+                members = members[:int(top[0])]
+            data = dict(data, Members=members)
+        if "$select" in query:
+            selected = {p.strip() for p in ",".join(query["$select"]).split(",")}
+            data = {k: v for k, v in data.items() if k in selected or k in _SELECT_KEEP}
+        return data
+
+    def send(self, request, **kwargs) -> requests.Response:
+        url = urlsplit(request.url)
+        uri = normalize_path(url.path)
+        if request.method not in REPLAY_METHODS:
+            return self._response(
+                request, 405, _error(405, "ActionNotSupported",
+                                     f"{request.method} {uri}: a replay is read only"),
+                {"Allow": ", ".join(REPLAY_METHODS)})
+
+        entry = self.source.get(uri)
+        if entry is None:
+            return self._response(request, 404, _error(
+                404, "ResourceMissingAtURI", f"{uri} is not in the replayed crawl"))
+
+        headers = {"Allow": ", ".join(entry.allowed_methods)}
+        if entry.etag:
+            headers["ETag"] = entry.etag
+            if request.headers.get("If-None-Match") == entry.etag:
+                return self._response(request, 304, None, headers)
+        try:
+            data = self._apply_query(entry.data, parse_qs(url.query))
+        except ValueError:
+            data = None
+        if data is None:
+            return self._response(request, 501, _error(
+                501, "QueryNotSupported", f"{url.query} is not supported by a replay"))
+        return self._response(request, 200, data, headers)
+
+    def close(self):
+        self.source.close()
+
+
+def replay_session(path: str) -> requests.Session:
+    """Session whose http and https requests are served from the crawl at path.
+
+    :param path: snapshot file or crawl directory
+    :return: requests.Session
+    """
+    session = requests.Session()
+    adapter = ReplayAdapter(ReplaySource(path))
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
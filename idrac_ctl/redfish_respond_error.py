@@ -133,7 +133,9 @@ class RedfishError(RedfishRespondMessage):
         return self._message_extended
 
     def __repr__(self) -> str:
-        msgs = [m.message for m in self._message_extended]
+        # parse_error keeps the raw @Message.ExtendedInfo dicts
+        msgs = [m.get("Message", "") if isinstance(m, dict) else m.message
+                for m in self._message_extended]
         return "\n".join(msgs) + "\n"
 
     @message_extended.setter
@@ -74,6 +74,8 @@ class RedfishJson:
     Data_next = "@odata.nextLink"
     #
     MembersCount = "Members@odata.count"
+    # next page of a collection that the service returns in pages.
+    MembersNext = "Members@odata.nextLink"
     # This property is an array of references to the systems that this manager has control over.
     ManagerServers = "ManagerForServers"
     # This property is an array of references to the chassis that this manager has control over.
@@ -108,4 +110,6 @@ class RedfishApi:
     BiosSettings = f"{Bios}/{Settings}"
     BiosReset = f"{Bios}/{Settings}/{Actions}/{RedfishActions.BiosReset.value}"
     ManagerAccount = f"{Version}/{AccountService}"
+    SessionService = f"{Version}/SessionService"
+    Sessions = f"{SessionService}/Sessions"
     CHASSIS = "/Chassis"
@@ -0,0 +1,273 @@
+"""Redfish Server-Sent Events, parsed and consumed in a background thread.
+
+``EventStream`` subscribes to the ``ServerSentEventUri`` advertised by the
+EventService, optionally narrowed with ``$filter``, and hands every event to
+``handle``. Subclasses decide what an event means: the exporter keeps pushed
+MetricReports (``telemetry.metric_stream``), the task waiter wakes the waits
+of the tasks an event names (``redfish_task_wait``).
+
+The stream reconnects with jittered exponential backoff and resumes with
+Last-Event-ID. A BMC without an SSE URI, or one that answers 404/405/501,
+marks the stream unsupported and the caller falls back to polling, as does
+one that compresses the stream although it is asked for identity encoding.
+A stream never creates an EventService subscription.
+
+Author Mus spyroot@gmail.com
+"""
+from __future__ import annotations
+
+import logging
+import random
+import threading
+import urllib.parse
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Iterable, Iterator, Optional
+
+import requests
+
+from .redfish_exceptions import RedfishException
+from .redfish_shared import RedfishApi
+
+# first and max seconds between two connection attempts.
+DEFAULT_BACKOFF = (1.0, 60.0)
+# seconds without a byte, keep-alive comments included, before reconnecting.
+DEFAULT_READ_TIMEOUT = 300.0
+# the BMC does not implement SSE.
+UNSUPPORTED_STATUS = (404, 405, 501)
+# most bytes taken from the socket in one read of the stream.
+READ_SIZE = 64 * 1024
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SseEvent:
+    """One dispatched Server-Sent Event."""
+
+    data: str
+    event: str = "message"
+    id: Optional[str] = None
+    retry: Optional[float] = None
+
+
+def parse_sse(lines: Iterable) -> Iterator[SseEvent]:
+    """Parse a text/event-stream incrementally.
+
+    :param lines: decoded or raw lines, without or with their line endings
+    :return: events, each one dispatched by the blank line that ends it
+    """
+    data, event, event_id, retry = [], "", None, None
+    for line in lines:
+        if isinstance(line, bytes):
+            line = line.decode("utf-8", "replace")
+        line = line.rstrip("\r\n")
+        if not line:
+            if data:
+                yield SseEvent("\n".join(data), event or "message", event_id, retry)
+            data, event, retry = [], "", None
+            continue
+        if line.startswith(":"):
+            continue
+        name, _, value = line.partition(":")
+        if value.startswith(" "):
+            value = value[1:]
+        if name == "data":
+            data.append(value)
+        elif name == "event":
+            event = value
+        elif name == "id":
+            event_id = value
+        elif name == "retry" and value.isdigit():
+            retry = int(value) / 1000.0
+
+
+def _read1(raw):
+    """Compatibility shim for urllib3 1.26, pinned in requirements.txt.
+
+    urllib3 2.x responses have read1. The 1.26 ones do not, so this falls
+    back to read1 of the private http.client response they wrap. That read
+    skips urllib3's content decoding, which is why the stream is requested
+    with Accept-Encoding: identity and refused when it is encoded anyway.
+
+    :param raw: urllib3 response of a request sent with stream=True
+    :return: read1 callable of the response
+    """
+    read1 = getattr(raw, "read1", None)
+    if read1 is not None:
+        return read1
+    return raw._fp.read1
+
+
+def raw_lines(raw, read_size: int = READ_SIZE) -> Iterator[bytes]:
+    """Split a streamed body in lines as soon as each newline arrives.
+
+    Every read returns what one socket read brought, so an event is handed
+    over once complete, and a large MetricReport costs a few reads instead
+    of one Python iteration per byte. The body must not be content encoded,
+    see _read1.
+
+    :param raw: urllib3 response of a request sent with stream=True
+    :param read_size: most bytes taken in one read
+    :return: lines with their line ending, the last one may lack it
+    """
+    raw.decode_content = True
+    read1 = _read1(raw)
+    pending = b""
+    while True:
+        chunk = read1(read_size)
+        if not chunk:
+            break
+        lines = (pending + chunk).splitlines(keepends=True)
+        # a trailing CR may be the first half of a CRLF, wait for the next byte.
+        pending = b"" if lines[-1].endswith(b"\n") else lines.pop()
+        yield from lines
+    if pending:
+        yield pending
+
+
+class EventStream(ABC):
+    """Background SSE consumer, subclasses implement ``handle``."""
+
+    name = "event stream"
+    # logged once the BMC told it does not implement SSE.
+    unsupported_message = "BMC does not implement SSE"
+
+    def __init__(self,
+                 manager,
+                 sse_filter: Optional[str] = None,
+                 backoff: tuple = DEFAULT_BACKOFF,
+                 read_timeout: float = DEFAULT_READ_TIMEOUT):
+        """
+        :param manager: RedfishManager bound to the BMC
+        :param sse_filter: $filter sent on the SSE URI, None subscribes to all events
+        :param backoff: first and max seconds between two connection attempts
+        :param read_timeout: seconds of silence before reconnecting
+        """
+        self.manager = manager
+        self.sse_filter = sse_filter
+        self.backoff = backoff
+        self.read_timeout = read_timeout
+        # None until the BMC told, False once it does not implement SSE.
+        self.supported = None
+        self.connected = False
+        self.connects = 0
+        self.last_event_id = None
+        self._retry = None
+        self._response = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def sse_uri(self) -> Optional[str]:
+        """ServerSentEventUri advertised by the EventService, None when absent."""
+        service = self.manager.base_query(f"{RedfishApi.Version}/EventService").data
+        uri = service.get("ServerSentEventUri") if isinstance(service, dict) else None
+        return uri or None
+
+    def _url(self, uri: str) -> str:
+        url = f"{self.manager._default_method}{self.manager.redfish_ip}{uri}"
+        if self.sse_filter:
+            url += "&" if "?" in url else "?"
+            url += "$filter=" + urllib.parse.quote(self.sse_filter)
+        return url
+
+    @abstractmethod
+    def handle(self, event: SseEvent) -> bool:
+        """Apply one event.
+        :return: True when the event was used
+        """
+
+    def on_connect(self):
+        """Called once a stream is open, before the first event."""
+
+    def _dispatch(self, event: SseEvent):
+        if event.id is not None:
+            self.last_event_id = event.id
+        if event.retry is not None:
+            self._retry = event.retry
+        self.handle(event)
+
+    def consume_once(self) -> None:
+        """Connect once and apply events until the stream ends.
+        Sets supported to False when the BMC does not implement SSE, and
+        raises RedfishException as well when it content encodes the stream.
+        """
+        uri = self.sse_uri()
+        if uri is None:
+            self.supported = False
+            return
+        # raw_lines reads the body undecoded, a compressed stream would reach parse_sse.
+        headers = {"Accept": "text/event-stream", "Accept-Encoding": "identity"}
+        if self.last_event_id is not None:
+            headers["Last-Event-ID"] = self.last_event_id
+        response = self.manager.http_request(
+            "GET", self._url(uri), headers, stream=True, timeout=(10.0, self.read_timeout))
+        if response.status_code == 400 and self.sse_filter:
+            # the BMC does not take $filter on the SSE URI, stream every event.
+            response.close()
+            self.sse_filter = None
+            response = self.manager.http_request(
+                "GET", self._url(uri), headers, stream=True, timeout=(10.0, self.read_timeout))
+        if response.status_code in UNSUPPORTED_STATUS:
+            response.close()
+            self.supported = False
+            return
+        self.manager.default_error_handler(response)
+        encoding = response.headers.get("Content-Encoding", "identity").strip().lower()
+        if encoding not in ("", "identity"):
+            response.close()
+            self.supported = False
+            raise RedfishException(
+                f"{self.name}: BMC sent a {encoding} encoded stream "
+                f"despite Accept-Encoding: identity")
+        self.supported = True
+        self.connected = True
+        self.connects += 1
+        self._response = response
+        try:
+            self.on_connect()
+            for event in parse_sse(raw_lines(response.raw)):
+                self._dispatch(event)
+                if self._stop.is_set():
+                    break
+        finally:
+            self.connected = False
+            self._response = None
+            response.close()
+
+    def _run(self):
+        attempt = 0
+        while not self._stop.is_set():
+            connects = self.connects
+            try:
+                self.consume_once()
+            except (requests.exceptions.RequestException, OSError) as err:
+                logger.info(f"{self.name} dropped: {err}")
+            except Exception as err:  # noqa: BLE001 - keep the stream thread alive
+                logger.warning(f"{self.name} failed: {type(err).__name__}: {err}")
+            if self.supported is False:
+                logger.info(self.unsupported_message)
+                return
+            attempt = 0 if self.connects > connects else attempt + 1
+            first, cap = self.backoff
+            delay = min(cap, (self._retry or first) * 2 ** attempt)
+            self._stop.wait(delay * random.uniform(0.5, 1.0))
+
+    def start(self) -> "EventStream":
+        """Start consuming in a daemon thread."""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run,
+                                            name=self.name.replace(" ", "-"), daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: Optional[float] = None):
+        """Stop the thread, closing the stream if one is open. A read that is
+        already blocked ends with the next event or the read timeout."""
+        self._stop.set()
+        response = self._response
+        if response is not None:
+            response.close()
+        if self._thread is not None:
+            self._thread.join(timeout)
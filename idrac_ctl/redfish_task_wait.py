@@ -0,0 +1,402 @@
+"""Wait for Redfish tasks without fixed-interval polling.
+
+A ``TaskWaiter`` tracks every task a process waits for on one BMC, from one
+poller thread:
+
+ * Polls back off: the first GET comes ``first`` seconds after the wait
+   starts and the delay doubles up to ``cap``. A ``Retry-After`` header is
+   honoured as the earliest next poll, never shortened.
+ * Where the vendor profile supports Redfish SSE (``lifecycle_events_sse``)
+   the waiter also opens the EventService stream. An event that names a
+   watched task, i.e. ``TaskStateChanged`` / ``TaskCompletedOK`` with the task
+   as OriginOfCondition or a Dell ``JobStatus`` carrying the job id in
+   MessageArgs, polls that task at once. The GET stays the source of truth,
+   the event only removes the dead time; while the stream is up the backoff
+   is allowed to grow to ``events_cap``.
+ * Every wait is a ``concurrent.futures.Future``. Waits for the same task and
+   condition share one future, ``await waiter.wait(task)`` and
+   ``waiter.wait_sync(task)`` are the async and blocking faces of it, so any
+   number of concurrent waits cost one poll per task per tick and one event
+   stream per BMC.
+
+The completion rules are the ones ``IDracManager.fetch_task`` always had:
+202 while the task runs, 200 with the final state, 404/410 and 5xx end the
+wait with the last known state, a Critical or Warning TaskStatus ends it
+early and ``wait_for`` / ``wait_for_state`` let a caller stop at a status
+code or a state.
+
+Author Mus spyroot@gmail.com
+"""
+import asyncio
+import json
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .cmd_exceptions import AuthenticationFailed
+from .redfish_sse import EventStream, SseEvent
+from .redfish_task_state import TaskState, TaskStatus
+
+TASKS_PATH = "/redfish/v1/TaskService/Tasks/"
+SSE_EVENT_FILTER = "EventFormatType eq Event"
+# seconds the poller thread lingers without watches before it exits.
+IDLE_SECONDS = 5.0
+
+logger = logging.getLogger(__name__)
+
+# on_update(state, status, body) after every poll of a running task.
+OnUpdate = Callable[[TaskState, TaskStatus, dict], None]
+
+_waiters: Dict[Tuple, "TaskWaiter"] = {}
+_waiters_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class PollSchedule:
+    """Delay before the next poll of a task."""
+
+    first: float = 0.5
+    factor: float = 2.0
+    cap: float = 10.0
+
+    def delay(self, attempt: int,
+              retry_after: Optional[float] = None,
+              cap: Optional[float] = None) -> float:
+        """
+        :param attempt: polls of the task so far, 0 before the first one
+        :param retry_after: Retry-After of the last answer, in seconds
+        :param cap: overrides ``cap``
+        :return: seconds
+        """
+        cap = self.cap if cap is None else cap
+        backoff = min(cap, self.first * self.factor ** attempt)
+        return max(backoff, retry_after or 0.0)
+
+
+def retry_after_seconds(headers) -> Optional[float]:
+    """Retry-After in seconds, None when absent or an HTTP date."""
+    value = headers.get("Retry-After") if headers is not None else None
+    try:
+        return max(0.0, float(value)) if value is not None else None
+    except ValueError:
+        return None
+
+
+def task_uri(task: str) -> str:
+    """Task monitor path of a task id, a path is kept as is."""
+    return task if task.startswith("/") else f"{TASKS_PATH}{task}"
+
+
+@dataclass
+class _Watch:
+    uri: str
+    key: Tuple
+    wait_for: int
+    wait_for_state: Optional[TaskState]
+    cap: Optional[float]
+    future: Future = field(default_factory=Future)
+    callbacks: List[OnUpdate] = field(default_factory=list)
+    state: TaskState = TaskState.Unknown
+    attempt: int = 0
+    due: float = 0.0
+
+    @property
+    def ids(self) -> Tuple[str, str]:
+        return self.uri.rstrip("/"), self.uri.rstrip("/").rsplit("/", 1)[-1]
+
+
+class TaskEventStream(EventStream):
+    """EventService stream that wakes the waits of the tasks events name."""
+
+    name = "task event stream"
+    unsupported_message = "BMC does not stream task events, polling tasks instead"
+
+    def __init__(self, waiter: "TaskWaiter", **kwargs):
+        super().__init__(waiter.manager, sse_filter=SSE_EVENT_FILTER, **kwargs)
+        self.waiter = waiter
+        self.events = 0
+
+    @staticmethod
+    def named(payload: dict) -> List[str]:
+        """Task uris and ids an Event payload refers to."""
+        records = payload.get("Events")
+        names = []
+        for record in records if isinstance(records, list) else [payload]:
+            if not isinstance(record, dict):
+                continue
+            origin = record.get("OriginOfCondition")
+            uri = origin.get("@odata.id") if isinstance(origin, dict) else origin
+            if isinstance(uri, str) and uri:
+                names += [uri.rstrip("/"), uri.rstrip("/").rsplit("/", 1)[-1]]
+            args = record.get("MessageArgs")
+            names += [a for a in args if isinstance(a, str)] if isinstance(args, list) else []
+        return names
+
+    def on_connect(self):
+        # events sent before the subscription are lost, poll everything once.
+        self.waiter.notify()
+
+    def handle(self, event: SseEvent) -> bool:
+        try:
+            payload = json.loads(event.data)
+        except ValueError:
+            return False
+        if not isinstance(payload, dict):
+            return False
+        self.events += 1
+        return self.waiter.notify(self.named(payload)) > 0
+
+
+class TaskWaiter:
+    """Shared waits for the tasks of one BMC, see the module docstring."""
+
+    def __init__(self,
+                 manager,
+                 schedule: Optional[PollSchedule] = None,
+                 use_events: Optional[bool] = None,
+                 events_cap: float = 60.0,
+                 max_workers: Optional[int] = None):
+        """
+        :param manager: IDracManager bound to the BMC
+        :param schedule: poll backoff, PollSchedule() by default
+        :param use_events: force (True) or disable (False) the SSE stream,
+                           None follows the vendor profile
+        :param events_cap: backoff cap while the event stream is connected
+        :param max_workers: polls in flight at once, defaults to walk_concurrency
+        """
+        self.manager = manager
+        self.schedule = schedule or PollSchedule()
+        self.use_events = use_events
+        self.events_cap = events_cap
+        self.max_workers = max_workers or getattr(manager, "walk_concurrency", 8)
+        self.polls = 0
+        self.stream: Optional[TaskEventStream] = None
+        self._watches: Dict[Tuple, _Watch] = {}
+        self._cond = threading.Condition()
+        self._thread = None
+        self._closed = False
+        self._events = None
+
+    def _events_enabled(self) -> bool:
+        if self.use_events is not None:
+            return self.use_events
+        if self._events is None:
+            try:
+                self._events = bool(self.manager.vendor_capabilities.lifecycle_events_sse)
+            except Exception as err:
+                logger.debug(f"task events disabled: {err}")
+                self._events = False
+        return self._events
+
+    def watch(self,
+              task: str,
+              wait_for: Optional[int] = 0,
+              wait_for_state: Optional[TaskState] = None,
+              on_update: Optional[OnUpdate] = None,
+              cap: Optional[float] = None) -> Future:
+        """Future of the final TaskState of a task, shared by equal waits.
+
+        :param task: task id or task monitor path
+        :param wait_for: status code that ends the wait, 0 waits for 200.
+        :param wait_for_state: state that ends the wait, None waits for completion.
+        :param on_update: called with (state, status, body) after every poll.
+        :param cap: backoff cap of this wait, the schedule cap by default.
+        :return: concurrent.futures.Future resolving to a TaskState
+        """
+        if wait_for_state == TaskState.Unknown:
+            wait_for_state = None
+        uri = task_uri(task)
+        key = (uri, wait_for or 0, wait_for_state)
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("task waiter is closed")
+            watch = self._watches.get(key)
+            if watch is None or watch.future.done():
+                watch = _Watch(uri, key, wait_for or 0, wait_for_state, cap)
+                watch.due = time.monotonic() + self.schedule.delay(0, cap=cap)
+                self._watches[key] = watch
+            if on_update is not None:
+                watch.callbacks.append(on_update)
+            self._ensure_running()
+            self._cond.notify_all()
+            return watch.future
+
+    async def wait(self, task: str, **kwargs) -> TaskState:
+        """Await the final TaskState of a task, see ``watch``."""
+        return await asyncio.wrap_future(self.watch(task, **kwargs))
+
+    def wait_sync(self, task: str, timeout: Optional[float] = None, **kwargs) -> TaskState:
+        """Block until a task ends, see ``watch``.
+        :raise concurrent.futures.TimeoutError: the task did not end in time
+        """
+        return self.watch(task, **kwargs).result(timeout)
+
+    def notify(self, names: Optional[List[str]] = None) -> int:
+        """Poll the watched tasks named by an event now, every task when None.
+        :return: number of waits woken
+        """
+        now = time.monotonic()
+        woken = 0
+        with self._cond:
+            for watch in self._watches.values():
+                if names is None or any(n in names for n in watch.ids):
+                    watch.due = now
+                    woken += 1
+            if woken:
+                self._cond.notify_all()
+        return woken
+
+    def _ensure_running(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="task-waiter", daemon=True)
+            self._thread.start()
+        if self.stream is None and self._events_enabled():
+            self.stream = TaskEventStream(self).start()
+
+    def _cap(self, watch: _Watch) -> Optional[float]:
+        if self.stream is not None and self.stream.connected:
+            return max(self.events_cap, watch.cap or self.schedule.cap)
+        return watch.cap
+
+    def _run(self):
+        pool = stream = None
+        try:
+            while True:
+                with self._cond:
+                    for key in [k for k, w in self._watches.items() if w.future.done()]:
+                        del self._watches[key]
+                    if not self._watches:
+                        self._cond.wait(IDLE_SECONDS)
+                        if not self._watches or self._closed:
+                            self._thread = None
+                            stream, self.stream = self.stream, None
+                            return
+                        continue
+                    now = time.monotonic()
+                    due = [w for w in self._watches.values() if w.due <= now]
+                    if not due:
+                        self._cond.wait(min(w.due for w in self._watches.values()) - now)
+                        continue
+                    for watch in due:
+                        # not due again until this poll answered.
+                        watch.due = float("inf")
+                if len(due) > 1 and self.max_workers > 1:
+                    if pool is None:
+                        pool = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                  thread_name_prefix="task-poll")
+                    list(pool.map(self._poll, due))
+                else:
+                    for watch in due:
+                        self._poll(watch)
+        finally:
+            if pool is not None:
+                pool.shutdown(wait=False)
+            if stream is not None:
+                stream.stop(0.1)
+
+    def _poll(self, watch: _Watch):
+        """GET the task monitor once and settle or reschedule the wait."""
+        if watch.future.done():
+            return
+        manager = self.manager
+        try:
+            url = f"{manager._default_method}{manager.idrac_ip}{watch.uri}"
+            resp = manager.http_request("GET", url, {})
+            with self._cond:
+                self.polls += 1
+            done, state = self._settle(watch, resp)
+        except Exception as err:
+            if not watch.future.done():
+                watch.future.set_exception(err)
+            return
+        if done:
+            if not watch.future.done():
+                watch.future.set_result(state)
+            with self._cond:
+                self._cond.notify_all()
+            return
+        watch.attempt += 1
+        delay = self.schedule.delay(watch.attempt, retry_after_seconds(resp.headers),
+                                    cap=self._cap(watch))
+        next_due = time.monotonic() + delay
+        with self._cond:
+            # an event that arrived during the poll keeps its earlier due time.
+            watch.due = next_due if watch.due == float("inf") else min(watch.due, next_due)
+            self._cond.notify_all()
+
+    def _settle(self, watch: _Watch, resp) -> Tuple[bool, TaskState]:
+        """(done, state) of one task monitor answer."""
+        code = resp.status_code
+        if code == 401:
+            raise AuthenticationFailed("Authentication failed.")
+        if code > 499:
+            logger.critical(f"task service return http error code {code}")
+            return True, watch.state
+        # Cancellation: a GET on the task monitor returns 410 Gone or 404.
+        if code in (404, 410):
+            logger.info(f"task service returned {code}")
+            return True, watch.state
+        try:
+            state, status = self.manager.get_task_state(resp)
+        except Exception as err:
+            logger.error(f"failed to read the state of {watch.uri}: {err}")
+            state, status = watch.state, TaskStatus.Warning
+        watch.state = state
+        if 0 < watch.wait_for == code or code == 200:
+            return True, state
+        if watch.wait_for_state is not None and state == watch.wait_for_state:
+            return True, state
+        if code == 202:
+            try:
+                body = resp.json()
+            except ValueError:
+                body = {}
+            for callback in list(watch.callbacks):
+                callback(state, status, body if isinstance(body, dict) else {})
+            # we bounce, if status not ok
+            if status in (TaskStatus.Critical, TaskStatus.Warning):
+                return True, state
+        else:
+            logger.error(f"unexpected status code {code}")
+        return False, state
+
+    def close(self):
+        """Cancel every pending wait and stop the event stream."""
+        with self._cond:
+            self._closed = True
+            watches = list(self._watches.values())
+            self._watches.clear()
+            self._cond.notify_all()
+        for watch in watches:
+            watch.future.cancel()
+        if self.stream is not None:
+            self.stream.stop(1.0)
+            self.stream = None
+
+
+def shared_task_waiter(manager, **kwargs) -> TaskWaiter:
+    """Process wide TaskWaiter of the BMC and user a manager talks to.
+
+    :param manager: IDracManager bound to the BMC
+    :param kwargs: TaskWaiter options, used when the waiter is created
+    :return: TaskWaiter
+    """
+    key = (manager._default_method, manager.idrac_ip, getattr(manager, "_username", None))
+    with _waiters_lock:
+        waiter = _waiters.get(key)
+        if waiter is None or waiter._closed:
+            waiter = TaskWaiter(manager, **kwargs)
+            _waiters[key] = waiter
+        return waiter
+
+
+def close_task_waiters():
+    """Close every shared waiter, pending waits are cancelled."""
+    with _waiters_lock:
+        waiters = list(_waiters.values())
+        _waiters.clear()
+    for waiter in waiters:
+        waiter.close()
@@ -15,6 +15,9 @@ from typing import Optional
 from ..idrac_manager import IDracManager
 from ..idrac_shared import IDRAC_API, ApiRequestType, Singleton
 from ..redfish_manager import CommandResult
+from ..redfish_planner import Walk
+
+SENSOR_FIELDS = ("Name", "Reading", "ReadingUnits", "ReadingType", "Status")
 
 
 class Sensors(IDracManager,
@@ -51,45 +54,23 @@ class Sensors(IDracManager,
         """Walk every Chassis Sensors collection and collect readings.
 
         Tolerant of a chassis without a Sensors link or an unreachable
-        collection (skips it). An ``$expand``'d Sensors member already carries
-        its Reading; otherwise each member is fetched individually.
+        collection (skips it). The walk is planned for the target, see
+        ``redfish_planner``: collections are $expand'ed where the vendor
+        honors it and member GETs fall back to ``$select`` of the reading
+        fields. ``do_expanded`` forces $expand.
         """
         readings = []
-        chassis = self.base_query(IDRAC_API.Chassis, do_async=do_async)
-        for chassis_uri in self._members(chassis.data):
-            try:
-                cdata = self.base_query(chassis_uri, do_async=do_async).data or {}
-            except Exception:
-                continue
-            link = cdata.get("Sensors")
-            sensors_uri = link.get("@odata.id") if isinstance(link, dict) else None
-            if not sensors_uri:
-                continue
-            try:
-                coll = self.base_query(sensors_uri, do_async=do_async,
-                                       do_expanded=do_expanded).data or {}
-            except Exception:
-                continue
-            for member in coll.get("Members", []):
-                if not isinstance(member, dict):
-                    continue
-                sd = member if "Reading" in member else None
-                if sd is None:
-                    uri = member.get("@odata.id")
-                    if not uri:
-                        continue
-                    try:
-                        sd = self.base_query(uri, do_async=do_async).data
-                    except Exception:
-                        continue
-                if isinstance(sd, dict) and "Reading" in sd:
-                    status = sd.get("Status") or {}
-                    readings.append({
-                        "Chassis": chassis_uri.rsplit("/", 1)[-1],
-                        "Name": sd.get("Name"),
-                        "Reading": sd.get("Reading"),
-                        "ReadingUnits": sd.get("ReadingUnits"),
-                        "ReadingType": sd.get("ReadingType"),
-                        "Health": status.get("Health") if isinstance(status, dict) else None,
-                    })
+        walked = self.walk(Walk(IDRAC_API.Chassis, link="Sensors", fields=SENSOR_FIELDS),
+                           do_async=do_async, expand=True if do_expanded else None)
+        for chassis_uri, _, sd in walked.rows:
+            if "Reading" in sd:
+                status = sd.get("Status") or {}
+                readings.append({
+                    "Chassis": chassis_uri.rsplit("/", 1)[-1],
+                    "Name": sd.get("Name"),
+                    "Reading": sd.get("Reading"),
+                    "ReadingUnits": sd.get("ReadingUnits"),
+                    "ReadingType": sd.get("ReadingType"),
+                    "Health": status.get("Health") if isinstance(status, dict) else None,
+                })
         return CommandResult(readings, None, None, None)
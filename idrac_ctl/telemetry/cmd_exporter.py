@@ -8,20 +8,31 @@ The exporter is read-only. It walks modern Redfish telemetry resources and
 normalizes them into the ``hw.*`` metric contract used by the GB300/NV72
 observability demo.
 """
+import time
 from abc import abstractmethod
-from typing import Optional
+from typing import Mapping, Optional
 
 from ..idrac_manager import IDracManager
 from ..idrac_shared import IDRAC_API, ApiRequestType, Singleton
 from ..redfish_manager import CommandResult
 from .exporter import (
+    COLLECTOR_AGE_METRIC,
+    COLLECTOR_DURATION_METRIC,
+    COLLECTOR_ROWS,
+    ScrapeScheduler,
     build_identity_dimensions,
     build_metric_samples,
+    collection_schedule,
+    metric_sample,
+    parse_collector_intervals,
     render_prometheus_text,
     run_signalfx_loop,
     serve_prometheus,
     to_signalfx_body,
+    with_dimensions,
 )
+from .fleet import DEFAULT_FLEET_WORKERS
+from .metric_stream import MetricReportStream
 
 
 class Exporter(IDracManager,
@@ -30,8 +41,21 @@ class Exporter(IDracManager,
                metaclass=Singleton):
     """Read BMC telemetry and expose Prometheus or SignalFx metric output."""
 
+    # collector name -> read-only command that produces its rows.
+    COLLECTOR_COMMANDS = {
+        "sensors": (ApiRequestType.Sensors, "sensors"),
+        "nvlink": (ApiRequestType.NvLinkPorts, "nvlink-ports"),
+        "metric_reports": (ApiRequestType.MetricReports, "metric-reports"),
+        "network": (ApiRequestType.NetworkAdapters, "network-adapters"),
+        "component_integrity": (ApiRequestType.ComponentIntegrity, "component-integrity"),
+    }
+
     def __init__(self, *args, **kwargs):
         super(Exporter, self).__init__(*args, **kwargs)
+        # collector name -> (rows, monotonic start, duration) of its last run.
+        self._collected = {}
+        # MetricReportStream when metric reports are pushed over SSE.
+        self.metric_stream = None
 
     @staticmethod
     @abstractmethod
@@ -47,6 +71,16 @@ class Exporter(IDracManager,
         cmd_parser.add_argument(
             "--interval", default=30.0, type=float,
             help="scrape interval in seconds for long-running output")
+        cmd_parser.add_argument(
+            "--collector-interval", dest="collector_interval", action="append",
+            default=None, metavar="NAME=SECONDS",
+            help="run one collector every SECONDS and reuse its last rows in between, "
+                 "repeatable; collectors: environment, sensors, nvlink, metric_reports, "
+                 "network, component_integrity, or all")
+        cmd_parser.add_argument(
+            "--metric-stream", dest="metric_stream", default="poll", choices=("poll", "sse"),
+            help="sse: take metric reports from the BMC Server-Sent Events stream, "
+                 "polling the ones it does not push and all of them while it is down")
         cmd_parser.add_argument(
             "--once", action="store_true", default=False,
             help="scrape once and return the rendered output instead of serving forever")
@@ -63,6 +97,13 @@ class Exporter(IDracManager,
         cmd_parser.add_argument(
             "--credential-file", dest="exporter_credential_file", default=None, type=str,
             help="gitignored KEY=VALUE runtime file for IDRAC_IP/USERNAME/PASSWORD/PORT")
+        cmd_parser.add_argument(
+            "--targets", dest="targets", default=None, type=str,
+            help="fleet mode: file with one BMC address or CIDR per line, a CIDR, "
+                 "or a comma separated list; serves /metrics for all and /probe?target=")
+        cmd_parser.add_argument(
+            "--fleet-workers", dest="fleet_workers", default=DEFAULT_FLEET_WORKERS, type=int,
+            help="fleet mode: max number of BMCs scraped at once")
         cmd_parser.add_argument(
             "--push-signalfx", action="store_true", default=False,
             help="push SignalFx datapoints instead of returning/serving Prometheus output")
@@ -125,36 +166,52 @@ class Exporter(IDracManager,
             detected = ""
         return detected or "unknown"
 
+    def _collector_rows(self, name: str, do_async: bool, do_expanded: bool) -> list:
+        """Run one collector and return its rows."""
+        if name == "environment":
+            return self._environment_rows(do_async=do_async)
+        api_type, cmd_name = self.COLLECTOR_COMMANDS[name]
+        stream = self.metric_stream
+        if name == "metric_reports" and stream is not None and stream.connected:
+            # poll the reports that are not pushed, pushed rows win in the merge.
+            stream.store.merge(self._invoke_rows(api_type, cmd_name, do_async=do_async,
+                                                 do_expanded=do_expanded,
+                                                 skip_reports=stream.store.pushed()))
+            return stream.store.rows()
+        return self._invoke_rows(api_type, cmd_name, do_async=do_async, do_expanded=do_expanded)
+
     def collect_samples(self,
                         label_bmc_ip: Optional[str] = None,
                         vendor: Optional[str] = None,
                         do_async: bool = False,
-                        do_expanded: bool = False) -> list:
-        """Scrape all supported read-only telemetry paths and build samples."""
+                        do_expanded: bool = False,
+                        intervals: Optional[Mapping[str, float]] = None) -> list:
+        """Scrape all supported read-only telemetry paths and build samples.
+
+        :param intervals: seconds between two runs per collector, see
+            parse_collector_intervals. A collector that is not due reuses
+            the rows of its last run. None runs every collector.
+        """
         identity = build_identity_dimensions(
             label_bmc_ip or self.idrac_ip,
             vendor=self._vendor_label(vendor),
         )
-        environment_rows = self._environment_rows(do_async=do_async)
-        sensor_rows = self._invoke_rows(ApiRequestType.Sensors, "sensors",
-                                        do_async=do_async, do_expanded=do_expanded)
-        nvlink_rows = self._invoke_rows(ApiRequestType.NvLinkPorts, "nvlink-ports",
-                                        do_async=do_async, do_expanded=do_expanded)
-        metric_rows = self._invoke_rows(ApiRequestType.MetricReports, "metric-reports",
-                                        do_async=do_async, do_expanded=do_expanded)
-        network_rows = self._invoke_rows(ApiRequestType.NetworkAdapters, "network-adapters",
-                                         do_async=do_async, do_expanded=do_expanded)
-        component_rows = self._invoke_rows(ApiRequestType.ComponentIntegrity, "component-integrity",
-                                           do_async=do_async, do_expanded=do_expanded)
-        return build_metric_samples(
-            identity=identity,
-            environment_rows=environment_rows,
-            sensor_rows=sensor_rows,
-            nvlink_rows=nvlink_rows,
-            metric_report_rows=metric_rows,
-            network_rows=network_rows,
-            component_integrity_rows=component_rows,
-        )
+        rows, status = {}, []
+        for name, keyword in COLLECTOR_ROWS.items():
+            last = self._collected.get(name)
+            interval = (intervals or {}).get(name, 0.0)
+            # a second of slack, so a 60s collector on a 30s tick runs every other tick.
+            if intervals is None or last is None or time.monotonic() - last[1] >= interval - 1.0:
+                start = time.monotonic()
+                last = (self._collector_rows(name, do_async, do_expanded),
+                        start, time.monotonic() - start)
+                self._collected[name] = last
+            collector_rows, collected_at, duration = last
+            rows[keyword] = collector_rows
+            dims = with_dimensions(identity, collector=name)
+            status.append(metric_sample(COLLECTOR_DURATION_METRIC, duration, dims, "s"))
+            status.append(metric_sample(COLLECTOR_AGE_METRIC, time.monotonic() - collected_at, dims, "s"))
+        return build_metric_samples(identity=identity, **rows) + status
 
     def execute(self,
                 filename: Optional[str] = None,
@@ -172,6 +229,8 @@ class Exporter(IDracManager,
                 push_signalfx: Optional[bool] = False,
                 signalfx_ingest_url: Optional[str] = None,
                 signalfx_token_env: Optional[str] = "SPLUNK_ACCESS_TOKEN",
+                collector_interval: Optional[list] = None,
+                metric_stream: Optional[str] = "poll",
                 **kwargs) -> CommandResult:
         """Scrape once, serve Prometheus, or push SignalFx datapoints."""
         if once:
@@ -189,15 +248,22 @@ class Exporter(IDracManager,
             if not ingest_url:
                 raise ValueError("SPLUNK_INGEST_URL is not set")
 
-            def scrape_samples():
-                return self.collect_samples(label_bmc_ip, vendor, do_async, do_expanded)
+        intervals, tick = collection_schedule(parse_collector_intervals(collector_interval),
+                                              interval)
 
-            run_signalfx_loop(scrape_samples, token, ingest_url, float(interval or 30.0))
-            return CommandResult(None, None, None, None)
+        def scrape_samples():
+            return self.collect_samples(label_bmc_ip, vendor, do_async, do_expanded, intervals)
 
-        def scrape_text():
-            samples = self.collect_samples(label_bmc_ip, vendor, do_async, do_expanded)
-            return render_prometheus_text(samples)
+        if metric_stream == "sse" and self.metric_stream is None:
+            self.metric_stream = MetricReportStream(self).start()
+
+        if push_signalfx or exporter_output == "signalfx":
+            run_signalfx_loop(scrape_samples, token, ingest_url, tick)
+            return CommandResult(None, None, None, None)
 
-        serve_prometheus(scrape_text, listen or "0.0.0.0", int(port or 9109))
+        # collect on the exporter's own schedule, /metrics serves the last payload.
+        identity = build_identity_dimensions(label_bmc_ip or self.idrac_ip,
+                                             vendor=self._vendor_label(vendor))
+        scheduler = ScrapeScheduler(scrape_samples, tick, dims=with_dimensions(identity))
+        serve_prometheus(scheduler, listen or "0.0.0.0", int(port or 9109))
         return CommandResult(None, None, None, None)
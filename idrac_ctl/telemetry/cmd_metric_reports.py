@@ -17,11 +17,12 @@ powered off or pre-OS. ``MetricValue`` is always a Redfish string and
 Author Mus spyroot@gmail.com
 """
 from abc import abstractmethod
-from typing import Optional
+from typing import Iterable, Optional
 
 from ..idrac_manager import IDracManager
 from ..idrac_shared import ApiRequestType, Singleton
 from ..redfish_manager import CommandResult
+from ..redfish_query import RedfishQuery
 from ..redfish_shared import RedfishApi
 
 
@@ -45,13 +46,28 @@ class MetricReports(IDracManager,
         help_text = "command read TelemetryService metric reports (incl. OOB GPU)"
         return cmd_parser, "metric-reports", help_text
 
+    def _report_uris(self, reports_uri: str, do_expanded: Optional[bool] = False):
+        """@odata.id of every report across the pages of the collection, tolerantly."""
+        query = RedfishQuery(expand=True) if do_expanded else None
+        for member in self.iter_collection(reports_uri, query=query):
+            if isinstance(member, dict) and isinstance(member.get("@odata.id"), str):
+                yield member["@odata.id"]
+
     @staticmethod
-    def _members(data):
-        """Return the @odata.id strings from a Redfish collection, tolerantly."""
-        if not isinstance(data, dict):
-            return []
-        return [m["@odata.id"] for m in data.get("Members", [])
-                if isinstance(m, dict) and isinstance(m.get("@odata.id"), str)]
+    def report_rows(rid: str, rdata: dict) -> list:
+        """Flatten the MetricValues of one MetricReport, non-dict samples are skipped."""
+        rows = []
+        for sample in rdata.get("MetricValues", []) if isinstance(rdata, dict) else []:
+            if not isinstance(sample, dict):
+                continue
+            rows.append({
+                "Report": rid,
+                "MetricId": sample.get("MetricId"),
+                "MetricProperty": sample.get("MetricProperty"),
+                "MetricValue": sample.get("MetricValue"),
+                "Timestamp": sample.get("Timestamp"),
+            })
+        return rows
 
     def execute(self,
                 report: Optional[str] = None,
@@ -60,6 +76,7 @@ class MetricReports(IDracManager,
                 verbose: Optional[bool] = False,
                 do_async: Optional[bool] = False,
                 do_expanded: Optional[bool] = False,
+                skip_reports: Optional[Iterable[str]] = None,
                 **kwargs) -> CommandResult:
         """Walk MetricReports and flatten each MetricValue into a flat row.
 
@@ -67,31 +84,26 @@ class MetricReports(IDracManager,
         non-dict sample (each is skipped). ``report`` narrows to reports whose id
         contains that substring (case-insensitive) — e.g. ``ProcessorMetrics`` to
         scope to GPU/CPU processor telemetry on an HGX baseboard.
+        ``skip_reports`` are report ids left unread, e.g. the ones an SSE
+        stream already pushes.
         """
         rows = []
+        skip = set(skip_reports or ())
         reports_uri = f"{RedfishApi.Version}/TelemetryService/MetricReports"
         try:
-            coll = self.base_query(reports_uri, do_async=do_async,
-                                   do_expanded=do_expanded).data or {}
+            report_uris = list(self._report_uris(reports_uri, do_expanded))
         except Exception:
             return CommandResult(rows, None, None, None)
 
-        for report_uri in self._members(coll):
+        for report_uri in report_uris:
             rid = report_uri.rsplit("/", 1)[-1]
             if report and report.lower() not in rid.lower():
                 continue
+            if rid in skip:
+                continue
             try:
                 rdata = self.base_query(report_uri, do_async=do_async).data or {}
             except Exception:
                 continue
-            for sample in rdata.get("MetricValues", []):
-                if not isinstance(sample, dict):
-                    continue
-                rows.append({
-                    "Report": rid,
-                    "MetricId": sample.get("MetricId"),
-                    "MetricProperty": sample.get("MetricProperty"),
-                    "MetricValue": sample.get("MetricValue"),
-                    "Timestamp": sample.get("Timestamp"),
-                })
+            rows.extend(self.report_rows(rid, rdata))
         return CommandResult(rows, None, None, None)
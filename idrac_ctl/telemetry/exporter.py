@@ -2,17 +2,23 @@
 
 from __future__ import annotations
 
+import gzip
 import json
+import logging
 import math
 import os
 import re
+import threading
 import time
+import urllib.parse
 import urllib.request
 from dataclasses import dataclass
-from http.server import BaseHTTPRequestHandler, HTTPServer
+from http.server import BaseHTTPRequestHandler, HTTPServer, ThreadingHTTPServer
 from pathlib import Path
 from typing import Callable, Iterable, Mapping, Optional
 
+from ..redfish_cache import expire_resource_cache
+
 REQUIRED_DIMENSIONS = ("host.name", "node", "server.address", "bmc.ip", "vendor")
 SENSOR_METRIC = {
     "Temperature": ("hw.temperature", "sensor"),
@@ -56,6 +62,27 @@ FABRIC_PROPERTY_METRICS = {
 SECRET_ARG_NAMES = {"--idrac_password", "--idrac-password"}
 DIM_VALUE_OK = re.compile(r"[^A-Za-z0-9_.\-/]")
 
+# collector name -> build_metric_samples keyword of its rows.
+COLLECTOR_ROWS = {
+    "environment": "environment_rows",
+    "sensors": "sensor_rows",
+    "nvlink": "nvlink_rows",
+    "metric_reports": "metric_report_rows",
+    "network": "network_rows",
+    "component_integrity": "component_integrity_rows",
+}
+# seconds between two runs of a collector, collectors not listed run every
+# --interval seconds. Inventory style data changes rarely.
+DEFAULT_COLLECTOR_INTERVALS = {
+    "nvlink": 60.0,
+    "network": 1800.0,
+    "component_integrity": 1800.0,
+}
+COLLECTOR_DURATION_METRIC = "idrac_ctl.exporter.collector_duration_seconds"
+COLLECTOR_AGE_METRIC = "idrac_ctl.exporter.collector_age_seconds"
+
+logger = logging.getLogger(__name__)
+
 
 @dataclass(frozen=True)
 class MetricSample:
@@ -98,6 +125,45 @@ def build_identity_dimensions(
     }
 
 
+def parse_collector_intervals(values: Optional[Iterable[str]]) -> dict[str, float]:
+    """Parse ``name=seconds`` overrides over DEFAULT_COLLECTOR_INTERVALS.
+
+    :param values: i.e. ``["sensors=15", "network=3600"]``, ``all=`` sets every collector.
+    :return: interval per collector name, 0 follows --interval, see collection_schedule.
+    :raise ValueError: unknown collector or malformed, negative or non-finite value.
+    """
+    intervals = {name: DEFAULT_COLLECTOR_INTERVALS.get(name, 0.0) for name in COLLECTOR_ROWS}
+    for value in values or ():
+        name, sep, seconds = value.partition("=")
+        name = name.strip().replace("-", "_")
+        if not sep or (name != "all" and name not in COLLECTOR_ROWS):
+            raise ValueError(f"invalid collector interval {value!r}, expected one of "
+                             f"{', '.join(COLLECTOR_ROWS)} as name=seconds")
+        seconds = float(seconds)
+        if not math.isfinite(seconds) or seconds < 0:
+            raise ValueError(f"collector interval must be a finite, non-negative number: {value!r}")
+        for key in (COLLECTOR_ROWS if name == "all" else (name,)):
+            intervals[key] = seconds
+    return intervals
+
+
+def collection_schedule(intervals: Mapping[str, float],
+                        interval: float) -> tuple[dict[str, float], float]:
+    """Resolve collector intervals against the ``--interval`` of the exporter.
+
+    A collector without an interval of its own runs every ``interval``
+    seconds. The collection tick is the shortest interval, so a collector
+    faster than ``interval`` runs on time without dragging the others along.
+
+    :param intervals: interval per collector, see parse_collector_intervals
+    :param interval: seconds between two collections, ``--interval``
+    :return: interval per collector and the collection tick in seconds
+    """
+    interval = float(interval or 30.0)
+    resolved = {name: seconds or interval for name, seconds in intervals.items()}
+    return resolved, min([interval, *resolved.values()])
+
+
 def load_exporter_env_file(path: os.PathLike[str] | str) -> dict[str, str]:
     """Read a simple KEY=VALUE runtime env file without printing secret values."""
     values = {}
@@ -171,16 +237,16 @@ def samples_from_environment_rows(
     samples = []
     for row in rows:
         chassis = str(row.get("Chassis") or row.get("Id") or "unknown")
-        dims = _with_dims(identity, source="environment", chassis=chassis)
+        dims = with_dimensions(identity, source="environment", chassis=chassis)
         power = _as_float(_reading(row.get("PowerWatts")))
         if power is not None:
             metric = "hw.gpu.power" if _gpu_from_chassis(chassis) else "hw.power"
-            samples.append(_sample(metric, power, dims | _gpu_dim(chassis), unit="W"))
+            samples.append(metric_sample(metric, power, dims | _gpu_dim(chassis), unit="W"))
         energy = _as_float(_reading(row.get("EnergykWh") or row.get("EnergyKWh")))
         if energy is not None:
-            samples.append(_sample("hw.energy_kwh", energy, dims | _gpu_dim(chassis), unit="kWh"))
+            samples.append(metric_sample("hw.energy_kwh", energy, dims | _gpu_dim(chassis), unit="kWh"))
         for fan_name, rpm in _fan_readings(row):
-            samples.append(_sample("hw.fan_speed", rpm, dims | {"fan": _dim_value(fan_name)}, "RPM"))
+            samples.append(metric_sample("hw.fan_speed", rpm, dims | {"fan": _dim_value(fan_name)}, "RPM"))
     return samples
 
 
@@ -196,17 +262,17 @@ def samples_from_sensor_rows(
         chassis = str(row.get("Chassis") or "unknown")
         reading_type = row.get("ReadingType")
         name = str(row.get("Name") or "sensor")
-        dims = _with_dims(identity, source="sensor", chassis=chassis)
+        dims = with_dimensions(identity, source="sensor", chassis=chassis)
         health = row.get("Health")
         if health:
             dims["health"] = str(health)
         if reading_type == "Power" and _gpu_from_chassis(chassis):
-            samples.append(_sample("hw.gpu.power", value, dims | _gpu_dim(chassis), "W"))
+            samples.append(metric_sample("hw.gpu.power", value, dims | _gpu_dim(chassis), "W"))
         elif reading_type == "Power":
-            samples.append(_sample("hw.power", value, dims | {"sensor": _dim_value(name)}, "W"))
+            samples.append(metric_sample("hw.power", value, dims | {"sensor": _dim_value(name)}, "W"))
         elif reading_type in SENSOR_METRIC:
             metric, label = SENSOR_METRIC[reading_type]
-            samples.append(_sample(metric, value, dims | {label: _dim_value(name)}, row.get("ReadingUnits")))
+            samples.append(metric_sample(metric, value, dims | {label: _dim_value(name)}, row.get("ReadingUnits")))
     return samples
 
 
@@ -218,7 +284,7 @@ def samples_from_nvlink_rows(
     for row in rows:
         dims = _fabric_dims(identity, row.get("System"), row.get("GPU"), row.get("Port"), "nvlink")
         link_up = 1.0 if row.get("LinkStatus") == "LinkUp" else 0.0
-        samples.append(_sample("hw.fabric.link_up", link_up, dims, None))
+        samples.append(metric_sample("hw.fabric.link_up", link_up, dims, None))
         for key, metric, unit in (
                 ("CurrentSpeedGbps", "hw.fabric.port_speed", "Gbps"),
                 ("RXBytes", "hw.fabric.rx_bytes", "By"),
@@ -226,7 +292,7 @@ def samples_from_nvlink_rows(
                 ("BitErrorRate", "hw.fabric.bit_error_rate", None)):
             value = _as_float(row.get(key))
             if value is not None:
-                samples.append(_sample(metric, value, dims, unit))
+                samples.append(metric_sample(metric, value, dims, unit))
     return samples
 
 
@@ -250,7 +316,7 @@ def samples_from_metric_report_rows(
         dims = _fabric_dims(identity, prop_info.get("system"),
                             prop_info.get("gpu"), prop_info.get("port"), fabric)
         dims["report"] = str(row.get("Report") or "unknown")
-        samples.append(_sample(metric, value, dims, _unit_for_metric(metric), row.get("Timestamp")))
+        samples.append(metric_sample(metric, value, dims, _unit_for_metric(metric), row.get("Timestamp")))
     return samples
 
 
@@ -261,11 +327,11 @@ def samples_from_network_rows(
     samples = []
     for row in rows:
         adapter = str(row.get("Id") or "adapter")
-        dims = _with_dims(identity, source="network-adapter", adapter=_dim_value(adapter))
+        dims = with_dimensions(identity, source="network-adapter", adapter=_dim_value(adapter))
         dims["device_class"] = str(row.get("DeviceClass") or "NIC")
         if row.get("Model"):
             dims["model"] = _dim_value(row["Model"])
-        samples.append(_sample("hw.fabric.adapter_present", 1.0, dims, None))
+        samples.append(metric_sample("hw.fabric.adapter_present", 1.0, dims, None))
     return samples
 
 
@@ -277,10 +343,10 @@ def samples_from_component_integrity_rows(
     for row in rows:
         component = str(row.get("Id") or "component")
         enabled = 1.0 if row.get("Enabled") is True else 0.0
-        dims = _with_dims(identity, source="component-integrity", component=_dim_value(component))
+        dims = with_dimensions(identity, source="component-integrity", component=_dim_value(component))
         if row.get("Type"):
             dims["component_integrity_type"] = str(row["Type"])
-        samples.append(_sample("hw.component_integrity.enabled", enabled, dims, None))
+        samples.append(metric_sample("hw.component_integrity.enabled", enabled, dims, None))
     return samples
 
 
@@ -327,37 +393,205 @@ def push_signalfx(body: Mapping, token: str, ingest_url: str, timeout: float = 2
         return response.status
 
 
-def serve_prometheus(
-        scrape: Callable[[], str],
+SCRAPE_AGE_METRIC = "idrac_ctl.exporter.scrape_age_seconds"
+LAST_SUCCESS_METRIC = "idrac_ctl.exporter.last_success_timestamp_seconds"
+COLLECT_DURATION_METRIC = "idrac_ctl.exporter.collect_duration_seconds"
+COLLECT_ERRORS_METRIC = "idrac_ctl.exporter.collect_errors"
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class ScrapeScheduler:
+    """Collect samples on a fixed schedule and keep the last rendered payload.
+
+    The Redfish walk runs in a background thread, not inside the HTTP GET,
+    so a scrape returns the cached payload at once and two Prometheus
+    servers scraping the same exporter do not double the BMC load. The
+    payload is kept plain and gzip compressed. Every response appends
+    gauges for the payload age and the last successful collection; a
+    failed collection keeps serving the previous payload.
+    """
+
+    def __init__(self,
+                 collect: Callable[[], list[MetricSample]],
+                 interval: float = 30.0,
+                 dims: Optional[Mapping[str, str]] = None):
+        """
+        :param collect: returns the samples of one collection
+        :param interval: seconds between two collection starts
+        :param dims: labels of the exporter gauges, i.e. the BMC identity
+        """
+        self.collect = collect
+        self.interval = max(1.0, float(interval))
+        self.dims = dict(dims or {})
+        self.last_success = None
+        self.last_duration = 0.0
+        self.errors = 0
+        self._plain = b""
+        self._gzip = b""
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def collect_once(self) -> bool:
+        """Run one collection and swap the cached payload on success."""
+        start = time.monotonic()
+        # status documents share the inventory TTL, revalidate them every scrape.
+        expire_resource_cache()
+        try:
+            samples = sorted(self.collect(), key=lambda sample: sample.metric)
+        except Exception as exc:  # noqa: BLE001 - keep serving the last payload
+            logger.warning(f"exporter collection failed: {type(exc).__name__}: {exc}")
+            with self._lock:
+                self.errors += 1
+                self.last_duration = time.monotonic() - start
+            return False
+        plain = render_prometheus_text(samples).encode()
+        compressed = gzip.compress(plain, compresslevel=6)
+        with self._lock:
+            self._plain, self._gzip = plain, compressed
+            self.last_success = time.time()
+            self.last_duration = time.monotonic() - start
+        self._ready.set()
+        return True
+
+    def _run(self):
+        while not self._stop.is_set():
+            start = time.monotonic()
+            self.collect_once()
+            self._stop.wait(max(0.0, self.interval - (time.monotonic() - start)))
+
+    def start(self) -> "ScrapeScheduler":
+        """Start the background collection thread."""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="exporter-collect",
+                                            daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: Optional[float] = None):
+        """Stop the collection thread after the running collection."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        """Wait for the first successful collection."""
+        return self._ready.wait(timeout)
+
+    def status_samples(self) -> list[MetricSample]:
+        """Gauges describing the cached payload, computed per request."""
+        with self._lock:
+            last_success, duration, errors = self.last_success, self.last_duration, self.errors
+        now = time.time()
+        return [
+            metric_sample(SCRAPE_AGE_METRIC,
+                          now - last_success if last_success else math.inf, self.dims, "s"),
+            metric_sample(LAST_SUCCESS_METRIC, last_success or 0.0, self.dims, "s"),
+            metric_sample(COLLECT_DURATION_METRIC, duration, self.dims, "s"),
+            MetricSample(COLLECT_ERRORS_METRIC, float(errors), dict(self.dims),
+                         metric_type="counter"),
+        ]
+
+    def payload(self, compressed: bool = False) -> Optional[bytes]:
+        """Cached payload followed by the status gauges, None before the
+        first successful collection. A gzip payload is two gzip members,
+        which every gzip reader concatenates."""
+        if not self._ready.is_set():
+            return None
+        with self._lock:
+            body = self._gzip if compressed else self._plain
+        status = render_prometheus_text(self.status_samples()).encode()
+        return body + (gzip.compress(status) if compressed else status)
+
+    def __call__(self) -> str:
+        """Plain text payload, so a scheduler can stand in for a scrape callable."""
+        self.wait_ready(self.interval)
+        return (self.payload() or b"").decode()
+
+
+def prometheus_server(
+        scrape: Callable[[], str] | ScrapeScheduler,
         bind: str = "0.0.0.0",
-        port: int = 9109) -> None:
-    """Serve ``/metrics`` by calling ``scrape`` for each request."""
+        port: int = 9109,
+        probe: Optional[Callable[[str], Optional[str]]] = None) -> HTTPServer:
+    """Build a threaded HTTP server for ``/metrics``.
+
+    ``scrape`` is either a callable rendering the text on each request, or a
+    ``ScrapeScheduler`` whose cached payload is served as is, gzip encoded
+    when the client accepts it. With ``probe``, ``/probe?target=<bmc>``
+    renders a single target in blackbox-exporter style; ``probe`` returns
+    None for an unknown target.
+    """
+    scheduler = scrape if isinstance(scrape, ScrapeScheduler) else None
 
     class Handler(BaseHTTPRequestHandler):
+        def _reply(self, status: int, payload: bytes,
+                   content_type: str = "text/plain; charset=utf-8",
+                   encoding: Optional[str] = None):
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            if encoding:
+                self.send_header("Content-Encoding", encoding)
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def _cached_metrics(self):
+            accepts = self.headers.get("Accept-Encoding", "")
+            compressed = "gzip" in accepts.lower()
+            scheduler.wait_ready(scheduler.interval)
+            payload = scheduler.payload(compressed)
+            if payload is None:
+                self._reply(503, b"no successful collection yet\n")
+                return
+            self._reply(200, payload, PROMETHEUS_CONTENT_TYPE,
+                        "gzip" if compressed else None)
+
         def do_GET(self):  # noqa: N802 - http.server API
-            if self.path != "/metrics":
+            url = urllib.parse.urlsplit(self.path)
+            if url.path == "/probe" and probe is not None:
+                target = urllib.parse.parse_qs(url.query).get("target", [""])[0]
+                if not target:
+                    self._reply(400, b"missing target parameter\n")
+                    return
+                render = lambda: probe(target)  # noqa: E731
+            elif url.path == "/metrics" and scheduler is not None:
+                self._cached_metrics()
+                return
+            elif url.path == "/metrics":
+                render = scrape
+            else:
                 self.send_response(404)
                 self.end_headers()
                 return
             try:
-                payload = scrape().encode()
-                self.send_response(200)
-                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
-                self.send_header("Content-Length", str(len(payload)))
-                self.end_headers()
-                self.wfile.write(payload)
+                text = render()
+                if text is None:
+                    self._reply(404, f"unknown target {target}\n".encode())
+                    return
+                self._reply(200, text.encode(), PROMETHEUS_CONTENT_TYPE)
             except Exception as exc:  # noqa: BLE001 - exporter should return HTTP 500
-                payload = f"exporter scrape failed: {type(exc).__name__}\n".encode()
-                self.send_response(500)
-                self.send_header("Content-Type", "text/plain; charset=utf-8")
-                self.send_header("Content-Length", str(len(payload)))
-                self.end_headers()
-                self.wfile.write(payload)
+                self._reply(500, f"exporter scrape failed: {type(exc).__name__}\n".encode())
 
         def log_message(self, format, *args):  # noqa: A002 - http.server API
             return
 
-    HTTPServer((bind, port), Handler).serve_forever()
+    server = ThreadingHTTPServer((bind, port), Handler)
+    server.daemon_threads = True
+    return server
+
+
+def serve_prometheus(
+        scrape: Callable[[], str] | ScrapeScheduler,
+        bind: str = "0.0.0.0",
+        port: int = 9109,
+        probe: Optional[Callable[[str], Optional[str]]] = None) -> None:
+    """Serve ``/metrics`` (and ``/probe`` when given) forever."""
+    if isinstance(scrape, ScrapeScheduler):
+        scrape.start()
+    prometheus_server(scrape, bind, port, probe).serve_forever()
 
 
 def run_signalfx_loop(
@@ -410,17 +644,19 @@ def _as_float(value) -> Optional[float]:
     return parsed if math.isfinite(parsed) else None
 
 
-def _sample(metric: str,
-            value: float,
-            dims: Mapping[str, str],
-            unit: Optional[str] = None,
-            timestamp: Optional[str] = None) -> MetricSample:
+def metric_sample(metric: str,
+                  value: float,
+                  dims: Mapping[str, str],
+                  unit: Optional[str] = None,
+                  timestamp: Optional[str] = None) -> MetricSample:
+    """One sample with its value as float and its dimensions as strings."""
     return MetricSample(metric=metric, value=float(value),
                         dimensions={k: str(v) for k, v in dims.items()},
                         unit=unit, timestamp=timestamp)
 
 
-def _with_dims(identity: Mapping[str, str], **extra) -> dict[str, str]:
+def with_dimensions(identity: Mapping[str, str], **extra) -> dict[str, str]:
+    """The required dimensions of identity, plus every non empty extra one."""
     dims = {key: str(identity.get(key, "unknown")) for key in REQUIRED_DIMENSIONS}
     for key, value in extra.items():
         if value not in (None, ""):
@@ -433,7 +669,7 @@ def _fabric_dims(identity: Mapping[str, str],
                  gpu,
                  port,
                  fabric: str) -> dict[str, str]:
-    dims = _with_dims(identity, source="fabric", fabric=fabric)
+    dims = with_dimensions(identity, source="fabric", fabric=fabric)
     for key, value in (("system", system), ("gpu", gpu), ("port", port)):
         if value:
             dims[key] = str(value)
@@ -0,0 +1,236 @@
+"""Scrape a fleet of BMCs from one exporter process.
+
+    idrac_ctl exporter --targets hosts.txt --credential-file creds.env
+    idrac_ctl exporter --targets 172.25.230.20/27 --fleet-workers 32 --once
+
+The single-BMC exporter needs one process per BMC. ``FleetExporter`` reads a
+target list (a file with one address per line, a CIDR, or a comma separated
+list), scrapes every target with a bounded worker pool, and serves the whole
+fleet on one ``/metrics`` endpoint, or a single BMC on
+``/probe?target=<address>`` in blackbox-exporter style.
+
+Every target gets the usual identity labels from ``build_identity_dimensions``
+plus two series about the scrape itself::
+
+    idrac_ctl.scrape.duration_seconds{bmc.ip=...}  wall time of the target scrape
+    idrac_ctl.scrape.success{bmc.ip=...}           1 when the BMC answered
+
+With ``--metric-stream sse`` every listed target that answered a scrape gets
+its own ``MetricReportStream``, so its metric reports are pushed instead of
+polled.
+
+Credentials come from ``--credential-file`` (or IDRAC_USERNAME/PASSWORD) and
+are shared by all targets.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Iterable, Mapping, Optional
+
+from ..fleet import load_targets
+from ..fleet import target_host as _host
+from ..redfish_cache import expire_resource_cache
+from ..redfish_shared import RedfishApi
+from .exporter import (
+    MetricSample,
+    ScrapeScheduler,
+    build_identity_dimensions,
+    collection_schedule,
+    metric_sample,
+    parse_collector_intervals,
+    render_prometheus_text,
+    serve_prometheus,
+    with_dimensions,
+)
+from .metric_stream import MetricReportStream
+
+DEFAULT_FLEET_WORKERS = 16
+SCRAPE_DURATION_METRIC = "idrac_ctl.scrape.duration_seconds"
+SCRAPE_SUCCESS_METRIC = "idrac_ctl.scrape.success"
+
+
+@dataclass
+class TargetScrape:
+    """Outcome of one target scrape."""
+
+    target: str
+    samples: list[MetricSample] = field(default_factory=list)
+    duration: float = 0.0
+    success: bool = False
+    error: Optional[str] = None
+
+
+class FleetExporter:
+    """Scrape many BMCs concurrently and render them as one payload."""
+
+    def __init__(self,
+                 targets: Iterable[str],
+                 username: str,
+                 password: str,
+                 port: int = 443,
+                 vendor: Optional[str] = None,
+                 max_workers: int = DEFAULT_FLEET_WORKERS,
+                 insecure: bool = True,
+                 any_target: bool = False,
+                 resource_cache: bool = True,
+                 intervals: Optional[Mapping[str, float]] = None,
+                 metric_stream: str = "poll",
+                 **manager_kwargs):
+        """
+        :param targets: BMC addresses, ``host`` or ``host:port``
+        :param username: BMC username shared by all targets
+        :param password: BMC password shared by all targets
+        :param port: default BMC port
+        :param vendor: vendor label override, detected per BMC when None
+        :param max_workers: max number of targets scraped at once
+        :param insecure: skip TLS verification
+        :param any_target: let /probe scrape addresses outside ``targets``
+        :param resource_cache: reuse documents within a scrape, revalidate them between scrapes
+        :param intervals: per collector interval, see parse_collector_intervals
+        :param metric_stream: sse takes the metric reports of every listed target
+                              from its SSE stream once the target answered, poll polls them
+        :param manager_kwargs: extra IDracManager arguments, i.e. session_auth
+        """
+        if max_workers < 1:
+            raise ValueError("max_workers must be positive")
+        self.targets = list(targets)
+        self.vendor = vendor
+        self.max_workers = max_workers
+        self.any_target = any_target
+        self.intervals = intervals
+        self.metric_stream = metric_stream
+        self._credentials = {"idrac_username": username, "idrac_password": password,
+                             "idrac_port": port, "insecure": insecure}
+        self._manager_kwargs = dict(manager_kwargs, resource_cache=resource_cache)
+        self._locks: dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+        # target -> MetricReportStream of its exporter.
+        self._streams: dict[str, MetricReportStream] = {}
+
+    def exporter_for(self, target: str):
+        """Return the Exporter command bound to one target."""
+        from .cmd_exporter import Exporter
+        return Exporter(idrac_ip=target, **self._credentials, **self._manager_kwargs)
+
+    def _start_stream(self, target: str, exporter):
+        """Take the target's metric reports from its SSE stream from now on."""
+        if exporter.metric_stream is None:
+            exporter.metric_stream = MetricReportStream(exporter).start()
+            self._streams[target] = exporter.metric_stream
+
+    def close(self):
+        """Stop the metric report streams."""
+        for stream in self._streams.values():
+            stream.stop()
+        self._streams.clear()
+
+    def _lock(self, target: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault(target, threading.Lock())
+
+    def scrape_target(self, target: str) -> TargetScrape:
+        """Scrape one target. Never raises, a failure is reported by the
+        success series instead."""
+        result = TargetScrape(target)
+        vendor = self.vendor or "unknown"
+        start = time.monotonic()
+        with self._lock(target):
+            try:
+                exporter = self.exporter_for(target)
+                # a /probe scrapes without the scheduler, revalidate here too.
+                base = f"{exporter._default_method}{exporter.redfish_ip}"
+                expire_resource_cache(base)
+                # collectors tolerate missing resources, so probe the service
+                # root first to tell an unreachable BMC from an empty one.
+                response = exporter.api_get_call(f"{base}{RedfishApi.Version}", {})
+                exporter.default_error_handler(response)
+                if self.metric_stream == "sse" and target in self.targets:
+                    self._start_stream(target, exporter)
+                vendor = exporter._vendor_label(self.vendor)
+                result.samples = exporter.collect_samples(label_bmc_ip=_host(target),
+                                                          vendor=vendor,
+                                                          intervals=self.intervals)
+                result.success = True
+            except Exception as exc:  # noqa: BLE001 - one dead BMC must not fail the fleet
+                result.error = type(exc).__name__
+        result.duration = time.monotonic() - start
+
+        dims = with_dimensions(build_identity_dimensions(_host(target), vendor=vendor))
+        result.samples.append(metric_sample(SCRAPE_DURATION_METRIC, result.duration, dims, "s"))
+        result.samples.append(metric_sample(SCRAPE_SUCCESS_METRIC, 1.0 if result.success else 0.0, dims))
+        return result
+
+    def scrape_all(self) -> list[TargetScrape]:
+        """Scrape every target, at most max_workers at once, in target order."""
+        if not self.targets:
+            return []
+        workers = min(self.max_workers, len(self.targets))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="fleet-scrape") as pool:
+            return list(pool.map(self.scrape_target, self.targets))
+
+    def collect_samples(self) -> list[MetricSample]:
+        """Samples of the whole fleet."""
+        samples = []
+        for scrape in self.scrape_all():
+            samples.extend(scrape.samples)
+        return samples
+
+    def render(self) -> str:
+        """Prometheus text for the whole fleet, one family per metric."""
+        samples = sorted(self.collect_samples(), key=lambda sample: sample.metric)
+        return render_prometheus_text(samples)
+
+    def render_probe(self, target: str) -> Optional[str]:
+        """Prometheus text for one target, None when the target is unknown."""
+        if target not in self.targets and not self.any_target:
+            return None
+        return render_prometheus_text(self.scrape_target(target).samples)
+
+    def serve(self, bind: str = "0.0.0.0", port: int = 9109, interval: float = 30.0) -> None:
+        """Serve /metrics for the fleet, collected every interval seconds in
+        the background, and /probe?target= for one BMC on demand."""
+        serve_prometheus(ScrapeScheduler(self.collect_samples, interval),
+                         bind, port, probe=self.render_probe)
+
+
+def run_fleet_exporter(args) -> int:
+    """Run the exporter in fleet mode from parsed CLI arguments.
+    :return: process exit code
+    """
+    if not getattr(args, "idrac_username", None) or not getattr(args, "idrac_password", None):
+        print("Please provide fleet credentials through environment "
+              "variables or --credential-file.")
+        return 1
+    targets = load_targets(args.targets)
+    if not targets:
+        print(f"No targets found in {args.targets}.")
+        return 1
+    intervals, tick = collection_schedule(
+        parse_collector_intervals(getattr(args, "collector_interval", None)),
+        getattr(args, "interval", 30.0))
+    fleet = FleetExporter(
+        targets,
+        username=args.idrac_username,
+        password=args.idrac_password,
+        port=int(args.idrac_port or 443),
+        vendor=getattr(args, "vendor", None),
+        max_workers=int(getattr(args, "fleet_workers", DEFAULT_FLEET_WORKERS)),
+        insecure=not getattr(args, "verify_ssl", False),
+        is_http=getattr(args, "use_http", False),
+        session_auth=getattr(args, "session_auth", False) or getattr(args, "token_cache", False),
+        token_cache=getattr(args, "token_cache", False),
+        resource_cache=not getattr(args, "no_resource_cache", False),
+        intervals=intervals,
+        # a single collection has no use for a stream.
+        metric_stream="poll" if getattr(args, "once", False) else getattr(
+            args, "metric_stream", "poll"),
+    )
+    if getattr(args, "once", False):
+        print(fleet.render(), end="")
+        return 0
+    fleet.serve(getattr(args, "listen", "0.0.0.0"), int(getattr(args, "port", 9109)), tick)
+    return 0
@@ -0,0 +1,153 @@
+"""Stream MetricReports over Redfish Server-Sent Events.
+
+    idrac_ctl exporter --metric-stream sse
+
+Polling MetricReports walks the collection and every report on each
+collection, the most expensive part of a scrape on an HGX baseboard. A BMC
+that implements SSE pushes each report as it is generated instead. This
+module subscribes to the ``ServerSentEventUri`` advertised by the
+EventService, narrowed to MetricReport events when the BMC accepts the
+filter, and keeps the last rows of every report in a ``MetricReportStore``
+that the exporter renders from. Reports the BMC does not push, OnRequest
+ones or ones outside the filter, are still polled on the ``metric_reports``
+collector interval and merged with the pushed ones.
+
+Connection handling lives in ``idrac_ctl.redfish_sse.EventStream``: it
+reconnects with jittered exponential backoff and resumes with Last-Event-ID.
+A BMC without an SSE URI, or one that answers 404/405/501, marks the stream
+unsupported and the exporter keeps polling. The exporter stays read-only:
+it never creates an EventService subscription.
+
+Author Mus spyroot@gmail.com
+"""
+from __future__ import annotations
+
+import json
+import threading
+import time
+from typing import Iterable, Optional
+
+from ..redfish_sse import (  # noqa: F401 - parse_sse and SseEvent are part of this API
+    DEFAULT_BACKOFF,
+    DEFAULT_READ_TIMEOUT,
+    UNSUPPORTED_STATUS,
+    EventStream,
+    SseEvent,
+    parse_sse,
+)
+from .cmd_metric_reports import MetricReports
+
+SSE_FILTER = "EventFormatType eq MetricReport"
+# seconds a pushed report is served before it is polled again.
+DEFAULT_MAX_AGE = 300.0
+
+
+def report_id(report: dict) -> Optional[str]:
+    """Id of a pushed MetricReport, from Id, its definition or @odata.id."""
+    if report.get("Id"):
+        return str(report["Id"])
+    for link in (report.get("MetricReportDefinition"), report):
+        uri = link.get("@odata.id") if isinstance(link, dict) else None
+        if isinstance(uri, str) and uri:
+            return uri.rstrip("/").rsplit("/", 1)[-1]
+    return None
+
+
+class MetricReportStore:
+    """Last rows of every MetricReport, pushed or polled.
+
+    Each report keeps the time it was last updated. A pushed report older
+    than max_age counts as no longer pushed, so the next poll reads it
+    again, and any report older than max_age is left out of rows().
+    """
+
+    def __init__(self, max_age: float = DEFAULT_MAX_AGE):
+        """
+        :param max_age: seconds a report is served without being pushed or polled again
+        """
+        self.max_age = max_age
+        # report id -> (rows, pushed, monotonic time of the last update)
+        self._reports = {}
+        self._lock = threading.Lock()
+        self.events = 0
+        self.updated = None
+
+    def __len__(self):
+        with self._lock:
+            return len(self._reports)
+
+    def _fresh(self, entry, now: float) -> bool:
+        return now - entry[2] <= self.max_age
+
+    def update(self, rid: str, rows: list):
+        """Replace the rows of one report with pushed rows."""
+        with self._lock:
+            self._reports[rid] = (list(rows), True, time.monotonic())
+            self.events += 1
+            self.updated = time.time()
+
+    def pushed(self) -> set:
+        """Ids of the reports pushed within max_age, the ones a poll can skip."""
+        now = time.monotonic()
+        with self._lock:
+            return {rid for rid, entry in self._reports.items()
+                    if entry[1] and self._fresh(entry, now)}
+
+    def merge(self, rows: Iterable[dict]):
+        """Replace the polled reports with the rows of one poll.
+        A report pushed within max_age keeps its pushed rows."""
+        polled = {}
+        for row in rows:
+            polled.setdefault(row.get("Report"), []).append(row)
+        now = time.monotonic()
+        with self._lock:
+            self._reports = {rid: entry for rid, entry in self._reports.items()
+                             if entry[1] and self._fresh(entry, now)}
+            for rid, report_rows in polled.items():
+                self._reports.setdefault(rid, (report_rows, False, now))
+
+    def rows(self) -> list:
+        """Rows of every report updated within max_age, in the shape MetricReports returns."""
+        now = time.monotonic()
+        with self._lock:
+            return [row for entry in self._reports.values() if self._fresh(entry, now)
+                    for row in entry[0]]
+
+
+class MetricReportStream(EventStream):
+    """Background SSE consumer that feeds a MetricReportStore."""
+
+    name = "metric report stream"
+    unsupported_message = "BMC does not stream metric reports, polling them instead"
+
+    def __init__(self,
+                 manager,
+                 store: Optional[MetricReportStore] = None,
+                 sse_filter: Optional[str] = SSE_FILTER,
+                 backoff: tuple = DEFAULT_BACKOFF,
+                 read_timeout: float = DEFAULT_READ_TIMEOUT):
+        """
+        :param manager: RedfishManager bound to the BMC
+        :param store: store to update, a new one by default
+        :param sse_filter: $filter sent on the SSE URI, None subscribes to all events
+        :param backoff: first and max seconds between two connection attempts
+        :param read_timeout: seconds of silence before reconnecting
+        """
+        super().__init__(manager, sse_filter, backoff, read_timeout)
+        self.store = store if store is not None else MetricReportStore()
+
+    def handle(self, event: SseEvent) -> bool:
+        """Apply one event to the store.
+        :return: True when the event carried a MetricReport
+        """
+        try:
+            payload = json.loads(event.data)
+        except ValueError:
+            return False
+        if not isinstance(payload, dict) or "MetricValues" not in payload:
+            return False
+        rid = report_id(payload)
+        if rid is None:
+            return False
+        self.store.update(rid, MetricReports.report_rows(rid, payload))
+        return True
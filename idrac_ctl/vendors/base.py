@@ -24,6 +24,8 @@ class VendorCapabilities:
     query_select: bool = False
     query_filter: bool = False
     query_expand: bool = True
+    # Deepest $expand $levels the service honors.
+    query_expand_levels: int = 1
     query_top: bool = False
     query_only: bool = False
     # Some vendors (Dell) accept only one query parameter per URI.
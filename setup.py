@@ -39,6 +39,9 @@ setup_info = dict(name='idrac_ctl',
                       "tui": [
                           "rich >= 13",
                       ],
+                      "async": [
+                          "aiohttp >= 3.8",
+                      ],
                   },
                   )
 setup(**setup_info)
@@ -230,9 +230,17 @@ def _reset_command_singletons():
     Clearing the instance registry before each test isolates them.
     """
     from idrac_ctl.idrac_shared import Singleton
+    from idrac_ctl.redfish_auth import forget_sessions
+    from idrac_ctl.redfish_cache import clear_resource_cache
+    from idrac_ctl.redfish_pool import close_shared_sessions
+    from idrac_ctl.redfish_task_wait import close_task_waiters
     Singleton._instances.clear()
     yield
     Singleton._instances.clear()
+    close_task_waiters()
+    forget_sessions()
+    close_shared_sessions()
+    clear_resource_cache()
 
 
 @pytest.fixture
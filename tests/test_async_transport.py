@@ -0,0 +1,153 @@
+"""Native asyncio transport: async_base_query and async_base_post/patch/delete.
+
+The executor backend runs through requests-mock like the rest of the suite.
+The aiohttp backend is exercised against a local HTTP server and skips when
+the optional ``aiohttp`` extra is not installed.
+
+Author Mus spyroot@gmail.com
+"""
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from idrac_ctl.idrac_manager import IDracManager
+from idrac_ctl.idrac_shared import IdracApiRespond
+from idrac_ctl.redfish_async import AsyncRedfishResponse, async_client, basic_auth_header
+
+
+def _run(mgr, coro_factory, use_aiohttp=None, per_host_limit=8):
+    """Run a coroutine on a fresh loop with a configured shared client."""
+    async def _main():
+        async_client(per_host_limit=per_host_limit, use_aiohttp=use_aiohttp)
+        try:
+            return await coro_factory()
+        finally:
+            await mgr.async_close()
+
+    return asyncio.run(_main())
+
+
+def test_async_base_query_gathers_a_subtree(redfish_mock):
+    """Chassis members fetched with asyncio.gather come back in order."""
+    mgr = redfish_mock
+
+    async def walk():
+        chassis = await mgr.async_base_query("/redfish/v1/Chassis")
+        uris = [m["@odata.id"] for m in chassis.data["Members"]]
+        members = await asyncio.gather(*(mgr.async_base_query(u) for u in uris))
+        return uris, members
+
+    uris, members = _run(mgr, walk, use_aiohttp=False)
+    assert uris
+    assert [m.data["@odata.id"] for m in members] == uris
+    assert mgr.query_counter == len(uris) + 1
+
+
+def test_async_base_post_returns_task_id(redfish_service, redfish_mock):
+    """A 202 + Location answer surfaces the task id like base_post does."""
+    mgr = redfish_mock
+
+    async def post():
+        return await mgr.async_base_post(
+            "/redfish/v1/Systems/1/Actions/ComputerSystem.Reset",
+            payload={"ResetType": "On"})
+
+    result, api_resp = _run(mgr, post, use_aiohttp=False)
+    assert api_resp == IdracApiRespond.AcceptedTaskGenerated
+    assert result.data == {"task_id": redfish_service.JOB_ID}
+    assert redfish_service.last_request.json() == {"ResetType": "On"}
+
+
+def test_async_base_patch_and_delete(redfish_service, redfish_mock):
+    """PATCH and DELETE go through the async client with their payloads."""
+    mgr = redfish_mock
+
+    async def write():
+        patched = await mgr.async_base_patch(
+            "/redfish/v1/Systems/1", payload={"AssetTag": "rack-7"}, expected_status=200)
+        deleted = await mgr.async_base_delete(
+            "/redfish/v1/SessionService/Sessions/1", expected_status=200)
+        return patched, deleted
+
+    (_, patch_resp), (_, delete_resp) = _run(mgr, write, use_aiohttp=False)
+    assert patch_resp == IdracApiRespond.Ok
+    assert delete_resp == IdracApiRespond.Ok
+    methods = [r.method for r in redfish_service.requests]
+    assert methods == ["PATCH", "DELETE"]
+
+
+def test_async_response_json_error_matches_requests():
+    """An empty body raises the same JSONDecodeError requests raises."""
+    import requests
+    resp = AsyncRedfishResponse(204, {"Location": "/x"}, b"")
+    assert resp.headers["location"] == "/x"
+    with pytest.raises(requests.exceptions.JSONDecodeError):
+        resp.json()
+
+
+def test_basic_auth_header_matches_requests():
+    """The aiohttp backend sends the Authorization header requests would."""
+    from requests.auth import HTTPBasicAuth
+    from requests.models import PreparedRequest
+    prepared = PreparedRequest()
+    prepared.prepare(method="GET", url="https://bmc/redfish/v1", auth=HTTPBasicAuth("root", "calvin"))
+    assert basic_auth_header("root", "calvin") == prepared.headers["Authorization"]
+
+
+class _SlowHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    lock = threading.Lock()
+    in_flight = 0
+    max_in_flight = 0
+
+    def do_GET(self):  # noqa: N802 - http.server naming
+        cls = type(self)
+        with cls.lock:
+            cls.in_flight += 1
+            cls.max_in_flight = max(cls.max_in_flight, cls.in_flight)
+        time.sleep(0.05)
+        with cls.lock:
+            cls.in_flight -= 1
+        body = json.dumps({"@odata.id": self.path}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def slow_server():
+    _SlowHandler.in_flight = 0
+    _SlowHandler.max_in_flight = 0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _SlowHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.parametrize("use_aiohttp", [True, False])
+def test_per_host_limit_bounds_in_flight_requests(use_aiohttp, slow_server):
+    """20 gathered queries never exceed per_host_limit concurrent requests."""
+    if use_aiohttp:
+        pytest.importorskip("aiohttp")
+    mgr = IDracManager(idrac_ip=slow_server, idrac_username="root",
+                       idrac_password="pw", is_http=True)
+
+    async def fan_out():
+        return await asyncio.gather(
+            *(mgr.async_base_query(f"/redfish/v1/Chassis/{i}") for i in range(20)))
+
+    results = _run(mgr, fan_out, use_aiohttp=use_aiohttp, per_host_limit=3)
+    assert [r.data["@odata.id"] for r in results] == [
+        f"/redfish/v1/Chassis/{i}" for i in range(20)]
+    assert 1 < _SlowHandler.max_in_flight <= 3
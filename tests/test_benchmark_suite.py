@@ -0,0 +1,61 @@
+"""Benchmark suite: scenario reports and the regression gate.
+
+Author Mus spyroot@gmail.com
+"""
+import json
+
+from benchmarks import suite
+
+
+def _options(**overrides):
+    args = suite._options_parser().parse_args([])
+    args.runs = 2
+    for key, value in overrides.items():
+        setattr(args, key, value)
+    return args
+
+
+def _write(path, name, **results):
+    path.mkdir(parents=True, exist_ok=True)
+    (path / f"bench-{name}.json").write_text(json.dumps({"benchmark": name, "results": results}))
+
+
+def test_measure_reports_requests_and_percentiles():
+    report = suite.measure("sensors", _options())
+    results = report["results"]
+
+    assert report["benchmark"] == "sensors" and report["config"]["runs"] == 2
+    assert results["requests"] > 10 and results["bytes"] > 0
+    assert results["http_errors"] >= 0 and results["rows"] > 0
+    assert results["p50_seconds"] <= results["p99_seconds"] <= results["max_seconds"]
+
+
+def test_logs_scenario_walks_entries():
+    report = suite.measure("logs", _options(runs=1, vendor="dell"))
+    assert report["config"]["vendor"] == "hpe"
+    assert report["results"]["rows"] > 0 and report["results"]["http_errors"] <= 1
+
+
+def test_fleet_scenario_reports_ok_ratio():
+    report = suite.measure("fleet", _options(runs=1, bmcs=4, max_workers=4))
+    assert report["config"]["bmcs"] == 4
+    assert report["results"]["ok_ratio"] == 1.0
+
+
+def test_compare_flags_regressions_beyond_threshold(tmp_path, capsys):
+    _write(tmp_path / "base", "fleet", p50_seconds=1.0, requests=100, ok_ratio=1.0)
+    _write(tmp_path / "base", "startup", command={"median": 0.2, "max": 0.3, "runs": 5})
+    _write(tmp_path / "base", "logs", rows=50, requests=20)
+    _write(tmp_path / "new", "logs", rows=80, requests=20)
+    _write(tmp_path / "new", "fleet", p50_seconds=1.1, requests=100, ok_ratio=0.7)
+    _write(tmp_path / "new", "startup", command={"median": 0.4, "max": 0.5, "runs": 5})
+
+    rows = suite.compare(suite.load_reports(tmp_path / "base"),
+                         suite.load_reports(tmp_path / "new"), threshold=0.2)
+    regressed = {(r["benchmark"], r["metric"]) for r in rows if r["regressed"]}
+    assert regressed == {("fleet", "ok_ratio"), ("startup", "command")}
+
+    assert suite.main(["compare", str(tmp_path / "base"), str(tmp_path / "new"),
+                       "--metric", "p50_seconds"]) == 0
+    assert suite.main(["compare", str(tmp_path / "base"), str(tmp_path / "new")]) == 1
+    assert "REGRESSED" in capsys.readouterr().out
@@ -0,0 +1,123 @@
+"""jobs: server-side $filter, $top/$skip paging and the one pass job index.
+
+The Dell simulator corpus carries two captured jobs (one Completed, one
+Running) and every job posted to it. It honours $filter, $top and $skip,
+one parameter per URI like iDRAC.
+
+Author Mus spyroot@gmail.com
+"""
+import dataclasses
+import json
+import time
+
+import requests
+
+from benchmarks import simulator
+from benchmarks.simulator import FleetSimulator, SimulatorThread
+from idrac_ctl.idrac_manager import IDracManager
+from idrac_ctl.idrac_shared import ApiRequestType
+from idrac_ctl.jobs.cmd_jobs import JobIndex, jobs_query
+from idrac_ctl.vendors import get_vendor
+
+JOBS = "/redfish/v1/Managers/iDRAC.Embedded.1/Jobs"
+BIOS_SETTINGS = "/redfish/v1/Systems/System.Embedded.1/Bios/Settings"
+
+
+def _post_jobs(sim, count, seconds):
+    target = sim.targets[0]
+    sim.bmcs[0].job_seconds = seconds
+    for _ in range(count):
+        requests.post(f"http://{target}{JOBS}", json={"TargetSettingsURI": BIOS_SETTINGS},
+                      auth=("root", "sim"))
+
+
+def _jobs(sim, **kwargs):
+    """Jobs and the requests they cost, once the manager resolved its service root."""
+    manager = IDracManager(idrac_ip=sim.targets[0], idrac_username="root",
+                           idrac_password="sim", is_http=True)
+    manager.sync_invoke(ApiRequestType.Jobs, "jobs_sources_query", failed=True)
+    before = sim.stats["requests"]
+    data = manager.sync_invoke(ApiRequestType.Jobs, "jobs_sources_query", **kwargs).data
+    return data, sim.stats["requests"] - before
+
+
+def test_jobs_query_follows_the_profile():
+    dell = get_vendor("dell")
+    assert jobs_query(dell, ["Failed"]).to_query_string(True) == \
+        "?$filter=JobState%20eq%20'Failed'"
+    assert jobs_query(dell, None, page_size=50).to_query_string(True) == \
+        "?$expand=*($levels=1)"
+    # completed jobs are many: one expanded read beats a GET per filtered link.
+    assert jobs_query(dell, ["Failed", "Completed"]).to_query_string(True) == \
+        "?$expand=*($levels=1)"
+    combined = dataclasses.replace(dell, one_query_param_per_uri=False)
+    assert jobs_query(combined, ["Scheduled", "Scheduling"], page_size=50).to_query_string() == \
+        "?$filter=JobState%20eq%20'Scheduled'%20or%20JobState%20eq%20'Scheduling'" \
+        "&$expand=*($levels=1)&$top=50&$skip=0"
+    assert jobs_query(get_vendor("generic"), ["Failed"]).to_query_string() == \
+        "?$expand=*($levels=1)"
+
+
+def test_job_index_sorts_once_and_tolerates_missing_times():
+    jobs = [{"Id": "a", "JobState": "Completed"},
+            {"Id": "b", "JobState": "Running", "ActualRunningStartTime": "x",
+             "StartTime": "2026-06-28T10:05:00+00:00"},
+            {"Id": "c", "JobState": "Completed", "ActualRunningStartTime": "x",
+             "StartTime": "TIME_NOW"},
+            {"Id": "d", "JobState": "Completed", "ActualRunningStartTime": "x",
+             "StartTime": "2026-06-28T10:00:00+00:00"}]
+    index = JobIndex(jobs)
+    assert index.count == 4 and set(index.by_state) == {"Completed", "Running"}
+    assert [j["Id"] for j in index.jobs()] == ["b", "d", "a", "c"]
+    assert [j["Id"] for j in index.jobs(["Completed"], sort_by_time=False)] == ["a", "c", "d"]
+
+
+def test_state_filter_runs_on_the_bmc():
+    with SimulatorThread(FleetSimulator(bmcs=1, vendors=["dell"])) as sim:
+        _post_jobs(sim, 20, 0.0)
+        _post_jobs(sim, 2, 600.0)
+        everything, full = _jobs(sim)
+        failed, failed_requests = _jobs(sim, failed=True)
+        scheduled, _ = _jobs(sim, filter_scheduled=True, job_ids=True)
+        running, _ = _jobs(sim, running=True)
+        completed, completed_requests = _jobs(sim, filter_completed=True)
+    assert len(everything) == 24 and full == 1
+    assert len(completed) == 21 and completed_requests == 1
+    # nothing matched on the BMC, so nothing was fetched.
+    assert failed == [] and failed_requests == 1
+    assert len(scheduled) == 2 and all(s.startswith("JID_0000") for s in scheduled)
+    assert [job["Id"] for job in running] == ["JID_000000000002"]
+
+
+def test_unsorted_jobs_keep_the_collection_shape():
+    with SimulatorThread(FleetSimulator(bmcs=1, vendors=["dell"])) as sim:
+        _post_jobs(sim, 3, 0.0)
+        collection, _ = _jobs(sim, sort_by_time=False)
+        sorted_jobs, _ = _jobs(sim)
+    assert collection["@odata.id"] == JOBS and collection["Members@odata.count"] == 5
+    assert sorted(job["Id"] for job in collection["Members"]) == \
+        sorted(job["Id"] for job in sorted_jobs)
+
+
+def test_paging_and_refused_queries(monkeypatch):
+    combined = dataclasses.replace(get_vendor("dell"), one_query_param_per_uri=False)
+    monkeypatch.setattr(IDracManager, "planning_capabilities", lambda self: combined)
+    with SimulatorThread(FleetSimulator(bmcs=1, vendors=["dell"])) as sim:
+        _post_jobs(sim, 10, 0.0)
+        time.sleep(0.05)
+        # iDRAC answers 400 to two parameters: the plain expanded collection is read.
+        refused, refused_requests = _jobs(sim, filter_completed=True)
+        monkeypatch.setattr(simulator, "ONE_QUERY_PARAM_PER_URI", frozenset())
+        paged, paged_requests = _jobs(sim, filter_completed=True, page_size=4)
+    assert len(refused) == len(paged) == 11 and refused_requests == 2
+    # 11 completed jobs, 4 per page: 3 pages.
+    assert paged_requests == 3
+    assert [job["Id"] for job in paged] == [job["Id"] for job in refused]
+
+
+def test_stream_writes_json_lines(capsys):
+    with SimulatorThread(FleetSimulator(bmcs=1, vendors=["dell"])) as sim:
+        _post_jobs(sim, 3, 0.0)
+        summary, _ = _jobs(sim, stream=True, job_ids=True)
+    lines = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert summary == {"jobs": 5} and len(lines) == 5 and "JID_000000000001" in lines
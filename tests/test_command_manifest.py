@@ -0,0 +1,82 @@
+"""Static command manifest and the lazy CLI build on top of it.
+
+The import checks run in a fresh interpreter, the test process has every
+command module imported already.
+
+Author Mus spyroot@gmail.com
+"""
+import argparse
+import json
+import subprocess
+import sys
+
+from idrac_ctl.command_manifest import load_manifest, select_command
+from idrac_ctl.idrac_main import create_cmd_tree
+from idrac_ctl.idrac_shared import ApiRequestType
+
+
+def _fresh(snippet):
+    out = subprocess.run([sys.executable, "-c", snippet], capture_output=True, text=True,
+                         check=True)
+    return json.loads(out.stdout)
+
+
+def test_manifest_is_up_to_date():
+    # other tests import command modules the CLI does not ship.
+    out = subprocess.run([sys.executable, "-m", "idrac_ctl.command_manifest", "--check"],
+                         capture_output=True, text=True, check=False)
+    assert out.returncode == 0, out.stdout
+
+
+def test_select_command_skips_option_values():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--idrac_ip")
+    parser.add_argument("--debug", action="store_true")
+    names = load_manifest()
+
+    assert select_command(parser, ["--idrac_ip", "sensors", "--debug", "bios"], names) == "bios"
+    assert select_command(parser, ["--idrac_ip=10.0.0.1", "sensors"], names) == "sensors"
+    assert select_command(parser, ["--debug"], names) is None
+    assert select_command(parser, ["not-a-command", "bios"], names) is None
+
+
+def test_cmd_tree_builds_only_the_selected_parser():
+    parser = argparse.ArgumentParser()
+    cmd_dict = create_cmd_tree(parser, selected="sensors")
+    assert set(cmd_dict) == set(load_manifest())
+    assert cmd_dict["sensors"].type == ApiRequestType.Sensors
+
+    sub = parser._subparsers._group_actions[0].choices
+    assert len(sub["sensors"]._actions) > 1
+    assert len(sub["bios"]._actions) == 1
+
+
+def test_cli_imports_only_the_selected_command():
+    loaded = _fresh(
+        "import json, sys, argparse\n"
+        "from idrac_ctl.idrac_main import create_cmd_tree\n"
+        "create_cmd_tree(argparse.ArgumentParser(), selected='sensors')\n"
+        "print(json.dumps(sorted(m for m in sys.modules\n"
+        "                        if m.count('.') == 2 and '.cmd_' in m)))\n")
+    assert loaded == ["idrac_ctl.sensors.cmd_sensors"]
+
+
+def test_invoke_imports_unloaded_commands():
+    loaded = _fresh(
+        "import json, sys\n"
+        "import idrac_ctl\n"
+        "from idrac_ctl.idrac_manager import IDracManager\n"
+        "from idrac_ctl.idrac_shared import ApiRequestType\n"
+        "before = 'idrac_ctl.bios.cmd_bios' in sys.modules\n"
+        "cls = IDracManager.command_class(ApiRequestType.BiosQuery, 'bios_inventory')\n"
+        "print(json.dumps([before, cls.__module__, hasattr(idrac_ctl, 'save_if_needed')]))\n")
+    assert loaded == [False, "idrac_ctl.bios.cmd_bios", True]
+
+
+def test_package_attributes_resolve_to_command_classes():
+    resolved = _fresh(
+        "import json\n"
+        "import idrac_ctl\n"
+        "print(json.dumps([idrac_ctl.BootSource.__module__,\n"
+        "                  idrac_ctl.ApiRequestType.__module__]))\n")
+    assert resolved == ["idrac_ctl.boot_source.cmd_boot_source_get", "idrac_ctl.idrac_shared"]
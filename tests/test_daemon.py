@@ -0,0 +1,133 @@
+"""Resident daemon: commands forwarded over the local socket run on warm managers.
+
+The daemon runs in a thread of the test process, so the requests-mock
+transport of the fixtures serves it like it serves an in-process command.
+
+Author Mus spyroot@gmail.com
+"""
+import argparse
+import os
+import stat
+import threading
+
+import pytest
+
+from idrac_ctl import idrac_main
+from idrac_ctl.cmd_exceptions import JsonHttpError, UnsupportedAction
+from idrac_ctl.daemon import DaemonServer, decode, encode, forward, private_socket_dir, socket_path
+from idrac_ctl.idrac_shared import ApiRequestType, RedfishAction
+
+MANAGER_ARGS = dict(idrac_ip="mock-supermicro", idrac_username="root", idrac_password="mock",
+                    idrac_port=443, insecure=True, is_http=False, session_auth=False,
+                    token_cache=False, walk_concurrency=8, resource_cache=False,
+                    inventory_cache=False)
+
+
+@pytest.fixture
+def daemon(tmp_path, monkeypatch):
+    path = tmp_path / "daemon.sock"
+    monkeypatch.setenv("IDRAC_CTL_DAEMON_SOCKET", str(path))
+    server = DaemonServer(path, idle_timeout=0)
+    thread = threading.Thread(target=server.serve, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    thread.join(5)
+
+
+def test_forwarded_command_reuses_warm_state(daemon, redfish_mock_factory):
+    mgr, service = redfish_mock_factory("supermicro")
+    local = mgr.sync_invoke(ApiRequestType.Sensors, "sensors")
+
+    service.requests.clear()
+    first, info = forward(ApiRequestType.Sensors, "sensors", MANAGER_ARGS, {})
+    cold = len(service.requests)
+    service.requests.clear()
+    second, _ = forward(ApiRequestType.Sensors, "sensors", MANAGER_ARGS, {})
+    warm = len(service.requests)
+
+    assert first.data == second.data == local.data
+    assert warm < cold
+    assert "vendor" in info
+    assert daemon.status()["bmcs"] == ["mock-supermicro"]
+
+
+def test_changed_credentials_build_new_managers(daemon, redfish_mock_factory):
+    redfish_mock_factory("supermicro")
+    forward(ApiRequestType.Sensors, "sensors", MANAGER_ARGS, {})
+    old = daemon._managers[("mock-supermicro", 443, "root")][1]
+
+    forward(ApiRequestType.Sensors, "sensors", dict(MANAGER_ARGS, idrac_password="rotated"), {})
+    args, new = daemon._managers[("mock-supermicro", 443, "root")]
+    assert new is not old and args["idrac_password"] == "rotated"
+
+
+def test_cached_state_does_not_outlive_a_command(daemon, redfish_mock_factory):
+    _, service = redfish_mock_factory("supermicro")
+    cached = dict(MANAGER_ARGS, resource_cache=True)
+    forward(ApiRequestType.Sensors, "sensors", cached, {})
+    service.requests.clear()
+    forward(ApiRequestType.Sensors, "sensors", cached, {})
+    # the chassis read by the first command is asked for again.
+    assert any(r.path.lower().rstrip("/") == "/redfish/v1/chassis" for r in service.requests)
+
+
+def test_command_errors_are_raised_by_the_client(daemon, redfish_mock_factory):
+    redfish_mock_factory("supermicro")
+    with pytest.raises(UnsupportedAction):
+        forward(ApiRequestType.Sensors, "no-such-command", MANAGER_ARGS, {})
+
+
+def test_no_daemon_falls_back(tmp_path):
+    assert forward(ApiRequestType.Sensors, "sensors", MANAGER_ARGS, {},
+                   path=tmp_path / "missing.sock") is None
+    stale = tmp_path / "stale.sock"
+    stale.write_text("")
+    assert forward(ApiRequestType.Sensors, "sensors", MANAGER_ARGS, {}, path=stale) is None
+
+
+def test_cli_forwards_to_the_daemon(daemon, redfish_mock_factory, capsys):
+    redfish_mock_factory("supermicro")
+    args = argparse.Namespace(
+        idrac_ip="mock-supermicro", idrac_username="root", idrac_password="mock",
+        idrac_port=443, use_http=False, debug=False, verbose=False, subcommand="sensors",
+        no_stdout=False, json_only=False, data_only=True, nocolor=False)
+    cmd = idrac_main.create_cmd_tree(argparse.ArgumentParser(), selected="sensors")
+    idrac_main.main(args, cmd)
+    assert daemon.requests == 1
+    assert '"Reading"' in capsys.readouterr().out
+
+    args.no_daemon = True
+    idrac_main.main(args, cmd)
+    assert daemon.requests == 1
+
+
+def test_socket_is_private_from_the_start(tmp_path, monkeypatch):
+    monkeypatch.setenv("IDRAC_CTL_CACHE_DIR", str(tmp_path))
+    monkeypatch.delenv("IDRAC_CTL_DAEMON_SOCKET", raising=False)
+    path = socket_path()
+    # a directory left behind with a loose mode is tightened before the bind.
+    path.parent.mkdir(mode=0o755)
+    os.chmod(path.parent, 0o755)
+    private_socket_dir(path)
+    old = os.umask(0o022)
+    try:
+        server = DaemonServer(path, idle_timeout=0)
+    finally:
+        os.umask(old)
+    server.server_close()
+    assert stat.S_IMODE(os.stat(path.parent).st_mode) == 0o700
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+
+
+def test_protocol_round_trip():
+    action = RedfishAction("Reset", "/redfish/v1/Systems/1/Actions/ComputerSystem.Reset",
+                           "#ComputerSystem.Reset")
+    action.add_action_arg("ResetType", ["On", "ForceOff"])
+    error = JsonHttpError(json_error={"error": {"code": "Base.1.8.GeneralError"}})
+    message = decode(encode({"discovered": {"Reset": action}, "error": error}))
+
+    assert isinstance(message["discovered"]["Reset"], RedfishAction)
+    assert dict(message["discovered"]["Reset"]) == dict(action)
+    assert isinstance(message["error"], JsonHttpError)
+    assert message["error"].json_error == error.json_error
@@ -242,8 +242,8 @@ def test_main_no_hosts_returns_2():
     assert discover_cli.redfish_discover_main([]) == 2
 
 
-def test_main_with_default_fetcher_discovers_nothing(capsys):
-    """The default fetcher performs no I/O, so a scan finds nothing (exit 0)."""
-    rc = discover_cli.redfish_discover_main(["10.0.0.5"])
+def test_main_with_unreachable_host_discovers_nothing(capsys):
+    """A refused host is not a service, so a scan finds nothing (exit 0)."""
+    rc = discover_cli.redfish_discover_main(["127.0.0.1:1"])
     assert rc == 0
     assert "No Redfish services discovered." in capsys.readouterr().out
@@ -0,0 +1,143 @@
+"""Network sweeps of ``redfish-discover``: target expansion, the adaptive
+limiter, the streaming scan and the fetcher against local listeners.
+
+The fleet simulator in host mode stands in for a management subnet: its
+BMCs answer on 127.1.0.1, 127.1.0.2, ... so a CIDR sweep finds them and
+gets a 404 on the other addresses. No external network.
+
+Author Mus spyroot@gmail.com
+"""
+import asyncio
+import json
+import socket
+import time
+
+import pytest
+
+from benchmarks.simulator import FleetSimulator, SimulatorThread
+from idrac_ctl.discover import (
+    AdaptiveConcurrency,
+    ServiceRootFetcher,
+    expand_targets,
+    scan_stream,
+)
+from idrac_ctl.discover import cli as discover_cli
+
+
+def test_expand_targets():
+    assert list(expand_targets(["10.0.0.0/30"])) == ["10.0.0.1", "10.0.0.2"]
+    assert list(expand_targets(["10.0.0.7/32", "bmc-1.lab", "bmc:8443", ""])) == [
+        "10.0.0.7", "bmc-1.lab", "bmc:8443"]
+    assert list(expand_targets(["10.0.0.254-10.0.1.1"])) == [
+        "10.0.0.254", "10.0.0.255", "10.0.1.0", "10.0.1.1"]
+    assert list(expand_targets(["10.0.0.5-7"])) == ["10.0.0.5", "10.0.0.6", "10.0.0.7"]
+    # a /8 is expanded lazily.
+    assert next(iter(expand_targets(["10.0.0.0/8"]))) == "10.0.0.1"
+    with pytest.raises(ValueError):
+        list(expand_targets(["10.0.0.9-3"]))
+    with pytest.raises(ValueError):
+        list(expand_targets(["10.0.0.0/33"]))
+
+
+def test_adaptive_concurrency_follows_timeouts():
+    async def run(outcomes, limiter):
+        for timed_out in outcomes:
+            await limiter.acquire()
+            await limiter.release(timed_out)
+        return limiter
+
+    limiter = asyncio.run(run([True] * 8, AdaptiveConcurrency(16, window=4)))
+    assert limiter.limit == 4 and limiter.timeouts == 8
+    limiter = asyncio.run(run([False] * 400, AdaptiveConcurrency(16, maximum=64, window=4)))
+    assert limiter.limit == 64 and limiter.completed == 400
+    limiter = asyncio.run(run([True] * 100, AdaptiveConcurrency(16, minimum=2, window=4)))
+    assert limiter.limit == 2
+    with pytest.raises(ValueError):
+        AdaptiveConcurrency(0)
+
+
+def test_scan_stream_yields_as_services_answer():
+    in_flight = peak = 0
+
+    async def fake_get(ip):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        try:
+            if ip == "slow":
+                await asyncio.sleep(0.05)
+            await asyncio.sleep(0)
+            if ip == "stalled":
+                raise TimeoutError(ip)
+            return None if ip == "web" else {"Vendor": "Dell"}
+        finally:
+            in_flight -= 1
+
+    async def run():
+        limiter = AdaptiveConcurrency(3, maximum=3)
+        hosts = ["slow", "web", "stalled"] + [f"10.0.0.{i}" for i in range(10)] + ["slow"]
+        found = [svc.ip async for svc in scan_stream(iter(hosts), fake_get, limiter=limiter)]
+        return found, limiter
+
+    found, limiter = asyncio.run(run())
+    assert found[-1] == "slow" and sorted(found[:-1]) == sorted(f"10.0.0.{i}" for i in range(10))
+    assert peak <= 3 and limiter.completed == 13 and limiter.timeouts == 1
+
+    async def first():
+        async for svc in scan_stream(expand_targets(["10.0.0.0/16"]), fake_get):
+            return svc.ip
+
+    # stopping early cancels the rest of the sweep.
+    assert asyncio.run(first()).startswith("10.0.0.")
+
+
+def test_fetcher_against_local_listeners():
+    stalled = socket.socket()
+    stalled.bind(("127.0.0.1", 0))
+    # connections complete in the backlog and are never answered.
+    stalled.listen(8)
+    closed = socket.socket()
+    closed.bind(("127.0.0.1", 0))
+    closed_port = closed.getsockname()[1]
+    closed.close()
+
+    async def run(target, **kwargs):
+        fetcher = ServiceRootFetcher(use_http=True, timeout=0.3, **kwargs)
+        try:
+            return await fetcher(target)
+        finally:
+            await fetcher.close()
+
+    with SimulatorThread(FleetSimulator(bmcs=1, vendors=["supermicro"])) as sim:
+        for backend in (None, False):
+            root = asyncio.run(run(sim.targets[0], use_aiohttp=backend))
+            assert root["@odata.id"].rstrip("/") == "/redfish/v1"
+
+    start = time.monotonic()
+    assert asyncio.run(run(f"127.0.0.1:{closed_port}")) is None
+    assert time.monotonic() - start < 0.3
+    for backend in (None, False):
+        with pytest.raises(TimeoutError):
+            asyncio.run(run(f"127.0.0.1:{stalled.getsockname()[1]}", use_aiohttp=backend))
+    stalled.close()
+
+
+def test_cli_sweeps_a_cidr_block_as_jsonl(capsys):
+    with SimulatorThread(FleetSimulator(bmcs=3, vendors=["dell", "hpe", "supermicro"],
+                                        mode="host", bind="0.0.0.0")) as sim:
+        port = sim.targets[0].rsplit(":", 1)[1]
+        rc = discover_cli.redfish_discover_main(
+            ["127.1.0.0/29", "--port", port, "--http", "--jsonl", "--concurrency", "2"])
+        assert rc == 0
+        out, err = capsys.readouterr()
+        found = [json.loads(line) for line in out.splitlines()]
+        assert sorted(s["ip"] for s in found) == ["127.1.0.1", "127.1.0.2", "127.1.0.3"]
+        # the dell corpus serves the DMTF ServiceRoot, which carries no Oem block.
+        assert sorted(s["vendor"] for s in found) == ["generic", "hpe", "supermicro"]
+        assert "6 hosts probed, 3 services" in err
+
+        assert discover_cli.redfish_discover_main(
+            ["127.1.0.1-3", "--port", port, "--http"]) == 0
+        table = capsys.readouterr().out
+        assert table.index("127.1.0.1") < table.index("127.1.0.2") < table.index("127.1.0.3")
+    assert discover_cli.redfish_discover_main(["10.0.0.9-3"]) == 2
@@ -0,0 +1,189 @@
+"""Offline tests for the breadth-first discovery crawler.
+
+Like the recursive walker tests, ``Discovery`` is built with ``__init__``
+bypassed and ``_conditional_get`` served from an in-memory graph, here with a lock
+and an in-flight gauge so the worker pool can be observed.
+
+Author Mus spyroot@gmail.com
+"""
+import json
+import threading
+import time
+
+import pytest
+
+from idrac_ctl.discovery.cmd_discovery import CHECKPOINT_FILE, Discovery
+from idrac_ctl.discovery.crawler import FrontierCrawler, RateLimiter
+from idrac_ctl.discovery.incremental import STATE_FILE
+from idrac_ctl.discovery.snapshot import CrawlSnapshot
+from idrac_ctl.redfish_exceptions import RedfishNotFound
+
+
+def _tree(fanout=4, depth=3):
+    """/redfish/v1/N, N/0 ... a tree whose nodes also link back to the root."""
+    graph, level = {}, ["/redfish/v1/N"]
+    for d in range(depth + 1):
+        nxt = []
+        for node in level:
+            children = [f"{node}/{i}" for i in range(fanout)] if d < depth else []
+            graph[node] = {"@odata.id": node, "Up": {"@odata.id": "/redfish/v1/N/"},
+                           "Members": [{"@odata.id": c} for c in children]}
+            nxt += children
+        level = nxt
+    return graph
+
+
+class _Graph:
+    def __init__(self, graph, delay=0.0, interrupt_after=None, flaky=()):
+        self.graph = graph
+        self.delay = delay
+        self.interrupt_after = interrupt_after
+        # paths whose first fetch fails.
+        self.flaky = set(flaky)
+        self.fetches = []
+        self.active = self.peak = 0
+        self.lock = threading.Lock()
+
+    def conditional_get(self, resource_path, *args, **kwargs):
+        with self.lock:
+            if self.interrupt_after is not None and len(self.fetches) >= self.interrupt_after:
+                raise KeyboardInterrupt
+            self.fetches.append(resource_path)
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(self.delay)
+        with self.lock:
+            self.active -= 1
+            if resource_path in self.flaky:
+                self.flaky.discard(resource_path)
+                raise ConnectionError(resource_path)
+        if resource_path not in self.graph:
+            raise RedfishNotFound(resource_path)
+        return self.graph[resource_path], "GET, HEAD", f'W/"{resource_path}"'
+
+
+def _discovery(tmp_path, graph):
+    disc = Discovery.__new__(Discovery)
+    disc.visited_urls = {}
+    disc._discovered_url_file_mapping = {}
+    disc._api_allowed_methods = {}
+    disc._resource_state = {}
+    disc.default_query_filter = ["Skip"]
+    disc.json_response_dir = str(tmp_path)
+    disc.walk_concurrency = 4
+    disc._conditional_get = graph.conditional_get
+    return disc
+
+
+def test_crawl_fetches_every_resource_once(tmp_path):
+    graph = _Graph(_tree(), delay=0.005)
+    disc = _discovery(tmp_path, graph)
+    progress = disc.crawl(["/redfish/v1/N", "/redfish/v1/N/", "/redfish/v1/N/0/Skip"],
+                          workers=4, quiet=True)
+
+    assert sorted(graph.fetches) == sorted(graph.graph)
+    assert progress.fetched == len(graph.graph) and progress.errors == 0
+    assert 1 < graph.peak <= 4
+    assert disc._api_allowed_methods["/redfish/v1/N/1"] == ["GET", "HEAD"]
+    saved = json.loads((tmp_path / "_redfish_v1_N_3.json").read_text())
+    assert saved["@odata.id"] == "/redfish/v1/N/3"
+    assert disc.visited_urls["/redfish/v1/N/0/Skip"]
+    assert not (tmp_path / CHECKPOINT_FILE).exists()
+
+
+def test_crawl_is_breadth_first_and_honours_max_depth(tmp_path):
+    graph = _Graph(_tree(fanout=2, depth=3))
+    disc = _discovery(tmp_path, graph)
+    disc.crawl(["/redfish/v1/N"], workers=1, max_depth=2, quiet=True)
+
+    depths = [path.count("/") - 3 for path in graph.fetches]
+    assert depths == sorted(depths) and max(depths) == 2
+
+
+def test_interrupted_crawl_resumes_from_checkpoint(tmp_path):
+    graph = _Graph(_tree(), interrupt_after=20)
+    disc = _discovery(tmp_path, graph)
+    with pytest.raises(KeyboardInterrupt):
+        disc.crawl(["/redfish/v1/N"], workers=2, quiet=True)
+    checkpoint = json.loads((tmp_path / CHECKPOINT_FILE).read_text())
+    assert checkpoint["frontier"] and len(checkpoint["visited"]) <= 20
+    first = list(graph.fetches)
+
+    graph.interrupt_after = None
+    resumed = _discovery(tmp_path, graph)
+    resumed.crawl(["/redfish/v1/N"], workers=2, resume=True, quiet=True)
+
+    assert set(graph.fetches) == set(graph.graph)
+    # only the fetches in flight at the interruption are repeated.
+    assert len(graph.fetches) - len(graph.graph) <= 2
+    assert set(resumed._discovered_url_file_mapping) == set(graph.graph)
+    assert set(first) <= set(resumed.visited_urls)
+    assert not (tmp_path / CHECKPOINT_FILE).exists()
+    # resources fetched before the interruption stay in the crawl state.
+    state = json.loads((tmp_path / STATE_FILE).read_text())
+    assert set(state) == set(graph.graph)
+    assert state["/redfish/v1/N"]["etag"] == 'W/"/redfish/v1/N"'
+
+
+def test_resume_retries_failed_fetches(tmp_path):
+    graph = _Graph(_tree(), interrupt_after=30, flaky={"/redfish/v1/N/1"})
+    disc = _discovery(tmp_path, graph)
+    with pytest.raises(KeyboardInterrupt):
+        disc.crawl(["/redfish/v1/N"], workers=1, quiet=True)
+    checkpoint = json.loads((tmp_path / CHECKPOINT_FILE).read_text())
+    assert "/redfish/v1/N/1" not in checkpoint["visited"]
+    assert ["/redfish/v1/N/1", 1] in checkpoint["frontier"]
+
+    graph.interrupt_after = None
+    resumed = _discovery(tmp_path, graph)
+    progress = resumed.crawl(["/redfish/v1/N"], workers=1, resume=True, quiet=True)
+    assert progress.errors == 0
+    assert set(resumed._discovered_url_file_mapping) == set(graph.graph)
+
+
+def test_completed_crawl_keeps_failed_paths(tmp_path):
+    graph = _Graph(_tree(), flaky={"/redfish/v1/N/1", "/redfish/v1/N/2/0"})
+    disc = _discovery(tmp_path, graph)
+    progress = disc.crawl(["/redfish/v1/N"], workers=2, quiet=True)
+    checkpoint = json.loads((tmp_path / CHECKPOINT_FILE).read_text())
+    assert progress.errors == 2
+    assert sorted(checkpoint["frontier"]) == [["/redfish/v1/N/1", 1], ["/redfish/v1/N/2/0", 2]]
+
+    resumed = _discovery(tmp_path, graph)
+    progress = resumed.crawl(["/redfish/v1/N"], workers=2, resume=True, quiet=True)
+    assert progress.errors == 0
+    assert set(resumed._discovered_url_file_mapping) == set(graph.graph)
+    assert not (tmp_path / CHECKPOINT_FILE).exists()
+
+
+def test_checkpoint_commits_the_snapshot(tmp_path):
+    graph = _Graph(_tree(), interrupt_after=20)
+    disc = _discovery(tmp_path, graph)
+    path = str(tmp_path / "crawl.db")
+    disc._snapshot = CrawlSnapshot(path)
+    try:
+        with pytest.raises(KeyboardInterrupt):
+            disc.crawl(["/redfish/v1/N"], workers=2, quiet=True)
+        checkpoint = json.loads((tmp_path / CHECKPOINT_FILE).read_text())
+        # read from another connection before close(), as after a hard kill.
+        with CrawlSnapshot(path, readonly=True) as committed:
+            assert checkpoint["visited"] and set(checkpoint["visited"]) <= set(committed.uris())
+            assert all(committed.get(uri).etag == f'W/"{uri}"' for uri in committed.uris())
+    finally:
+        disc._snapshot.close()
+
+
+def test_rate_limit_and_progress():
+    limiter = RateLimiter(rate=100)
+    start = time.monotonic()
+    for _ in range(11):
+        limiter.acquire()
+    assert time.monotonic() - start >= 0.09
+
+    reports = []
+    graph = _tree(fanout=3, depth=1)
+    crawler = FrontierCrawler(lambda p: [m["@odata.id"] for m in graph[p]["Members"]],
+                              lambda p: p, workers=3, rate=200, on_progress=reports.append)
+    progress = crawler.crawl([("/redfish/v1/N", 0)], {})
+    assert progress.fetched == 4 and reports[-1] is progress
+    assert "resources" in str(progress) and progress.rate > 0
@@ -0,0 +1,96 @@
+"""Incremental re-discovery against the fleet simulator.
+
+The simulator serves ETags, answers If-None-Match with 304 and applies
+PATCH bodies, so a crawl, a change on the BMC and a re-crawl run over real
+HTTP. Crawl output goes to a temporary HOME.
+
+Author Mus spyroot@gmail.com
+"""
+import json
+
+import pytest
+import requests
+
+from benchmarks.simulator import FleetSimulator, SimulatorThread
+from idrac_ctl.discovery.incremental import (
+    STATE_FILE,
+    ResourceState,
+    body_hash,
+    carried_over,
+)
+from idrac_ctl.idrac_manager import IDracManager
+from idrac_ctl.idrac_shared import ApiRequestType
+
+SYSTEM = "/redfish/v1/Systems/System.Embedded.1"
+SENSORS = "/redfish/v1/Chassis/System.Embedded.1/Sensors"
+
+
+@pytest.fixture
+def bmc(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    with SimulatorThread(FleetSimulator(bmcs=1, vendors=["dell"])) as sim:
+        target = sim.targets[0]
+        manager = IDracManager(idrac_ip=target, idrac_username="root", idrac_password="sim",
+                               is_http=True, insecure=True)
+
+        def discovery(**kwargs):
+            return manager.sync_invoke(ApiRequestType.Discovery, "discovery", **kwargs)
+
+        yield discovery, f"http://{target}", tmp_path / ".json_responses" / target.replace(":", "")
+
+
+def test_unchanged_bmc_reports_no_changes(bmc, capsys):
+    discovery, _, out = bmc
+    discovery()
+    state = json.loads((out / STATE_FILE).read_text())
+    system_file = out / f"{SYSTEM.replace('/', '_')}.json"
+    mtime = system_file.stat().st_mtime_ns
+
+    assert all(entry["etag"] for entry in state.values())
+
+    # the crawl stored ETags, so every incremental run is all 304s.
+    report = discovery(incremental=True, no_prune=True).data
+    assert (report["added"], report["changed"], report["removed"]) == ([], [], [])
+    assert report["not_modified"] == len(state) and report["unchanged"] == 0
+    assert system_file.stat().st_mtime_ns == mtime
+    again = discovery(incremental=True, no_prune=True).data
+    assert again == report
+
+    pruned = discovery(incremental=True).data
+    assert pruned["requests"] < again["requests"] and pruned["carried"] > 0
+    assert pruned["not_modified"] + pruned["carried"] == len(state)
+    assert json.loads((out / "changes.json").read_text()) == pruned
+    assert "discovery:" in capsys.readouterr().err
+
+
+def test_changes_and_removals_are_reported(bmc):
+    discovery, base, out = bmc
+    discovery()
+    session = requests.Session()
+    session.auth = ("root", "sim")
+    session.patch(f"{base}{SYSTEM}", json={"AssetTag": "rack-7"})
+
+    # Systems lists the same members, so the pruned run does not look below it.
+    pruned = discovery(incremental=True).data
+    assert pruned["changed"] == []
+
+    report = discovery(incremental=True, no_prune=True).data
+    assert report["changed"] == [SYSTEM]
+    saved = json.loads((out / f"{SYSTEM.replace('/', '_')}.json").read_text())
+    assert saved["AssetTag"] == "rack-7"
+
+    session.patch(f"{base}{SENSORS}", json={"Members": [], "Members@odata.count": 0})
+    removed = discovery(incremental=True, no_prune=True).data
+    assert removed["removed"] == [f"{SENSORS}/InletTemp"] and removed["changed"] == [SENSORS]
+    assert not (out / f"{SENSORS.replace('/', '_')}_InletTemp.json").exists()
+    assert f"{SENSORS}/InletTemp" not in json.loads((out / STATE_FILE).read_text())
+
+
+def test_carried_over_stops_at_visited_resources():
+    previous = {"/a": ResourceState(body_hash({}), links=["/a/1", "/b"]),
+                "/a/1": ResourceState(body_hash({}), links=["/a/1/x"]),
+                "/a/1/x": ResourceState(body_hash({})),
+                "/b": ResourceState(body_hash({}), links=["/b/1"]),
+                "/b/1": ResourceState(body_hash({}))}
+    assert carried_over(previous, ["/a"], visited=["/b"]) == {"/a", "/a/1", "/a/1/x"}
+    assert body_hash({"a": 1, "b": 2}) == body_hash({"b": 2, "a": 1})
@@ -0,0 +1,103 @@
+"""Single file crawl snapshots and their conversion to the directory layout.
+
+Crawls run against the fleet simulator, so the directory crawl, the
+snapshot crawl and the pack / unpack round trip all see the same tree.
+
+Author Mus spyroot@gmail.com
+"""
+import json
+import os
+
+import numpy as np
+import pytest
+
+from benchmarks.simulator import FleetSimulator, SimulatorThread
+from idrac_ctl.discovery.snapshot import REST_API_MAP, CrawlSnapshot, main, pack, unpack
+from idrac_ctl.idrac_manager import IDracManager
+from idrac_ctl.idrac_shared import ApiRequestType
+
+
+@pytest.fixture
+def discovery(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    with SimulatorThread(FleetSimulator(bmcs=1, vendors=["dell"])) as sim:
+        target = sim.targets[0]
+        manager = IDracManager(idrac_ip=target, idrac_username="root", idrac_password="sim",
+                               is_http=True, insecure=True)
+
+        def run(**kwargs):
+            return manager.sync_invoke(ApiRequestType.Discovery, "discovery", **kwargs)
+
+        run.directory = tmp_path / ".json_responses" / target.replace(":", "")
+        yield run
+
+
+def test_snapshot_random_access(tmp_path):
+    path = str(tmp_path / "crawl.db")
+    with CrawlSnapshot(path) as snapshot:
+        for i in range(200):
+            snapshot.put(f"/redfish/v1/Things/{i}", {"Id": str(i), "Pad": "x" * 512},
+                         ["GET", "PATCH"], f'W/"{i}"', fetched_at=1000.0 + i)
+        snapshot.put("/redfish/v1/Things/7", {"Id": "seven"}, ["GET"])
+        snapshot.delete("/redfish/v1/Things/199")
+        snapshot.set_meta("redfish_ip", "10.0.0.1")
+
+    with CrawlSnapshot(path, readonly=True) as snapshot:
+        assert len(snapshot) == 199 and "/redfish/v1/Things/199" not in snapshot
+        entry = snapshot.get("/redfish/v1/Things/42")
+        assert entry.data["Id"] == "42" and entry.allowed_methods == ["GET", "PATCH"]
+        assert (entry.etag, entry.fetched_at) == ('W/"42"', 1042.0)
+        assert snapshot.get("/redfish/v1/Things/7").data == {"Id": "seven"}
+        assert snapshot.get("/redfish/v1/Nope") is None
+        assert snapshot.meta("redfish_ip") == "10.0.0.1"
+        assert snapshot.allowed_methods_mapping()["/redfish/v1/Things/7"] == ["GET"]
+    # bodies are compressed, 199 * 512 bytes of padding would not fit.
+    assert os.path.getsize(path) < 199 * 512
+
+    with pytest.raises(FileNotFoundError):
+        CrawlSnapshot(str(tmp_path / "missing.db"), readonly=True)
+
+
+def test_snapshot_crawl_writes_a_single_file(discovery, tmp_path):
+    discovery()
+    directory = discovery.directory
+    mappings = np.load(directory / REST_API_MAP, allow_pickle=True).item()
+
+    path = str(tmp_path / "crawl.db")
+    discovery(snapshot=path)
+    with CrawlSnapshot(path, readonly=True) as snapshot:
+        assert set(snapshot.uris()) == set(mappings["url_file_mapping"]) | {"/redfish/v1"}
+        system = snapshot.get("/redfish/v1/Systems/System.Embedded.1")
+        with open(mappings["url_file_mapping"][system.uri]) as file:
+            assert system.data == json.load(file)
+        assert system.allowed_methods == mappings["allowed_methods_mapping"][system.uri]
+        # the simulator sends an ETag with every resource, the snapshot keeps it.
+        assert all(snapshot.get(uri).etag for uri in snapshot.uris() if uri != "/redfish/v1")
+        assert snapshot.get("/redfish/v1").data["@odata.id"] == "/redfish/v1"
+
+    with pytest.raises(ValueError):
+        discovery(snapshot=path, incremental=True)
+
+
+def test_pack_and_unpack_keep_the_igc_contract(discovery, tmp_path, capsys):
+    discovery()
+    directory = discovery.directory
+    mappings = np.load(directory / REST_API_MAP, allow_pickle=True).item()
+
+    path = str(tmp_path / "packed.db")
+    assert pack(str(directory), path) == len(mappings["url_file_mapping"])
+    out = tmp_path / "unpacked"
+    main(["unpack", path, str(out)])
+    assert "unpacked" in capsys.readouterr().out
+
+    loaded = np.load(out / REST_API_MAP, allow_pickle=True).item()
+    assert set(loaded) == {"url_file_mapping", "allowed_methods_mapping"}
+    assert loaded["allowed_methods_mapping"] == mappings["allowed_methods_mapping"]
+    for uri, filename in mappings["url_file_mapping"].items():
+        assert loaded["url_file_mapping"][uri] == str(out / os.path.basename(filename))
+        with open(filename) as original, open(loaded["url_file_mapping"][uri]) as copy:
+            assert json.load(original) == json.load(copy)
+
+    assert unpack(path, str(tmp_path / "again")) == len(mappings["url_file_mapping"])
+    with pytest.raises(FileNotFoundError):
+        pack(str(tmp_path / "again" / "nothing"), str(tmp_path / "x.db"))
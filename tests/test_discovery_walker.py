@@ -2,7 +2,7 @@
 
 These exercise ``Discovery.recursive_discovery`` against a small synthetic
 Redfish graph, with no live iDRAC and no network. The walker's HTTP fetch
-(``base_query``) is replaced by an in-memory graph server that counts how many
+(``_conditional_get``) is replaced by an in-memory graph server that counts how many
 times each logical resource is requested, so we can assert:
 
 * URI variants of one resource (trailing slash, ``$expand``/``$ref`` query
@@ -11,7 +11,7 @@ times each logical resource is requested, so we can assert:
 * recursion stops once it passes the requested ``max_depth``.
 
 The walker is driven on an instance built with ``__init__`` bypassed: it only
-touches a handful of plain attributes plus ``base_query``, so a real network
+touches a handful of plain attributes plus ``_conditional_get``, so a real network
 client is never constructed. The whole module runs green with no IDRAC_IP set.
 
 Author Mus spyroot@gmail.com
@@ -23,13 +23,12 @@ from idrac_ctl.discovery.cmd_discovery import (
     Discovery,
 )
 from idrac_ctl.redfish_exceptions import RedfishForbidden, RedfishNotFound
-from idrac_ctl.redfish_manager import CommandResult
 
 
 class _FakeGraph:
     """In-memory Redfish service backed by a ``normalized path -> payload`` map.
 
-    Stands in for ``Discovery.base_query``: the walker normalizes a path and
+    Stands in for ``Discovery._conditional_get``: the walker normalizes a path and
     calls this with the canonical form, so the map is keyed on canonical paths.
     Each call is tallied in :attr:`fetch_counts` so a test can prove a logical
     resource was fetched exactly once even when its links spell it many ways.
@@ -40,16 +39,16 @@ class _FakeGraph:
         self.graph = graph
         self.fetch_counts = {}
 
-    def base_query(self, resource_path, *args, **kwargs):
+    def conditional_get(self, resource_path, *args, **kwargs):
         self.fetch_counts[resource_path] = self.fetch_counts.get(resource_path, 0) + 1
         if resource_path not in self.graph:
             raise RedfishNotFound(resource_path)
-        # extra="GET" -> the Allow header the walker records as allowed methods.
-        return CommandResult(self.graph[resource_path], None, "GET", None)
+        # (body, Allow header the walker records as allowed methods, ETag).
+        return self.graph[resource_path], "GET", None
 
 
 def _make_discovery(tmp_path, graph, query_filter=None):
-    """Build a Discovery whose ``base_query`` serves ``graph``, no network.
+    """Build a Discovery whose ``_conditional_get`` serves ``graph``, no network.
 
     ``__init__`` (which would construct a real Redfish client) is bypassed; we
     set only the attributes ``recursive_discovery`` actually reads. JSON dumps
@@ -64,8 +63,8 @@ def _make_discovery(tmp_path, graph, query_filter=None):
 
     fake = _FakeGraph(graph)
     # Instance attribute shadows the bound method, so it is called with just
-    # the resource path (no implicit self), matching base_query's real call.
-    disc.base_query = fake.base_query
+    # the resource path (no implicit self), matching _conditional_get's real call.
+    disc._conditional_get = fake.conditional_get
     return disc, fake
 
 
@@ -267,13 +266,13 @@ def test_forbidden_marks_visited_and_reports(tmp_path, capsys):
     }
     disc, fake = _make_discovery(tmp_path, graph)
 
-    def base_query(resource_path, *args, **kwargs):
+    def conditional_get(resource_path, *args, **kwargs):
         fake.fetch_counts[resource_path] = fake.fetch_counts.get(resource_path, 0) + 1
         if resource_path == "/redfish/v1/Secret":
             raise RedfishForbidden("403 on Secret")
-        return CommandResult(graph[resource_path], None, "GET", None)
+        return graph[resource_path], "GET", None
 
-    disc.base_query = base_query
+    disc._conditional_get = conditional_get
     disc.recursive_discovery("/redfish/v1/A")
 
     assert disc.visited_urls.get("/redfish/v1/Secret") is True
@@ -295,13 +294,13 @@ def test_generic_error_is_not_mislabeled_forbidden(tmp_path, capsys):
     }
     disc, fake = _make_discovery(tmp_path, graph)
 
-    def base_query(resource_path, *args, **kwargs):
+    def conditional_get(resource_path, *args, **kwargs):
         fake.fetch_counts[resource_path] = fake.fetch_counts.get(resource_path, 0) + 1
         if resource_path == "/redfish/v1/Boom":
             raise RuntimeError("connection reset")
-        return CommandResult(graph[resource_path], None, "GET", None)
+        return graph[resource_path], "GET", None
 
-    disc.base_query = base_query
+    disc._conditional_get = conditional_get
     disc.recursive_discovery("/redfish/v1/A")
 
     assert disc.visited_urls.get("/redfish/v1/Boom") is True
@@ -0,0 +1,81 @@
+"""Fleet mode of the telemetry exporter: many BMCs behind one endpoint.
+
+The mock service answers for any host, so two addresses stand in for two
+BMCs. A third address is wired to time out and must only flip its success
+series, never the scrape of its neighbours.
+"""
+import re
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+import requests
+
+from idrac_ctl.telemetry.exporter import prometheus_server
+from idrac_ctl.telemetry.fleet import (
+    SCRAPE_DURATION_METRIC,
+    SCRAPE_SUCCESS_METRIC,
+    FleetExporter,
+    load_targets,
+)
+
+TARGETS = ["172.25.230.21", "172.25.230.22", "172.25.230.23"]
+
+
+@pytest.fixture
+def fleet(redfish_mock_factory):
+    _, service = redfish_mock_factory("supermicro")
+    service.mocker.get(re.compile(r"https://172\.25\.230\.23/.*"),
+                       exc=requests.exceptions.ConnectTimeout)
+    return FleetExporter(TARGETS, username="root", password="mock", max_workers=2)
+
+
+def _series(samples, metric):
+    return {s.dimensions["bmc.ip"]: s.value for s in samples if s.metric == metric}
+
+
+def test_fleet_labels_every_target_and_reports_failures(fleet):
+    samples = fleet.collect_samples()
+
+    assert _series(samples, SCRAPE_SUCCESS_METRIC) == {
+        "172.25.230.21": 1.0, "172.25.230.22": 1.0, "172.25.230.23": 0.0}
+    assert set(_series(samples, SCRAPE_DURATION_METRIC)) == set(TARGETS)
+    hw = {s.dimensions["bmc.ip"] for s in samples if s.metric.startswith("hw.")}
+    assert hw == {"172.25.230.21", "172.25.230.22"}
+    node = {s.dimensions["bmc.ip"]: s.dimensions["node"] for s in samples}
+    assert node["172.25.230.22"] == "slot2"
+
+
+def test_fleet_render_groups_metric_families(fleet):
+    text = fleet.render()
+    types = [line.split()[2] for line in text.splitlines() if line.startswith("# TYPE")]
+    assert len(types) == len(set(types))
+    assert f'{SCRAPE_SUCCESS_METRIC}{{' in text
+
+
+def test_probe_endpoint(fleet):
+    server = prometheus_server(fleet.render, "127.0.0.1", 0, probe=fleet.render_probe)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        with urllib.request.urlopen(f"{base}/probe?target=172.25.230.22") as resp:
+            body = resp.read().decode()
+        assert 'bmc.ip="172.25.230.22"' in body
+        assert 'bmc.ip="172.25.230.21"' not in body
+
+        for query, status in (("", 400), ("?target=10.0.0.1", 404)):
+            with pytest.raises(urllib.error.HTTPError) as err:
+                urllib.request.urlopen(f"{base}/probe{query}")
+            assert err.value.code == status
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_load_targets(tmp_path):
+    hosts = tmp_path / "hosts.txt"
+    hosts.write_text("# rack 7\n10.0.0.5\n10.0.0.5:8443  # spare port\n\n10.0.1.0/30\n")
+    assert load_targets(str(hosts)) == ["10.0.0.5", "10.0.0.5:8443", "10.0.1.1", "10.0.1.2"]
+    assert load_targets("10.0.0.1, 10.0.0.2,10.0.0.1") == ["10.0.0.1", "10.0.0.2"]
+    assert load_targets("10.0.2.7/32") == ["10.0.2.7"]
@@ -0,0 +1,107 @@
+"""Fleet runner: one registered command across many BMCs.
+
+The mock service answers for any host, so addresses stand in for BMCs; one
+of them is wired to time out and must only fail its own line.
+
+Author Mus spyroot@gmail.com
+"""
+import argparse
+import json
+import re
+import threading
+import time
+
+import pytest
+import requests
+
+from idrac_ctl.fleet import (
+    FleetRunner,
+    HostResult,
+    percentile,
+    run_fleet,
+    subnet_of,
+    summarize,
+)
+from idrac_ctl.idrac_shared import ApiRequestType
+
+MANAGER_ARGS = dict(idrac_username="root", idrac_password="mock", idrac_port=443,
+                    insecure=True, is_http=False)
+TARGETS = ["172.25.230.21", "172.25.230.22", "172.25.231.5"]
+
+
+@pytest.fixture
+def fleet_service(redfish_mock_factory):
+    _, service = redfish_mock_factory("supermicro")
+    service.mocker.get(re.compile(r"https://172\.25\.231\.5/.*"),
+                       exc=requests.exceptions.ConnectTimeout)
+    return service
+
+
+def test_runner_reports_every_target(fleet_service):
+    runner = FleetRunner(TARGETS, ApiRequestType.Sensors, "sensors", MANAGER_ARGS,
+                         max_workers=3)
+    results = {r.target: r for r in runner.run()}
+
+    assert set(results) == set(TARGETS)
+    assert results["172.25.230.21"].ok and results["172.25.230.22"].ok
+    assert results["172.25.230.21"].data == results["172.25.230.22"].data
+    assert not results["172.25.231.5"].ok
+    assert results["172.25.231.5"].error_type == "ConnectTimeout"
+
+
+def test_run_fleet_streams_json_lines(fleet_service, tmp_path, capsys):
+    output = tmp_path / "sensors.jsonl"
+    fleet_args = argparse.Namespace(targets=",".join(TARGETS), max_workers=2, per_subnet=1,
+                                    subnet_prefix=24, output=str(output))
+    command = argparse.Namespace(type=ApiRequestType.Sensors, name="sensors")
+    code = run_fleet(argparse.Namespace(), command, MANAGER_ARGS, fleet_args)
+
+    lines = [json.loads(line) for line in output.read_text().splitlines()]
+    assert code == 1
+    assert sorted(line["target"] for line in lines) == sorted(TARGETS)
+    summary = json.loads(capsys.readouterr().err)
+    assert (summary["ok"], summary["failed"]) == (2, 1)
+    assert summary["failures"] == {"ConnectTimeout": 1}
+    assert summary["latency"]["p50"] <= summary["latency"]["p99"]
+
+
+def test_global_and_subnet_caps(monkeypatch):
+    targets = [f"10.0.{net}.{host}" for net in range(3) for host in range(1, 7)]
+    lock = threading.Lock()
+    active = {"all": 0, "max": 0}
+    per_subnet = {}
+
+    def invoke(self, target):
+        subnet = subnet_of(target)
+        with lock:
+            active["all"] += 1
+            active["max"] = max(active["max"], active["all"])
+            per_subnet.setdefault(subnet, [0, 0])
+            per_subnet[subnet][0] += 1
+            per_subnet[subnet][1] = max(per_subnet[subnet][1], per_subnet[subnet][0])
+        time.sleep(0.02)
+        with lock:
+            active["all"] -= 1
+            per_subnet[subnet][0] -= 1
+        return argparse.Namespace(data={}, error=None)
+
+    monkeypatch.setattr(FleetRunner, "invoke", invoke)
+    runner = FleetRunner(targets, ApiRequestType.Sensors, "sensors", MANAGER_ARGS,
+                         max_workers=5, per_subnet=2)
+    assert runner.schedule()[:3] == ["10.0.0.1", "10.0.1.1", "10.0.2.1"]
+    assert all(r.ok for r in runner.run())
+    assert active["max"] <= 5
+    assert max(peak for _, peak in per_subnet.values()) <= 2
+
+
+def test_percentiles_and_summary():
+    values = [float(v) for v in range(1, 101)]
+    assert (percentile(values, 50), percentile(values, 95), percentile(values, 99)) == \
+        (50.0, 95.0, 99.0)
+    assert percentile([], 50) is None
+    summary = summarize([HostResult("a", True, 0.2), HostResult("b", False, 1.0, None, "x", "Boom")],
+                        wall=1.0)
+    assert summary["failures"] == {"Boom": 1}
+    assert summary["latency"]["max"] == 1.0
+    assert subnet_of("10.1.2.3:8443") == "10.1.2.0/24"
+    assert subnet_of("bmc-7.lab") == "bmc-7.lab"
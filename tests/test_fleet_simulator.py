@@ -0,0 +1,144 @@
+"""Synthetic Redfish fleet: real HTTP against the fixture corpora.
+
+The simulator runs on its own loop in a thread; the clients are the real
+managers, commands and fleet runner over plain HTTP on loopback.
+
+Author Mus spyroot@gmail.com
+"""
+import random
+import time
+
+import pytest
+import requests
+
+from benchmarks.simulator import Faults, FleetSimulator, Latency, SimulatorThread
+from idrac_ctl.fleet import FleetRunner
+from idrac_ctl.idrac_manager import IDracManager
+from idrac_ctl.idrac_shared import ApiRequestType
+
+MANAGER_ARGS = dict(idrac_username="root", idrac_password="sim", is_http=True, insecure=True)
+SYSTEM = "/redfish/v1/Systems/System.Embedded.1"
+
+
+def _session() -> requests.Session:
+    session = requests.Session()
+    session.auth = ("root", "sim")
+    return session
+
+
+def _wait(session, url, timeout=5.0) -> requests.Response:
+    deadline = time.monotonic() + timeout
+    while True:
+        resp = session.get(url)
+        if resp.status_code != 202 or time.monotonic() > deadline:
+            return resp
+        time.sleep(0.05)
+
+
+def test_commands_run_against_every_vendor():
+    simulator = FleetSimulator(bmcs=4, vendors=["dell", "hpe", "supermicro", "generic"])
+    with SimulatorThread(simulator) as sim:
+        chassis = set()
+        for target in sim.targets:
+            manager = IDracManager(idrac_ip=target, **MANAGER_ARGS)
+            manager.check_api_version()
+            result = manager.sync_invoke(ApiRequestType.Sensors, "sensors")
+            assert result.error is None and result.data
+            chassis.add(result.data[0]["Chassis"])
+    assert len(chassis) == 4
+    assert sim.stats["requests"] == sum(v for k, v in sim.stats.items() if k.isdigit())
+
+
+def test_fleet_runner_over_the_simulator():
+    with SimulatorThread(FleetSimulator(bmcs=12, vendors=["supermicro"])) as sim:
+        runner = FleetRunner(sim.targets, ApiRequestType.Sensors, "sensors", MANAGER_ARGS,
+                             max_workers=6)
+        results = runner.run()
+    assert len(results) == 12 and all(r.ok for r in results)
+
+
+def test_host_header_selects_the_bmc():
+    with SimulatorThread(FleetSimulator(bmcs=3, mode="host", vendors=["dell", "hpe"])) as sim:
+        port = sim.targets[0].rsplit(":", 1)[1]
+        session = _session()
+        roots = [session.get(f"http://127.0.0.1:{port}/redfish/v1",
+                             headers={"Host": target}).json() for target in sim.targets]
+        unknown = session.get(f"http://127.0.0.1:{port}/redfish/v1",
+                              headers={"Host": "127.9.9.9"})
+    assert sim.targets[2].startswith("127.1.0.3:")
+    assert len({root["UUID"] for root in roots}) == 3
+    assert unknown.status_code == 404
+
+
+def test_authentication_and_sessions():
+    with SimulatorThread(FleetSimulator(bmcs=1)) as sim:
+        base = f"http://{sim.targets[0]}"
+        assert requests.get(f"{base}/redfish/v1").status_code == 200
+        assert requests.get(f"{base}{SYSTEM}", auth=("root", "wrong")).status_code == 401
+        created = requests.post(f"{base}/redfish/v1/SessionService/Sessions",
+                                json={"UserName": "root", "Password": "sim"})
+        token = {"X-Auth-Token": created.headers["X-Auth-Token"]}
+        assert created.status_code == 201
+        system = requests.get(f"{base}{SYSTEM}", headers=token)
+        assert system.status_code == 200
+        assert requests.get(f"{base}{SYSTEM}", headers=dict(
+            token, **{"If-None-Match": system.headers["ETag"]})).status_code == 304
+        requests.delete(f"{base}{created.headers['Location']}", headers=token)
+        assert requests.get(f"{base}{SYSTEM}", headers=token).status_code == 401
+
+
+def test_injected_faults():
+    faults = Faults(throttle_rate=1.0, retry_after=7)
+    with SimulatorThread(FleetSimulator(bmcs=1, faults=faults)) as sim:
+        resp = _session().get(f"http://{sim.targets[0]}{SYSTEM}")
+        assert resp.status_code == 503 and resp.headers["Retry-After"] == "7"
+
+        faults.throttle_rate, faults.error_rate = 0.0, 1.0
+        assert _session().get(f"http://{sim.targets[0]}{SYSTEM}").status_code == 500
+
+        faults.error_rate, faults.timeout_rate, faults.hang = 0.0, 1.0, 2.0
+        with pytest.raises(requests.exceptions.ReadTimeout):
+            _session().get(f"http://{sim.targets[0]}{SYSTEM}", timeout=0.2)
+    assert sim.stats["timeouts"] == 1
+
+
+def test_reset_task_completes_and_changes_power_state():
+    with SimulatorThread(FleetSimulator(bmcs=1, job_seconds=0.3)) as sim:
+        base, session = f"http://{sim.targets[0]}", _session()
+        assert session.get(f"{base}{SYSTEM}").json()["PowerState"] == "On"
+        resp = session.post(f"{base}{SYSTEM}/Actions/ComputerSystem.Reset",
+                            json={"ResetType": "ForceOff"})
+        assert resp.status_code == 202 and "Retry-After" in resp.headers
+        running = session.get(f"{base}{resp.headers['Location']}")
+        done = _wait(session, f"{base}{resp.headers['Location']}")
+        power = session.get(f"{base}{SYSTEM}").json()["PowerState"]
+    assert running.status_code == 202 and running.json()["TaskState"] in ("New", "Running")
+    assert done.status_code == 200 and done.json()["TaskState"] == "Completed"
+    assert power == "Off"
+
+
+def test_bios_job_applies_pending_attributes():
+    with SimulatorThread(FleetSimulator(bmcs=1, job_seconds=0.2)) as sim:
+        base, session = f"http://{sim.targets[0]}", _session()
+        session.patch(f"{base}{SYSTEM}/Bios/Settings", json={"Attributes": {"BootMode": "Uefi"}})
+        job = session.post(f"{base}/redfish/v1/Managers/iDRAC.Embedded.1/Jobs",
+                           json={"TargetSettingsURI": f"{SYSTEM}/Bios/Settings"})
+        job_id = job.headers["Location"].rsplit("/", 1)[1]
+        listed = session.get(f"{base}/redfish/v1/Managers/iDRAC.Embedded.1/Jobs").json()
+        time.sleep(0.3)
+        state = session.get(f"{base}/redfish/v1/Managers/iDRAC.Embedded.1/Oem/Dell/Jobs/"
+                            f"{job_id}").json()
+        bios = session.get(f"{base}{SYSTEM}/Bios").json()
+    assert any(m["@odata.id"].endswith(job_id) for m in listed["Members"])
+    assert state["JobState"] == "Completed" and state["JobType"] == "BIOSConfiguration"
+    assert bios["Attributes"]["BootMode"] == "Uefi"
+
+
+def test_latency_specs():
+    rng = random.Random(1)
+    assert all(0.01 <= Latency("uniform:0.01,0.02").sample(rng) <= 0.02 for _ in range(100))
+    assert Latency("normal:0,1").sample(rng) >= 0
+    assert Latency("fixed:0.5").sample(rng) == 0.5
+    for spec in ("gamma:1", "uniform:1", "fixed:x", "exp:-1"):
+        with pytest.raises(ValueError):
+            Latency(spec)
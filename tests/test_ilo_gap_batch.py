@@ -13,6 +13,8 @@ Dell backward-compat for the reroutes is covered by the existing dual-mode tests
 which still pass.
 """
 from idrac_ctl.idrac_shared import ApiRequestType
+from idrac_ctl.logs.cmd_logs import Logs
+from idrac_ctl.vendors.base import VendorCapabilities
 
 
 def test_logs_reads_ilo_entries(redfish_mock_factory):
@@ -25,6 +27,19 @@ def test_logs_reads_ilo_entries(redfish_mock_factory):
     assert "Message" in row
 
 
+def test_logs_lists_entries_with_top(redfish_mock_factory, monkeypatch):
+    """Where the profile takes $top, logs lists no more than --limit entries."""
+    mgr, service = redfish_mock_factory("hpe")
+    monkeypatch.setattr(Logs, "planning_capabilities",
+                        lambda self: VendorCapabilities("hpe", query_top=True))
+    result = mgr.sync_invoke(ApiRequestType.Logs, "logs", limit=3)
+    listed = [r for r in service.mocker.request_history if r.path.endswith("/entries")]
+    assert listed and all(r.qs.get("$top") == ["3"] for r in listed)
+    assert result.data and all(
+        len([r for r in result.data if r["Service"] == svc]) <= 3
+        for svc in {r["Service"] for r in result.data})
+
+
 def test_ethernet_interfaces_on_ilo(redfish_mock_factory):
     """ethernet-interfaces returns host/BMC NICs with identifying fields on iLO."""
     mgr, _ = redfish_mock_factory("hpe")
@@ -0,0 +1,109 @@
+"""On-disk inventory cache shared across CLI invocations.
+
+A second manager built for the same BMC stands in for the next CLI
+invocation: everything it needs to resolve must come from the cache
+directory instead of the mock service.
+
+Author Mus spyroot@gmail.com
+"""
+import json
+import threading
+
+import pytest
+
+from idrac_ctl.idrac_manager import IDracManager
+from idrac_ctl.redfish_inventory import META_FILE, InventoryCache
+
+
+@pytest.fixture
+def cache_root(tmp_path, monkeypatch):
+    monkeypatch.setenv("IDRAC_CTL_CACHE_DIR", str(tmp_path))
+    return tmp_path
+
+
+def _invocation(host="mock-idrac"):
+    return IDracManager(idrac_ip=host, idrac_username="root",
+                        idrac_password="mock", inventory_cache=True)
+
+
+def _resolve(mgr):
+    return mgr.idrac_members, mgr.idrac_manage_servers, mgr.idrac_id
+
+
+def test_second_invocation_resolves_ids_without_requests(cache_root, redfish_service):
+    """Manager, system and id come from disk on the next invocation."""
+    first = _resolve(_invocation())
+    assert first[0] == "/redfish/v1/Managers/iDRAC.Embedded.1"
+    sent = len(redfish_service.requests)
+
+    second = _resolve(_invocation())
+    assert second == first
+    assert len(redfish_service.requests) == sent
+    assert (cache_root / "mock-idrac" / "idrac_members.json").exists()
+
+
+def test_service_root_and_vendor_are_cached(cache_root, redfish_mock_factory):
+    """The vendor profile and the service root survive the invocation."""
+    _, service = redfish_mock_factory("supermicro")
+    mgr = _invocation("mock-supermicro")
+    assert mgr.vendor_capabilities.vendor == "supermicro"
+    version = mgr.redfish_version
+    sent = len(service.requests)
+
+    mgr = _invocation("mock-supermicro")
+    assert mgr.vendor_capabilities.vendor == "supermicro"
+    assert mgr.redfish_version == version
+    assert len(service.requests) == sent
+
+
+def test_firmware_change_drops_the_cache(cache_root, redfish_service):
+    """A new firmware version invalidates everything cached for the BMC."""
+    _resolve(_invocation())
+    meta_path = cache_root / "mock-idrac" / META_FILE
+    meta = json.loads(meta_path.read_text())
+    assert meta["firmware"] == "7.00.00.00"
+    # pretend the cache was written under older firmware and is due a check.
+    meta_path.write_text(json.dumps({"firmware": "6.10.00.00", "checked": 0}))
+
+    sent = len(redfish_service.requests)
+    _resolve(_invocation())
+    assert len(redfish_service.requests) > sent
+    assert json.loads(meta_path.read_text())["firmware"] == "7.00.00.00"
+
+
+def test_entries_expire(tmp_path):
+    cache = InventoryCache("bmc", fingerprint=lambda: "1.0", root=tmp_path,
+                           ttls={"ids": 0})
+    cache.put("idrac_id", "System.Embedded.1")
+    assert cache.get("idrac_id") is None
+    calls = []
+    assert cache.cached("idrac_id", lambda: calls.append(1) or "x") == "x"
+    assert calls == [1]
+
+
+def test_entry_from_other_firmware_is_ignored(tmp_path):
+    old = InventoryCache("bmc", fingerprint=lambda: "1.0", root=tmp_path)
+    old.put("idrac_id", "System.Embedded.1")
+    new = InventoryCache("bmc", fingerprint=lambda: "2.0", root=tmp_path,
+                         fingerprint_ttl=0)
+    assert new.get("idrac_id") is None
+
+
+def test_concurrent_writers_never_leave_a_partial_file(tmp_path):
+    cache = InventoryCache("bmc", fingerprint=lambda: "1.0", root=tmp_path)
+    cache.put("blob", {"v": 0})
+    errors = []
+
+    def writer(n):
+        for i in range(50):
+            cache.put("blob", {"v": n, "pad": "x" * 4096})
+            if cache.get("blob") is None:
+                errors.append(i)
+
+    threads = [threading.Thread(target=writer, args=(n,)) for n in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert not errors
+    assert not [f for f in (tmp_path / "bmc").iterdir() if f.name.startswith(".")]
@@ -0,0 +1,303 @@
+"""MetricReport ingestion over Server-Sent Events.
+
+A local HTTP server stands in for the BMC: it advertises an SSE URI on the
+EventService, pushes MetricReports as a chunked text/event-stream and then
+either keeps the stream open or drops it to force a reconnect.
+
+Author Mus spyroot@gmail.com
+"""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+import urllib3
+
+from idrac_ctl.redfish_sse import EventStream, _read1, raw_lines
+from idrac_ctl.telemetry.cmd_exporter import Exporter
+from idrac_ctl.telemetry.fleet import FleetExporter
+from idrac_ctl.telemetry.metric_stream import (
+    MetricReportStore,
+    MetricReportStream,
+    parse_sse,
+    report_id,
+)
+
+
+def _report(rid, value):
+    return {"@odata.id": f"/redfish/v1/TelemetryService/MetricReports/{rid}",
+            "Id": rid,
+            "MetricValues": [{"MetricProperty": "/redfish/v1/Chassis/GPU_0#/PowerWatts",
+                              "MetricValue": str(value),
+                              "Timestamp": "2026-10-17T10:00:00Z"}]}
+
+
+class _BmcHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    sse_uri = "/redfish/v1/SSE"
+    reject_filter = False
+    # Content-Encoding sent on the stream, None for identity.
+    encoding = None
+    # events sent on each connection, then the stream stays open while hold is set.
+    script = []
+    hold = threading.Event()
+    streams = []
+    accept_encodings = []
+    polls = []
+
+    def _json(self, status, body):
+        raw = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(raw)))
+        self.end_headers()
+        self.wfile.write(raw)
+
+    def _chunk(self, text):
+        raw = text.encode()
+        self.wfile.write(f"{len(raw):x}\r\n".encode() + raw + b"\r\n")
+        self.wfile.flush()
+
+    def do_GET(self):  # noqa: N802 - http.server naming
+        cls = type(self)
+        if self.path == "/redfish/v1/EventService":
+            body = {"Id": "EventService"}
+            if cls.sse_uri:
+                body["ServerSentEventUri"] = cls.sse_uri
+            self._json(200, body)
+            return
+        if self.path.startswith("/redfish/v1/SSE"):
+            cls.streams.append((self.path, self.headers.get("Last-Event-ID")))
+            cls.accept_encodings.append(self.headers.get("Accept-Encoding"))
+            if cls.reject_filter and "$filter" in self.path:
+                self._json(400, {"error": "filter not supported"})
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Transfer-Encoding", "chunked")
+            if cls.encoding:
+                self.send_header("Content-Encoding", cls.encoding)
+            self.end_headers()
+            self._chunk(": keep-alive\n\n")
+            for event in cls.script:
+                self._chunk(event)
+            cls.hold.wait(5)
+            self.wfile.write(b"0\r\n\r\n")
+            self.close_connection = True
+            return
+        cls.polls.append(self.path)
+        if self.path == "/redfish/v1":
+            self._json(200, {"@odata.id": "/redfish/v1"})
+        elif self.path == "/redfish/v1/TelemetryService/MetricReports":
+            self._json(200, {"Members": [
+                {"@odata.id": "/redfish/v1/TelemetryService/MetricReports/Polled"}]})
+        elif self.path == "/redfish/v1/TelemetryService/MetricReports/Polled":
+            self._json(200, _report("Polled", 1))
+        else:
+            self._json(404, {})
+
+    def log_message(self, *args):
+        pass
+
+
+def _event(rid, value, event_id):
+    return f"id: {event_id}\nevent: MetricReport\ndata: {json.dumps(_report(rid, value))}\n\n"
+
+
+@pytest.fixture
+def bmc():
+    _BmcHandler.sse_uri = "/redfish/v1/SSE"
+    _BmcHandler.reject_filter = False
+    _BmcHandler.script = [_event("GpuPower", 231, "1"), _event("GpuPower", 240, "2")]
+    _BmcHandler.hold = threading.Event()
+    _BmcHandler.encoding = None
+    _BmcHandler.streams = []
+    _BmcHandler.accept_encodings = []
+    _BmcHandler.polls = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _BmcHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"127.0.0.1:{server.server_address[1]}"
+    _BmcHandler.hold.set()
+    server.shutdown()
+    server.server_close()
+
+
+def _exporter(host):
+    return Exporter(idrac_ip=host, idrac_username="root", idrac_password="pw", is_http=True)
+
+
+def _wait(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def test_pushed_reports_merge_with_polled_ones(bmc):
+    exporter = _exporter(bmc)
+    stream = MetricReportStream(exporter, backoff=(0.01, 0.05))
+    exporter.metric_stream = stream.start()
+    try:
+        _wait(lambda: stream.store.events == 2)
+        rows = exporter._collector_rows("metric_reports", False, False)
+        polls = list(_BmcHandler.polls)
+        rows_again = exporter._collector_rows("metric_reports", False, False)
+    finally:
+        _BmcHandler.hold.set()
+        stream.stop(5)
+
+    assert [(r["Report"], r["MetricValue"]) for r in rows] == [
+        ("GpuPower", "240"), ("Polled", "1")]
+    assert rows_again == rows
+    assert stream.supported and stream.last_event_id == "2"
+    assert "filter=EventFormatType%20eq%20MetricReport" in _BmcHandler.streams[0][0]
+    assert _BmcHandler.accept_encodings[0] == "identity"
+    # the report that is not pushed is polled on every run, the pushed one never is.
+    assert polls.count("/redfish/v1/TelemetryService/MetricReports/Polled") == 1
+    assert _BmcHandler.polls.count("/redfish/v1/TelemetryService/MetricReports/Polled") == 2
+    assert "/redfish/v1/TelemetryService/MetricReports/GpuPower" not in _BmcHandler.polls
+
+
+def test_store_ages_out_reports(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    store = MetricReportStore(max_age=60.0)
+    store.update("GpuPower", [{"Report": "GpuPower", "MetricValue": "231"}])
+    store.merge([{"Report": "GpuPower", "MetricValue": "1"},
+                 {"Report": "Polled", "MetricValue": "2"}])
+    assert store.pushed() == {"GpuPower"}
+    assert [r["MetricValue"] for r in store.rows()] == ["231", "2"]
+
+    # the pushed report stopped arriving: it is polled again and the poll wins.
+    now[0] += 61.0
+    assert store.pushed() == set() and store.rows() == []
+    store.merge([{"Report": "GpuPower", "MetricValue": "3"}])
+    assert [(r["Report"], r["MetricValue"]) for r in store.rows()] == [("GpuPower", "3")]
+
+
+def test_stream_reconnects_with_last_event_id(bmc):
+    _BmcHandler.hold.set()
+    stream = MetricReportStream(_exporter(bmc), backoff=(0.01, 0.05)).start()
+    try:
+        _wait(lambda: stream.connects >= 3)
+    finally:
+        stream.stop(5)
+    assert _BmcHandler.streams[0][1] is None
+    assert _BmcHandler.streams[1][1] == "2"
+
+
+def test_rejected_filter_streams_every_event(bmc):
+    _BmcHandler.reject_filter = True
+    stream = MetricReportStream(_exporter(bmc), backoff=(0.01, 0.05)).start()
+    try:
+        _wait(lambda: stream.store.events == 2)
+    finally:
+        _BmcHandler.hold.set()
+        stream.stop(5)
+    assert stream.sse_filter is None
+    assert "$filter" not in _BmcHandler.streams[-1][0]
+
+
+def test_encoded_stream_falls_back_to_polling(bmc):
+    _BmcHandler.encoding = "gzip"
+    stream = MetricReportStream(_exporter(bmc), backoff=(0.01, 0.05)).start()
+    try:
+        _wait(lambda: stream.supported is False)
+    finally:
+        _BmcHandler.hold.set()
+        stream.stop(5)
+    assert stream.store.events == 0 and stream.connects == 0
+    assert len(_BmcHandler.streams) == 1
+
+
+def test_raw_lines_on_pinned_urllib3(bmc):
+    _BmcHandler.hold.set()
+    response = requests.get(f"http://{bmc}/redfish/v1/SSE", stream=True, timeout=5,
+                            headers={"Accept-Encoding": "identity"})
+    try:
+        if urllib3.__version__.startswith("1."):
+            # the 1.26 pin has no read1, the shim reads the http.client response.
+            assert not hasattr(response.raw, "read1")
+            assert _read1(response.raw) == response.raw._fp.read1
+        events = list(parse_sse(raw_lines(response.raw)))
+    finally:
+        response.close()
+    assert [e.id for e in events] == ["1", "2"]
+    assert json.loads(events[-1].data)["MetricValues"][0]["MetricValue"] == "240"
+
+
+def test_bmc_without_sse_falls_back_to_polling(bmc):
+    _BmcHandler.sse_uri = None
+    exporter = _exporter(bmc)
+    stream = MetricReportStream(exporter, backoff=(0.01, 0.05))
+    exporter.metric_stream = stream.start()
+    _wait(lambda: stream.supported is False)
+    stream.stop(5)
+
+    rows = exporter._collector_rows("metric_reports", False, False)
+    assert [(r["Report"], r["MetricValue"]) for r in rows] == [("Polled", "1")]
+    assert not _BmcHandler.streams
+
+
+def test_fleet_targets_stream_their_reports(bmc):
+    fleet = FleetExporter([bmc], username="root", password="pw", is_http=True,
+                          metric_stream="sse")
+    try:
+        assert fleet.scrape_target(bmc).success
+        exporter = fleet.exporter_for(bmc)
+        stream = exporter.metric_stream
+        _wait(lambda: stream.store.events == 2)
+        assert fleet.scrape_target(bmc).success
+        rows, _, _ = exporter._collected["metric_reports"]
+    finally:
+        _BmcHandler.hold.set()
+        fleet.close()
+    assert stream.supported and _BmcHandler.streams
+    assert [(r["Report"], r["MetricValue"]) for r in rows] == [("GpuPower", "240"), ("Polled", "1")]
+
+
+def test_stream_without_handle_fails_when_created(bmc):
+    class Unhandled(EventStream):
+        pass
+
+    with pytest.raises(TypeError):
+        Unhandled(_exporter(bmc))
+
+
+def test_parse_sse():
+    raw = [": comment", "retry: 2500", "id: 7", "data: {\"a\":", "data: 1}", "",
+           "data: second\r\n", "\r\n", "event: ping", ""]
+    events = list(parse_sse(raw))
+    assert [(e.data, e.id, e.retry) for e in events] == [
+        ('{"a":\n1}', "7", 2.5), ("second", "7", None)]
+    assert report_id({"MetricReportDefinition": {
+        "@odata.id": "/redfish/v1/TelemetryService/MetricReportDefinitions/GpuPower"}}) == "GpuPower"
+
+
+class _Raw:
+    """Streamed body handing back the chunks one socket read would."""
+
+    def __init__(self, chunks):
+        self.chunks = list(chunks)
+        self.reads = 0
+
+    def read1(self, size):
+        self.reads += 1
+        return self.chunks.pop(0) if self.chunks else b""
+
+
+def test_raw_lines_join_reads():
+    report = json.dumps(_report("Big", "x" * 300_000)).encode()
+    body = b"data: " + report + b"\r\n\r\ndata: tail"
+    # a CRLF split between two reads is still one line ending.
+    chunks = [b"id: 1\r", b"\n"] + [body[i:i + 65536] for i in range(0, len(body), 65536)]
+    raw = _Raw(chunks)
+    lines = list(raw_lines(raw))
+    events = list(parse_sse(lines))
+    assert raw.decode_content and raw.reads == len(chunks) + 1
+    assert lines[0] == b"id: 1\r\n" and lines[-1] == b"data: tail"
+    assert len(events) == 1 and events[0].id == "1"
+    assert json.loads(events[0].data)["Id"] == "Big"
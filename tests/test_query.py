@@ -71,6 +71,15 @@ def test_negative_top_rejected():
         RedfishQuery(top=-1).to_query_string()
 
 
+def test_skip_pages_with_top():
+    """$skip renders after $top and counts as its own parameter."""
+    assert RedfishQuery(top=50, skip=100).to_query_string() == "?$top=50&$skip=100"
+    with pytest.raises(ValueError):
+        RedfishQuery(top=50, skip=100).to_query_string(one_param_per_uri=True)
+    with pytest.raises(ValueError):
+        RedfishQuery(skip=-1).to_query_string()
+
+
 def test_bad_expand_levels_rejected():
     """$expand levels must be >= 1."""
     with pytest.raises(ValueError):
@@ -0,0 +1,103 @@
+"""Batched job watch: one Jobs collection poll per BMC per tick.
+
+Jobs come from the fleet simulator: a POST to a Jobs collection becomes a
+Dell job that runs for ``job_seconds``. Dell honours ``$expand``, Supermicro
+does not, so the Supermicro run covers the per member fallback.
+
+Author Mus spyroot@gmail.com
+"""
+import asyncio
+import json
+
+import requests
+
+from benchmarks.simulator import FleetSimulator, SimulatorThread
+from idrac_ctl.idrac_manager import IDracManager
+from idrac_ctl.idrac_shared import ApiRequestType, JobState
+from idrac_ctl.redfish_job_watch import JobBatchWatcher
+
+JOBS = "/redfish/v1/Managers/iDRAC.Embedded.1/Jobs"
+BIOS_SETTINGS = "/redfish/v1/Systems/System.Embedded.1/Bios/Settings"
+
+
+def _manager(target):
+    return IDracManager(idrac_ip=target, idrac_username="root", idrac_password="sim",
+                        is_http=True)
+
+
+def _jobs(target, count):
+    ids = []
+    for _ in range(count):
+        resp = requests.post(f"http://{target}{JOBS}", json={"TargetSettingsURI": BIOS_SETTINGS},
+                             auth=("root", "sim"))
+        ids.append(resp.headers["Location"].rsplit("/", 1)[-1])
+    return ids
+
+
+def test_one_collection_poll_per_bmc_per_tick():
+    with SimulatorThread(FleetSimulator(bmcs=2, vendors=["dell"], job_seconds=0.5)) as sim:
+        jobs = {_manager(target): _jobs(target, 5) for target in sim.targets}
+        changes = []
+        before = sim.stats["requests"]
+        watcher = JobBatchWatcher(interval=0.1)
+        for manager, ids in jobs.items():
+            watcher.add(manager, ids)
+        final = asyncio.run(watcher.run(changes.append))
+        served = sim.stats["requests"] - before
+    assert {t: set(states.values()) for t, states in final.items()} == {
+        t: {JobState.Completed} for t in sim.targets}
+    # each job reports its first state once, and its last one with final set.
+    first = [c for c in changes if c.previous == JobState.Unknown]
+    last = [c for c in changes if c.final]
+    assert len(first) == len(last) == 10
+    assert all(c.state == JobState.Completed and c.error is None for c in last)
+    # one GET per BMC per tick instead of one per job, plus the manager lookup per BMC.
+    assert watcher.requests == watcher.polls <= 2 * 8 and served == watcher.polls + 2
+    assert json.loads(json.dumps(last[0].as_dict()))["state"] == "Completed"
+
+
+def test_jobs_on_later_pages_are_followed():
+    with SimulatorThread(FleetSimulator(bmcs=1, vendors=["dell"], job_seconds=0.3,
+                                        page_size=4)) as sim:
+        target = sim.targets[0]
+        ids = _jobs(target, 10)
+        watcher = JobBatchWatcher(interval=0.05, missing_ticks=2)
+        watcher.add(_manager(target), ids)
+        final = asyncio.run(watcher.run())
+    # twelve jobs, four per page: the last watched ones only show up on page three.
+    assert final[target] == {job_id: JobState.Completed for job_id in ids}
+    # three pages per poll; the links of the later pages carry $skip alone, so
+    # their watched members come back unexpanded and are fetched on their own.
+    assert watcher.requests > 3 * watcher.polls
+
+
+def test_unexpanded_members_and_deleted_jobs():
+    with SimulatorThread(FleetSimulator(bmcs=1, vendors=["supermicro"], job_seconds=0.2)) as sim:
+        target = sim.targets[0]
+        ids = _jobs(target, 2)
+        _jobs(target, 3)
+        watcher = JobBatchWatcher(interval=0.05, missing_ticks=2)
+        watcher.add(_manager(target), ids + ["JID_GONE"], collection=JOBS)
+
+        async def stream():
+            return [change async for change in watcher.transitions()]
+
+        changes = asyncio.run(stream())
+    gone = [c for c in changes if c.job_id == "JID_GONE"]
+    assert len(gone) == 1 and gone[0].final and gone[0].state == JobState.Unknown
+    assert watcher.final[target] == {ids[0]: JobState.Completed, ids[1]: JobState.Completed,
+                                     "JID_GONE": JobState.Unknown}
+    # members come back unexpanded: only the two watched jobs are fetched, never the other three.
+    assert watcher.polls < watcher.requests <= 3 * watcher.polls and watcher.watched == 0
+
+
+def test_job_watch_command_streams_transitions(capsys):
+    with SimulatorThread(FleetSimulator(bmcs=1, vendors=["dell"], job_seconds=0.2)) as sim:
+        target = sim.targets[0]
+        ids = _jobs(target, 2)
+        result = _manager(target).sync_invoke(
+            ApiRequestType.JobWatch, "job_watch", job_id=",".join(ids), interval=0.05)
+    assert result.data == {job_id: "Completed" for job_id in ids}
+    lines = [json.loads(line) for line in capsys.readouterr().err.splitlines()
+             if line.startswith("{")]
+    assert {line["job_id"] for line in lines if line["final"]} == set(ids)
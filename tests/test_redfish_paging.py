@@ -0,0 +1,93 @@
+"""Collection paging: Members@odata.nextLink, $top/$skip windows and limits.
+
+The fleet simulator splits collections in pages of ``page_size`` members and
+links the rest with ``Members@odata.nextLink``. The Dell Jobs collection
+carries two captured jobs and every job posted to it.
+
+Author Mus spyroot@gmail.com
+"""
+import time
+
+import requests
+
+from benchmarks import simulator
+from benchmarks.simulator import FleetSimulator, SimulatorThread
+from idrac_ctl.idrac_manager import IDracManager
+from idrac_ctl.redfish_planner import Walk
+from idrac_ctl.redfish_query import RedfishQuery
+
+JOBS = "/redfish/v1/Managers/iDRAC.Embedded.1/Jobs"
+
+
+def _manager(sim):
+    target = sim.targets[0]
+    for _ in range(10):
+        requests.post(f"http://{target}{JOBS}", json={}, auth=("root", "sim"))
+    return IDracManager(idrac_ip=target, idrac_username="root", idrac_password="sim",
+                        is_http=True)
+
+
+def _served(sim, read):
+    before = sim.stats["requests"]
+    value = read()
+    return value, sim.stats["requests"] - before
+
+
+def test_next_link_is_followed_up_to_the_limit():
+    with SimulatorThread(FleetSimulator(bmcs=1, vendors=["dell"], page_size=5)) as sim:
+        manager = _manager(sim)
+        every, every_requests = _served(sim, lambda: list(manager.iter_collection(JOBS)))
+        some, some_requests = _served(sim, lambda: list(manager.iter_collection(JOBS, limit=5)))
+        before = sim.stats["requests"]
+        pages = manager.iter_collection_pages(JOBS)
+        first = next(pages)
+        # the second page is on its way while the first one is consumed.
+        deadline = time.monotonic() + 5
+        while sim.stats["requests"] < before + 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        prefetched = sim.stats["requests"] - before
+        pages.close()
+    assert len(every) == 12 and every_requests == 3
+    assert len({m["@odata.id"] for m in every}) == 12
+    # the limit was reached on the first page: the second one is never asked for.
+    assert len(some) == 5 and some_requests == 1
+    assert len(first["Members"]) == 5 and prefetched == 2
+
+
+def test_top_skip_windows(monkeypatch):
+    monkeypatch.setattr(simulator, "ONE_QUERY_PARAM_PER_URI", frozenset())
+    with SimulatorThread(FleetSimulator(bmcs=1, vendors=["dell"])) as sim:
+        manager = _manager(sim)
+        jobs, paged = _served(sim, lambda: list(manager.iter_collection(
+            JOBS, page_size=4, query=RedfishQuery(expand=True))))
+        # one parameter per URI: $top alone, then $skip alone.
+        links, single = _served(sim, lambda: list(manager.iter_collection(
+            JOBS, page_size=5, one_param_per_uri=True)))
+        few, few_requests = _served(sim, lambda: list(manager.iter_collection(
+            JOBS, page_size=50, limit=3)))
+    # 12 jobs, 4 per page: three full pages and the empty one that ends the walk.
+    assert len(jobs) == 12 and all("JobState" in job for job in jobs) and paged == 4
+    assert [m["@odata.id"].rsplit("/", 1)[-1] for m in links] == \
+        [job["Id"] for job in jobs] and single == 2
+    assert len(few) == 3 and few_requests == 1
+
+
+def test_refused_window_falls_back():
+    with SimulatorThread(FleetSimulator(bmcs=1, vendors=["dell"])) as sim:
+        manager = _manager(sim)
+        # iDRAC answers 400 to $top and $skip together.
+        jobs, served = _served(sim, lambda: list(manager.iter_collection(
+            JOBS, page_size=4, fallback=RedfishQuery(expand=True))))
+    assert len(jobs) == 12 and all("JobState" in job for job in jobs) and served == 2
+
+
+def test_walks_read_every_page():
+    with SimulatorThread(FleetSimulator(bmcs=1, vendors=["dell"], page_size=5)) as sim:
+        manager = _manager(sim)
+        limited, = manager.walk_members([JOBS], do_expanded=True, limit=7)
+        every, = manager.walk_members([JOBS], do_expanded=True)
+        result = manager.walk(Walk(JOBS, fields=("JobState",)))
+    assert [uri for uri, _ in limited] == [uri for uri, _ in every][:7] and len(every) == 12
+    assert len(result.rows) == 12 and all("JobState" in body for _, _, body in result.rows)
+    # the first page comes expanded, the members linked from the next two are fetched.
+    assert result.requests == 3 + 7 and result.baseline == 3 + 12
@@ -0,0 +1,95 @@
+"""Walk plans from vendor capability profiles, run against the fixture corpora.
+
+The fleet simulator serves each vendor corpus and honours the query
+parameters that vendor profile claims, so a planned walk must return the
+same rows as the plain member by member walk in fewer requests, and never
+more.
+
+Author Mus spyroot@gmail.com
+"""
+import dataclasses
+
+import pytest
+
+from benchmarks.simulator import FleetSimulator, SimulatorThread
+from idrac_ctl.idrac_manager import IDracManager
+from idrac_ctl.idrac_shared import ApiRequestType
+from idrac_ctl.redfish_planner import EXPAND, MEMBERS, SELECT, Walk, WalkPlan, plan_walk
+from idrac_ctl.redfish_query import RedfishQuery
+from idrac_ctl.sensors.cmd_sensors import SENSOR_FIELDS
+from idrac_ctl.vendors import get_vendor
+
+SENSORS = Walk("/redfish/v1/Chassis", link="Sensors", fields=SENSOR_FIELDS)
+
+
+def test_plan_follows_the_profile():
+    dell = plan_walk(SENSORS, get_vendor("dell"))
+    assert dell.strategy == EXPAND and dell.one_param_per_uri
+    assert dell.url("/redfish/v1/Chassis", dell.collection_query) == \
+        "/redfish/v1/Chassis?$expand=.($levels=1)"
+    # one parameter per URI: the member fallback only selects.
+    assert dell.url("/s/1", dell.member_query) == \
+        "/s/1?$select=Name,Reading,ReadingUnits,ReadingType,Status"
+    assert plan_walk(SENSORS, get_vendor("supermicro")).strategy == MEMBERS
+    assert plan_walk(SENSORS, get_vendor("dell"), expand=False).strategy == SELECT
+    assert plan_walk(SENSORS, get_vendor("supermicro"), expand=True).strategy == EXPAND
+    deep = dataclasses.replace(get_vendor("dell"), query_expand_levels=5)
+    assert plan_walk(SENSORS, deep).collection_query.expand_levels == 3
+    assert plan_walk(Walk("/redfish/v1/Chassis"), deep).collection_query.expand_levels == 1
+
+
+def _walk(target, walk, caps=None, **kwargs):
+    manager = IDracManager(idrac_ip=target, idrac_username="root", idrac_password="sim",
+                           is_http=True)
+    if caps is None:
+        return manager.walk(walk, **kwargs)
+    return plan_walk(walk, caps, **kwargs).run(manager.fetch_resources)
+
+
+@pytest.mark.parametrize("vendor", ["dell", "hpe", "supermicro", "generic"])
+def test_planned_walk_matches_plain_walk(vendor):
+    with SimulatorThread(FleetSimulator(bmcs=1, vendors=[vendor])) as sim:
+        target = sim.targets[0]
+        plain = _walk(target, SENSORS, get_vendor("supermicro"))
+        before = sim.stats["requests"]
+        planned = _walk(target, SENSORS, get_vendor(vendor))
+        served = sim.stats["requests"] - before
+    assert plain.savings == 0 and plain.requests == plain.baseline
+    assert planned.baseline == plain.baseline and planned.requests == served
+    key = [(parent, uri) for parent, uri, _ in plain.rows]
+    assert [(parent, uri) for parent, uri, _ in planned.rows] == key
+    for (_, _, full), (_, _, body) in zip(plain.rows, planned.rows):
+        assert {f: body.get(f) for f in SENSOR_FIELDS} == {f: full.get(f) for f in SENSOR_FIELDS}
+    if vendor == "supermicro":
+        assert planned.savings == 0
+    else:
+        assert planned.savings > 0, planned.summary()
+
+
+def test_deep_expand_and_refused_queries():
+    with SimulatorThread(FleetSimulator(bmcs=1, vendors=["dell"])) as sim:
+        target = sim.targets[0]
+        deep = _walk(target, SENSORS, dataclasses.replace(get_vendor("dell"),
+                                                          query_expand_levels=3))
+        assert deep.requests == 1 and deep.savings == deep.baseline - 1
+        plain = _walk(target, SENSORS, get_vendor("supermicro"))
+        assert [row[:2] for row in deep.rows] == [row[:2] for row in plain.rows]
+
+        # iDRAC answers 400 to two parameters, the walk falls back to plain GETs.
+        combined = WalkPlan(SENSORS, EXPAND, RedfishQuery(expand=".", top=10))
+        manager = IDracManager(idrac_ip=target, idrac_username="root",
+                               idrac_password="sim", is_http=True)
+        refused = combined.run(manager.fetch_resources)
+        assert [row[:2] for row in refused.rows] == [row[:2] for row in plain.rows]
+        assert refused.requests == plain.requests + 1
+
+
+def test_sensors_command_uses_the_plan(redfish_mock_factory):
+    """The mock ignores query parameters: expanded members never come back,
+    so every member is fetched and the readings do not change."""
+    manager, service = redfish_mock_factory("supermicro")
+    readings = manager.sync_invoke(ApiRequestType.Sensors, "sensors", do_expanded=True).data
+    assert readings
+    assert any("$expand=.($levels=1)" in r.url for r in service.requests)
+    result = manager.walk(SENSORS, expand=False)
+    assert len([row for row in result.rows if "Reading" in row[2]]) == len(readings)
@@ -0,0 +1,127 @@
+"""Commands served from a crawl with ``RedfishManager(replay=...)``.
+
+The simulator is crawled once into a snapshot and a directory, then
+stopped: the replayed commands must return what the live ones did without
+any BMC to talk to.
+
+Author Mus spyroot@gmail.com
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from benchmarks.simulator import FleetSimulator, SimulatorThread
+from idrac_ctl.cmd_exceptions import ResourceNotFound
+from idrac_ctl.discovery.snapshot import CrawlSnapshot
+from idrac_ctl.idrac_main import manager_args
+from idrac_ctl.idrac_manager import IDracManager
+from idrac_ctl.idrac_shared import ApiRequestType
+from idrac_ctl.redfish_replay import replay_session
+
+COMMANDS = [(ApiRequestType.Sensors, "sensors"),
+            (ApiRequestType.BiosQuery, "bios_inventory"),
+            (ApiRequestType.ManagerQuery, "manager_query"),
+            (ApiRequestType.StorageListQuery, "storage_list")]
+
+
+@pytest.fixture
+def crawl(tmp_path, monkeypatch):
+    """(snapshot, directory, live results) of one simulated iDRAC."""
+    monkeypatch.setenv("HOME", str(tmp_path))
+    snapshot = str(tmp_path / "crawl.db")
+    with SimulatorThread(FleetSimulator(bmcs=1, vendors=["dell"])) as sim:
+        target = sim.targets[0]
+        live = IDracManager(idrac_ip=target, idrac_username="root", idrac_password="sim",
+                            is_http=True)
+        live.sync_invoke(ApiRequestType.Discovery, "discovery", snapshot=snapshot)
+        live.sync_invoke(ApiRequestType.Discovery, "discovery")
+        results = {name: live.sync_invoke(api, name).data for api, name in COMMANDS}
+    directory = str(tmp_path / ".json_responses" / target.replace(":", ""))
+    return snapshot, directory, results
+
+
+@pytest.mark.parametrize("source", [0, 1], ids=["snapshot", "directory"])
+def test_replay_matches_live_commands(crawl, source):
+    replay = crawl[source]
+    manager = IDracManager(idrac_ip="replay", idrac_password="", replay=replay)
+    assert manager.check_api_version()
+    for api, name in COMMANDS:
+        assert manager.sync_invoke(api, name).data == crawl[2][name], name
+    with pytest.raises(ResourceNotFound):
+        manager.base_query("/redfish/v1/NotCaptured")
+
+
+def test_replay_adapter_answers_like_a_bmc(tmp_path):
+    path = str(tmp_path / "crawl.db")
+    members = [{"@odata.id": f"/redfish/v1/Things/{i}"} for i in range(5)]
+    with CrawlSnapshot(path) as snapshot:
+        snapshot.put("/redfish/v1/Things", {"@odata.id": "/redfish/v1/Things", "Name": "Things",
+                                            "Members": members}, ["GET"], 'W/"c"')
+        for i in range(5):
+            snapshot.put(f"/redfish/v1/Things/{i}", {"Id": str(i)}, ["GET", "PATCH"])
+
+    session = replay_session(path)
+    url = "https://10.0.0.1/redfish/v1/Things"
+    things = session.get(url + "/")
+    assert things.status_code == 200 and things.json()["Name"] == "Things"
+    assert things.headers["ETag"] == 'W/"c"' and things.headers["Allow"] == "GET"
+    assert session.get(url, headers={"If-None-Match": 'W/"c"'}).status_code == 304
+    assert session.head(url).content == b""
+
+    assert session.get(url + "?$select=Name").json() == {"@odata.id": "/redfish/v1/Things",
+                                                         "Name": "Things"}
+    assert session.get(url + "?$expand=*($levels=1)").json()["Members"][3] == {"Id": "3"}
+    page = session.get(url + "?$skip=1&$top=2").json()["Members"]
+    assert page == members[1:3]
+    assert session.get(url + "?$filter=Id eq '1'").status_code == 501
+
+    assert session.get(url + "/9").status_code == 404
+    patch = session.patch(url + "/1", data="{}")
+    assert patch.status_code == 405 and "read only" in patch.text
+
+
+def test_replay_async_and_cli(crawl):
+    manager = IDracManager(idrac_ip="replay", idrac_password="", replay=crawl[0],
+                           session_auth=True, resource_cache=True)
+    assert manager.session_auth is None and manager.resource_cache is None
+
+    system = "/redfish/v1/Systems/System.Embedded.1"
+
+    async def query():
+        return await manager.async_base_query(system)
+
+    with CrawlSnapshot(crawl[0], readonly=True) as snapshot:
+        assert asyncio.run(query()).data == snapshot.get(system).data
+
+    args = argparse.Namespace(idrac_ip="", idrac_username="root", idrac_password="",
+                              idrac_port=443, use_http=False, replay=crawl[0])
+    assert manager_args(args)["idrac_ip"] == "replay"
+    assert manager_args(args)["replay"] == crawl[0]
+
+
+def test_replay_cli_needs_no_address_or_credentials(tmp_path):
+    path = str(tmp_path / "crawl.db")
+    chassis, sensors = "/redfish/v1/Chassis/1", "/redfish/v1/Chassis/1/Sensors"
+    with CrawlSnapshot(path) as snapshot:
+        snapshot.put("/redfish/v1", {"@odata.id": "/redfish/v1"}, ["GET"])
+        snapshot.put("/redfish/v1/Chassis", {"@odata.id": "/redfish/v1/Chassis",
+                                             "Members": [{"@odata.id": chassis}]}, ["GET"])
+        snapshot.put(chassis, {"@odata.id": chassis, "Id": "1",
+                               "Sensors": {"@odata.id": sensors}}, ["GET"])
+        snapshot.put(sensors, {"@odata.id": sensors,
+                               "Members": [{"@odata.id": sensors + "/Inlet"}]}, ["GET"])
+        snapshot.put(sensors + "/Inlet", {"@odata.id": sensors + "/Inlet", "Name": "Inlet",
+                                          "Reading": 24, "ReadingUnits": "Cel"}, ["GET"])
+
+    env = {k: v for k, v in os.environ.items() if not k.startswith("IDRAC_")}
+    env["HOME"] = str(tmp_path)
+    out = subprocess.run([sys.executable, "-m", "idrac_ctl", "--nocolor", "--replay", path,
+                          "sensors"], capture_output=True, text=True, env=env, timeout=60)
+    assert out.returncode == 0, out.stdout + out.stderr
+    rows = json.loads(out.stdout)["data"]
+    assert [(r["Name"], r["Reading"]) for r in rows] == [("Inlet", 24)]
@@ -0,0 +1,162 @@
+"""Task waits: backoff, shared futures, Retry-After and SSE wake ups.
+
+Tasks come from the fleet simulator (a reset becomes a task that completes
+after ``job_seconds``). The event path runs against a small local BMC that
+streams one event naming the task once it completed.
+
+Author Mus spyroot@gmail.com
+"""
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from benchmarks.simulator import Faults, FleetSimulator, SimulatorThread
+from idrac_ctl.idrac_manager import IDracManager
+from idrac_ctl.redfish_task_state import TaskState
+from idrac_ctl.redfish_task_wait import PollSchedule, TaskEventStream, TaskWaiter, task_uri
+
+RESET = "/redfish/v1/Systems/System.Embedded.1/Actions/ComputerSystem.Reset"
+
+
+def _manager(target):
+    return IDracManager(idrac_ip=target, idrac_username="root", idrac_password="sim",
+                        is_http=True)
+
+
+def _reset(target) -> str:
+    resp = requests.post(f"http://{target}{RESET}", json={"ResetType": "ForceRestart"},
+                         auth=("root", "sim"))
+    assert resp.status_code == 202
+    return resp.headers["Location"]
+
+
+def test_poll_schedule():
+    schedule = PollSchedule(first=0.5, factor=2.0, cap=3.0)
+    assert [schedule.delay(n) for n in range(5)] == [0.5, 1.0, 2.0, 3.0, 3.0]
+    assert schedule.delay(0, retry_after=5) == 5
+    assert schedule.delay(4, cap=60) == 8.0
+    assert task_uri("JID_1") == "/redfish/v1/TaskService/Tasks/JID_1"
+    assert TaskEventStream.named({"Events": [
+        {"MessageId": "TaskEvent.1.0.TaskCompletedOK", "MessageArgs": ["JID_7"],
+         "OriginOfCondition": {"@odata.id": "/redfish/v1/TaskService/Tasks/JID_7"}}]}) == [
+        "/redfish/v1/TaskService/Tasks/JID_7", "JID_7", "JID_7"]
+
+
+def test_concurrent_waits_share_one_poll_per_task():
+    with SimulatorThread(FleetSimulator(bmcs=1, job_seconds=0.3,
+                                        faults=Faults(retry_after=0))) as sim:
+        target = sim.targets[0]
+        tasks = [_reset(target) for _ in range(3)]
+        manager = _manager(target)
+        waiter = TaskWaiter(manager, PollSchedule(first=0.05, cap=0.1), use_events=False)
+        assert waiter.watch(tasks[0]) is waiter.watch(tasks[0])
+
+        async def wait_all():
+            waits = [waiter.wait(task) for task in tasks for _ in range(4)]
+            return await asyncio.gather(*waits)
+
+        assert asyncio.run(wait_all()) == [TaskState.Completed] * 12
+        # each task is polled on its own schedule, not once per wait.
+        assert waiter.polls <= 3 * 8
+        waiter.close()
+
+
+def test_retry_after_and_fetch_task():
+    with SimulatorThread(FleetSimulator(bmcs=1, job_seconds=0.3)) as sim:
+        target = sim.targets[0]
+        waiter = TaskWaiter(_manager(target), PollSchedule(first=0.05), use_events=False)
+        start = time.monotonic()
+        assert waiter.wait_sync(_reset(target), timeout=10) == TaskState.Completed
+        # the running task asked for Retry-After: 1, so the second poll is the last.
+        assert waiter.polls == 2 and time.monotonic() - start >= 1.0
+        waiter.close()
+
+        manager = _manager(target)
+        start = time.monotonic()
+        assert manager.fetch_task(_reset(target).rsplit("/", 1)[-1]) == TaskState.Completed
+        assert time.monotonic() - start < 5
+
+        async def wait():
+            return await manager.async_wait_task(_reset(target))
+
+        assert asyncio.run(wait()) == TaskState.Completed
+
+
+class _EventBmc(BaseHTTPRequestHandler):
+    done = threading.Event()
+    polls = []
+
+    def _json(self, status, body):
+        raw = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(raw)))
+        self.end_headers()
+        self.wfile.write(raw)
+
+    def do_GET(self):  # noqa: N802 - http.server naming
+        cls = type(self)
+        path = self.path.split("?", 1)[0]
+        if path == "/redfish/v1/EventService":
+            self._json(200, {"ServerSentEventUri": "/redfish/v1/SSE"})
+        elif path == "/redfish/v1/SSE":
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.end_headers()
+            self.wfile.write(b": connected\n\n")
+            self.wfile.flush()
+            cls.done.wait(10)
+            event = {"Events": [{"MessageId": "IDRAC.2.8.JCP037", "MessageArgs": ["JID_1"]}]}
+            self.wfile.write(f"id: 1\ndata: {json.dumps(event)}\n\n".encode())
+            self.wfile.flush()
+            time.sleep(1)
+        elif path.endswith("/JID_1"):
+            cls.polls.append(time.monotonic())
+            if cls.done.is_set():
+                self._json(200, {"TaskState": "Completed", "TaskStatus": "OK"})
+            else:
+                self._json(202, {"TaskState": "Running", "TaskStatus": "OK",
+                                 "PercentComplete": 40})
+        else:
+            self._json(404, {"error": {"message": f"{path} not found"}})
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def event_bmc():
+    _EventBmc.done = threading.Event()
+    _EventBmc.polls = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _EventBmc)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"127.0.0.1:{server.server_address[1]}"
+    _EventBmc.done.set()
+    server.shutdown()
+    server.server_close()
+
+
+def test_task_event_wakes_the_wait(event_bmc):
+    # without the event the next poll would be 30 seconds away.
+    waiter = TaskWaiter(_manager(event_bmc), PollSchedule(first=30), use_events=True)
+    updates = []
+    future = waiter.watch("JID_1", on_update=lambda *args: updates.append(args[0]))
+    threading.Timer(0.5, _EventBmc.done.set).start()
+    start = time.monotonic()
+    assert future.result(10) == TaskState.Completed
+    assert time.monotonic() - start < 5
+    # one poll when the stream connected, one when the event arrived.
+    assert len(_EventBmc.polls) == 2 and updates == [TaskState.Starting]
+    assert waiter.stream.events == 1
+
+    quiet = TaskWaiter(_manager(event_bmc), PollSchedule(first=0.01), use_events=False)
+    # 404: the task is gone, the wait ends with the last known state.
+    assert quiet.wait_sync("JID_GONE", timeout=5) == TaskState.Unknown
+    waiter.close()
+    quiet.close()
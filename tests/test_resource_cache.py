@@ -0,0 +1,186 @@
+"""Per-process resource cache: LRU, per-class TTLs and ETag revalidation.
+
+Runs offline against the mock service. A sensor endpoint is overridden with
+a callback that hands out an ETag and answers 304 to a matching
+If-None-Match, the way a BMC that supports conditional GETs does.
+
+Author Mus spyroot@gmail.com
+"""
+import json
+
+import pytest
+
+from idrac_ctl.idrac_manager import IDracManager
+from idrac_ctl.idrac_shared import ApiRequestType
+from idrac_ctl.redfish_cache import (
+    ResourceCache,
+    expire_resource_cache,
+    normalize_url,
+    parse_cache_control,
+    resource_class,
+    shared_resource_cache,
+)
+from idrac_ctl.telemetry.exporter import ScrapeScheduler
+
+SENSOR = "https://mock-idrac/redfish/v1/Chassis/1U/Sensors/AmbientTemp"
+
+
+def _mgr(**kwargs):
+    return IDracManager(idrac_ip="mock-idrac", idrac_username="root",
+                        idrac_password="mock", resource_cache=True, **kwargs)
+
+
+@pytest.fixture
+def etag_sensor(redfish_service):
+    """Sensor that answers 304 when the client already holds its ETag."""
+    calls = []
+
+    def sensor_cb(request, context):
+        calls.append(request.headers.get("If-None-Match"))
+        context.headers["ETag"] = '"v1"'
+        if request.headers.get("If-None-Match") == '"v1"':
+            context.status_code = 304
+            return ""
+        context.status_code = 200
+        return json.dumps({"@odata.id": "/redfish/v1/Chassis/1U/Sensors/AmbientTemp",
+                           "Reading": 22.5})
+
+    redfish_service.mocker.get(SENSOR, text=sensor_cb)
+    return calls
+
+
+def test_cache_is_off_by_default(redfish_service, redfish_mock):
+    """Library managers keep sending every GET unless they opt in."""
+    redfish_mock.base_query("/redfish/v1/Chassis")
+    redfish_mock.base_query("/redfish/v1/Chassis")
+    assert redfish_mock.query_counter == 2
+    assert redfish_mock.resource_cache is None
+
+
+def test_fresh_entry_skips_the_request(redfish_service):
+    """Inventory is served from the cache, across URL spellings and commands."""
+    mgr = _mgr()
+    first = mgr.base_query("/redfish/v1/Chassis")
+    second = mgr.base_query("/redfish/v1/Chassis/")
+    assert second.data == first.data
+    assert len(redfish_service.requests) == 1
+    assert mgr.query_counter == 1
+    assert shared_resource_cache().stats()["hits"] == 1
+
+
+def test_cached_document_is_private_to_the_caller(redfish_service):
+    """Mutating a returned document does not leak into the next read."""
+    mgr = _mgr()
+    mgr.base_query("/redfish/v1/Chassis").data["Members"].clear()
+    assert mgr.base_query("/redfish/v1/Chassis").data["Members"]
+
+
+def test_telemetry_revalidates_with_etag(etag_sensor):
+    """A sensor is never served blind, a 304 reuses the cached body."""
+    mgr = _mgr()
+    first = mgr.base_query("/redfish/v1/Chassis/1U/Sensors/AmbientTemp")
+    second = mgr.base_query("/redfish/v1/Chassis/1U/Sensors/AmbientTemp")
+    assert etag_sensor == [None, '"v1"']
+    assert second.data == first.data == {
+        "@odata.id": "/redfish/v1/Chassis/1U/Sensors/AmbientTemp", "Reading": 22.5}
+    assert shared_resource_cache().stats()["revalidated"] == 1
+
+
+def test_no_store_is_not_cached(redfish_service):
+    """Cache-Control: no-store keeps a resource out of the cache."""
+    redfish_service.mocker.get(
+        "https://mock-idrac/redfish/v1/Managers",
+        text='{"Members": []}', headers={"Cache-Control": "no-store"})
+    mgr = _mgr()
+    mgr.base_query("/redfish/v1/Managers")
+    mgr.base_query("/redfish/v1/Managers")
+    assert mgr.query_counter == 2
+    assert len(shared_resource_cache()) == 0
+
+
+def test_write_invalidates_the_bmc(redfish_service):
+    """A PATCH is visible to the next GET of the same BMC."""
+    mgr = _mgr()
+    mgr.base_query("/redfish/v1/Chassis")
+    mgr.base_patch("/redfish/v1/Chassis/1U", payload={"AssetTag": "rack-7"},
+                   expected_status=200)
+    mgr.base_query("/redfish/v1/Chassis")
+    gets = [r for r in redfish_service.requests if r.method == "GET"]
+    assert len(gets) == 2
+
+
+def test_expired_entries_are_refetched(redfish_service, etag_sensor):
+    """After expire an entry is never served without asking the BMC."""
+    mgr = _mgr()
+    mgr.base_query("/redfish/v1/Chassis")
+    mgr.base_query("/redfish/v1/Chassis/1U/Sensors/AmbientTemp")
+    expire_resource_cache()
+    mgr.base_query("/redfish/v1/Chassis")
+    mgr.base_query("/redfish/v1/Chassis/1U/Sensors/AmbientTemp")
+    assert mgr.query_counter == 4
+    assert etag_sensor == [None, '"v1"']
+
+
+def test_every_scrape_revalidates(redfish_service):
+    """Port and health documents are inventory, a scrape still asks the BMC."""
+    mgr = _mgr()
+    port = "/redfish/v1/Chassis/1U"
+    scheduler = ScrapeScheduler(lambda: mgr.base_query(port) and [])
+    assert scheduler.collect_once() and scheduler.collect_once()
+    assert mgr.query_counter == 2
+    # expiring another BMC leaves this one fresh.
+    expire_resource_cache("https://other-idrac/redfish/v1")
+    mgr.base_query(port)
+    assert mgr.query_counter == 2
+
+
+def test_write_without_the_cache_invalidates_it(redfish_service):
+    """A writer that does not read through the cache still drops its entries."""
+    mgr = _mgr()
+    mgr.base_query("/redfish/v1/Chassis")
+    writer = IDracManager(idrac_ip="mock-idrac", idrac_username="root",
+                          idrac_password="mock", resource_cache=False)
+    writer.base_patch("/redfish/v1/Chassis/1U", payload={"AssetTag": "rack-7"},
+                      expected_status=200)
+    mgr.base_query("/redfish/v1/Chassis")
+    assert mgr.query_counter == 2
+
+
+def test_dispatched_commands_share_the_cache(redfish_service):
+    """sync_invoke forwards the flag, a second walk reuses inventory."""
+    mgr = _mgr()
+    mgr.sync_invoke(ApiRequestType.Sensors, "sensors")
+    first = len(redfish_service.requests)
+    mgr.sync_invoke(ApiRequestType.Sensors, "sensors")
+    # chassis documents come from the cache, sensor readings are refetched.
+    assert len(redfish_service.requests) < 2 * first
+
+
+def test_lru_eviction():
+    cache = ResourceCache(max_entries=2)
+    for i in range(3):
+        cache.store(cache.key(f"https://bmc/redfish/v1/Chassis/{i}"), {"Id": i})
+    assert len(cache) == 2
+    assert cache.lookup(cache.key("https://bmc/redfish/v1/Chassis/0")) is None
+    assert cache.stats()["evictions"] == 1
+
+
+@pytest.mark.parametrize("path, expected", [
+    ("/redfish/v1", "static"),
+    ("/redfish/v1/Registries/Base", "static"),
+    ("/redfish/v1/Chassis/1/Sensors/Fan1", "telemetry"),
+    ("/redfish/v1/TaskService/Tasks/JID_1", "volatile"),
+    ("/redfish/v1/Systems/System.Embedded.1", "inventory"),
+])
+def test_resource_class(path, expected):
+    assert resource_class(path) == expected
+
+
+def test_helpers():
+    assert normalize_url("HTTPS://BMC//redfish/v1/") == ("https://bmc", "/redfish/v1")
+    assert normalize_url("https://bmc/redfish/v1/Systems?$select=Id")[1] == \
+        "/redfish/v1/Systems?$select=Id"
+    assert parse_cache_control('max-age=30, no-cache') == {"max-age": "30", "no-cache": None}
+    cache = ResourceCache(ttls={"inventory": 5})
+    assert cache.ttl_for("/redfish/v1/Chassis") == 5
+    assert cache.ttl_for("/redfish/v1/Chassis", {"Cache-Control": "max-age=9"}) == 9
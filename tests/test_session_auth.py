@@ -0,0 +1,157 @@
+"""SessionService X-Auth-Token authentication, offline against the mock service.
+
+The mock gains a ``/SessionService/Sessions`` endpoint that hands out tokens,
+so the tests can check that requests carry the token instead of basic
+credentials, that a rejected token is refreshed once, and that the on-disk
+token cache survives a simulated second CLI invocation.
+
+Author Mus spyroot@gmail.com
+"""
+import itertools
+import os
+
+import pytest
+
+from idrac_ctl.cmd_exceptions import AuthenticationFailed
+from idrac_ctl.idrac_manager import IDracManager
+from idrac_ctl.idrac_shared import ApiRequestType
+from idrac_ctl.redfish_auth import close_sessions, forget_sessions, token_cache_path
+
+SESSIONS = "https://mock-idrac/redfish/v1/SessionService/Sessions"
+
+
+@pytest.fixture
+def session_service(redfish_service, tmp_path, monkeypatch):
+    """Mock service that issues tok-1, tok-2, ... on every login."""
+    monkeypatch.setenv("IDRAC_CTL_CACHE_DIR", str(tmp_path))
+    counter = itertools.count(1)
+    logins = []
+
+    def login_cb(request, context):
+        n = next(counter)
+        logins.append(request.json())
+        context.status_code = 201
+        context.headers["X-Auth-Token"] = f"tok-{n}"
+        context.headers["Location"] = f"/redfish/v1/SessionService/Sessions/{n}"
+        return '{"Id": "%d"}' % n
+
+    redfish_service.mocker.post(SESSIONS, text=login_cb)
+    redfish_service.logins = logins
+    return redfish_service
+
+
+def _mgr(**kwargs):
+    return IDracManager(idrac_ip="mock-idrac", idrac_username="root",
+                        idrac_password="mock", session_auth=True, **kwargs)
+
+
+def test_requests_carry_session_token(session_service):
+    """One login, then every GET sends X-Auth-Token and no basic credentials."""
+    mgr = _mgr()
+    mgr.base_query("/redfish/v1/Chassis")
+    mgr.base_query("/redfish/v1/Managers")
+
+    assert session_service.logins == [{"UserName": "root", "Password": "mock"}]
+    gets = [r for r in session_service.requests if r.method == "GET"]
+    assert len(gets) == 2
+    assert all(r.headers["X-Auth-Token"] == "tok-1" for r in gets)
+    assert all("Authorization" not in r.headers for r in gets)
+
+
+def test_token_shared_by_dispatched_commands(session_service):
+    """sync_invoke forwards session auth, the command reuses the same token."""
+    mgr = _mgr()
+    mgr.base_query("/redfish/v1/Chassis")
+    mgr.sync_invoke(ApiRequestType.Sensors, "sensors")
+    assert len(session_service.logins) == 1
+    assert {r.headers.get("X-Auth-Token") for r in session_service.requests} == {"tok-1"}
+
+
+def test_rejected_token_is_refreshed_once(session_service):
+    """A 401 triggers one new login and the request is replayed with it."""
+    def root_cb(request, context):
+        session_service.requests.append(request)
+        if request.headers.get("X-Auth-Token") == "tok-1":
+            context.status_code = 401
+            return "{}"
+        context.status_code = 200
+        return '{"RedfishVersion": "1.11.0"}'
+
+    session_service.mocker.get("https://mock-idrac/redfish/v1/", text=root_cb)
+    mgr = _mgr()
+    result = mgr.base_query("/redfish/v1/")
+
+    assert result.data["RedfishVersion"] == "1.11.0"
+    assert len(session_service.logins) == 2
+    assert [r.headers["X-Auth-Token"] for r in session_service.requests] == ["tok-1", "tok-2"]
+
+
+def test_unsupported_session_service_falls_back_to_basic(redfish_service):
+    """No SessionService -> basic auth, and no further login attempts."""
+    redfish_service.mocker.post(SESSIONS, status_code=405, text="{}")
+    mgr = _mgr()
+    mgr.base_query("/redfish/v1/Chassis")
+    mgr.base_query("/redfish/v1/Managers")
+
+    gets = [r for r in redfish_service.requests if r.method == "GET"]
+    assert redfish_service.mocker.call_count - len(gets) == 1
+    assert all("Authorization" in r.headers for r in gets)
+
+
+def test_failed_login_is_retried(session_service):
+    """A transient failure uses basic auth once, the next request logs in."""
+    answers = iter([{"status_code": 503, "text": "{}"},
+                    {"status_code": 201, "headers": {"X-Auth-Token": "tok-9"}, "text": "{}"}])
+    session_service.mocker.post(SESSIONS, [next(answers), next(answers)])
+    mgr = _mgr()
+    mgr.base_query("/redfish/v1/Chassis")
+    mgr.base_query("/redfish/v1/Managers")
+
+    gets = [r for r in session_service.requests if r.method == "GET"]
+    assert "Authorization" in gets[0].headers and "X-Auth-Token" not in gets[0].headers
+    assert gets[1].headers["X-Auth-Token"] == "tok-9"
+
+
+def test_rejected_credentials_raise(redfish_service):
+    redfish_service.mocker.post(SESSIONS, status_code=401, text="{}")
+    with pytest.raises(AuthenticationFailed):
+        _mgr().base_query("/redfish/v1/Chassis")
+
+
+def test_new_password_replaces_the_session(session_service):
+    """A long-lived process sees a corrected password."""
+    _mgr().base_query("/redfish/v1/Chassis")
+    IDracManager(idrac_ip="mock-idrac", idrac_username="root", idrac_password="rotated",
+                 session_auth=True).base_query("/redfish/v1/Chassis")
+
+    assert [login["Password"] for login in session_service.logins] == ["mock", "rotated"]
+    deletes = [r for r in session_service.requests if r.method == "DELETE"]
+    assert [r.headers["X-Auth-Token"] for r in deletes] == ["tok-1"]
+
+
+def test_session_deleted_on_exit(session_service):
+    """Without the token cache the session is deleted when the process exits."""
+    mgr = _mgr()
+    mgr.base_query("/redfish/v1/Chassis")
+    close_sessions()
+
+    deletes = [r for r in session_service.requests if r.method == "DELETE"]
+    assert [r.path for r in deletes] == ["/redfish/v1/sessionservice/sessions/1"]
+    assert deletes[0].headers["X-Auth-Token"] == "tok-1"
+
+
+def test_token_cache_survives_next_invocation(session_service):
+    """A cached token is written 0600, reused by the next process, kept on exit."""
+    _mgr(token_cache=True).base_query("/redfish/v1/Chassis")
+    close_sessions()
+    path = token_cache_path()
+    assert path.exists()
+    assert oct(os.stat(path).st_mode & 0o777) == "0o600"
+
+    # a new CLI invocation, nothing in memory
+    forget_sessions()
+    _mgr(token_cache=True).base_query("/redfish/v1/Managers")
+
+    assert len(session_service.logins) == 1
+    assert session_service.requests[-1].headers["X-Auth-Token"] == "tok-1"
+    assert not [r for r in session_service.requests if r.method == "DELETE"]
@@ -0,0 +1,102 @@
+"""Keep-alive session pool shared by RedfishManager and IDracManager.
+
+Runs a tiny HTTP/1.1 keep-alive server on localhost so the counters reflect
+real socket reuse; requests-mock bypasses the urllib3 pool entirely and
+would not exercise it.
+
+Author Mus spyroot@gmail.com
+"""
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from idrac_ctl.idrac_manager import IDracManager
+from idrac_ctl.redfish_manager import RedfishManager
+from idrac_ctl.redfish_pool import RedfishHTTPAdapter, new_session, session_stats
+
+
+class _KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):  # noqa: N802 - http.server naming
+        body = json.dumps({"@odata.id": self.path, "RedfishVersion": "1.11.0"}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def keepalive_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _KeepAliveHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def _manager(cls, host, **kwargs):
+    if cls is IDracManager:
+        return IDracManager(idrac_ip=host, idrac_username="root",
+                            idrac_password="pw", is_http=True, **kwargs)
+    return RedfishManager(redfish_ip=host, redfish_username="root",
+                          redfish_password="pw", is_http=True, **kwargs)
+
+
+@pytest.mark.parametrize("manager_cls", [RedfishManager, IDracManager])
+def test_sequential_queries_reuse_one_connection(manager_cls, keepalive_server):
+    """Five GETs to one BMC open a single connection and reuse it four times."""
+    mgr = _manager(manager_cls, keepalive_server, shared_pool=False)
+    for _ in range(5):
+        mgr.base_query("/redfish/v1/")
+    assert mgr.query_counter == 5
+    assert mgr.connection_stats() == {"requests": 5, "opened": 1, "reused": 4}
+
+
+def test_async_path_uses_the_same_pool(keepalive_server):
+    """api_async_get_call runs over the same keep-alive session as the sync path."""
+    mgr = _manager(IDracManager, keepalive_server, shared_pool=False)
+    mgr.api_get_call(f"http://{keepalive_server}/redfish/v1/", None)
+
+    async def _get():
+        loop = asyncio.get_running_loop()
+        return await mgr.api_async_get_until_complete(
+            f"http://{keepalive_server}/redfish/v1/", None, loop=loop)
+
+    resp = asyncio.run(_get())
+    assert resp.status_code == 200
+    assert mgr.connection_stats()["opened"] == 1
+    assert mgr.connection_stats()["reused"] == 1
+
+
+def test_shared_pool_is_per_process_per_bmc(keepalive_server):
+    """Two managers for the same BMC share a session; a private one does not."""
+    a = _manager(RedfishManager, keepalive_server)
+    b = _manager(IDracManager, keepalive_server)
+    private = _manager(RedfishManager, keepalive_server, shared_pool=False)
+    assert a.http_session is b.http_session
+    assert private.http_session is not a.http_session
+
+    a.base_query("/redfish/v1/")
+    b.base_query("/redfish/v1/")
+    assert b.connection_stats()["opened"] == 1
+    assert b.connection_stats()["reused"] == 1
+
+
+def test_pool_size_is_configurable():
+    """pool_size bounds the urllib3 pool; nonsense sizes are rejected."""
+    session = new_session(pool_size=3)
+    adapter = session.adapters["https://"]
+    assert isinstance(adapter, RedfishHTTPAdapter)
+    assert adapter._pool_maxsize == 3
+    assert session_stats(session) == {"requests": 0, "opened": 0, "reused": 0}
+    with pytest.raises(ValueError):
+        new_session(pool_size=0)
@@ -4,8 +4,9 @@ BMCs (iDRAC, Supermicro, etc.) ship self-signed certificates, so the tool must
 *skip* certificate verification by default and verify only when explicitly asked.
 Internally ``insecure`` means "skip verification" and maps to the inverse of the
 ``verify`` kwarg that the client hands to ``requests``. These tests pin that
-mapping at the seam where ``requests.get`` is called, capturing the ``verify``
-kwarg via a monkeypatched stub so no real network call is ever made.
+mapping at the seam where the keep-alive ``requests.Session`` sends the request,
+capturing the ``verify`` kwarg via a monkeypatched stub so no real network call
+is ever made.
 """
 from types import SimpleNamespace
 
@@ -26,27 +27,27 @@ class _FakeResponse:
 
 @pytest.fixture
 def captured_verify(monkeypatch):
-    """Monkeypatch ``requests.get`` to record the ``verify`` kwarg, no network.
+    """Monkeypatch ``requests.Session.request`` to record the ``verify`` kwarg.
 
-    Patches the symbol on the ``requests`` module that both managers import, so a
-    call to ``api_get_call`` records the flag instead of opening a socket.
+    Both managers send every call through their pooled session, so a call to
+    ``api_get_call`` records the flag instead of opening a socket.
     """
     seen = {}
 
-    def fake_get(url, **kwargs):
+    def fake_request(self, method, url, **kwargs):
         seen["verify"] = kwargs.get("verify")
         seen["url"] = url
         return _FakeResponse()
 
     import requests
 
-    monkeypatch.setattr(requests, "get", fake_get)
+    monkeypatch.setattr(requests.Session, "request", fake_request)
     return seen
 
 
 @pytest.mark.parametrize("manager_cls", [RedfishManager, IDracManager])
 def test_default_manager_skips_verification(manager_cls, captured_verify):
-    """No flag -> insecure default -> requests.get receives verify=False.
+    """No flag -> insecure default -> the session receives verify=False.
 
     This is the self-signed-BMC happy path: the client must not verify unless
     the operator opts in, otherwise every connection to a default iDRAC fails.
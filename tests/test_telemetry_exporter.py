@@ -1,12 +1,27 @@
 """Offline tests for the Redfish telemetry exporter contract."""
 
+import gzip
+import socket
+import threading
+import urllib.request
+
+import pytest
+
 from idrac_ctl.idrac_shared import ApiRequestType
+from idrac_ctl.telemetry.cmd_exporter import Exporter
 from idrac_ctl.telemetry.exporter import (
+    COLLECTOR_DURATION_METRIC,
+    LAST_SUCCESS_METRIC,
+    SCRAPE_AGE_METRIC,
     MetricSample,
+    ScrapeScheduler,
     build_identity_dimensions,
     build_metric_samples,
+    collection_schedule,
     exporter_argv_uses_secret,
     load_exporter_env_file,
+    parse_collector_intervals,
+    prometheus_server,
     render_prometheus_text,
     to_signalfx_body,
 )
@@ -232,3 +247,134 @@ def test_exporter_command_collects_supermicro_fixture_metrics(redfish_mock_facto
     assert {"hw.power", "hw.gpu.power", "hw.fabric.rx_bytes"} <= metrics
     assert all(REQUIRED_DIMS <= set(point["dimensions"]) for point in gauges)
     assert all(recorded.method != "POST" for recorded in service.requests)
+
+
+def _serve(scrape):
+    server = prometheus_server(scrape, "127.0.0.1", 0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/metrics"
+
+
+def test_scheduler_serves_cached_payload_plain_and_gzip():
+    """Scrapes never trigger a collection, gzip clients get the same text."""
+    calls = []
+    dims = build_identity_dimensions("172.25.230.29", vendor="supermicro")
+
+    def collect():
+        calls.append(1)
+        return [MetricSample("hw.power", 1349.0, dims)]
+
+    scheduler = ScrapeScheduler(collect, interval=3600, dims=dims)
+    assert scheduler.payload() is None
+    assert scheduler.collect_once()
+    server, url = _serve(scheduler)
+    try:
+        plain = urllib.request.urlopen(url).read().decode()
+        req = urllib.request.Request(url, headers={"Accept-Encoding": "gzip"})
+        with urllib.request.urlopen(req) as resp:
+            assert resp.headers["Content-Encoding"] == "gzip"
+            unzipped = gzip.decompress(resp.read()).decode()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert calls == [1]
+    assert 'hw.power{bmc.ip="172.25.230.29"' in plain
+    assert f"# TYPE {SCRAPE_AGE_METRIC} gauge" in plain
+    assert unzipped.split(SCRAPE_AGE_METRIC)[0] == plain.split(SCRAPE_AGE_METRIC)[0]
+    assert LAST_SUCCESS_METRIC in unzipped
+
+
+def test_scheduler_keeps_last_payload_when_collection_fails():
+    samples = [[MetricSample("hw.power", 1.0, {})], RuntimeError("bmc gone")]
+
+    def collect():
+        item = samples.pop(0)
+        if isinstance(item, Exception):
+            raise item
+        return item
+
+    scheduler = ScrapeScheduler(collect, interval=3600)
+    assert scheduler.collect_once()
+    assert not scheduler.collect_once()
+    text = scheduler.payload().decode()
+    assert "hw.power{} 1" in text
+    assert "idrac_ctl.exporter.collect_errors{} 1" in text
+
+
+def test_slow_client_does_not_block_other_scrapes():
+    scheduler = ScrapeScheduler(lambda: [MetricSample("hw.power", 1.0, {})], interval=3600)
+    scheduler.collect_once()
+    server, url = _serve(scheduler)
+    slow = socket.create_connection(server.server_address)
+    try:
+        slow.sendall(b"GET /metrics HTTP/1.1\r\n")
+        with urllib.request.urlopen(url, timeout=5) as resp:
+            assert resp.status == 200
+    finally:
+        slow.close()
+        server.shutdown()
+        server.server_close()
+
+
+def test_scheduler_thread_collects_in_background():
+    event = threading.Event()
+    scheduler = ScrapeScheduler(lambda: event.set() or [], interval=3600).start()
+    try:
+        assert scheduler.wait_ready(5)
+        assert event.is_set()
+    finally:
+        scheduler.stop(5)
+
+
+def test_collectors_not_due_reuse_their_last_rows(redfish_mock_factory):
+    """Inventory collectors are skipped between runs, their series stay."""
+    _, service = redfish_mock_factory("supermicro")
+    exporter = Exporter(idrac_ip="mock-supermicro", idrac_username="root",
+                        idrac_password="mock")
+    intervals = parse_collector_intervals(["all=3600", "environment=0"])
+
+    first = exporter.collect_samples("172.25.230.29", "supermicro", intervals=intervals)
+    sent = len(service.requests)
+    second = exporter.collect_samples("172.25.230.29", "supermicro", intervals=intervals)
+    rewalked = [r.path for r in service.requests[sent:]]
+
+    assert rewalked and all("/sensors" not in path for path in rewalked)
+    assert len(rewalked) < sent
+    hw = sorted((s.metric, sorted(s.dimensions.items())) for s in first if s.metric.startswith("hw."))
+    assert hw == sorted((s.metric, sorted(s.dimensions.items()))
+                        for s in second if s.metric.startswith("hw."))
+    collectors = {s.dimensions["collector"] for s in second
+                  if s.metric == COLLECTOR_DURATION_METRIC}
+    assert collectors == {"environment", "sensors", "nvlink", "metric_reports",
+                          "network", "component_integrity"}
+
+
+def test_parse_collector_intervals():
+    intervals = parse_collector_intervals(["sensors=15", "component-integrity=60"])
+    assert intervals["sensors"] == 15.0
+    assert intervals["component_integrity"] == 60.0
+    assert intervals["network"] == 1800.0
+    assert intervals["environment"] == 0.0
+    for bad in ("fans=10", "sensors", "sensors=-1", "sensors=nan", "all=inf"):
+        with pytest.raises(ValueError):
+            parse_collector_intervals([bad])
+
+
+def test_fast_collector_does_not_speed_up_the_others(redfish_mock_factory):
+    """sensors=15 with --interval 30 ticks every 15s, the rest still runs every 30s."""
+    _, service = redfish_mock_factory("supermicro")
+    exporter = Exporter(idrac_ip="mock-supermicro", idrac_username="root",
+                        idrac_password="mock")
+    intervals, tick = collection_schedule(parse_collector_intervals(["sensors=15"]), 30)
+    assert tick == 15.0
+    assert intervals["environment"] == intervals["metric_reports"] == 30.0
+
+    exporter.collect_samples("172.25.230.29", "supermicro", intervals=intervals)
+    # one tick later.
+    exporter._collected = {name: (rows, start - tick, duration)
+                           for name, (rows, start, duration) in exporter._collected.items()}
+    before = dict(exporter._collected)
+    exporter.collect_samples("172.25.230.29", "supermicro", intervals=intervals)
+    ran = {name for name, last in exporter._collected.items() if last is not before[name]}
+    assert ran == {"sensors"}
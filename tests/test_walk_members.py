@@ -0,0 +1,114 @@
+"""Bounded-concurrency collection walks: fetch_resources and walk_members.
+
+The ordering and skip semantics run offline against the mock service. The
+concurrency cap is checked against a local HTTP server that records how many
+GETs are in flight at once.
+
+Author Mus spyroot@gmail.com
+"""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from idrac_ctl.idrac_manager import IDracManager
+from idrac_ctl.idrac_shared import ApiRequestType, Singleton
+
+
+def test_fetch_resources_keeps_order_and_skips_failures(redfish_mock):
+    """Entry i belongs to uri i, a 404 becomes None instead of raising."""
+    uris = ["/redfish/v1/Chassis", "/redfish/v1/NoSuchThing", "/redfish/v1/Managers"]
+    bodies = redfish_mock.fetch_resources(uris, max_workers=3)
+    assert bodies[0]["@odata.id"] == "/redfish/v1/Chassis"
+    assert bodies[1] is None
+    assert bodies[2]["@odata.id"] == "/redfish/v1/Managers"
+
+
+def test_query_counter_counts_every_worker(redfish_mock):
+    """GETs sent from the fan-out threads are all counted."""
+    uris = ["/redfish/v1/Chassis", "/redfish/v1/Managers", "/redfish/v1/Systems"] * 20
+    before = redfish_mock.query_counter
+    redfish_mock.fetch_resources(uris, max_workers=8)
+    assert redfish_mock.query_counter - before == len(uris)
+
+
+def test_walk_members_matches_sequential_walk(redfish_mock):
+    """A parallel walk returns the same members, in the same order, as one worker."""
+    colls = ["/redfish/v1/Chassis", "/redfish/v1/NoSuchThing", "/redfish/v1/Managers"]
+    parallel = redfish_mock.walk_members(colls, max_workers=4)
+    sequential = redfish_mock.walk_members(colls, max_workers=1)
+    assert parallel == sequential
+    assert parallel[1] == []
+    chassis = redfish_mock.base_query("/redfish/v1/Chassis").data
+    assert [uri for uri, _ in parallel[0]] == [m["@odata.id"] for m in chassis["Members"]]
+    assert all(body["@odata.id"] == uri for uri, body in parallel[0])
+
+
+def test_walk_members_limit(redfish_mock):
+    """limit caps the members taken from every collection."""
+    walked, = redfish_mock.walk_members(["/redfish/v1/Chassis"], limit=1)
+    assert len(walked) == 1
+
+
+def test_walk_concurrency_forwarded_to_commands(redfish_mock):
+    """sync_invoke hands the manager's walk_concurrency to the command."""
+    mgr = IDracManager(idrac_ip="mock-idrac", idrac_username="root",
+                       idrac_password="mock", walk_concurrency=3)
+    mgr.sync_invoke(ApiRequestType.Sensors, "sensors")
+    sensors = next(v for c, v in Singleton._instances.items() if c.__name__ == "Sensors")
+    assert [cmd.walk_concurrency for cmd in sensors.values()] == [3]
+
+
+class _CountingHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    lock = threading.Lock()
+    in_flight = 0
+    max_in_flight = 0
+
+    def do_GET(self):  # noqa: N802 - http.server naming
+        cls = type(self)
+        if self.path == "/redfish/v1/Things":
+            body = {"Members": [{"@odata.id": f"/redfish/v1/Things/{i}"} for i in range(12)]}
+        else:
+            with cls.lock:
+                cls.in_flight += 1
+                cls.max_in_flight = max(cls.max_in_flight, cls.in_flight)
+            time.sleep(0.03)
+            with cls.lock:
+                cls.in_flight -= 1
+            body = {"@odata.id": self.path}
+        raw = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(raw)))
+        self.end_headers()
+        self.wfile.write(raw)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def counting_server():
+    _CountingHandler.in_flight = 0
+    _CountingHandler.max_in_flight = 0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _CountingHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_walk_members_bounds_in_flight_gets(workers, counting_server):
+    """Never more than walk_concurrency member GETs hit the BMC at once."""
+    mgr = IDracManager(idrac_ip=counting_server, idrac_username="root",
+                       idrac_password="pw", is_http=True, walk_concurrency=workers)
+    walked, = mgr.walk_members(["/redfish/v1/Things"])
+    assert [uri for uri, _ in walked] == [f"/redfish/v1/Things/{i}" for i in range(12)]
+    assert _CountingHandler.max_in_flight <= workers
+    if workers > 1:
+        assert _CountingHandler.max_in_flight > 1